@@ -1,4 +1,5 @@
 import os
+import re
 import sys
 from logging.config import fileConfig
 
@@ -13,6 +14,9 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 # Import your models and base
 from models.base import Base
 from models import *  # Import all models to ensure they're registered
+from change_notifications import VERSION_TABLE
+from online_migrations import CHECKPOINT_TABLE
+from partitioning import PARTITIONED_TABLES
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -27,6 +31,20 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Tables created by migrations and tools rather than models: the change
+# counters (SQLite), backfill checkpoints and the monthly/default partitions of
+# the partitioned tables (PostgreSQL). Autogenerate must not drop them.
+UNMANAGED_TABLES = {VERSION_TABLE, CHECKPOINT_TABLE}
+PARTITION_NAME = re.compile(rf"({'|'.join(map(re.escape, PARTITIONED_TABLES))})_(p\d{{6}}|default)")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave unmanaged tables and partitions, with their indexes and constraints, out of autogenerate"""
+    table_name = name if type_ == 'table' else getattr(getattr(object, 'table', None), 'name', None)
+    if table_name is None:
+        return True
+    return table_name not in UNMANAGED_TABLES and not PARTITION_NAME.fullmatch(table_name)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -49,6 +67,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -62,8 +81,21 @@ def run_migrations_online() -> None:
 
     In this scenario we need to create an Engine
     and associate a connection with the context.
+    A connection passed in config.attributes (by
+    migration_utils) is reused as-is.
 
     """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -72,7 +104,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
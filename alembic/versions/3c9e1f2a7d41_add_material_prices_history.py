@@ -0,0 +1,51 @@
+"""Add material price history table
+
+Revision ID: 3c9e1f2a7d41
+Revises: 7b40015340d2
+Create Date: 2025-10-25 10:12:31.184502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1f2a7d41'
+down_revision: Union[str, Sequence[str], None] = '7b40015340d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('material_prices',
+    sa.Column('price_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('material_id', sa.Integer(), nullable=False),
+    sa.Column('resource_id', sa.Integer(), nullable=True),
+    sa.Column('price_date', sa.Date(), nullable=False),
+    sa.Column('unit_cost', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('source', sa.String(length=50), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.CheckConstraint("source IN ('catalogue', 'quote', 'import')", name='ck_material_price_source'),
+    sa.ForeignKeyConstraint(['material_id'], ['materials.material_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['resource_id'], ['resources.resource_id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('price_id')
+    )
+    op.create_index('ix_material_prices_material_date', 'material_prices', ['material_id', 'price_date'], unique=False)
+    op.create_index('ix_material_prices_price_date', 'material_prices', ['price_date'], unique=False)
+
+    # Seed the history with the current catalogue prices
+    op.execute(
+        "INSERT INTO material_prices (material_id, resource_id, price_date, unit_cost, source, created_at) "
+        "SELECT material_id, resource_id, CURRENT_DATE, unit_cost, 'catalogue', CURRENT_TIMESTAMP "
+        "FROM materials WHERE unit_cost IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_material_prices_price_date', table_name='material_prices')
+    op.drop_index('ix_material_prices_material_date', table_name='material_prices')
+    op.drop_table('material_prices')
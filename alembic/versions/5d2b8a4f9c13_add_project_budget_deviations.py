@@ -0,0 +1,77 @@
+"""Add precomputed project budget deviations
+
+Revision ID: 5d2b8a4f9c13
+Revises: 3c9e1f2a7d41
+Create Date: 2025-10-26 09:41:07.522913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b8a4f9c13'
+down_revision: Union[str, Sequence[str], None] = '3c9e1f2a7d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('project_budget_deviations',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('budget', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('material_planned', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('material_ordered', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('material_actual', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('labour_cost', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('committed_cost', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('forecast_cost', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('deviation_amount', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('deviation_percent', sa.Numeric(precision=8, scale=2), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.project_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+    op.create_index('ix_project_budget_deviations_percent', 'project_budget_deviations', ['deviation_percent'], unique=False)
+
+    # Backfill deviations for existing projects
+    op.execute(
+        "INSERT INTO project_budget_deviations (project_id, budget, material_planned, material_ordered, material_actual, "
+        "labour_cost, committed_cost, forecast_cost, deviation_amount, deviation_percent, updated_at) "
+        "SELECT project_id, budget, planned, ordered, actual, labour, "
+        "ordered + actual + labour, ordered + actual + labour + planned, "
+        "CASE WHEN budget IS NOT NULL THEN ordered + actual + labour + planned - budget END, "
+        "CASE WHEN budget > 0 THEN (ordered + actual + labour + planned - budget) * 100 / budget END, "
+        "CURRENT_TIMESTAMP "
+        "FROM ("
+        "  SELECT p.project_id, p.budget, "
+        "    COALESCE(m.planned, 0) AS planned, COALESCE(m.ordered, 0) AS ordered, "
+        "    COALESCE(m.actual, 0) AS actual, COALESCE(l.cost, 0) AS labour "
+        "  FROM projects p "
+        "  LEFT JOIN ("
+        "    SELECT project_id, "
+        "      SUM(CASE WHEN status = 'Planned' THEN COALESCE(total_cost, quantity * unit_cost, 0) ELSE 0 END) AS planned, "
+        "      SUM(CASE WHEN status = 'Ordered' THEN COALESCE(total_cost, quantity * unit_cost, 0) ELSE 0 END) AS ordered, "
+        "      SUM(CASE WHEN status IN ('Delivered', 'Used') THEN COALESCE(total_cost, quantity * unit_cost, 0) ELSE 0 END) AS actual "
+        "    FROM project_materials GROUP BY project_id"
+        "  ) m ON m.project_id = p.project_id "
+        "  LEFT JOIN ("
+        "    SELECT pp.project_id, SUM(ta.hours_worked * r.hourly_rate) AS cost "
+        "    FROM project_phases pp "
+        "    JOIN project_tasks pt ON pt.project_phase_id = pp.project_phase_id "
+        "    JOIN task_assignments ta ON ta.project_task_id = pt.project_task_id "
+        "    JOIN resources r ON r.resource_id = ta.resource_id "
+        "    WHERE ta.status <> 'Cancelled' "
+        "    GROUP BY pp.project_id"
+        "  ) l ON l.project_id = p.project_id"
+        ") totals"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_budget_deviations_percent', table_name='project_budget_deviations')
+    op.drop_table('project_budget_deviations')
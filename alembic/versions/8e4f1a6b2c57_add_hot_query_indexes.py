@@ -0,0 +1,49 @@
+"""Add indexes for foreign keys and hot dashboard/scheduling queries
+
+Revision ID: 8e4f1a6b2c57
+Revises: 5d2b8a4f9c13
+Create Date: 2025-10-27 08:15:44.906121
+
+"""
+from typing import Sequence, Union
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from online_migrations import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4f1a6b2c57'
+down_revision: Union[str, Sequence[str], None] = '5d2b8a4f9c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_PROJECT_STATUSES = "status IN ('Tervezés alatt', 'Folyamatban', 'Késésben')"
+
+# (index name, table, columns, partial index predicate)
+INDEXES = [
+    ('ix_project_members_resource_id', 'project_members', ['resource_id'], None),
+    ('ix_project_phases_project_id', 'project_phases', ['project_id'], None),
+    ('ix_project_tasks_project_phase_id', 'project_tasks', ['project_phase_id'], None),
+    ('ix_task_assignments_resource_start', 'task_assignments', ['resource_id', 'start_date'], None),
+    ('ix_project_materials_project_status', 'project_materials', ['project_id', 'status'], None),
+    ('ix_project_materials_material_id', 'project_materials', ['material_id'], None),
+    ('ix_project_materials_planned_demand', 'project_materials', ['material_id', 'assigned_date'], "status = 'Planned'"),
+    ('ix_materials_resource_id', 'materials', ['resource_id'], None),
+    ('ix_projects_status_end_date', 'projects', ['status', 'end_date'], None),
+    ('ix_projects_active_end_date', 'projects', ['end_date'], ACTIVE_PROJECT_STATUSES),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for index_name, table_name, columns, where in INDEXES:
+        create_index_concurrently(index_name, table_name, columns, where=where)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for index_name, table_name, columns, where in reversed(INDEXES):
+        drop_index_concurrently(index_name, table_name)
@@ -0,0 +1,138 @@
+"""Partition weather_data and task_assignments by month
+
+Revision ID: 9a7c3e5f1b24
+Revises: 8e4f1a6b2c57
+Create Date: 2025-10-28 10:02:19.340557
+
+PostgreSQL only: each table is rebuilt as a RANGE partitioned table (monthly
+partitions from the oldest row through PARTITIONS_AHEAD months ahead, plus a
+default partition) and the rows are copied over. The copy holds an ACCESS
+EXCLUSIVE lock on the table, so rehearse it with
+`python online_migrations.py rehearse` and run it in a maintenance window.
+
+The partition column has to be part of every primary key and unique
+constraint, so task_assignments.start_date becomes NOT NULL (backfilled from
+assigned_date / created_at) and uq_task_assignment includes start_date.
+SQLite databases keep the plain tables but get the same NOT NULL column and
+unique key (batch mode), so both backends accept the same assignments.
+"""
+from typing import Sequence, Union
+import sys
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from online_migrations import is_postgresql
+from partitioning import ensure_partitions
+
+# revision identifiers, used by Alembic.
+revision: str = '9a7c3e5f1b24'
+down_revision: Union[str, Sequence[str], None] = '8e4f1a6b2c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ASSIGNMENT_FOREIGN_KEYS = [
+    ('task_assignments_project_task_id_fkey', 'project_task_id', 'project_tasks', 'project_task_id'),
+    ('task_assignments_resource_id_fkey', 'resource_id', 'resources', 'resource_id'),
+]
+
+# table -> (partition column, id column, partitioned layout, plain layout);
+# a layout is (primary key, [(unique name, columns)], [(index name, columns)])
+TABLES = {
+    'weather_data': (
+        'date', 'weather_id',
+        (['weather_id', 'date'], [('uq_weather_location_date', ['location', 'date'])], []),
+        (['weather_id'], [('uq_weather_location_date', ['location', 'date'])], []),
+    ),
+    'task_assignments': (
+        'start_date', 'assignment_id',
+        (['assignment_id', 'start_date'], [('uq_task_assignment', ['project_task_id', 'resource_id', 'start_date'])],
+         [('ix_task_assignments_resource_start', ['resource_id', 'start_date'])]),
+        (['assignment_id'], [('uq_task_assignment', ['project_task_id', 'resource_id'])],
+         [('ix_task_assignments_resource_start', ['resource_id', 'start_date'])]),
+    ),
+}
+
+
+def _rename_legacy(table: str) -> str:
+    """Move the existing table and its indexes out of the way"""
+    legacy = f"{table}_legacy"
+    op.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+    indexes = op.get_bind().execute(sa.text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = :table AND schemaname = current_schema()"
+    ), {'table': legacy}).scalars().all()
+    for index in indexes:
+        op.execute(f'ALTER INDEX "{index}" RENAME TO "{index}_legacy"')
+    return legacy
+
+
+def _rebuild(table: str, layout: tuple, partition_column: str = None):
+    """Recreate a table from its _legacy copy with the given keys, copy the rows and drop the copy"""
+    id_column = TABLES[table][1]
+    primary_key, uniques, indexes = layout
+    bind = op.get_bind()
+    legacy = _rename_legacy(table)
+    partition_by = f' PARTITION BY RANGE ("{partition_column}")' if partition_column else ''
+
+    op.execute(f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS){partition_by}')
+    op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY ({", ".join(primary_key)})')
+    for name, columns in uniques:
+        op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" UNIQUE ({", ".join(columns)})')
+    for name, columns in indexes:
+        op.execute(f'CREATE INDEX "{name}" ON "{table}" ({", ".join(columns)})')
+    if table == 'task_assignments':
+        for name, column, referent, remote in ASSIGNMENT_FOREIGN_KEYS:
+            op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" FOREIGN KEY ({column}) '
+                       f'REFERENCES "{referent}" ({remote}) ON DELETE CASCADE')
+
+    if partition_column:
+        first = bind.execute(sa.text(f'SELECT MIN("{partition_column}") FROM "{legacy}"')).scalar()
+        ensure_partitions(bind, table, partition_column, first_month=first)
+
+    # Keep the id sequence: hand it to the new table before the old one is dropped
+    sequence = bind.execute(sa.text("SELECT pg_get_serial_sequence(:table, :column)"),
+                            {'table': legacy, 'column': id_column}).scalar()
+    if sequence:
+        op.execute(f'ALTER SEQUENCE {sequence} OWNED BY "{table}".{id_column}')
+    op.execute(f'INSERT INTO "{table}" SELECT * FROM "{legacy}"')
+    op.execute(f'DROP TABLE "{legacy}"')
+    op.execute(f'ANALYZE "{table}"')
+
+
+def _set_assignment_key(layout: tuple, nullable: bool):
+    """SQLite: rebuild task_assignments with the layout's unique key and start_date nullability"""
+    (name, columns), = layout[1]
+    with op.batch_alter_table('task_assignments') as batch:
+        batch.alter_column('start_date', existing_type=sa.Date(), nullable=nullable)
+        batch.drop_constraint(name, type_='unique')
+        batch.create_unique_constraint(name, columns)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "UPDATE task_assignments SET start_date = COALESCE(assigned_date, CAST(created_at AS DATE)) "
+        "WHERE start_date IS NULL"
+    )
+    if not is_postgresql():
+        _set_assignment_key(TABLES['task_assignments'][2], nullable=False)
+        return
+
+    op.alter_column('task_assignments', 'start_date', existing_type=sa.Date(), nullable=False)
+    for table, (column, _, partitioned, _) in TABLES.items():
+        _rebuild(table, partitioned, partition_column=column)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not is_postgresql():
+        _set_assignment_key(TABLES['task_assignments'][3], nullable=True)
+        return
+
+    for table, (_, _, _, plain) in TABLES.items():
+        _rebuild(table, plain)
+    op.alter_column('task_assignments', 'start_date', existing_type=sa.Date(), nullable=True)
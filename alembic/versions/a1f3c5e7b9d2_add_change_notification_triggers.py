@@ -0,0 +1,82 @@
+"""Add change notification triggers on the watched tables
+
+Revision ID: a1f3c5e7b9d2
+Revises: 9a7c3e5f1b24
+Create Date: 2025-10-29 09:41:07.512384
+
+PostgreSQL: a statement-level trigger per watched table sends
+pg_notify('epitai_changes', <table>) so the per-process ChangeListener can
+invalidate cached reads. SQLite: row triggers bump a per-table counter in
+data_versions, which the listener polls. See change_notifications.py.
+"""
+from typing import Sequence, Union
+import os
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1f3c5e7b9d2'
+down_revision: Union[str, Sequence[str], None] = '9a7c3e5f1b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The DDL is spelled out here rather than taken from change_notifications.py,
+# so later changes to the live module do not alter this revision
+CHANGE_CHANNEL = os.getenv('CHANGE_CHANNEL', 'epitai_changes')
+TRIGGER_FUNCTION = 'epitai_notify_change'
+VERSION_TABLE = 'data_versions'
+
+# WATCHED_TABLES as of this revision; tables added later install their own triggers
+TABLES = [
+    'projects',
+    'project_members',
+    'project_locations',
+    'resources',
+    'task_assignments',
+    'materials',
+    'project_materials',
+    'material_prices',
+    'project_budget_deviations',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(f"""CREATE OR REPLACE FUNCTION {TRIGGER_FUNCTION}() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_notify('{CHANGE_CHANNEL}', TG_TABLE_NAME);
+    RETURN NULL;
+END
+$$""")
+        for table in TABLES:
+            op.execute(f'DROP TRIGGER IF EXISTS trg_{table}_change ON "{table}"')
+            op.execute(f'CREATE TRIGGER trg_{table}_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "{table}" '
+                       f'FOR EACH STATEMENT EXECUTE FUNCTION {TRIGGER_FUNCTION}()')
+        return
+
+    op.execute(f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+               f"table_name VARCHAR(64) PRIMARY KEY, "
+               f"version INTEGER NOT NULL DEFAULT 0, "
+               f"changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)")
+    for table in TABLES:
+        op.execute(f"INSERT OR IGNORE INTO {VERSION_TABLE} (table_name) VALUES ('{table}')")
+        for operation in ('INSERT', 'UPDATE', 'DELETE'):
+            op.execute(f'CREATE TRIGGER IF NOT EXISTS trg_{table}_change_{operation.lower()} '
+                       f'AFTER {operation} ON "{table}" BEGIN '
+                       f"UPDATE {VERSION_TABLE} SET version = version + 1, changed_at = CURRENT_TIMESTAMP "
+                       f"WHERE table_name = '{table}'; END")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        for table in TABLES:
+            op.execute(f'DROP TRIGGER IF EXISTS trg_{table}_change ON "{table}"')
+        op.execute(f"DROP FUNCTION IF EXISTS {TRIGGER_FUNCTION}()")
+        return
+
+    for table in TABLES:
+        for operation in ('insert', 'update', 'delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_change_{operation}")
+    op.execute(f"DROP TABLE IF EXISTS {VERSION_TABLE}")
@@ -0,0 +1,52 @@
+"""Add change notification triggers on phases and tasks
+
+Revision ID: b6d8f0a2c4e7
+Revises: f4a6c8e0b2d5
+Create Date: 2025-11-03 09:12:40.218836
+
+The phase catalogue (phase_catalogue.py) is cached per process and project
+type; these triggers let the ChangeListener drop it when phases or tasks
+change.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d8f0a2c4e7'
+down_revision: Union[str, Sequence[str], None] = 'f4a6c8e0b2d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The notify function and data_versions come from a1f3c5e7b9d2
+WATCHED = ['phases', 'tasks']
+TRIGGER_FUNCTION = 'epitai_notify_change'
+VERSION_TABLE = 'data_versions'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        for table in WATCHED:
+            op.execute(f'CREATE TRIGGER trg_{table}_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "{table}" '
+                       f'FOR EACH STATEMENT EXECUTE FUNCTION {TRIGGER_FUNCTION}()')
+    else:
+        for table in WATCHED:
+            op.execute(f"INSERT OR IGNORE INTO {VERSION_TABLE} (table_name) VALUES ('{table}')")
+            for operation in ('INSERT', 'UPDATE', 'DELETE'):
+                op.execute(f'CREATE TRIGGER IF NOT EXISTS trg_{table}_change_{operation.lower()} '
+                           f'AFTER {operation} ON "{table}" BEGIN '
+                           f"UPDATE {VERSION_TABLE} SET version = version + 1, changed_at = CURRENT_TIMESTAMP "
+                           f"WHERE table_name = '{table}'; END")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        for table in WATCHED:
+            op.execute(f'DROP TRIGGER IF EXISTS trg_{table}_change ON "{table}"')
+    else:
+        for table in WATCHED:
+            for operation in ('insert', 'update', 'delete'):
+                op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_change_{operation}")
+            op.execute(f"DELETE FROM {VERSION_TABLE} WHERE table_name = '{table}'")
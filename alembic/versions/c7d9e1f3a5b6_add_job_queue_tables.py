@@ -0,0 +1,62 @@
+"""Add background job queue tables
+
+Revision ID: c7d9e1f3a5b6
+Revises: a1f3c5e7b9d2
+Create Date: 2025-10-30 08:22:51.304617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d9e1f3a5b6'
+down_revision: Union[str, Sequence[str], None] = 'a1f3c5e7b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('jobs',
+    sa.Column('job_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('kind', sa.String(length=100), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('progress', sa.Float(), nullable=False),
+    sa.Column('progress_message', sa.String(length=500), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('worker', sa.String(length=100), nullable=True),
+    sa.Column('submitted_by', sa.String(length=255), nullable=True),
+    sa.Column('run_after', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.CheckConstraint("status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled')", name='ck_job_status'),
+    sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index('ix_jobs_status_priority', 'jobs', ['status', 'priority', 'job_id'], unique=False)
+    op.create_table('job_results',
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('result', sa.Text(), nullable=True),
+    sa.Column('content', sa.LargeBinary(), nullable=True),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('content_type', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.job_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_results')
+    op.drop_index('ix_jobs_status_priority', table_name='jobs')
+    op.drop_table('jobs')
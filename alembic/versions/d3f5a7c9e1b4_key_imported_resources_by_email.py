@@ -0,0 +1,54 @@
+"""Key bulk-imported resources by type and e-mail instead of type and name
+
+Revision ID: d3f5a7c9e1b4
+Revises: b6d8f0a2c4e7
+Create Date: 2025-11-04 10:21:52.604117
+
+Two employees may share a name, so (type, name) is not a natural key: the
+unique index refused such databases and made imports merge different people.
+Resources are now identified by their e-mail address (case-insensitive,
+per resource type); resources without one are not part of the key. Databases
+that already have uq_resources_type_name lose it here.
+"""
+from typing import Sequence, Union
+import sys
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from online_migrations import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f5a7c9e1b4'
+down_revision: Union[str, Sequence[str], None] = 'b6d8f0a2c4e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OLD_INDEX = 'uq_resources_type_name'
+INDEX = 'uq_resources_type_email'
+KEYS = ['type', 'lower(email)']
+WHERE = "email <> ''"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    duplicates = bind.execute(sa.text(
+        f"SELECT COUNT(*) FROM (SELECT 1 FROM resources WHERE {WHERE} "
+        f"GROUP BY {', '.join(KEYS)} HAVING COUNT(*) > 1) d"
+    )).scalar()
+    if duplicates:
+        raise RuntimeError(f"resources has {duplicates} duplicated ({', '.join(KEYS)}) keys; "
+                           f"merge them before adding {INDEX}")
+    if OLD_INDEX in {index['name'] for index in sa.inspect(bind).get_indexes('resources')}:
+        drop_index_concurrently(OLD_INDEX, 'resources')
+    create_index_concurrently(INDEX, 'resources', ['type', sa.text('lower(email)')], unique=True, where=WHERE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently(INDEX, 'resources')
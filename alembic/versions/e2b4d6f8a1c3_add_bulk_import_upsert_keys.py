@@ -0,0 +1,57 @@
+"""Add unique natural keys used by the bulk import upserts
+
+Revision ID: e2b4d6f8a1c3
+Revises: c7d9e1f3a5b6
+Create Date: 2025-10-31 09:12:40.218733
+
+bulk_import.py upserts with INSERT ... ON CONFLICT, which needs a unique index
+on the conflict target: materials (supplier, name) and imported material
+prices (material, day). Existing duplicates are reported instead of being
+merged, since which row to keep is a business decision. The resources key is
+added by d3f5a7c9e1b4.
+"""
+from typing import Sequence, Union
+import sys
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from online_migrations import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b4d6f8a1c3'
+down_revision: Union[str, Sequence[str], None] = 'c7d9e1f3a5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, key expressions, partial index predicate)
+INDEXES = [
+    ('uq_materials_supplier_name', 'materials', ['COALESCE(resource_id, 0)', 'name'], None),
+    ('uq_material_prices_import', 'material_prices', ['material_id', 'price_date'], "source = 'import'"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    for index_name, table_name, keys, where in INDEXES:
+        duplicates = bind.execute(sa.text(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM {table_name} WHERE {where or 'true'} "
+            f"GROUP BY {', '.join(keys)} HAVING COUNT(*) > 1) d"
+        )).scalar()
+        if duplicates:
+            raise RuntimeError(f"{table_name} has {duplicates} duplicated ({', '.join(keys)}) keys; "
+                               f"merge them before adding {index_name}")
+    for index_name, table_name, keys, where in INDEXES:
+        columns = [key if key.isidentifier() else sa.text(key) for key in keys]
+        create_index_concurrently(index_name, table_name, columns, unique=True, where=where)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for index_name, table_name, keys, where in reversed(INDEXES):
+        drop_index_concurrently(index_name, table_name)
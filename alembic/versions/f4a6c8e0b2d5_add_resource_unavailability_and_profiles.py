@@ -0,0 +1,89 @@
+"""Add resource unavailability periods and precomputed resource profiles
+
+Revision ID: f4a6c8e0b2d5
+Revises: e2b4d6f8a1c3
+Create Date: 2025-11-01 08:47:13.905162
+
+resource_profiles is the read model of the resource details page and is kept
+up to date by the after_flush listener in models/resource_profile.py. Existing
+resources get their rows from `python resource_profiles.py rebuild` (or the
+resource_profile_rebuild job); until then the page computes missing profiles
+on the fly.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a6c8e0b2d5'
+down_revision: Union[str, Sequence[str], None] = 'e2b4d6f8a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Change trigger of the new read model; the notify function and data_versions come from a1f3c5e7b9d2
+WATCHED = ['resource_profiles']
+TRIGGER_FUNCTION = 'epitai_notify_change'
+VERSION_TABLE = 'data_versions'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('resource_unavailability',
+    sa.Column('unavailability_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('resource_id', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('reason', sa.String(length=50), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.CheckConstraint("reason IN ('Szabadság', 'Betegszabadság', 'Személyes ok', 'Egyéb')", name='ck_resource_unavailability_reason'),
+    sa.CheckConstraint('end_date >= start_date', name='ck_resource_unavailability_dates'),
+    sa.ForeignKeyConstraint(['resource_id'], ['resources.resource_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('unavailability_id')
+    )
+    op.create_index('ix_resource_unavailability_resource_end', 'resource_unavailability', ['resource_id', 'end_date'], unique=False)
+    op.create_table('resource_profiles',
+    sa.Column('resource_id', sa.Integer(), nullable=False),
+    sa.Column('skills', sa.Text(), nullable=True),
+    sa.Column('active_projects', sa.Text(), nullable=True),
+    sa.Column('past_projects', sa.Text(), nullable=True),
+    sa.Column('current_tasks', sa.Text(), nullable=True),
+    sa.Column('upcoming_tasks', sa.Text(), nullable=True),
+    sa.Column('upcoming_unavailability', sa.Text(), nullable=True),
+    sa.Column('booked_hours', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('hours_worked', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('as_of', sa.Date(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['resource_id'], ['resources.resource_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('resource_id')
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        for table in WATCHED:
+            op.execute(f'CREATE TRIGGER trg_{table}_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "{table}" '
+                       f'FOR EACH STATEMENT EXECUTE FUNCTION {TRIGGER_FUNCTION}()')
+    else:
+        for table in WATCHED:
+            op.execute(f"INSERT OR IGNORE INTO {VERSION_TABLE} (table_name) VALUES ('{table}')")
+            for operation in ('INSERT', 'UPDATE', 'DELETE'):
+                op.execute(f'CREATE TRIGGER IF NOT EXISTS trg_{table}_change_{operation.lower()} '
+                           f'AFTER {operation} ON "{table}" BEGIN '
+                           f"UPDATE {VERSION_TABLE} SET version = version + 1, changed_at = CURRENT_TIMESTAMP "
+                           f"WHERE table_name = '{table}'; END")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Only this revision's triggers; the shared function and version table stay for a1f3c5e7b9d2
+    if op.get_bind().dialect.name == 'postgresql':
+        for table in WATCHED:
+            op.execute(f'DROP TRIGGER IF EXISTS trg_{table}_change ON "{table}"')
+    else:
+        for table in WATCHED:
+            for operation in ('insert', 'update', 'delete'):
+                op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_change_{operation}")
+            op.execute(f"DELETE FROM {VERSION_TABLE} WHERE table_name = '{table}'")
+    op.drop_table('resource_profiles')
+    op.drop_index('ix_resource_unavailability_resource_end', table_name='resource_unavailability')
+    op.drop_table('resource_unavailability')
@@ -0,0 +1,158 @@
+"""
+Avatar rendering for ÉpítAI Construction Management System
+
+User avatars are the initials of the name on a coloured disc, drawn locally
+with Pillow and embedded as data URIs, so rendering the sidebar never needs
+an external request (site networks are often air-gapped).
+
+- PNGs are cached on disk under AVATAR_CACHE_DIR, keyed by a hash of the
+  name, size and colours, and in memory per process
+- Pillow is imported only when an avatar is missing from the cache; without
+  Pillow an equivalent SVG is used instead
+
+Usage: python avatars.py "Nagy Péter" [--size 96] [--output avatar.png]
+"""
+
+import os
+import re
+import sys
+import base64
+import hashlib
+import html
+import threading
+from functools import lru_cache
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+AVATAR_VERSION = 1
+AVATAR_DIR = os.getenv('AVATAR_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.avatars'))
+DEFAULT_BACKGROUND = '#0D8ABC'
+DEFAULT_COLOR = '#FFFFFF'
+SUPERSAMPLING = 4
+FONT_CANDIDATES = ('DejaVuSans-Bold.ttf', 'LiberationSans-Bold.ttf', 'Arial Bold.ttf', 'arialbd.ttf')
+
+_write_lock = threading.Lock()
+
+
+def avatar_initials(name: str) -> str:
+    """Up to two initials: first letters of the first and last word"""
+    words = [word for word in re.split(r'[\s\-_.]+', name or '') if word]
+    if not words:
+        return '?'
+    if len(words) == 1:
+        return words[0][:2].upper()
+    return (words[0][0] + words[-1][0]).upper()
+
+
+def avatar_key(name: str, size: int, background: str = DEFAULT_BACKGROUND, color: str = DEFAULT_COLOR) -> str:
+    """Stable cache key of an avatar"""
+    payload = f"{AVATAR_VERSION}|{name}|{size}|{background}|{color}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24]
+
+
+def _load_font(pixel_size: int):
+    """Bold TrueType font at the given size; Pillow's bundled font as a fallback"""
+    from PIL import ImageFont
+
+    for candidate in FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(candidate, pixel_size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=pixel_size)
+    except TypeError:
+        # Pillow < 10.1 has no scalable default font
+        return ImageFont.load_default()
+
+
+def render_avatar_png(name: str, size: int, background: str = DEFAULT_BACKGROUND, color: str = DEFAULT_COLOR) -> bytes:
+    """Draw the initials on a disc and return PNG bytes (transparent outside the disc)"""
+    import io
+    from PIL import Image, ImageDraw
+
+    canvas = size * SUPERSAMPLING
+    image = Image.new('RGBA', (canvas, canvas), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((0, 0, canvas - 1, canvas - 1), fill=background)
+
+    initials = avatar_initials(name)
+    font = _load_font(int(canvas * (0.42 if len(initials) > 1 else 0.5)))
+    draw.text((canvas / 2, canvas / 2), initials, fill=color, font=font, anchor='mm')
+
+    # Drawing large and downscaling gives anti-aliased edges
+    image = image.resize((size, size), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def render_avatar_svg(name: str, size: int, background: str = DEFAULT_BACKGROUND, color: str = DEFAULT_COLOR) -> str:
+    """SVG version of the avatar, used when Pillow is not installed"""
+    initials = html.escape(avatar_initials(name))
+    font_size = size * (0.42 if len(initials) > 1 else 0.5)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}">'
+        f'<circle cx="{size / 2}" cy="{size / 2}" r="{size / 2}" fill="{background}"/>'
+        f'<text x="50%" y="50%" dy=".35em" text-anchor="middle" fill="{color}" '
+        f'font-family="DejaVu Sans, Arial, sans-serif" font-weight="bold" font-size="{font_size:.1f}">{initials}</text>'
+        f'</svg>'
+    )
+
+
+def avatar_path(name: str, size: int, background: str = DEFAULT_BACKGROUND, color: str = DEFAULT_COLOR) -> str:
+    """Disk cache path of an avatar PNG"""
+    return os.path.join(AVATAR_DIR, f"{avatar_key(name, size, background, color)}.png")
+
+
+def get_avatar_png(name: str, size: int, background: str = DEFAULT_BACKGROUND, color: str = DEFAULT_COLOR) -> bytes:
+    """Avatar PNG from the disk cache, rendering and storing it on a miss"""
+    path = avatar_path(name, size, background, color)
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        pass
+
+    content = render_avatar_png(name, size, background, color)
+    try:
+        os.makedirs(AVATAR_DIR, exist_ok=True)
+        with _write_lock:
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Failed to cache avatar {path}: {e}")
+    return content
+
+
+@lru_cache(maxsize=512)
+def avatar_data_uri(name: str, size: int = 96, background: str = DEFAULT_BACKGROUND, color: str = DEFAULT_COLOR) -> str:
+    """Avatar as a data URI for <img src>, cached in memory per process"""
+    try:
+        content = get_avatar_png(name, size, background, color)
+    except ImportError:
+        svg = render_avatar_svg(name, size, background, color)
+        return "data:image/svg+xml;base64," + base64.b64encode(svg.encode('utf-8')).decode('ascii')
+    return "data:image/png;base64," + base64.b64encode(content).decode('ascii')
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render a user avatar")
+    parser.add_argument("name", help="User name")
+    parser.add_argument("--size", type=int, default=96, help="Size in pixels")
+    parser.add_argument("--output", help="Write the PNG here instead of the cache only")
+    args = parser.parse_args()
+
+    png = get_avatar_png(args.name, args.size)
+    if args.output:
+        with open(args.output, 'wb') as f:
+            f.write(png)
+        print(f"💾 Avatar written to {args.output}")
+    else:
+        print(f"✅ Avatar cached at {avatar_path(args.name, args.size)} ({len(png)} bytes)")
@@ -0,0 +1,110 @@
+"""
+Budget deviation engine for ÉpítAI Construction Management System
+
+Compares each project's budget with its committed and forecast spend: project
+material lines by status plus labour (hours worked × hourly rate). The results
+live in the precomputed project_budget_deviations table, which is refreshed per
+project whenever the underlying rows change, so dashboards read a single
+small table instead of re-aggregating every project on every render.
+"""
+
+import os
+import sys
+from typing import List
+
+from sqlalchemy import select, func
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+from models.project import Project
+from models.project_budget import ProjectBudgetDeviation, refresh_budget_deviations
+
+BUDGET_OVERRUN_THRESHOLD = 10.0
+BUDGET_URGENT_THRESHOLD = 25.0
+ACTIVE_PROJECT_STATUSES = ('Tervezés alatt', 'Folyamatban', 'Késésben')
+
+
+def classify_deviation(percent: float) -> str:
+    """Get the chart category of a deviation percentage"""
+    if percent > BUDGET_OVERRUN_THRESHOLD:
+        return 'Túllépés'
+    if percent < 0:
+        return 'Takarékosság'
+    return 'Normál'
+
+
+def describe_deviation(percent: float) -> str:
+    """Format a deviation percentage for display ("+15% (túllépés)")"""
+    if percent > BUDGET_URGENT_THRESHOLD:
+        label = 'sürgős figyelem'
+    elif percent > 0:
+        label = 'túllépés'
+    elif percent < 0:
+        label = 'takarékosság'
+    else:
+        label = 'keretben'
+    return f"{percent:+.0f}% ({label})"
+
+
+def get_budget_deviations(connection, limit: int = 10, statuses=ACTIVE_PROJECT_STATUSES) -> List[dict]:
+    """Read the largest precomputed deviations of budgeted projects, overruns first"""
+    rows = connection.execute(
+        select(
+            ProjectBudgetDeviation.project_id,
+            Project.project_name,
+            ProjectBudgetDeviation.budget,
+            ProjectBudgetDeviation.committed_cost,
+            ProjectBudgetDeviation.forecast_cost,
+            ProjectBudgetDeviation.deviation_amount,
+            ProjectBudgetDeviation.deviation_percent,
+        )
+        .join(Project, Project.project_id == ProjectBudgetDeviation.project_id)
+        .where(
+            ProjectBudgetDeviation.deviation_percent.isnot(None),
+            Project.status.in_(statuses),
+        )
+        .order_by(func.abs(ProjectBudgetDeviation.deviation_percent).desc())
+        .limit(limit)
+    ).all()
+
+    deviations = [
+        {
+            'project_id': row.project_id,
+            'project_name': row.project_name,
+            'budget': float(row.budget),
+            'committed_cost': float(row.committed_cost),
+            'forecast_cost': float(row.forecast_cost),
+            'deviation_amount': float(row.deviation_amount),
+            'deviation_percent': float(row.deviation_percent),
+        }
+        for row in rows
+    ]
+    deviations.sort(key=lambda deviation: deviation['deviation_percent'], reverse=True)
+    return deviations
+
+
+def rebuild_budget_deviations(session) -> int:
+    """Recompute the whole deviation table (after bulk loads that bypass the ORM)"""
+    return refresh_budget_deviations(session.connection())
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+    from database import get_db_session
+
+    parser = argparse.ArgumentParser(description="Project budget deviations")
+    parser.add_argument("command", choices=["rebuild", "report"], help="Command to run")
+    parser.add_argument("--limit", type=int, default=20, help="Number of projects to report")
+
+    args = parser.parse_args()
+
+    with get_db_session() as session:
+        if args.command == "rebuild":
+            count = rebuild_budget_deviations(session)
+            print(f"✅ {count} projekt költségeltérése újraszámolva")
+        elif args.command == "report":
+            for deviation in get_budget_deviations(session.connection(), limit=args.limit):
+                print(f"{deviation['project_name']}: {describe_deviation(deviation['deviation_percent'])} "
+                      f"(keret: {deviation['budget']:,.0f} Ft, előrejelzés: {deviation['forecast_cost']:,.0f} Ft)")
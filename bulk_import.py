@@ -0,0 +1,546 @@
+"""
+Bulk import for ÉpítAI Construction Management System
+
+Loads resources, materials and supplier price lists from CSV or XLSX files:
+
+- files are read in chunks of IMPORT_CHUNK_SIZE rows (pandas for CSV,
+  openpyxl read-only mode for XLSX), so the file is never fully in memory
+- every chunk is validated with vectorised pandas rules: required values,
+  numbers, dates, column lengths and the allowed values of the model check
+  constraints (resource type/availability, material status), which are read
+  from the models themselves
+- rejected rows are collected in a row-level error report (file row, column,
+  value, error); valid rows are still imported
+- valid rows are loaded into a temporary staging table (COPY FROM STDIN on
+  PostgreSQL, executemany elsewhere) and upserted from there with a single
+  INSERT ... SELECT ... ON CONFLICT per chunk
+
+Upsert keys: resources by (type, e-mail), so every resource row needs an
+e-mail address (names are not unique), materials by (supplier resource, name)
+and price list points by (material, price date). A price list upserts the
+supplier's materials with the new unit cost and appends the prices to
+material_prices with source 'import'; re-importing the same list is a no-op
+for the history. Materials imports append new and changed unit costs the
+same way, as the ORM does for edits. Imported resources get their resource
+profile recomputed, since the upsert bypasses the ORM flush that normally
+keeps it current.
+
+Usage:
+  python bulk_import.py <resources|materials|prices> FILE [--supplier-id ID] [--errors FILE]
+                        [--chunk-size N] [--database-url URL]
+"""
+
+import csv
+import io
+import os
+import re
+import sys
+import time
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import CheckConstraint, Column, MetaData, Table, select, text
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+from models import Material, MaterialPrice, Resource
+from models.resource_profile import refresh_resource_profiles
+
+IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', '20000'))
+STAGING_TABLE = 'import_staging'
+# Resources whose profiles are recomputed per statement batch after a resources upsert
+PROFILE_REFRESH_BATCH = 1000
+# Column added to files without a supplier column when a supplier is given for the whole file
+STAGING_SUPPLIER = '__supplier_id'
+
+ERROR_COLUMNS = ['row', 'column', 'value', 'error']
+
+
+def allowed_values(table, column: str) -> Optional[tuple]:
+    """Values allowed by a "<column> IN (...)" check constraint of a model table"""
+    pattern = re.compile(rf"\s*{re.escape(column)}\s+IN\s*\((.*)\)\s*", re.IGNORECASE | re.DOTALL)
+    for constraint in table.constraints:
+        if isinstance(constraint, CheckConstraint):
+            match = pattern.fullmatch(str(constraint.sqltext))
+            if match:
+                return tuple(re.findall(r"'([^']*)'", match.group(1)))
+    return None
+
+
+def field(name: str, kind: str = 'text', required: bool = False, default=None, minimum=None,
+          aliases: tuple = (), table=None, target: Optional[str] = None) -> dict:
+    """Describe an import column; lengths, numeric ranges and allowed values come from the model column"""
+    spec = {'name': name, 'kind': kind, 'required': required, 'default': default, 'minimum': minimum,
+            'aliases': aliases, 'max_length': None, 'max_abs': None, 'allowed': None}
+    if table is not None:
+        column = table.c[target or name]
+        spec['max_length'] = getattr(column.type, 'length', None)
+        precision, scale = getattr(column.type, 'precision', None), getattr(column.type, 'scale', None)
+        if kind == 'decimal' and precision:
+            spec['max_abs'] = 10 ** (precision - (scale or 0))
+        spec['allowed'] = allowed_values(table, target or name)
+    return spec
+
+
+resources_table = Resource.__table__
+materials_table = Material.__table__
+prices_table = MaterialPrice.__table__
+
+# kind -> target table, import columns and upsert key; aliases are the labels used on the pages
+IMPORTS = {
+    'resources': {
+        'table': resources_table,
+        'key': ['type', 'email'],
+        'fields': [
+            field('type', required=True, aliases=('típus',), table=resources_table),
+            field('name', required=True, aliases=('név', 'cég neve'), table=resources_table),
+            field('position', aliases=('pozíció',), table=resources_table),
+            field('phone', aliases=('telefonszám', 'telefon'), table=resources_table),
+            field('email', required=True, aliases=('e-mail',), table=resources_table),
+            field('address', aliases=('cím',), table=resources_table),
+            field('skills', aliases=('készségek', 'készségek / szakterületek'), table=resources_table),
+            field('hourly_rate', 'decimal', default=0, minimum=0, aliases=('órabér', 'órabér (ft)'), table=resources_table),
+            field('availability', default='Elérhető', aliases=('elérhetőség',), table=resources_table),
+            field('experience_years', 'int', default=0, minimum=0, aliases=('tapasztalat', 'tapasztalat (év)'),
+                  table=resources_table),
+        ],
+    },
+    'materials': {
+        'table': materials_table,
+        'key': ['resource_id', 'name'],
+        'fields': [
+            field('name', required=True, aliases=('megnevezés', 'anyag'), table=materials_table),
+            field('resource_id', 'int', aliases=('supplier_id', 'beszállító azonosító'), table=materials_table),
+            field('supplier', aliases=('beszállító',), table=materials_table),
+            field('category', aliases=('kategória',), table=materials_table),
+            field('unit', aliases=('egység', 'mértékegység'), table=materials_table),
+            field('unit_cost', 'decimal', minimum=0, aliases=('egységár',), table=materials_table),
+            field('description', aliases=('leírás',), table=materials_table),
+            field('vendor_contact', aliases=('kapcsolattartó',), table=materials_table),
+            field('lead_time_days', 'int', default=0, minimum=0, aliases=('szállítási idő',), table=materials_table),
+            field('minimum_order', 'int', default=1, minimum=1, aliases=('minimális rendelés',), table=materials_table),
+            field('current_stock', 'int', default=0, minimum=0, aliases=('készlet',), table=materials_table),
+            field('reorder_level', 'int', default=0, minimum=0, aliases=('újrarendelési szint',), table=materials_table),
+            field('status', default='Available', aliases=('státusz',), table=materials_table),
+        ],
+    },
+    'prices': {
+        'table': prices_table,
+        'key': ['resource_id', 'name', 'price_date'],
+        'fields': [
+            field('name', required=True, aliases=('material', 'megnevezés', 'anyag'), table=materials_table),
+            field('resource_id', 'int', aliases=('supplier_id', 'beszállító azonosító'), table=prices_table),
+            field('supplier', aliases=('beszállító',), table=materials_table),
+            field('category', aliases=('kategória',), table=materials_table),
+            field('unit', aliases=('egység', 'mértékegység'), table=materials_table),
+            field('unit_cost', 'decimal', required=True, minimum=0, aliases=('price', 'ár', 'egységár'),
+                  table=prices_table),
+            field('price_date', 'date', aliases=('date', 'dátum'), table=prices_table),
+        ],
+    },
+}
+
+
+def _normalise_header(name) -> str:
+    return str(name).strip().lower().replace('_', ' ')
+
+
+def map_columns(kind: str, header: List) -> Dict[str, str]:
+    """Map file headers to import fields by column name or page label; unknown headers are ignored"""
+    lookup = {}
+    for spec in IMPORTS[kind]['fields']:
+        for label in (spec['name'],) + spec['aliases']:
+            lookup[_normalise_header(label)] = spec['name']
+    mapping = {}
+    for name in header:
+        target = lookup.get(_normalise_header(name))
+        if target and target not in mapping.values():
+            mapping[name] = target
+    return mapping
+
+
+def _sniff_delimiter(stream) -> str:
+    """Detect ',' or ';' (Hungarian Excel) from the start of a seekable stream"""
+    position = stream.tell()
+    sample = stream.read(8192)
+    stream.seek(position)
+    if isinstance(sample, bytes):
+        sample = sample.decode('utf-8-sig', errors='ignore')
+    try:
+        return csv.Sniffer().sniff(sample.split('\n', 1)[0], delimiters=',;\t').delimiter
+    except csv.Error:
+        return ','
+
+
+def read_chunks(source, fmt: Optional[str] = None, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Read a CSV or XLSX file (path or binary stream) as string DataFrames of chunk_size rows
+
+    The index of every chunk is the row number in the file (the header is row 1).
+    """
+    if fmt is None:
+        fmt = os.path.splitext(getattr(source, 'name', None) or str(source))[1].lstrip('.').lower()
+    if fmt == 'xlsx':
+        yield from _read_xlsx_chunks(source, chunk_size)
+        return
+    if fmt != 'csv':
+        raise ValueError(f"Unsupported import format: {fmt or 'unknown'} (use csv or xlsx)")
+
+    stream = open(source, 'rb') if isinstance(source, str) else source
+    try:
+        delimiter = _sniff_delimiter(stream)
+        reader = pd.read_csv(stream, sep=delimiter, dtype=str, keep_default_na=False, chunksize=chunk_size,
+                             encoding='utf-8-sig', skip_blank_lines=True)
+        first_row = 2
+        for chunk in reader:
+            chunk.index = np.arange(first_row, first_row + len(chunk))
+            first_row += len(chunk)
+            yield chunk
+    finally:
+        if isinstance(source, str):
+            stream.close()
+
+
+def _cell_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == datetime.min.time() else value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _read_xlsx_chunks(source, chunk_size: int) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [_cell_text(value) for value in next(rows, ())]
+        width = len(header)
+        batch, numbers = [], []
+        for row_number, row in enumerate(rows, start=2):
+            if all(value is None for value in row):
+                continue
+            values = [_cell_text(value) for value in row[:width]]
+            batch.append(values + [''] * (width - len(values)))
+            numbers.append(row_number)
+            if len(batch) == chunk_size:
+                yield pd.DataFrame(batch, columns=header, index=numbers, dtype=object)
+                batch, numbers = [], []
+        if batch:
+            yield pd.DataFrame(batch, columns=header, index=numbers, dtype=object)
+    finally:
+        workbook.close()
+
+
+def _errors(frame, mask, column: str, values, message: str) -> pd.DataFrame:
+    return pd.DataFrame({'row': frame.index[mask], 'column': column, 'value': np.asarray(values[mask], dtype=object),
+                         'error': message})
+
+
+def validate_chunk(kind: str, chunk: pd.DataFrame, mapping: Dict[str, str]):
+    """Validate a chunk with vectorised rules; returns (typed valid rows, error report rows)"""
+    frame = chunk[list(mapping)].rename(columns=mapping)
+    clean = pd.DataFrame(index=frame.index)
+    problems = []
+    for spec in IMPORTS[kind]['fields']:
+        name = spec['name']
+        if name not in frame:
+            if spec['default'] is not None:
+                clean[name] = spec['default']
+            continue
+        raw = frame[name].astype(object).where(frame[name].notna(), '').astype(str).str.strip()
+        missing = (raw == '').to_numpy()
+        values = raw.where(~missing, None)
+
+        if spec['required']:
+            problems.append(_errors(frame, missing, name, raw, 'Kötelező mező'))
+        if spec['kind'] in ('int', 'decimal'):
+            numbers = pd.to_numeric(raw.str.replace(' ', '').str.replace(',', '.'), errors='coerce')
+            invalid = ~missing & numbers.isna().to_numpy()
+            problems.append(_errors(frame, invalid, name, raw, 'Nem szám'))
+            if spec['kind'] == 'int':
+                fractional = ~missing & ~invalid & (numbers % 1 != 0).to_numpy()
+                problems.append(_errors(frame, fractional, name, raw, 'Egész szám szükséges'))
+            if spec['minimum'] is not None:
+                too_small = (numbers < spec['minimum']).to_numpy()
+                problems.append(_errors(frame, too_small, name, raw, f"Legalább {spec['minimum']}"))
+            if spec['max_abs'] is not None:
+                too_large = (numbers.abs() >= spec['max_abs']).to_numpy()
+                problems.append(_errors(frame, too_large, name, raw, 'Túl nagy érték'))
+            values = numbers.round(2) if spec['kind'] == 'decimal' else numbers.where(numbers % 1 == 0).astype('Int64')
+        elif spec['kind'] == 'date':
+            dates = pd.to_datetime(raw.str.rstrip('.').str.replace('.', '-'), errors='coerce', format='%Y-%m-%d')
+            invalid = ~missing & dates.isna().to_numpy()
+            problems.append(_errors(frame, invalid, name, raw, 'Érvénytelen dátum (ÉÉÉÉ-HH-NN)'))
+            values = dates.dt.date
+        else:
+            if spec['max_length']:
+                too_long = (raw.str.len() > spec['max_length']).to_numpy()
+                problems.append(_errors(frame, too_long, name, raw, f"Legfeljebb {spec['max_length']} karakter"))
+            if spec['allowed']:
+                not_allowed = ~missing & ~raw.isin(spec['allowed']).to_numpy()
+                problems.append(_errors(frame, not_allowed, name, raw,
+                                        f"Megengedett értékek: {', '.join(spec['allowed'])}"))
+
+        values = values.astype(object).where(~missing, None)
+        if spec['default'] is not None:
+            values = values.where(~missing, spec['default'])
+        clean[name] = values
+
+    errors = pd.concat([p for p in problems if len(p)], ignore_index=True) if any(len(p) for p in problems) \
+        else pd.DataFrame(columns=ERROR_COLUMNS)
+    return clean[~clean.index.isin(errors['row'])], errors
+
+
+def _staging_table(columns: List[str], tables: tuple) -> Table:
+    """Temporary table with the column types of the target tables (first match wins) and no constraints"""
+    types = {}
+    for name in columns:
+        for table in tables:
+            if name in table.c:
+                types[name] = table.c[name].type
+                break
+    return Table(STAGING_TABLE, MetaData(), *[Column(name, types[name]) for name in columns],
+                 prefixes=['TEMPORARY'])
+
+
+def _copy_into_staging(connection, staging: Table, frame: pd.DataFrame):
+    """Load a chunk into the staging table: COPY on PostgreSQL, executemany elsewhere"""
+    columns = [column.name for column in staging.columns]
+    if connection.dialect.name == 'postgresql':
+        buffer = io.StringIO()
+        frame[columns].to_csv(buffer, index=False, header=False, na_rep='')
+        buffer.seek(0)
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {STAGING_TABLE} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+    else:
+        records = frame[columns].astype(object).where(frame[columns].notna(), None).to_dict('records')
+        connection.execute(staging.insert(), records)
+
+
+def _upsert_sql(table: str, columns: List[str], conflict: str, updated: List[str]) -> str:
+    """INSERT ... SELECT FROM staging ... ON CONFLICT (PostgreSQL and SQLite share the syntax)"""
+    assignments = [f"{name} = excluded.{name}" for name in updated] + ["updated_at = excluded.updated_at"]
+    # "WHERE true" keeps SQLite from reading ON CONFLICT as a join constraint
+    return (f"INSERT INTO {table} ({', '.join(columns)}, created_at, updated_at) "
+            f"SELECT {', '.join(columns)}, :now, :now FROM {STAGING_TABLE} WHERE true "
+            f"ON CONFLICT {conflict} DO UPDATE SET {', '.join(assignments)}")
+
+
+RESOURCE_CONFLICT = "(type, lower(email)) WHERE email <> ''"
+MATERIAL_CONFLICT = "(COALESCE(resource_id, 0), name)"
+PRICE_CONFLICT = "(material_id, price_date) WHERE source = 'import'"
+
+
+def _stage(connection, frame: pd.DataFrame, *tables: Table):
+    """(Re)create the staging table with the columns of a frame, typed from the target tables, and load the frame"""
+    connection.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+    staging = _staging_table(list(frame.columns), tables)
+    staging.create(connection)
+    _copy_into_staging(connection, staging, frame)
+
+
+def _record_cost_changes(connection, frame: pd.DataFrame, condition: str, now: datetime):
+    """Append import price history rows for the staged materials matching condition (m: materials, s: staging)
+
+    The upsert bypasses the ORM hook that records Material.unit_cost changes in
+    material_prices, so materials imports record them here. A material keeps one
+    imported price per day: a later change on the same day replaces it.
+    """
+    supplier = "COALESCE(m.resource_id, 0) = COALESCE(s.resource_id, 0)" if 'resource_id' in frame \
+        else "m.resource_id IS NULL"
+    connection.execute(text(
+        f"INSERT INTO material_prices (material_id, resource_id, price_date, unit_cost, source, created_at) "
+        f"SELECT m.material_id, m.resource_id, :today, s.unit_cost, 'import', :now "
+        f"FROM {STAGING_TABLE} s JOIN materials m ON {supplier} AND m.name = s.name "
+        f"WHERE s.unit_cost IS NOT NULL AND ({condition}) "
+        f"ON CONFLICT {PRICE_CONFLICT} DO UPDATE SET unit_cost = excluded.unit_cost"
+    ), {'today': date.today(), 'now': now})
+
+
+def _load_chunk(connection, kind: str, frame: pd.DataFrame, present: List[str], now: datetime) -> int:
+    """Stage and upsert one validated chunk; returns the number of rows written"""
+    # The same key twice in a chunk would hit the same row twice in one upsert: the last one wins
+    keys = frame[[name for name in IMPORTS[kind]['key'] if name in frame]]
+    if 'email' in keys:
+        keys = keys.assign(email=keys['email'].str.lower())
+    frame = frame[~keys.duplicated(keep='last')]
+    updated = [name for name in present if name not in IMPORTS[kind]['key']]
+    if kind in ('resources', 'materials'):
+        conflict = RESOURCE_CONFLICT if kind == 'resources' else MATERIAL_CONFLICT
+        _stage(connection, frame, IMPORTS[kind]['table'])
+        costs = kind == 'materials' and 'unit_cost' in frame
+        if costs:
+            # Changed costs of existing materials before the upsert, costs of new materials after it
+            _record_cost_changes(connection, frame, "m.unit_cost IS NULL OR m.unit_cost <> s.unit_cost", now)
+        connection.execute(text(_upsert_sql(kind, list(frame.columns), conflict, updated)), {'now': now})
+        if costs:
+            _record_cost_changes(connection, frame, "m.created_at = :now", now)
+        if kind == 'resources':
+            resource_ids = connection.execute(text(
+                f"SELECT r.resource_id FROM resources r JOIN {STAGING_TABLE} s "
+                f"ON r.type = s.type AND lower(r.email) = lower(s.email) WHERE r.email <> ''"
+            )).scalars().all()
+            for start in range(0, len(resource_ids), PROFILE_REFRESH_BATCH):
+                refresh_resource_profiles(connection, resource_ids[start:start + PROFILE_REFRESH_BATCH])
+        return len(frame)
+
+    # Supplier price list: set the supplier's materials to their latest listed price,
+    # then append every listed price point to the history
+    latest = (frame.sort_values('price_date', kind='mergesort')
+              .drop_duplicates(['resource_id', 'name'], keep='last')
+              .drop(columns='price_date'))
+    # New materials get the defaults of a materials import (status, minimum order, ...)
+    latest = latest.assign(**{spec['name']: spec['default'] for spec in IMPORTS['materials']['fields']
+                              if spec['default'] is not None and spec['name'] not in latest})
+    _stage(connection, latest, materials_table)
+    updated = [name for name in updated if name in ('supplier', 'category', 'unit', 'unit_cost')]
+    connection.execute(text(_upsert_sql('materials', list(latest.columns), MATERIAL_CONFLICT, updated)), {'now': now})
+    # The history rows join the materials by name, which only the materials table has
+    _stage(connection, frame, prices_table, materials_table)
+    connection.execute(text(
+        f"INSERT INTO material_prices (material_id, resource_id, price_date, unit_cost, source, created_at) "
+        f"SELECT m.material_id, s.resource_id, s.price_date, s.unit_cost, 'import', :now "
+        f"FROM {STAGING_TABLE} s JOIN materials m "
+        f"ON COALESCE(m.resource_id, 0) = COALESCE(s.resource_id, 0) AND m.name = s.name WHERE true "
+        f"ON CONFLICT {PRICE_CONFLICT} DO NOTHING"
+    ), {'now': now})
+    return len(frame)
+
+
+def _resolve_suppliers(connection, clean: pd.DataFrame):
+    """Fill resource_id of price list rows from the supplier name; returns (rows, errors for unknown suppliers)"""
+    suppliers = dict(connection.execute(
+        select(resources_table.c.name, resources_table.c.resource_id)
+        .where(resources_table.c.type == 'Beszállító')
+    ).all())
+    resolved = clean['supplier'].map(suppliers)
+    unknown = (clean['supplier'].notna() & resolved.isna()).to_numpy()
+    errors = _errors(clean, unknown, 'supplier', clean['supplier'], 'Ismeretlen beszállító')
+    # Unmatched names make the mapped ids float; keep them integers for COPY
+    clean = clean.assign(resource_id=resolved.astype('Int64').astype(object).where(resolved.notna(), None))
+    return clean[~unknown], errors
+
+
+def import_file(engine, kind: str, source, fmt: Optional[str] = None, supplier_id: Optional[int] = None,
+                chunk_size: int = IMPORT_CHUNK_SIZE, progress=None, on_rows=None) -> dict:
+    """Validate and upsert a resources, materials or prices file in one transaction
+
+    supplier_id sets the supplier of every row of a materials or price list
+    file without a resource_id column; price lists may instead name the
+    supplier (a 'Beszállító' resource) in a supplier column. Price lists
+    without any of these are refused, rows without a supplier are rejected.
+    progress(rows_read) is called after every chunk and on_rows(frame) with
+    the valid rows of every chunk. Returns the counts and the error report as
+    a DataFrame.
+    """
+    if kind not in IMPORTS:
+        raise ValueError(f"Unknown import: {kind}")
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    totals = {'rows': 0, 'imported': 0, 'rejected': 0}
+    reports = []
+    mapping = ignored = None
+    fill_supplier = False
+    with engine.begin() as connection:
+        if kind != 'resources' and supplier_id is not None:
+            exists = connection.execute(
+                select(resources_table.c.resource_id).where(resources_table.c.resource_id == supplier_id)
+            ).first()
+            if exists is None:
+                raise ValueError(f"Supplier resource {supplier_id} does not exist")
+        for chunk in read_chunks(source, fmt, chunk_size):
+            if mapping is None:
+                mapping = map_columns(kind, list(chunk.columns))
+                ignored = [str(name) for name in chunk.columns if name not in mapping]
+                missing = [spec['name'] for spec in IMPORTS[kind]['fields']
+                           if spec['required'] and spec['name'] not in mapping.values()]
+                if missing:
+                    raise ValueError(f"Missing required columns: {', '.join(missing)}")
+                present = list(mapping.values())
+                fill_supplier = supplier_id is not None and kind != 'resources' and 'resource_id' not in present
+                if fill_supplier:
+                    mapping[STAGING_SUPPLIER] = 'resource_id'
+                    present.append('resource_id')
+                if kind == 'prices' and 'resource_id' not in present and 'supplier' not in present:
+                    raise ValueError("Price lists need a supplier: a supplier or supplier_id column, "
+                                     "or a supplier for the whole file")
+            if fill_supplier:
+                chunk = chunk.assign(**{STAGING_SUPPLIER: str(supplier_id)})
+            clean, errors = validate_chunk(kind, chunk, mapping)
+            if kind == 'prices' and 'supplier' in present and 'resource_id' not in present:
+                clean, unknown = _resolve_suppliers(connection, clean)
+                errors = pd.concat([errors, unknown], ignore_index=True)
+            if kind == 'prices':
+                # Every price point belongs to a supplier's material
+                column = 'resource_id' if 'resource_id' in present else 'supplier'
+                no_supplier = clean['resource_id'].isna().to_numpy()
+                errors = pd.concat([errors, _errors(clean, no_supplier, column, clean[column], 'Kötelező mező')],
+                                   ignore_index=True)
+                clean = clean[~no_supplier]
+            if kind == 'prices' and 'price_date' not in present:
+                clean = clean.assign(price_date=date.today())
+            totals['rows'] += len(chunk)
+            totals['rejected'] += errors['row'].nunique()
+            reports.append(errors)
+            if len(clean):
+                totals['imported'] += _load_chunk(connection, kind, clean, present, now)
+                if on_rows:
+                    on_rows(clean)
+            if progress:
+                progress(totals['rows'])
+        connection.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+    errors = pd.concat(reports, ignore_index=True) if reports else pd.DataFrame(columns=ERROR_COLUMNS)
+    return dict(totals, errors=errors.sort_values('row', kind='mergesort', ignore_index=True),
+                ignored_columns=ignored or [], seconds=time.perf_counter() - started)
+
+
+def error_report_csv(errors: pd.DataFrame) -> bytes:
+    """Row-level error report as CSV bytes (utf-8 with BOM for Excel)"""
+    return errors.to_csv(index=False).encode('utf-8-sig')
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+    from sqlalchemy import create_engine
+
+    parser = argparse.ArgumentParser(description="Bulk import resources, materials or supplier price lists")
+    parser.add_argument("kind", choices=sorted(IMPORTS), help="What the file contains")
+    parser.add_argument("file", help="CSV or XLSX file")
+    parser.add_argument("--supplier-id", type=int, help="Supplier resource of every row (materials, prices)")
+    parser.add_argument("--errors", help="Write the row-level error report to this CSV file")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows validated and loaded at once")
+    parser.add_argument("--database-url", default=os.getenv('IMPORT_DATABASE_URL'), help="Database URL (default: database.py)")
+
+    args = parser.parse_args()
+    if args.database_url:
+        cli_engine = create_engine(args.database_url)
+    else:
+        from database import engine as cli_engine
+
+    try:
+        summary = import_file(cli_engine, args.kind, args.file, supplier_id=args.supplier_id,
+                              chunk_size=args.chunk_size)
+    except ValueError as error:
+        print(f"❌ {error}")
+        sys.exit(1)
+    print(f"✅ {summary['imported']} of {summary['rows']} rows imported in {summary['seconds']:.1f}s")
+    if summary['ignored_columns']:
+        print(f"ℹ️ Ignored columns: {', '.join(summary['ignored_columns'])}")
+    if summary['rejected']:
+        print(f"⚠️ {summary['rejected']} rows rejected")
+        if args.errors:
+            with open(args.errors, 'wb') as report:
+                report.write(error_report_csv(summary['errors']))
+            print(f"📄 Error report written to {args.errors}")
+        else:
+            print(summary['errors'].head(20).to_string(index=False))
@@ -0,0 +1,411 @@
+"""
+Capacity planning for ÉpítAI Construction Management System
+
+Forecasts, per profession and working day over the next CAPACITY_HORIZON_MONTHS
+months, how many people the remaining tasks of the active projects need and
+how many employees and subcontractors are available:
+
+- demand: each remaining task needs required_people of its profession for
+  duration_days working days. Tasks follow each other in phase and task order
+  from the project start (or from their own planned start); a project with a
+  remaining task that should have ended already resumes its remaining tasks
+  today. The daily curve is a difference array and a cumulative sum, so the
+  whole portfolio is a handful of NumPy operations
+- supply: employees and subcontractors per profession (a subcontractor counts
+  as SUBCONTRACTOR_CREW people) minus their unavailability periods
+- per month: shortage and surplus person-days, peak shortage and a signal:
+  hire when at least HIRING_MIN_SHORTAGE people are missing on average for
+  HIRING_MIN_MONTHS months in a row, subcontract for other shortages, surplus
+  when less than SURPLUS_UTILISATION of the available capacity is needed
+
+The portfolio is loaded once (database or session state) into a Portfolio of
+arrays; compute_capacity() only redoes the array maths, so trying other
+project start dates takes milliseconds.
+
+Usage:
+  python capacity_planning.py report [--months 12] [--database-url URL]
+  python capacity_planning.py benchmark [--projects 5000] [--repeat 5]
+"""
+
+import os
+import sys
+import time
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+CAPACITY_HORIZON_MONTHS = int(os.getenv('CAPACITY_HORIZON_MONTHS', '12'))
+SUBCONTRACTOR_CREW = float(os.getenv('CAPACITY_SUBCONTRACTOR_CREW', '1'))
+HIRING_MIN_SHORTAGE = 1.0
+HIRING_MIN_MONTHS = 3
+SURPLUS_UTILISATION = 0.5
+ACTIVE_PROJECT_STATUSES = ('Tervezés alatt', 'Folyamatban', 'Késésben')
+SUPPLY_TYPES = ('Alkalmazott', 'Alvállalkozó')
+
+SIGNAL_HIRE = 'Felvétel'
+SIGNAL_SUBCONTRACT = 'Alvállalkozó'
+SIGNAL_SURPLUS = 'Többlet'
+SIGNAL_OK = 'Rendben'
+
+
+class Portfolio:
+    """Remaining tasks of the active projects and the workforce, as arrays
+
+    Tasks are stored relative to their project's start (task_offset working
+    days), so a different start date only moves the project's tasks.
+    """
+
+    def __init__(self, professions: List[str], project_names: List[str], project_starts, tasks: dict,
+                 resources: dict, periods: dict):
+        self.professions = tuple(professions)
+        self.project_names = tuple(project_names)
+        self.project_starts = np.asarray(project_starts, dtype='datetime64[D]')
+        self.task_project = np.asarray(tasks['project'], dtype=np.int64)
+        self.task_offset = np.asarray(tasks['offset'], dtype=np.int64)
+        self.task_duration = np.asarray(tasks['duration'], dtype=np.int64)
+        self.task_people = np.asarray(tasks['people'], dtype=np.float64)
+        self.task_profession = np.asarray(tasks['profession'], dtype=np.int64)
+        self.resource_profession = np.asarray(resources['profession'], dtype=np.int64)
+        self.resource_subcontractor = np.asarray(resources['subcontractor'], dtype=bool)
+        self.period_resource = np.asarray(periods['resource'], dtype=np.int64)
+        self.period_start = np.asarray(periods['start'], dtype='datetime64[D]')
+        self.period_end = np.asarray(periods['end'], dtype='datetime64[D]')
+
+    def __repr__(self):
+        return (f"<Portfolio(projects={len(self.project_names)}, tasks={len(self.task_project)}, "
+                f"resources={len(self.resource_profession)}, professions={len(self.professions)})>")
+
+
+class _TaskLayout:
+    """Lays out each project's tasks back to back and keeps the remaining ones"""
+
+    def __init__(self):
+        self.columns = {'project': [], 'offset': [], 'duration': [], 'people': [], 'profession': []}
+        self._project = None
+        self._cursor = 0
+
+    def add(self, project: int, project_start, duration: int, people: float, profession: Optional[int],
+            remaining: bool, planned_start=None):
+        if project != self._project:
+            self._project, self._cursor = project, 0
+        if planned_start is not None:
+            self._cursor = int(np.busday_count(np.datetime64(project_start, 'D'), np.datetime64(planned_start, 'D')))
+        duration = max(int(duration or 1), 1)
+        if remaining and profession is not None:
+            for name, value in (('project', project), ('offset', self._cursor), ('duration', duration),
+                                ('people', float(people or 1)), ('profession', profession)):
+                self.columns[name].append(value)
+        self._cursor += duration
+
+
+def _periods(rows) -> dict:
+    """Unavailability arrays from (resource index, start, end) rows"""
+    rows = list(rows)
+    return {
+        'resource': [row[0] for row in rows],
+        'start': [row[1] for row in rows],
+        'end': [row[2] for row in rows],
+    }
+
+
+def load_portfolio(connection, today: Optional[date] = None) -> Portfolio:
+    """Read the active projects' tasks, the workforce and its upcoming unavailability from the database"""
+    from sqlalchemy import select
+    from models.profession_type import ProfessionType
+    from models.resource import Resource, ResourceUnavailability
+    from models.project import Project
+    from models.phase import Phase
+    from models.task import Task
+    from models.project_phase import ProjectPhase
+    from models.project_task import ProjectTask
+
+    today = today or date.today()
+    profession_ids = connection.execute(
+        select(ProfessionType.profession_type_id, ProfessionType.name).order_by(ProfessionType.name)
+    ).all()
+    profession_index = {profession_id: index for index, (profession_id, _) in enumerate(profession_ids)}
+
+    rows = connection.execute(
+        select(Project.project_id, Project.project_name, Project.start_date, ProjectTask.start_date.label('planned'),
+               ProjectTask.status, Task.duration_days, Task.required_people,
+               Task.profession_type_id)
+        .join(ProjectPhase, ProjectPhase.project_id == Project.project_id)
+        .join(Phase, Phase.phase_id == ProjectPhase.phase_id)
+        .join(ProjectTask, ProjectTask.project_phase_id == ProjectPhase.project_phase_id)
+        .join(Task, Task.task_id == ProjectTask.task_id)
+        .where(Project.status.in_(ACTIVE_PROJECT_STATUSES))
+        .order_by(Project.project_id, Phase.order_sequence, Task.order_sequence, ProjectTask.project_task_id)
+    )
+    project_names, project_starts, project_index = [], [], {}
+    layout = _TaskLayout()
+    for row in rows:
+        if row.project_id not in project_index:
+            project_index[row.project_id] = len(project_names)
+            project_names.append(row.project_name)
+            project_starts.append(row.start_date)
+        layout.add(project_index[row.project_id], row.start_date, row.duration_days, row.required_people,
+                   profession_index.get(row.profession_type_id),
+                   remaining=row.status != 'Completed', planned_start=row.planned)
+
+    resources = connection.execute(
+        select(Resource.resource_id, Resource.type, Resource.profession_type_id)
+        .where(Resource.type.in_(SUPPLY_TYPES), Resource.profession_type_id.isnot(None))
+        .order_by(Resource.resource_id)
+    ).all()
+    resource_index = {row.resource_id: index for index, row in enumerate(resources)}
+    periods = connection.execute(
+        select(ResourceUnavailability.resource_id, ResourceUnavailability.start_date, ResourceUnavailability.end_date)
+        .where(ResourceUnavailability.end_date >= today)
+    )
+
+    return Portfolio(
+        [name for _, name in profession_ids], project_names, project_starts, layout.columns,
+        {'profession': [profession_index[row.profession_type_id] for row in resources],
+         'subcontractor': [row.type == 'Alvállalkozó' for row in resources]},
+        _periods((resource_index[resource_id], start, end) for resource_id, start, end in periods
+                 if resource_id in resource_index),
+    )
+
+
+def _match_profession(position: str, professions: List[str]) -> Optional[int]:
+    """Profession of a session resource: its position by name, else the resource details page's substring rule"""
+    position = (position or "").strip().lower()
+    if not position:
+        return None
+    names = [name.lower() for name in professions]
+    if position in names:
+        return names.index(position)
+    for index, name in enumerate(names):
+        if name in position or position in name:
+            return index
+    return None
+
+
+def session_portfolio(projects: list, resources: list, phases: list, profession_types: list,
+                      today: Optional[date] = None) -> Portfolio:
+    """Portfolio of the session-state projects and resources (phase catalogue tasks, unchecked = remaining)"""
+    today = today or date.today()
+    professions = [profession.get("Név") for profession in profession_types if profession.get("Név")]
+    for phase in phases:
+        for task in phase["tasks"]:
+            if isinstance(task, dict) and task.get("profession") and task["profession"] not in professions:
+                professions.append(task["profession"])
+    profession_index = {name: index for index, name in enumerate(professions)}
+
+    project_names, project_starts = [], []
+    layout = _TaskLayout()
+    for project in projects:
+        if project.get("status") not in ACTIVE_PROJECT_STATUSES or not project.get("start"):
+            continue
+        index = len(project_names)
+        project_names.append(project.get("name", "Névtelen projekt"))
+        project_starts.append(str(project["start"]))
+        phases_checked = project.get("phases_checked") or []
+        for phase_index, phase in enumerate(phases):
+            checked = phases_checked[phase_index] if phase_index < len(phases_checked) else []
+            for task_index, task in enumerate(phase["tasks"]):
+                if isinstance(task, str):
+                    task = {"name": task}
+                layout.add(index, project["start"], task.get("duration_days", 1), task.get("required_people", 1),
+                           profession_index.get(task.get("profession")),
+                           remaining=not (task_index < len(checked) and checked[task_index]))
+
+    workforce, periods = [], []
+    for resource in resources:
+        if resource.get("Típus") not in SUPPLY_TYPES:
+            continue
+        profession = _match_profession(resource.get("Pozíció"), professions)
+        if profession is None:
+            continue
+        for period in resource.get("unavailability_periods", []):
+            if period["end_date"] >= today.isoformat():
+                periods.append((len(workforce), period["start_date"], period["end_date"]))
+        workforce.append((profession, resource.get("Típus") == 'Alvállalkozó'))
+
+    return Portfolio(
+        professions, project_names, project_starts, layout.columns,
+        {'profession': [row[0] for row in workforce], 'subcontractor': [row[1] for row in workforce]},
+        _periods(periods),
+    )
+
+
+def _run_lengths(flags: np.ndarray) -> np.ndarray:
+    """Length of the run of consecutive True months each month belongs to (0 where False)"""
+    forward = np.zeros(flags.shape, dtype=np.int64)
+    backward = np.zeros(flags.shape, dtype=np.int64)
+    months = flags.shape[1]
+    for month in range(months):
+        previous = forward[:, month - 1] if month else 0
+        forward[:, month] = np.where(flags[:, month], previous + 1, 0)
+    for month in reversed(range(months)):
+        following = backward[:, month + 1] if month + 1 < months else 0
+        backward[:, month] = np.where(flags[:, month], following + 1, 0)
+    return np.where(flags, forward + backward - 1, 0)
+
+
+def compute_capacity(portfolio: Portfolio, today: Optional[date] = None, months: int = CAPACITY_HORIZON_MONTHS,
+                     start_dates: Optional[Dict[int, date]] = None) -> dict:
+    """Daily demand and supply per profession and the monthly shortage, surplus and hiring signal
+
+    start_dates overrides the start of projects by their index in
+    portfolio.project_names (what-if planning).
+    """
+    started = time.perf_counter()
+    today = np.datetime64(today or date.today(), 'D')
+    first_month = today.astype('datetime64[M]')
+    calendar = np.arange(today, (first_month + months).astype('datetime64[D]'), dtype='datetime64[D]')
+    days = calendar[np.is_busday(calendar)]
+    n_days, n_professions = len(days), len(portfolio.professions)
+    month_matrix = (days.astype('datetime64[M]') - first_month).astype(np.int64)[:, None] == np.arange(months)
+
+    # Demand: +people on a task's first day, -people after its last, summed along the days
+    starts = portfolio.project_starts.copy()
+    for index, start in (start_dates or {}).items():
+        starts[index] = np.datetime64(start, 'D')
+    task_start = np.busday_count(today, starts)[portfolio.task_project] + portfolio.task_offset
+    # A project with remaining work that should have ended already is late: its remaining tasks resume today
+    first_start = np.full(len(starts), np.iinfo(np.int64).max)
+    first_end = np.full(len(starts), np.iinfo(np.int64).max)
+    np.minimum.at(first_start, portfolio.task_project, task_start)
+    np.minimum.at(first_end, portfolio.task_project, task_start + portfolio.task_duration)
+    task_start += np.where(first_end <= 0, -first_start, 0)[portfolio.task_project]
+    delta = np.zeros((n_professions, n_days + 1))
+    np.add.at(delta, (portfolio.task_profession, np.clip(task_start, 0, n_days)), portfolio.task_people)
+    np.add.at(delta, (portfolio.task_profession, np.clip(task_start + portfolio.task_duration, 0, n_days)),
+              -portfolio.task_people)
+    demand = np.cumsum(delta[:, :-1], axis=1)
+
+    # Supply: headcount per type and profession, minus the unavailable days
+    subcontractor = portfolio.resource_subcontractor.astype(np.int64)
+    weight = np.where(portfolio.resource_subcontractor, SUBCONTRACTOR_CREW, 1.0)
+    headcount = np.zeros((2, n_professions))
+    np.add.at(headcount, (subcontractor, portfolio.resource_profession), weight)
+    absent = np.zeros((2, n_professions, n_days + 1))
+    period_type = subcontractor[portfolio.period_resource]
+    period_profession = portfolio.resource_profession[portfolio.period_resource]
+    period_weight = weight[portfolio.period_resource]
+    period_first = np.clip(np.busday_count(today, np.maximum(portfolio.period_start, today)), 0, n_days)
+    period_last = np.clip(np.busday_count(today, portfolio.period_end + 1), 0, n_days)
+    np.add.at(absent, (period_type, period_profession, period_first), period_weight)
+    np.add.at(absent, (period_type, period_profession, np.maximum(period_last, period_first)), -period_weight)
+    available = np.maximum(headcount[:, :, None] - np.cumsum(absent[:, :, :-1], axis=2), 0)
+    supply = available.sum(axis=0)
+
+    # Monthly totals in person-days
+    balance = supply - demand
+    shortage = np.maximum(-balance, 0)
+    working_days = month_matrix.sum(axis=0)
+    monthly_demand = demand @ month_matrix
+    monthly_supply = supply @ month_matrix
+    monthly_shortage = shortage @ month_matrix
+    monthly_surplus = np.maximum(balance, 0) @ month_matrix
+    peak_shortage = np.where(month_matrix.T[None], shortage[:, None, :], 0).max(axis=2, initial=0)
+    average_shortage = monthly_shortage / np.maximum(working_days, 1)
+
+    sustained = average_shortage >= HIRING_MIN_SHORTAGE
+    signal = np.full((n_professions, months), SIGNAL_OK, dtype=object)
+    signal[(monthly_supply > 0) & (monthly_demand < SURPLUS_UTILISATION * monthly_supply)] = SIGNAL_SURPLUS
+    signal[monthly_shortage > 0] = SIGNAL_SUBCONTRACT
+    signal[sustained & (_run_lengths(sustained) >= HIRING_MIN_MONTHS)] = SIGNAL_HIRE
+
+    return {
+        'professions': portfolio.professions,
+        'days': days,
+        'months': first_month + np.arange(months),
+        'working_days': working_days,
+        'demand': demand,
+        'employees': available[0],
+        'subcontractors': available[1],
+        'supply': supply,
+        'monthly_demand': monthly_demand,
+        'monthly_supply': monthly_supply,
+        'monthly_shortage': monthly_shortage,
+        'monthly_surplus': monthly_surplus,
+        'peak_shortage': peak_shortage,
+        'average_shortage': average_shortage,
+        'hires': np.where(signal == SIGNAL_HIRE, np.ceil(average_shortage), 0).astype(np.int64),
+        'signal': signal,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def monthly_rows(plan: dict) -> List[dict]:
+    """One row per profession and month of a compute_capacity() result"""
+    return [
+        {
+            'profession': profession,
+            'month': str(month),
+            'working_days': int(plan['working_days'][m]),
+            'demand': round(float(plan['monthly_demand'][p, m]), 1),
+            'supply': round(float(plan['monthly_supply'][p, m]), 1),
+            'shortage': round(float(plan['monthly_shortage'][p, m]), 1),
+            'surplus': round(float(plan['monthly_surplus'][p, m]), 1),
+            'peak_shortage': round(float(plan['peak_shortage'][p, m]), 1),
+            'hires': int(plan['hires'][p, m]),
+            'signal': plan['signal'][p, m],
+        }
+        for p, profession in enumerate(plan['professions'])
+        for m, month in enumerate(plan['months'])
+    ]
+
+
+def _synthetic_portfolio(projects: int, tasks_per_project: int = 30, professions: int = 8,
+                         resources: int = 400, seed: int = 42) -> Portfolio:
+    """Random portfolio for benchmarking compute_capacity()"""
+    rng = np.random.default_rng(seed)
+    n_tasks = projects * tasks_per_project
+    duration = rng.integers(1, 40, n_tasks)
+    offset = (np.cumsum(duration.reshape(projects, tasks_per_project), axis=1) - duration.reshape(projects, -1)).ravel()
+    today = np.datetime64(date.today(), 'D')
+    period_resource = rng.integers(0, resources, resources)
+    period_start = today + rng.integers(0, 365, resources)
+    return Portfolio(
+        [f"Szakma {index + 1}" for index in range(professions)],
+        [f"Projekt {index + 1}" for index in range(projects)],
+        today + rng.integers(-180, 365, projects),
+        {'project': np.repeat(np.arange(projects), tasks_per_project), 'offset': offset, 'duration': duration,
+         'people': rng.integers(1, 6, n_tasks), 'profession': rng.integers(0, professions, n_tasks)},
+        {'profession': rng.integers(0, professions, resources), 'subcontractor': rng.random(resources) < 0.2},
+        {'resource': period_resource, 'start': period_start, 'end': period_start + rng.integers(1, 15, resources)},
+    )
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Profession demand vs supply forecast")
+    parser.add_argument("command", choices=["report", "benchmark"], help="Command to run")
+    parser.add_argument("--months", type=int, default=CAPACITY_HORIZON_MONTHS, help="Forecast horizon in months")
+    parser.add_argument("--database-url", help="Database URL (default: database.py)")
+    parser.add_argument("--projects", type=int, default=5000, help="Synthetic projects to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Benchmark runs")
+
+    args = parser.parse_args()
+
+    if args.command == "benchmark":
+        portfolio = _synthetic_portfolio(args.projects)
+        runs = [compute_capacity(portfolio, months=args.months)['seconds'] for _ in range(args.repeat)]
+        print(f"⏱️ {portfolio}: {min(runs) * 1000:.1f} ms (runs: {[round(run * 1000, 1) for run in runs]})")
+    else:
+        if args.database_url:
+            from sqlalchemy import create_engine
+            cli_engine = create_engine(args.database_url)
+        else:
+            from database import engine as cli_engine
+
+        with cli_engine.connect() as connection:
+            started = time.perf_counter()
+            portfolio = load_portfolio(connection)
+            loaded = time.perf_counter() - started
+        plan = compute_capacity(portfolio, months=args.months)
+        print(f"📊 {portfolio} (betöltés {loaded * 1000:.0f} ms, számítás {plan['seconds'] * 1000:.0f} ms)")
+        for row in monthly_rows(plan):
+            if row['signal'] in (SIGNAL_HIRE, SIGNAL_SUBCONTRACT):
+                hires = f", {row['hires']} fő felvétele" if row['hires'] else ""
+                print(f"⚠️ {row['month']} {row['profession']}: {row['signal']} – hiány {row['shortage']:,.0f} "
+                      f"embernap, csúcs {row['peak_shortage']:,.0f} fő{hires}")
@@ -0,0 +1,365 @@
+"""
+Change notifications for ÉpítAI Construction Management System
+
+Keeps in-process caches of database data fresh without re-querying on every
+Streamlit rerun:
+
+- on PostgreSQL, statement-level triggers on the watched tables call
+  pg_notify(CHANGE_CHANNEL, <table name>) after INSERT, UPDATE, DELETE or
+  TRUNCATE; notifications are delivered on commit, one per table and
+  transaction
+- on SQLite (local development) row triggers bump a counter per table in the
+  data_versions table, which the listener polls
+- one ChangeListener thread per process receives the changes, increments a
+  process-local version per table and calls the callbacks subscribed to the
+  table, e.g. the .clear() of an st.cache_data loader
+
+Sessions therefore keep serving cached data until a watched table actually
+changes. Notifications sent while the listener is disconnected are lost, so
+after every (re)connect all tables are treated as changed.
+
+    from change_notifications import subscribe
+    subscribe("dashboard.budget_deviations", ["project_budget_deviations"], load_budget_deviations.clear)
+
+The triggers are installed by the a1f3c5e7b9d2 migration (resource_profiles by
+f4a6c8e0b2d5, phases and tasks by b6d8f0a2c4e7); `install` does the same for a
+database created with create_all().
+
+Usage:
+  python change_notifications.py install [--database-url URL]
+  python change_notifications.py listen [--database-url URL] [--poll-interval 2]
+  python change_notifications.py status [--database-url URL]
+"""
+
+import os
+import select
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+CHANGE_CHANNEL = os.getenv('CHANGE_CHANNEL', 'epitai_changes')
+POLL_INTERVAL = float(os.getenv('CHANGE_POLL_INTERVAL', '2'))
+MAX_RECONNECT_DELAY = 60.0
+VERSION_TABLE = 'data_versions'
+TRIGGER_FUNCTION = 'epitai_notify_change'
+
+# Tables whose changes invalidate caches: projects, resources, assignments, materials and the phase catalogue.
+# Migrations pin their own list; a table added here needs a migration installing its trigger.
+WATCHED_TABLES = [
+    'projects',
+    'project_members',
+    'project_locations',
+    'resources',
+    'task_assignments',
+    'materials',
+    'project_materials',
+    'material_prices',
+    'project_budget_deviations',
+    'resource_profiles',
+    'phases',
+    'tasks',
+]
+
+
+def trigger_name(table: str) -> str:
+    """Name of a table's change trigger"""
+    return f"trg_{table}_change"
+
+
+def install_statements(dialect: str, tables: Iterable[str] = WATCHED_TABLES) -> List[str]:
+    """DDL that installs the change triggers for a dialect ('postgresql' or 'sqlite')"""
+    tables = list(tables)
+    if dialect == 'postgresql':
+        # Statement-level NOTIFY only: a version row updated by every writer
+        # would serialise concurrent transactions on the same table
+        statements = [
+            f"""CREATE OR REPLACE FUNCTION {TRIGGER_FUNCTION}() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_notify('{CHANGE_CHANNEL}', TG_TABLE_NAME);
+    RETURN NULL;
+END
+$$"""
+        ]
+        for table in tables:
+            statements += [
+                f'DROP TRIGGER IF EXISTS {trigger_name(table)} ON "{table}"',
+                f'CREATE TRIGGER {trigger_name(table)} AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "{table}" '
+                f'FOR EACH STATEMENT EXECUTE FUNCTION {TRIGGER_FUNCTION}()',
+            ]
+        return statements
+
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+        f"table_name VARCHAR(64) PRIMARY KEY, "
+        f"version INTEGER NOT NULL DEFAULT 0, "
+        f"changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+    ]
+    for table in tables:
+        statements.append(f"INSERT OR IGNORE INTO {VERSION_TABLE} (table_name) VALUES ('{table}')")
+        for operation in ('INSERT', 'UPDATE', 'DELETE'):
+            statements.append(
+                f'CREATE TRIGGER IF NOT EXISTS {trigger_name(table)}_{operation.lower()} '
+                f'AFTER {operation} ON "{table}" BEGIN '
+                f"UPDATE {VERSION_TABLE} SET version = version + 1, changed_at = CURRENT_TIMESTAMP "
+                f"WHERE table_name = '{table}'; END"
+            )
+    return statements
+
+
+def uninstall_statements(dialect: str, tables: Iterable[str] = WATCHED_TABLES) -> List[str]:
+    """DDL that removes the change triggers again"""
+    tables = list(tables)
+    if dialect == 'postgresql':
+        statements = [f'DROP TRIGGER IF EXISTS {trigger_name(table)} ON "{table}"' for table in tables]
+        return statements + [f"DROP FUNCTION IF EXISTS {TRIGGER_FUNCTION}()"]
+
+    statements = [f"DROP TRIGGER IF EXISTS {trigger_name(table)}_{operation}"
+                  for table in tables for operation in ('insert', 'update', 'delete')]
+    return statements + [f"DROP TABLE IF EXISTS {VERSION_TABLE}"]
+
+
+def install_change_triggers(engine, tables: Iterable[str] = WATCHED_TABLES) -> int:
+    """Install the change triggers on a database; returns the number of statements run"""
+    statements = install_statements(engine.dialect.name, tables)
+    with engine.begin() as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+    return len(statements)
+
+
+def read_table_versions(connection) -> Dict[str, int]:
+    """Change counters per table from the data_versions table (SQLite mode)"""
+    rows = connection.execute(text(f"SELECT table_name, version FROM {VERSION_TABLE}")).all()
+    return {table: int(version) for table, version in rows}
+
+
+class ChangeListener(threading.Thread):
+    """Background thread that turns database change events into cache invalidations
+
+    PostgreSQL: LISTEN on CHANGE_CHANNEL over a dedicated connection.
+    Other databases: poll data_versions every poll_interval seconds.
+    """
+
+    def __init__(self, engine, tables: Iterable[str] = WATCHED_TABLES, poll_interval: float = POLL_INTERVAL,
+                 channel: str = CHANGE_CHANNEL):
+        super().__init__(name='change-listener', daemon=True)
+        self.engine = engine
+        self.tables = tuple(tables)
+        self.poll_interval = poll_interval
+        self.channel = channel
+        self.mode = 'notify' if engine.dialect.name == 'postgresql' else 'poll'
+        self.connected = False
+        self.last_error = None
+        self.events = 0
+        self._versions = {table: 0 for table in self.tables}
+        self._db_versions = None
+        self._subscribers: Dict[str, Tuple[frozenset, Callable]] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def subscribe(self, name: str, tables: Iterable[str], callback: Callable):
+        """Call `callback()` whenever one of the tables changes
+
+        Subscriptions are keyed by name, so a page script that subscribes on
+        every rerun replaces its previous subscription instead of adding one.
+        """
+        with self._lock:
+            self._subscribers[name] = (frozenset(tables), callback)
+
+    def unsubscribe(self, name: str):
+        """Remove a subscription"""
+        with self._lock:
+            self._subscribers.pop(name, None)
+
+    def version(self, *tables: str) -> Tuple[int, ...]:
+        """Process-local change counters of the tables (all watched tables if none given)"""
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in (tables or self.tables))
+
+    def mark_changed(self, tables: Iterable[str]):
+        """Bump the tables' versions and run the subscribed callbacks"""
+        changed = {table for table in tables if table in self._versions}
+        if not changed:
+            return
+        with self._lock:
+            for table in changed:
+                self._versions[table] += 1
+            self.events += 1
+            callbacks = [(name, callback) for name, (subscribed, callback) in self._subscribers.items()
+                         if subscribed & changed]
+        for name, callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Change callback {name} failed: {e}")
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the thread and wait for it"""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout if timeout is not None else self.poll_interval + 1)
+
+    def run(self):
+        failures = 0
+        while not self._stop_event.is_set():
+            try:
+                if self.mode == 'notify':
+                    self._listen()
+                else:
+                    self._poll()
+                failures = 0
+            except Exception as e:
+                self.connected = False
+                if failures == 0:
+                    print(f"Change listener error ({self.mode}): {e}")
+                self.last_error = str(e)
+                failures += 1
+                self._stop_event.wait(min(MAX_RECONNECT_DELAY, self.poll_interval * 2 ** failures))
+
+    def _listen(self):
+        """Receive NOTIFY events until stopped or the connection drops"""
+        connection = self.engine.raw_connection()
+        # LISTEN state must not leak into the pool
+        connection.detach()
+        try:
+            dbapi_connection = connection.dbapi_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            self.connected = True
+            self.last_error = None
+            # Anything may have changed while no connection was listening
+            self.mark_changed(self.tables)
+
+            while not self._stop_event.is_set():
+                ready, _, _ = select.select([dbapi_connection], [], [], self.poll_interval)
+                if not ready:
+                    continue
+                dbapi_connection.poll()
+                changed = set()
+                while dbapi_connection.notifies:
+                    changed.add(dbapi_connection.notifies.pop(0).payload)
+                self.mark_changed(changed)
+        finally:
+            self.connected = False
+            connection.close()
+
+    def _poll(self):
+        """Compare data_versions with the previous poll until stopped"""
+        while not self._stop_event.is_set():
+            with self.engine.connect() as connection:
+                versions = read_table_versions(connection)
+            self.connected = True
+            self.last_error = None
+            if self._db_versions is not None:
+                self.mark_changed(table for table, version in versions.items()
+                                  if self._db_versions.get(table) != version)
+            self._db_versions = versions
+            self._stop_event.wait(self.poll_interval)
+
+    def status(self) -> dict:
+        """Listener state for diagnostics"""
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'alive': self.is_alive(),
+                'connected': self.connected,
+                'events': self.events,
+                'last_error': self.last_error,
+                'subscribers': sorted(self._subscribers),
+                'versions': dict(self._versions),
+            }
+
+
+_listener: Optional[ChangeListener] = None
+_listener_lock = threading.Lock()
+
+
+def get_change_listener(engine=None) -> ChangeListener:
+    """The process-wide listener, started on first use (default engine: database.engine)"""
+    global _listener
+    if _listener is None:
+        with _listener_lock:
+            if _listener is None:
+                if engine is None:
+                    from database import engine
+                listener = ChangeListener(engine)
+                listener.start()
+                _listener = listener
+    return _listener
+
+
+def subscribe(name: str, tables: Iterable[str], callback: Callable, engine=None):
+    """Subscribe a cache invalidation callback to changes of the tables"""
+    get_change_listener(engine).subscribe(name, tables, callback)
+
+
+def data_version(*tables: str) -> Tuple[int, ...]:
+    """Version token of the tables, e.g. as an extra argument of a cached loader"""
+    return get_change_listener().version(*tables)
+
+
+def stop_change_listener():
+    """Stop the process-wide listener (tests and CLI)"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+    from sqlalchemy import create_engine
+
+    parser = argparse.ArgumentParser(description="Database change notifications")
+    parser.add_argument("--database-url", default=os.getenv('DATABASE_URL'), help="Database URL (default: database.py)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("install", help="Install the change triggers")
+
+    listen_parser = subparsers.add_parser("listen", help="Print change events until interrupted")
+    listen_parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL, help="Seconds between polls")
+
+    subparsers.add_parser("status", help="Show the change counters (SQLite) or trigger state (PostgreSQL)")
+
+    args = parser.parse_args()
+    if args.database_url:
+        cli_engine = create_engine(args.database_url)
+    else:
+        from database import engine as cli_engine
+
+    if args.command == "install":
+        count = install_change_triggers(cli_engine)
+        print(f"✅ Change triggers installed ({count} statements, {cli_engine.dialect.name})")
+    elif args.command == "listen":
+        listener = ChangeListener(cli_engine, poll_interval=args.poll_interval)
+        for table in WATCHED_TABLES:
+            listener.subscribe(table, [table], lambda table=table: print(f"🔔 {time.strftime('%H:%M:%S')} {table}"))
+        listener.start()
+        print(f"👂 Listening for changes ({listener.mode}), Ctrl+C to stop")
+        try:
+            while listener.is_alive():
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            listener.stop()
+    elif args.command == "status":
+        with cli_engine.connect() as connection:
+            if cli_engine.dialect.name == 'postgresql':
+                installed = set(connection.execute(text(
+                    "SELECT tgname FROM pg_trigger WHERE NOT tgisinternal AND tgname LIKE 'trg\\_%\\_change'"
+                )).scalars().all())
+                for table in WATCHED_TABLES:
+                    mark = '✅' if trigger_name(table) in installed else '❌'
+                    print(f"{mark} {table}")
+            else:
+                versions = read_table_versions(connection)
+                for table in WATCHED_TABLES:
+                    print(f"📊 {table:<28} {versions.get(table, '-')}")
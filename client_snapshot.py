@@ -0,0 +1,388 @@
+"""
+Client snapshot builder and read-only snapshot endpoint for ÉpítAI Construction Management System
+
+A snapshot is a compact, precomputed view of a project's status (current phase,
+progress, remaining days and phase timeline) keyed by the project's share token
+from generate_project_id(). Snapshots are rebuilt only when the project's
+fingerprint changes and are served from disk by a lightweight HTTP endpoint, so
+clients checking their project do not need a Streamlit session. Every project
+of a session is published when the session starts, and a deleted project's
+snapshot is removed with it.
+
+Usage: python client_snapshot.py [--host 0.0.0.0] [--port 8502]
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import html
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+from default_data import generate_project_id
+from phase_catalogue import get_phase_catalogue
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DIR = os.getenv('CLIENT_SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.client_snapshots'))
+SHARE_TOKEN_PATTERN = re.compile(r'^[A-Za-z0-9]{32}$')
+SNAPSHOT_CACHE_SIZE = int(os.getenv('CLIENT_SNAPSHOT_CACHE_SIZE', '512'))
+
+# Project fields that influence the client snapshot
+FINGERPRINT_FIELDS = ('name', 'type', 'status', 'start', 'end', 'locations', 'progress', 'phases_checked')
+
+# In-process LRU cache: share token -> snapshot dict (at most SNAPSHOT_CACHE_SIZE entries)
+_snapshot_cache = OrderedDict()
+
+
+def ensure_share_token(project):
+    """Make sure the project has a share token and return it"""
+    if not project.get("project_id"):
+        project["project_id"] = generate_project_id()
+    return project["project_id"]
+
+
+def project_fingerprint(project, catalogue_version=None):
+    """Get a stable hash of the project fields shown in the client snapshot"""
+    relevant = {field: project.get(field) for field in FINGERPRINT_FIELDS}
+    relevant['_version'] = SNAPSHOT_VERSION
+    if catalogue_version:
+        relevant['_catalogue'] = catalogue_version
+    payload = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _phase_done_count(phases_checked, phase_index):
+    """Count checked tasks of a phase, tolerating short or missing matrices"""
+    if phase_index < len(phases_checked):
+        return sum(1 for v in phases_checked[phase_index] if v)
+    return 0
+
+
+def _resolve_phases(phases_def):
+    """Default to the phase catalogue; returns the phases and the catalogue version they came from"""
+    catalogue = get_phase_catalogue()
+    if phases_def is None:
+        phases_def = catalogue.phases
+    return phases_def, (catalogue.version if phases_def is catalogue.phases else None)
+
+
+def _parse_date(value, fallback):
+    """Parse an ISO date string, falling back to the given default"""
+    try:
+        return datetime.fromisoformat(str(value or fallback))
+    except ValueError:
+        return datetime.fromisoformat(fallback)
+
+
+def build_client_snapshot(project, phases_def=None):
+    """Build the compact client snapshot dict for a project"""
+    phases_def, catalogue_version = _resolve_phases(phases_def)
+    phases_checked = project.get("phases_checked") or [[False for _ in p["tasks"]] for p in phases_def]
+
+    # Find current phase (first incomplete phase, or the last one if all are done)
+    current_phase_index = len(phases_def) - 1
+    for pi, phase in enumerate(phases_def):
+        if pi < len(phases_checked) and _phase_done_count(phases_checked, pi) < len(phase["tasks"]):
+            current_phase_index = pi
+            break
+
+    current_phase = None
+    if 0 <= current_phase_index < len(phases_def):
+        phase = phases_def[current_phase_index]
+        phase_total = len(phase["tasks"])
+        phase_done = _phase_done_count(phases_checked, current_phase_index)
+        phase_duration = phase.get('total_duration_days', 0)
+        current_phase_days = int(phase_duration * phase_done / phase_total) if phase_total else 0
+        checked_row = phases_checked[current_phase_index] if current_phase_index < len(phases_checked) else []
+
+        tasks = []
+        for ti, task in enumerate(phase["tasks"]):
+            if isinstance(task, str):
+                task = {"name": task}
+            tasks.append({
+                'name': task.get("name", "Unknown task"),
+                'duration_days': task.get("duration_days"),
+                'required_people': task.get("required_people"),
+                'done': bool(checked_row[ti]) if ti < len(checked_row) else False,
+            })
+
+        current_phase = {
+            'index': current_phase_index,
+            'name': phase['name'],
+            'tasks_done': phase_done,
+            'tasks_total': phase_total,
+            'duration_days': phase_duration,
+            'required_people': sum(t.get("required_people", 0) for t in phase["tasks"] if isinstance(t, dict)),
+            'progress': int(phase_done * 100 / phase_total) if phase_total else 0,
+            'time_progress': int(current_phase_days * 100 / phase_duration) if phase_duration > 0 else 0,
+            'tasks': tasks,
+        }
+
+    # Timeline summary (completed phases count in full, the current one partially)
+    total_project_days = sum(phase.get('total_duration_days', 0) for phase in phases_def)
+    completed_days = 0
+    for pi, phase in enumerate(phases_def):
+        if pi < current_phase_index:
+            completed_days += phase.get('total_duration_days', 0)
+        elif pi == current_phase_index and phase["tasks"]:
+            completed_days += int(phase.get('total_duration_days', 0) * _phase_done_count(phases_checked, pi) / len(phase["tasks"]))
+
+    proj_start = _parse_date(project.get("start"), "2025-01-01")
+    proj_end = _parse_date(project.get("end"), "2025-12-31")
+
+    # Phase timeline rows, clamped to the project end date
+    timeline = []
+    duration_days = max((proj_end - proj_start).days, 1)
+    num_phases = max(len(phases_def), 1)
+    slice_days = max(duration_days // num_phases, 1)
+    current_start = proj_start
+    for pi, phase in enumerate(phases_def):
+        phase_duration = phase.get('total_duration_days', slice_days)
+        current_end = current_start + timedelta(days=phase_duration)
+        if pi == num_phases - 1 or current_end > proj_end:
+            current_end = proj_end
+        timeline.append({
+            'phase': f"{pi+1}. {phase['name']} ({phase_duration} nap)",
+            'start': current_start.date().isoformat(),
+            'end': current_end.date().isoformat(),
+            'completion': int(_phase_done_count(phases_checked, pi) * 100 / (len(phase["tasks"]) or 1)),
+        })
+        current_start = current_end
+
+    return {
+        'version': SNAPSHOT_VERSION,
+        'project_id': project.get("project_id"),
+        'fingerprint': project_fingerprint(project, catalogue_version),
+        'generated_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'name': project.get("name", ""),
+        'type': project.get("type") or 'Nincs megadva',
+        'status': project.get("status", 'Ismeretlen'),
+        'start': project.get("start", '-'),
+        'end': project.get("end", '-'),
+        'locations': project.get("locations") or ['Nincs megadva'],
+        'progress': int(project.get("progress", 0)),
+        'current_phase': current_phase,
+        'summary': {
+            'total_days': total_project_days,
+            'completed_days': completed_days,
+            'remaining_days': total_project_days - completed_days,
+            'required_people': sum(
+                task.get("required_people", 0) for phase in phases_def for task in phase["tasks"] if isinstance(task, dict)
+            ),
+            'estimated_completion': (proj_start + timedelta(days=total_project_days)).date().isoformat(),
+        },
+        'timeline': timeline,
+    }
+
+
+def render_snapshot_html(snapshot):
+    """Render a snapshot as a small self-contained HTML page"""
+    esc = html.escape
+    phase = snapshot.get('current_phase')
+    summary = snapshot['summary']
+
+    task_rows = ""
+    if phase:
+        for task in phase['tasks']:
+            icon = "✅" if task['done'] else "⏳"
+            duration = f"{task['duration_days']} nap" if task['duration_days'] is not None else "N/A"
+            people = f"{task['required_people']} fő" if task['required_people'] is not None else "N/A"
+            task_rows += f"<li>{icon} {esc(task['name'])} <span class='muted'>⏱️ {duration} | 👥 {people}</span></li>"
+
+    timeline_rows = "".join(
+        f"<tr><td>{esc(row['phase'])}</td><td>{row['start']}</td><td>{row['end']}</td>"
+        f"<td><div class='bar'><div style='width:{row['completion']}%'></div></div></td></tr>"
+        for row in snapshot['timeline']
+    )
+
+    phase_block = ""
+    if phase:
+        phase_block = f"""
+        <h3>🔄 {esc(phase['name'])} - Folyamatban</h3>
+        <p>Feladatok: {phase['tasks_done']}/{phase['tasks_total']} | Időtartam: {phase['duration_days']} nap |
+        Szükséges emberek: {phase['required_people']} fő | Haladás: {phase['progress']}%</p>
+        <div class='bar'><div style='width:{phase['time_progress']}%'></div></div>
+        <ul>{task_rows}</ul>"""
+
+    return f"""<!DOCTYPE html>
+<html lang="hu"><head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{esc(snapshot['name'])} – ÉpítAI</title>
+<style>
+body {{ font-family: sans-serif; max-width: 960px; margin: 0 auto; padding: 1rem; color: #222; }}
+.header {{ background: linear-gradient(90deg, #1f77b4, #ff7f0e); color: white; padding: 1rem; border-radius: 10px; }}
+.bar {{ background: #e9ecef; border-radius: 4px; height: 10px; }}
+.bar div {{ background: #1f77b4; border-radius: 4px; height: 10px; }}
+.muted {{ color: #666; font-size: 0.9em; }}
+table {{ width: 100%; border-collapse: collapse; }} td {{ padding: 4px; border-bottom: 1px solid #eee; }}
+</style></head><body>
+<div class="header"><h1>📋 {esc(snapshot['name'])}</h1><p><strong>Projekt típus:</strong> {esc(snapshot['type'])}</p></div>
+<p><strong>Állapot:</strong> {esc(snapshot['status'])} | <strong>Kezdés:</strong> {esc(str(snapshot['start']))} |
+<strong>Befejezés:</strong> {esc(str(snapshot['end']))} | <strong>Helyszín:</strong> {esc(', '.join(snapshot['locations']))}</p>
+<h2>📈 Teljes haladás: {snapshot['progress']}%</h2>
+<div class="bar"><div style="width:{snapshot['progress']}%"></div></div>
+{phase_block}
+<h2>⏱️ Projekt időtartam összefoglalás</h2>
+<p>Teljes projekt: {summary['total_days']} nap | Teljesített: {summary['completed_days']} nap |
+Hátralévő: {summary['remaining_days']} nap | Becsült befejezés: {summary['estimated_completion']}</p>
+<h2>📅 Ütemterv</h2>
+<table>{timeline_rows}</table>
+<p class="muted">Frissítve: {snapshot['generated_at']} UTC</p>
+</body></html>"""
+
+
+def _snapshot_paths(token):
+    """Get the JSON and HTML file paths for a share token"""
+    return os.path.join(SNAPSHOT_DIR, f"{token}.json"), os.path.join(SNAPSHOT_DIR, f"{token}.html")
+
+
+def _write_atomic(path, content):
+    """Write a file atomically so the endpoint never serves a partial snapshot"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def publish_client_snapshot(project, phases_def=None, force=False):
+    """Rebuild and store the project's snapshot if the project changed since the last build"""
+    token = ensure_share_token(project)
+    phases_def, catalogue_version = _resolve_phases(phases_def)
+    fingerprint = project_fingerprint(project, catalogue_version)
+
+    cached = _snapshot_cache.get(token)
+    if cached and cached['fingerprint'] == fingerprint and not force:
+        _snapshot_cache.move_to_end(token)
+        return cached
+
+    snapshot = build_client_snapshot(project, phases_def)
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        json_path, html_path = _snapshot_paths(token)
+        _write_atomic(json_path, json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')))
+        _write_atomic(html_path, render_snapshot_html(snapshot))
+    except OSError as e:
+        print(f"Failed to write client snapshot {token}: {e}")
+
+    _snapshot_cache[token] = snapshot
+    _snapshot_cache.move_to_end(token)
+    while len(_snapshot_cache) > SNAPSHOT_CACHE_SIZE:
+        _snapshot_cache.popitem(last=False)
+    return snapshot
+
+
+def publish_client_snapshots(projects, phases_def=None):
+    """Publish the snapshot of every project (unchanged projects are cache hits)"""
+    for project in projects:
+        try:
+            publish_client_snapshot(project, phases_def)
+        except Exception as e:
+            print(f"Failed to publish client snapshot for {project.get('name', '')}: {e}")
+
+
+def remove_client_snapshot(token):
+    """Delete a project's stored snapshot so its share link stops working"""
+    if not SHARE_TOKEN_PATTERN.match(token or ""):
+        return
+    _snapshot_cache.pop(token, None)
+    for path in _snapshot_paths(token):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Failed to remove client snapshot {path}: {e}")
+
+
+def load_client_snapshot(token):
+    """Load a stored snapshot by share token (None if missing or invalid)"""
+    if not SHARE_TOKEN_PATTERN.match(token or ""):
+        return None
+    json_path, _ = _snapshot_paths(token)
+    try:
+        with open(json_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class ClientSnapshotHandler(BaseHTTPRequestHandler):
+    """Read-only handler serving /snapshot/<token> (HTML) and /snapshot/<token>.json"""
+
+    # path -> (mtime, etag, body) cache shared by all handler threads
+    _file_cache = {}
+
+    def do_GET(self):
+        match = re.match(r'^/snapshot/([A-Za-z0-9]{32})(\.json|\.html)?$', self.path.split('?', 1)[0])
+        if not match:
+            self._send(404, 'text/plain; charset=utf-8', b'Not found')
+            return
+
+        token, suffix = match.group(1), match.group(2) or '.html'
+        json_path, html_path = _snapshot_paths(token)
+        path = json_path if suffix == '.json' else html_path
+        content_type = 'application/json' if suffix == '.json' else 'text/html; charset=utf-8'
+
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._file_cache.pop(path, None)
+            self._send(404, 'text/plain; charset=utf-8', b'Snapshot not found')
+            return
+
+        cached = self._file_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, 'rb') as f:
+                body = f.read()
+            cached = (mtime, f'"{hashlib.sha1(body).hexdigest()}"', body)
+            self._file_cache[path] = cached
+        _, etag, body = cached
+
+        if self.headers.get('If-None-Match') == etag:
+            self._send(304, content_type, b'', etag)
+        else:
+            self._send(200, content_type, body, etag)
+
+    def _send(self, status, content_type, body, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'public, max-age=60')
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep the endpoint quiet under load
+        pass
+
+
+def serve_client_snapshots(host='0.0.0.0', port=8502):
+    """Serve stored client snapshots over HTTP"""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    server = ThreadingHTTPServer((host, port), ClientSnapshotHandler)
+    print(f"Serving client snapshots from {SNAPSHOT_DIR} on http://{host}:{port}/snapshot/<token>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Read-only client snapshot endpoint")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address")
+    parser.add_argument("--port", type=int, default=8502, help="Port to listen on")
+
+    args = parser.parse_args()
+    serve_client_snapshots(args.host, args.port)
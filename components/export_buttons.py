@@ -0,0 +1,51 @@
+import tempfile
+from datetime import date
+
+import streamlit as st
+from lazy_imports import lazy_import
+
+# SQLAlchemy, the models and openpyxl are only imported once an export is downloaded
+data_export = lazy_import("data_export")
+
+FORMAT_LABELS = {"csv": "CSV", "xlsx": "Excel"}
+# Same as data_export.CONTENT_TYPES; repeated so rendering the buttons does not import it
+MIME_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _default_engine():
+    from database import engine
+    return engine
+
+
+def _deferred_export(dataset, fmt, engine, query_options):
+    """Callable for st.download_button: streams the export into a temporary file on click"""
+    def generate():
+        target = tempfile.TemporaryFile()
+        data_export.export_dataset(engine or _default_engine(), dataset, fmt, target, **query_options)
+        target.seek(0)
+        return target
+    return generate
+
+
+def render_export_buttons(dataset, key, label=None, engine=None, filters=None, date_from=None, date_to=None):
+    """CSV and XLSX download buttons for a dataset of data_export.
+
+    The export is only generated when a button is clicked, never on a rerun of
+    the page. Very large exports (millions of assignments) are better run with
+    `python data_export.py`, since the finished file is held by Streamlit until
+    it is downloaded.
+    """
+    query_options = {"filters": filters or {}, "date_from": date_from, "date_to": date_to}
+    cols = st.columns(len(FORMAT_LABELS))
+    for col, (fmt, fmt_label) in zip(cols, FORMAT_LABELS.items()):
+        col.download_button(
+            f"⬇️ {label or dataset} ({fmt_label})",
+            data=_deferred_export(dataset, fmt, engine, query_options),
+            file_name=f"{dataset}_{date.today().isoformat()}.{fmt}",
+            mime=MIME_TYPES[fmt],
+            key=f"{key}_{fmt}",
+            on_click="ignore",
+        )
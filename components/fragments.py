@@ -0,0 +1,14 @@
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+def rerun_fragment():
+    """Rerun only the current fragment.
+
+    A widget inside an st.fragment normally triggers a fragment rerun, but the
+    fragment is also drawn during full page runs, where scope="fragment" is
+    not allowed; fall back to rerunning the whole page then.
+    """
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
@@ -0,0 +1,74 @@
+import streamlit as st
+from lazy_imports import lazy_import
+
+# pandas, SQLAlchemy and the models are only imported once a file is imported
+bulk_import = lazy_import("bulk_import")
+
+IMPORT_KINDS = {
+    "resources": "Erőforrások",
+    "materials": "Anyagok",
+    "prices": "Beszállítói árlista",
+}
+
+IMPORT_HELP = {
+    "resources": "Oszlopok: Típus, Név, E-mail (kötelező), Pozíció, Telefonszám, Cím, Készségek, Órabér, "
+                 "Elérhetőség, Tapasztalat. Azonos típusú és e-mail című erőforrás frissül.",
+    "materials": "Oszlopok: Megnevezés (kötelező), Beszállító, Kategória, Egység, Egységár, Készlet, Státusz, ... "
+                 "Beszállítónként azonos nevű anyag frissül.",
+    "prices": "Oszlopok: Beszállító, Megnevezés, Egységár (kötelező), Egység, Kategória, Dátum. "
+              "Beszállító oszlop nélkül a beszállító azonosítóját meg kell adni. "
+              "Az anyagok az árlista legfrissebb árát kapják, minden ár bekerül az ártörténetbe.",
+}
+
+# Longest error report shown on the page; the download always has every row
+MAX_SHOWN_ERRORS = 500
+
+
+def _default_engine():
+    from database import engine
+    return engine
+
+
+def render_import_panel(key, engine=None, on_rows=None):
+    """Upload, validate and upsert a resources/materials/price list file.
+
+    on_rows(kind, frame) is called with the valid rows of every imported chunk.
+    """
+    kind = st.selectbox("Adattípus", list(IMPORT_KINDS), format_func=IMPORT_KINDS.get, key=f"{key}_kind")
+    st.caption(IMPORT_HELP[kind])
+    uploaded = st.file_uploader("CSV vagy Excel fájl", type=["csv", "xlsx"], key=f"{key}_file")
+    supplier_id = None
+    if kind != "resources":
+        supplier_id = st.number_input("Beszállító azonosító (ha a fájlban nincs beszállító oszlop)", min_value=0,
+                                      step=1, key=f"{key}_supplier") or None
+
+    if not st.button("Importálás", key=f"{key}_run", disabled=uploaded is None):
+        return None
+    progress = st.empty()
+    try:
+        summary = bulk_import.import_file(
+            engine or _default_engine(), kind, uploaded, fmt=uploaded.name.rsplit(".", 1)[-1].lower(),
+            supplier_id=supplier_id,
+            progress=lambda rows: progress.caption(f"{rows:,} sor feldolgozva..."),
+            on_rows=(lambda frame: on_rows(kind, frame)) if on_rows else None,
+        )
+    except ValueError as error:
+        st.error(f"Az importálás sikertelen: {error}")
+        return None
+    progress.empty()
+
+    st.success(f"{summary['imported']:,} / {summary['rows']:,} sor importálva ({summary['seconds']:.1f} mp).")
+    if summary["ignored_columns"]:
+        st.info(f"Figyelmen kívül hagyott oszlopok: {', '.join(summary['ignored_columns'])}")
+    if summary["rejected"]:
+        st.warning(f"{summary['rejected']:,} sor hibás, ezek nem kerültek importálásra.")
+        st.dataframe(summary["errors"].head(MAX_SHOWN_ERRORS), hide_index=True, use_container_width=True)
+        st.download_button(
+            "⬇️ Hibajelentés letöltése",
+            data=bulk_import.error_report_csv(summary["errors"]),
+            file_name=f"{kind}_import_hibak.csv",
+            mime="text/csv",
+            key=f"{key}_errors",
+            on_click="ignore",
+        )
+    return summary
@@ -0,0 +1,83 @@
+import streamlit as st
+from lazy_imports import lazy_import
+
+# SQLAlchemy and the models are only imported once a job is submitted or shown
+job_queue = lazy_import("job_queue")
+
+POLL_SECONDS = 2
+
+STATUS_LABELS = {
+    "queued": "⏳ Várakozik",
+    "running": "⚙️ Folyamatban",
+    "succeeded": "✅ Kész",
+    "failed": "❌ Sikertelen",
+    "cancelled": "🚫 Megszakítva",
+}
+
+
+def _default_engine():
+    from database import engine
+    return engine
+
+
+def submit_job_button(label, kind, build_payload, key, engine=None, disabled=False, priority=0):
+    """Button that queues a background job and remembers its id under `key`.
+
+    build_payload is only called on click, so expensive payloads are not built
+    on every rerun. Returns the id of the last job submitted with this key.
+    """
+    jobs = st.session_state.setdefault("background_jobs", {})
+    if st.button(label, key=f"{key}_submit", disabled=disabled):
+        user = st.session_state.get("current_user") or {}
+        jobs[key] = job_queue.submit_job(engine or _default_engine(), kind, build_payload(), priority=priority,
+                                         submitted_by=user.get("email"))
+    return jobs.get(key)
+
+
+def _render_job(job, key, engine):
+    """Status line, progress bar and result of a job"""
+    st.write(f"**{STATUS_LABELS.get(job['status'], job['status'])}** – feladat #{job['job_id']}")
+    if job["status"] in ("queued", "running"):
+        st.progress(float(job["progress"] or 0), text=job.get("progress_message") or "")
+        if st.button("Megszakítás", key=f"{key}_cancel"):
+            job_queue.cancel_job(engine, job["job_id"])
+            st.rerun()
+    elif job["status"] == "failed":
+        st.error((job.get("error") or "Ismeretlen hiba").splitlines()[0])
+    elif job["status"] == "succeeded":
+        result = job.get("result") or {}
+        if result.get("filename"):
+            job_file = job_queue.get_job_file(engine, job["job_id"])
+            st.download_button(
+                f"⬇️ {job_file.filename} letöltése",
+                data=job_file.content,
+                file_name=job_file.filename,
+                mime=job_file.content_type,
+                key=f"{key}_download",
+            )
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _poll_job(job_id, key, engine):
+    """Re-read the job every few seconds while it is queued or running"""
+    job = job_queue.get_job(engine, job_id)
+    if job is None or job["status"] not in ("queued", "running"):
+        # Redraw once without the timer
+        st.rerun()
+    _render_job(job, key, engine)
+
+
+def render_job_status(job_id, key, engine=None):
+    """Show a background job's progress; polls only until the job finishes"""
+    if job_id is None:
+        return None
+    engine = engine or _default_engine()
+    job = job_queue.get_job(engine, job_id)
+    if job is None:
+        st.warning(f"A #{job_id} feladat nem található.")
+        return None
+    if job["status"] in ("queued", "running"):
+        _poll_job(job_id, key, engine)
+    else:
+        _render_job(job, key, engine)
+    return job
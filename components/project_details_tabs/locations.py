@@ -1,5 +1,7 @@
 import streamlit as st
-import requests
+from lazy_imports import lazy_import
+
+requests = lazy_import("requests")
 
 @st.cache_data(show_spinner=False)
 def geocode_location(name: str):
@@ -1,7 +1,15 @@
 import streamlit as st
+from default_data import make_editable
+from components.fragments import rerun_fragment
 
-def render_material_costs_tab(project):
-    """Render the material costs tab for project details."""
+@st.fragment
+def render_material_costs_tab(project_index):
+    """Render the material costs tab for project details.
+
+    Runs as a fragment: adding, editing or deleting a material reruns only
+    this tab.
+    """
+    project = make_editable(st.session_state.projects, project_index)
     st.subheader("🧱 Anyagköltségek")
     
     # Initialize material costs if not exists
@@ -11,7 +19,7 @@ def render_material_costs_tab(project):
     # Add new material cost button
     if st.button("➕ Új anyag hozzáadása", key="add_material"):
         st.session_state.show_add_material = True
-        st.rerun()
+        rerun_fragment()
     
     # Add material form
     if st.session_state.get("show_add_material", False):
@@ -65,14 +73,14 @@ def render_material_costs_tab(project):
                         project["material_costs"].append(new_material)
                         st.success(f"Anyag hozzáadva: {material_name}")
                         st.session_state.show_add_material = False
-                        st.rerun()
+                        rerun_fragment()
                     else:
                         st.error("Az anyag neve és egységára megadása kötelező!")
             
             with col2:
                 if st.form_submit_button("❌ Mégse"):
                     st.session_state.show_add_material = False
-                    st.rerun()
+                    rerun_fragment()
     
     # Display material costs
     if project["material_costs"]:
@@ -108,12 +116,12 @@ def render_material_costs_tab(project):
                     with col5:
                         if st.button("✏️", key=f"edit_material_{i}", help="Szerkesztés"):
                             st.session_state.edit_material_index = i
-                            st.rerun()
+                            rerun_fragment()
                     
                     with col6:
                         if st.button("🗑️", key=f"delete_material_{i}", help="Törlés"):
                             st.session_state.delete_material_index = i
-                            st.rerun()
+                            rerun_fragment()
                     
                     st.divider()
         
@@ -211,14 +219,14 @@ def render_material_costs_tab(project):
                             }
                             st.success("Anyag sikeresen frissítve!")
                             st.session_state.edit_material_index = None
-                            st.rerun()
+                            rerun_fragment()
                         else:
                             st.error("Az anyag neve és egységára megadása kötelező!")
                 
                 with col2:
                     if st.form_submit_button("❌ Mégse"):
                         st.session_state.edit_material_index = None
-                        st.rerun()
+                        rerun_fragment()
     
     # Delete material confirmation
     if st.session_state.get("delete_material_index") is not None:
@@ -235,9 +243,9 @@ def render_material_costs_tab(project):
                     del project["material_costs"][delete_index]
                     st.success("Anyag sikeresen törölve!")
                     st.session_state.delete_material_index = None
-                    st.rerun()
+                    rerun_fragment()
             
             with col2:
                 if st.button("❌ Mégse", key="cancel_delete_material"):
                     st.session_state.delete_material_index = None
-                    st.rerun()
+                    rerun_fragment()
@@ -1,14 +1,29 @@
 import streamlit as st
-from default_data import get_default_phases
+from default_data import make_editable, invalidate_resource_profiles
+from phase_catalogue import get_phase_catalogue
+from client_snapshot import publish_client_snapshot
 
-def render_phases_tab(project, project_index):
-    """Render the phases tab for project details."""
+def render_progress(slot, progress):
+    """Render the overall progress bar into a placeholder (st.empty)."""
+    with slot.container():
+        st.progress(progress / 100)
+        st.caption(f"{progress}%")
+
+@st.fragment
+def render_phases_tab(project_index, progress_slot=None):
+    """Render the phases tab for project details.
+
+    Runs as a fragment: ticking a task reruns only this tab and refreshes the
+    page's progress placeholder.
+    """
+    project = make_editable(st.session_state.projects, project_index)
     st.subheader("📅 Fázisok")
-    phases_def = get_default_phases()
+    catalogue = get_phase_catalogue()
+    phases_def = catalogue.phases
     
     # Ensure project has phases_checked field (for legacy items)
     if "phases_checked" not in project or not project["phases_checked"]:
-        project["phases_checked"] = [[False for _ in p["tasks"]] for p in phases_def]
+        project["phases_checked"] = catalogue.empty_phases_checked()
     
     total_tasks = 0
     total_done = 0
@@ -35,6 +50,8 @@ def render_phases_tab(project, project_index):
                 # Display task with duration
                 task_display = f"{task_name} ⏱️ {task_duration}"
                 new_val = st.checkbox(task_display, value=current, key=f"proj_{project_index}_{pi}_{ti}")
+                if new_val != current:
+                    invalidate_resource_profiles(st)
                 project["phases_checked"][pi][ti] = new_val
                 if new_val:
                     total_done += 1
@@ -48,3 +65,8 @@ def render_phases_tab(project, project_index):
     
     # Update overall project progress from checked tasks
     project["progress"] = int(total_done * 100 / total_tasks) if total_tasks else 0
+    if progress_slot is not None:
+        render_progress(progress_slot, project["progress"])
+    
+    # Refresh the client snapshot (no-op if nothing changed)
+    publish_client_snapshot(project, phases_def)
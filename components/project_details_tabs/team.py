@@ -1,5 +1,5 @@
 import streamlit as st
-from default_data import get_default_phases
+from phase_catalogue import get_phase_catalogue
 
 def render_team_tab(project, project_index):
     """Render the team tab for project details."""
@@ -44,7 +44,7 @@ def render_team_tab(project, project_index):
         st.write("")  # Add some spacing
         
         # Calculate work hours for each member based on completed tasks
-        phases_def = get_default_phases()
+        phases_def = get_phase_catalogue().phases
         member_work_hours = {}
         
         # Initialize work hours for all members
@@ -1,11 +1,10 @@
 import streamlit as st
-import base64
-from PIL import Image
-import io
+from avatars import avatar_data_uri
 
 def create_user_profile_html(name, company, avatar_size=48):
     """Create HTML string for user profile with avatar and company info"""
-    user_avatar = f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&background=0D8ABC&color=fff&size={avatar_size * 2}"
+    # Rendered locally and inlined (2x for high-DPI screens): no request leaves the browser
+    user_avatar = avatar_data_uri(name, avatar_size * 2)
     
     html_string = f"""
     <div style="display: flex; align-items: center; gap: 1rem; margin-bottom: 0.5rem;">
@@ -31,6 +30,7 @@ def render_sidebar_navigation():
     st.sidebar.page_link('pages/projects.py', label='Projektek')
     st.sidebar.page_link('pages/resources.py', label='Erőforrások')
     st.sidebar.page_link('pages/scheduling.py', label='Ütemezés')
+    st.sidebar.page_link('pages/capacity_planning.py', label='Kapacitástervezés')
 
     st.sidebar.markdown("### 🤖 AI Asszisztensek")
     st.sidebar.page_link('pages/material_quote_ai.py', label='AI Ajánlatkérés')
@@ -0,0 +1,368 @@
+"""
+Contract document engine for ÉpítAI Construction Management System
+
+Contracts are assembled from a clause library whose templates are compiled
+once per contract type and cached. Contract data comes from project, client
+and resource rows (session state dicts or model to_dict() output), and
+documents can be rendered as plain text, DOCX or PDF. Batch rendering of
+subcontracts runs in a process pool.
+"""
+
+import os
+import io
+import re
+import sys
+import zipfile
+import unicodedata
+from datetime import date
+from functools import lru_cache
+from string import Template
+from xml.sax.saxutils import escape
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List, Tuple
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+DISCLAIMER = "FIGYELMEZTETÉS: A tervezet nem minősül jogi tanácsnak. Ügyvédi felülvizsgálat szükséges."
+MAIN_CONTRACTOR = os.getenv('CONTRACT_MAIN_CONTRACTOR', 'ÉpítAI Kivitelező Kft.')
+PDF_FONT_PATHS = [
+    os.getenv('CONTRACT_PDF_FONT', ''),
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/dejavu/DejaVuSans.ttf',
+]
+PARALLEL_THRESHOLD = 8
+SUBCONTRACTOR_TYPES = ('Alvállalkozó',)
+
+DEFAULT_TERMS = {
+    'scope': "Kivitelezési munkák a projekt ütemterve szerint.",
+    'price': "Egyedi megállapodás szerint",
+    'payment': "30% előleg, 60% részszámlák, 10% átadáskor",
+    'governing_law': "Magyar jog",
+    'warranty': "12 hónap jótállás a műszaki átadástól",
+}
+
+# Clause library: clause id -> (heading, body template)
+CLAUSE_LIBRARY = {
+    'parties': ("Felek", "A szerződő felek: $party_a ($role_a) és $party_b ($role_b)."),
+    'subject': ("A szerződés tárgya", "$scope"),
+    'deadlines': ("Határidők", "A teljesítés tervezett időtartama: $start – $end"),
+    'payment': ("Díjazás és fizetés", "$fee_label: $price. Fizetés módja: $payment."),
+    'acceptance': ("Teljesítés igazolása", "Rész-számlázás mérföldkövek szerint, végszámla átadás-átvétel után."),
+    'subcontract_duties': (
+        "Az Alvállalkozó kötelezettségei",
+        "Az Alvállalkozó a munkát a Fővállalkozó ütemterve szerint, a $project projekt helyszínén ($location) "
+        "végzi, betartja a munkavédelmi előírásokat, és további alvállalkozót csak a Fővállalkozó írásos "
+        "hozzájárulásával vonhat be."
+    ),
+    'data_processing': (
+        "Adatfeldolgozás",
+        "Az Adatfeldolgozó ($party_b) a személyes adatokat kizárólag az Adatkezelő ($party_a) írásbeli "
+        "utasításai szerint, az általános adatvédelmi rendelet (GDPR) 28. cikkének megfelelően kezeli."
+    ),
+    'law': ("Irányadó jog és jogvita rendezése", "$governing_law. A jogvitákat felek elsősorban egyeztetéssel rendezik."),
+    'warranty': ("Jótállás és szavatosság", "$warranty."),
+    'confidentiality': (
+        "Titoktartás és adatvédelem",
+        "A felek a szerződéssel összefüggő üzleti és személyes adatokat bizalmasan kezelik, "
+        "és azokat kizárólag a teljesítéshez szükséges mértékben használják fel."
+    ),
+    'misc': ("Vegyes rendelkezések", "A szerződés módosítása csak írásban érvényes."),
+}
+
+# Contract types: party roles, fee label and clause order ('misc' always closes the contract)
+CONTRACT_TEMPLATES = {
+    "Vállalkozási szerződés": {
+        'roles': ("Megrendelő", "Vállalkozó"),
+        'fee_label': "Vállalkozói díj",
+        'clauses': ('parties', 'subject', 'deadlines', 'payment', 'acceptance', 'law', 'warranty'),
+    },
+    "Alvállalkozói szerződés": {
+        'roles': ("Fővállalkozó", "Alvállalkozó"),
+        'fee_label': "Alvállalkozói díj",
+        'clauses': ('parties', 'subject', 'deadlines', 'payment', 'acceptance', 'subcontract_duties', 'law', 'warranty'),
+    },
+    "Adatfeldolgozási megállapodás (DPA)": {
+        'roles': ("Adatkezelő", "Adatfeldolgozó"),
+        'fee_label': "Díjazás",
+        'clauses': ('parties', 'subject', 'deadlines', 'data_processing', 'payment', 'law'),
+    },
+    "Titoktartási megállapodás (NDA)": {
+        'roles': ("Átadó fél", "Átvevő fél"),
+        'fee_label': "Díjazás",
+        'clauses': ('parties', 'subject', 'deadlines', 'confidentiality', 'law'),
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def compile_contract_template(contract_type: str, include_confidentiality: bool = True) -> Tuple[Tuple[str, Template], ...]:
+    """Compile the ordered clause templates of a contract type (cached per type and option)"""
+    if contract_type not in CONTRACT_TEMPLATES:
+        raise ValueError(f"Unknown contract type: {contract_type}")
+    clause_ids = list(CONTRACT_TEMPLATES[contract_type]['clauses'])
+    if include_confidentiality and 'confidentiality' not in clause_ids:
+        clause_ids.append('confidentiality')
+    clause_ids.append('misc')
+
+    compiled = []
+    for number, clause_id in enumerate(clause_ids, start=1):
+        heading, body = CLAUSE_LIBRARY[clause_id]
+        compiled.append((f"{number}. {heading}", Template(body)))
+    return tuple(compiled)
+
+
+def _format_date(value) -> str:
+    """Format a date or ISO date string, '(n/a)' when missing"""
+    if not value:
+        return '(n/a)'
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def project_terms(project: dict) -> dict:
+    """Extract contract fields from a project (session state or Project.to_dict() shape)"""
+    locations = project.get('locations') or ([project['location']] if project.get('location') else [])
+    return {
+        'project': project.get('name') or project.get('project_name') or '(projekt megnevezése)',
+        'start': project.get('start') or project.get('start_date'),
+        'end': project.get('end') or project.get('end_date'),
+        'location': ", ".join(locations) if locations else '(helyszín)',
+        'client': project.get('client') or project.get('client_name'),
+    }
+
+
+def resource_party(resource: dict) -> dict:
+    """Extract party fields from a resource (session state or Resource.to_dict() shape)"""
+    return {
+        'name': resource.get('Név') or resource.get('name', ''),
+        'address': resource.get('Cím') or resource.get('address'),
+        'email': resource.get('E-mail') or resource.get('email'),
+        'position': resource.get('Pozíció') or resource.get('position'),
+        'skills': resource.get('Készségek') or resource.get('skills'),
+    }
+
+
+def build_contract(contract_type: str, project: dict, party_a: str, party_b: str, terms: Optional[dict] = None,
+                   include_confidentiality: bool = True) -> dict:
+    """Build a structured contract document from project data, parties and commercial terms"""
+    template = CONTRACT_TEMPLATES[contract_type]
+    role_a, role_b = template['roles']
+    fields = dict(DEFAULT_TERMS, **{k: v for k, v in (terms or {}).items() if v})
+    fields.update(project_terms(project))
+    fields.update(
+        party_a=party_a,
+        party_b=party_b,
+        role_a=role_a,
+        role_b=role_b,
+        fee_label=template['fee_label'],
+        start=_format_date(fields['start']),
+        end=_format_date(fields['end']),
+    )
+
+    basics = [
+        ("Szerződés típusa", contract_type),
+        ("Felek", f"{party_a} ({role_a}) és {party_b} ({role_b})"),
+        ("Projekt", fields['project']),
+        ("Időtartam", f"{fields['start']} – {fields['end']}"),
+        ("Teljesítés tárgya", fields['scope']),
+        (template['fee_label'], fields['price']),
+        ("Fizetési feltételek", fields['payment']),
+        ("Irányadó jog", fields['governing_law']),
+        ("Jótállás / szavatosság", fields['warranty']),
+    ]
+    sections = [
+        (heading, body.safe_substitute(fields))
+        for heading, body in compile_contract_template(contract_type, include_confidentiality)
+    ]
+    return {
+        'contract_type': contract_type,
+        'title': contract_type,
+        'party_a': party_a,
+        'party_b': party_b,
+        'project': fields['project'],
+        'basics': basics,
+        'sections': sections,
+        'disclaimer': DISCLAIMER,
+    }
+
+
+def project_subcontractors(project: dict, resources: List[dict]) -> List[dict]:
+    """Get the subcontractor resources that are members of a project"""
+    members = set(project.get('members', []))
+    return [r for r in resources if r.get('Típus') in SUBCONTRACTOR_TYPES and r.get('Név') in members]
+
+
+def build_subcontracts(project: dict, resources: List[dict], terms: Optional[dict] = None,
+                       main_contractor: str = MAIN_CONTRACTOR, include_confidentiality: bool = True) -> List[dict]:
+    """Build one subcontract per resource, scoped to the resource's trade"""
+    documents = []
+    for resource in resources:
+        party = resource_party(resource)
+        resource_terms = dict(terms or {})
+        if not resource_terms.get('scope') and party['position']:
+            skills = f": {party['skills']}" if party['skills'] else ""
+            resource_terms['scope'] = f"{party['position']} munkák{skills}."
+        documents.append(build_contract(
+            "Alvállalkozói szerződés", project, main_contractor, party['name'], resource_terms, include_confidentiality
+        ))
+    return documents
+
+
+def render_text(document: dict) -> str:
+    """Render a contract document as plain text"""
+    return (
+        f"{document['title']}\n\n"
+        "ALAPADATOK\n" + "\n".join(f"{label}: {value}" for label, value in document['basics']) + "\n\n"
+        "RENDELKEZÉSEK\n" + "\n\n".join(f"{heading}\n{body}" for heading, body in document['sections']) + "\n\n"
+        + document['disclaimer']
+    )
+
+
+def render_docx(document: dict) -> bytes:
+    """Render a contract document as DOCX"""
+    from docx import Document
+
+    doc = Document()
+    doc.add_heading(document['title'], level=0)
+    doc.add_heading("Alapadatok", level=1)
+    for label, value in document['basics']:
+        paragraph = doc.add_paragraph(style='List Bullet')
+        paragraph.add_run(f"{label}: ").bold = True
+        paragraph.add_run(str(value))
+    doc.add_heading("Rendelkezések", level=1)
+    for heading, body in document['sections']:
+        doc.add_heading(heading, level=2)
+        doc.add_paragraph(body)
+    doc.add_paragraph().add_run(document['disclaimer']).italic = True
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=1)
+def _pdf_font() -> str:
+    """Register a Unicode TTF font for PDFs once per process, falling back to Helvetica"""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    for path in PDF_FONT_PATHS:
+        if path and os.path.exists(path):
+            pdfmetrics.registerFont(TTFont('ContractSans', path))
+            return 'ContractSans'
+    return 'Helvetica'
+
+
+def _pdf_text(text: str, font: str) -> str:
+    """Escape text for reportlab paragraphs; Helvetica lacks ő/ű so those are folded to ö/ü"""
+    if font == 'Helvetica':
+        text = text.translate(str.maketrans('őŐűŰ', 'öÖüÜ'))
+    return escape(str(text)).replace('\n', '<br/>')
+
+
+@lru_cache(maxsize=1)
+def _pdf_styles():
+    """Build the paragraph styles used in contract PDFs"""
+    from reportlab.lib.styles import ParagraphStyle
+
+    font = _pdf_font()
+    return {
+        'title': ParagraphStyle('ContractTitle', fontName=font, fontSize=16, leading=20, spaceAfter=12),
+        'heading': ParagraphStyle('ContractHeading', fontName=font, fontSize=12, leading=15, spaceBefore=8, spaceAfter=4),
+        'body': ParagraphStyle('ContractBody', fontName=font, fontSize=10, leading=13, spaceAfter=4),
+        'note': ParagraphStyle('ContractNote', fontName=font, fontSize=8, leading=10, spaceBefore=12),
+    }
+
+
+def render_pdf(document: dict) -> bytes:
+    """Render a contract document as PDF"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph
+
+    font = _pdf_font()
+    styles = _pdf_styles()
+    story = [Paragraph(_pdf_text(document['title'], font), styles['title']),
+             Paragraph("ALAPADATOK", styles['heading'])]
+    story.extend(Paragraph(_pdf_text(f"{label}: {value}", font), styles['body']) for label, value in document['basics'])
+    story.append(Paragraph("RENDELKEZÉSEK", styles['heading']))
+    for heading, body in document['sections']:
+        story.append(Paragraph(_pdf_text(heading, font), styles['heading']))
+        story.append(Paragraph(_pdf_text(body, font), styles['body']))
+    story.append(Paragraph(_pdf_text(document['disclaimer'], font), styles['note']))
+
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4, title=document['title'], author=document['party_a']).build(story)
+    return buffer.getvalue()
+
+
+RENDERERS = {
+    'docx': render_docx,
+    'pdf': render_pdf,
+    'txt': lambda document: render_text(document).encode('utf-8'),
+}
+
+
+def contract_filename(document: dict, fmt: str) -> str:
+    """Get a filesystem-safe file name for a rendered contract"""
+    text = unicodedata.normalize('NFKD', f"{document['project']} {document['party_b']}")
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', text).strip('_').lower() or 'szerzodes'
+    return f"{slug}.{fmt}"
+
+
+def _render_file(job) -> Tuple[str, bytes]:
+    """Render one (document, format) job; module level so it can run in worker processes"""
+    document, fmt = job
+    return contract_filename(document, fmt), RENDERERS[fmt](document)
+
+
+def render_batch(documents: List[dict], formats=('pdf',), max_workers: Optional[int] = None) -> List[Tuple[str, bytes]]:
+    """Render documents in every requested format, in a process pool for larger batches"""
+    jobs = [(document, fmt) for document in documents for fmt in formats]
+    if len(jobs) < PARALLEL_THRESHOLD or max_workers == 1:
+        return [_render_file(job) for job in jobs]
+
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_render_file, jobs, chunksize=chunksize))
+
+
+def export_batch_zip(files: List[Tuple[str, bytes]]) -> bytes:
+    """Pack rendered contracts into a zip archive, de-duplicating file names"""
+    buffer = io.BytesIO()
+    seen = {}
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for filename, content in files:
+            count = seen.get(filename, 0)
+            seen[filename] = count + 1
+            if count:
+                stem, ext = os.path.splitext(filename)
+                filename = f"{stem}_{count + 1}{ext}"
+            archive.writestr(filename, content)
+    return buffer.getvalue()
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+    import time
+    from default_data import get_default_resources
+
+    parser = argparse.ArgumentParser(description="Render subcontracts for a batch of resources")
+    parser.add_argument("--count", type=int, default=200, help="Number of subcontracts to render")
+    parser.add_argument("--format", choices=sorted(RENDERERS), action="append", help="Output format(s)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", default="subcontracts.zip", help="Output zip file")
+
+    args = parser.parse_args()
+
+    resources = [r for r in get_default_resources() if r.get('Típus') in SUBCONTRACTOR_TYPES] or get_default_resources()
+    batch = [dict(resources[i % len(resources)], Név=f"{resources[i % len(resources)]['Név']} {i + 1}") for i in range(args.count)]
+    project = {'name': "Családi ház", 'start': date.today().isoformat(), 'end': '(n/a)', 'locations': ["Győr"]}
+
+    started = time.perf_counter()
+    files = render_batch(build_subcontracts(project, batch), formats=args.format or ['pdf'], max_workers=args.workers)
+    with open(args.output, 'wb') as f:
+        f.write(export_batch_zip(files))
+    print(f"✅ {len(files)} szerződés elkészült {time.perf_counter() - started:.2f} mp alatt: {args.output}")
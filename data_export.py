@@ -0,0 +1,206 @@
+"""
+Streaming data export for ÉpítAI Construction Management System
+
+Exports projects, resources and task assignments to CSV or XLSX in constant
+memory, however many rows there are:
+
+- rows are read with a server-side cursor (`yield_per`), one batch of
+  EXPORT_BATCH_SIZE rows at a time, never as a full result or DataFrame
+- CSV is written row by row to the output stream
+- XLSX uses openpyxl's write-only workbook, which streams rows to a temporary
+  file; sheets are split at Excel's row limit (assignments, assignments_2, ...)
+- filters (status, type, date ranges on the partition column) are applied in
+  SQL, so assignment exports only scan the requested months
+
+Exports are offered as download buttons (components/export_buttons.py) and on
+the command line.
+
+Usage:
+  python data_export.py <projects|resources|assignments> [--format csv|xlsx] [--output FILE]
+                        [--status S] [--type T] [--from YYYY-MM-DD] [--to YYYY-MM-DD] [--database-url URL]
+"""
+
+import csv
+import io
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+from models import Project, Resource, TaskAssignment
+
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '5000'))
+# Excel's sheet limit is 1,048,576 rows including the header
+XLSX_MAX_ROWS = 1_048_575
+
+# dataset -> table, order column, equality filters, the column --from/--to apply to
+DATASETS = {
+    'projects': {'table': Project.__table__, 'order': 'project_id', 'filters': ['status'], 'range': 'start_date'},
+    'resources': {'table': Resource.__table__, 'order': 'resource_id', 'filters': ['type', 'availability'], 'range': None},
+    'assignments': {'table': TaskAssignment.__table__, 'order': 'assignment_id', 'filters': ['status', 'resource_id'],
+                    'range': 'start_date'},
+}
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def export_columns(dataset: str):
+    """Column names of a dataset, in export order"""
+    return [column.name for column in DATASETS[dataset]['table'].columns]
+
+
+def build_export_query(dataset: str, filters: Optional[dict] = None, date_from: Optional[date] = None,
+                       date_to: Optional[date] = None):
+    """Select of a dataset's rows with equality filters and a half-open date range"""
+    spec = DATASETS[dataset]
+    table = spec['table']
+    query = select(table).order_by(table.c[spec['order']])
+    for name, value in (filters or {}).items():
+        if name not in spec['filters']:
+            raise ValueError(f"{dataset} cannot be filtered by {name}")
+        if value is not None:
+            query = query.where(table.c[name] == value)
+    if spec['range'] and date_from:
+        query = query.where(table.c[spec['range']] >= date_from)
+    if spec['range'] and date_to:
+        query = query.where(table.c[spec['range']] < date_to)
+    return query
+
+
+def iter_rows(engine, dataset: str, filters: Optional[dict] = None, date_from: Optional[date] = None,
+              date_to: Optional[date] = None, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[tuple]:
+    """Stream a dataset's rows through a server-side cursor"""
+    query = build_export_query(dataset, filters, date_from, date_to)
+    with engine.connect() as connection:
+        result = connection.execution_options(yield_per=batch_size).execute(query)
+        for batch in result.partitions():
+            yield from batch
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, Decimal):
+        return format(value, 'f')
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def write_csv(engine, dataset: str, stream, **query_options) -> int:
+    """Write a dataset as CSV (with header) to a text or binary stream; returns the row count"""
+    wrapped = not isinstance(stream, io.TextIOBase)
+    if wrapped:
+        # utf-8-sig so Excel detects the encoding of accented names
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='', write_through=True)
+    writer = csv.writer(stream)
+    writer.writerow(export_columns(dataset))
+    count = 0
+    for row in iter_rows(engine, dataset, **query_options):
+        writer.writerow([_csv_value(value) for value in row])
+        count += 1
+    stream.flush()
+    if wrapped:
+        # Leave the caller's binary stream open
+        stream.detach()
+    return count
+
+
+def write_xlsx(engine, dataset: str, target, **query_options) -> int:
+    """Write a dataset as XLSX to a path or binary stream with a write-only workbook; returns the row count"""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    workbook = Workbook(write_only=True)
+    columns = export_columns(dataset)
+    bold = Font(bold=True)
+
+    def new_sheet(number: int):
+        sheet = workbook.create_sheet(dataset if number == 1 else f"{dataset}_{number}")
+        sheet.freeze_panes = 'A2'
+        header = []
+        for name in columns:
+            cell = WriteOnlyCell(sheet, value=name)
+            cell.font = bold
+            header.append(cell)
+        sheet.append(header)
+        return sheet
+
+    sheet, sheet_number, sheet_rows, count = new_sheet(1), 1, 0, 0
+    for row in iter_rows(engine, dataset, **query_options):
+        if sheet_rows == XLSX_MAX_ROWS:
+            sheet_number += 1
+            sheet, sheet_rows = new_sheet(sheet_number), 0
+        sheet.append(tuple(row))
+        sheet_rows += 1
+        count += 1
+    workbook.save(target)
+    return count
+
+
+def export_dataset(engine, dataset: str, fmt: str, target, **query_options) -> int:
+    """Export a dataset in the given format ('csv' or 'xlsx'); returns the row count"""
+    if fmt == 'csv':
+        if isinstance(target, str):
+            with open(target, 'wb') as stream:
+                return write_csv(engine, dataset, stream, **query_options)
+        return write_csv(engine, dataset, target, **query_options)
+    if fmt == 'xlsx':
+        return write_xlsx(engine, dataset, target, **query_options)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_filename(dataset: str, fmt: str, today: Optional[date] = None) -> str:
+    """Default file name of an export"""
+    return f"{dataset}_{(today or date.today()).isoformat()}.{fmt}"
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+    import time
+    from sqlalchemy import create_engine
+
+    parser = argparse.ArgumentParser(description="Stream projects, resources or assignments to CSV/XLSX")
+    parser.add_argument("dataset", choices=sorted(DATASETS), help="Data to export")
+    parser.add_argument("--format", choices=sorted(CONTENT_TYPES), default="csv", help="Output format")
+    parser.add_argument("--output", help="Output file ('-' for stdout, CSV only; default: <dataset>_<date>.<format>)")
+    parser.add_argument("--status", help="Only rows with this status")
+    parser.add_argument("--type", help="Only resources of this type")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="Start date from (inclusive)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="Start date to (exclusive)")
+    parser.add_argument("--database-url", default=os.getenv('EXPORT_DATABASE_URL'), help="Database URL (default: database.py)")
+
+    args = parser.parse_args()
+    if args.database_url:
+        cli_engine = create_engine(args.database_url)
+    else:
+        from database import engine as cli_engine
+
+    filters = {name: value for name, value in (('status', args.status), ('type', args.type)) if value is not None}
+    invalid = [name for name in filters if name not in DATASETS[args.dataset]['filters']]
+    if invalid:
+        parser.error(f"{args.dataset} cannot be filtered by {', '.join('--' + name for name in invalid)}")
+    if (args.date_from or args.date_to) and not DATASETS[args.dataset]['range']:
+        parser.error(f"{args.dataset} cannot be filtered by date")
+    options = {'filters': filters, 'date_from': args.date_from, 'date_to': args.date_to}
+    started = time.perf_counter()
+    if args.output == '-':
+        if args.format != 'csv':
+            parser.error("Only CSV can be written to stdout")
+        rows = write_csv(cli_engine, args.dataset, sys.stdout.buffer, **options)
+        print(f"✅ {rows} rows exported in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    else:
+        output = args.output or export_filename(args.dataset, args.format)
+        rows = export_dataset(cli_engine, args.dataset, args.format, output, **options)
+        print(f"✅ {rows} rows exported to {output} in {time.perf_counter() - started:.1f}s")
@@ -134,10 +134,11 @@ def initialize_database():
         # Run auto-migration first
         from migration_utils import auto_migrate_on_startup
         print("Running auto-migration...")
-        auto_migrate_on_startup()
+        migrated = auto_migrate_on_startup()
         
         # Create tables (fallback if migration fails)
-        create_tables()
+        if not migrated:
+            create_tables()
         
         # Check if we need to populate with sample data
         with get_db_session() as session:
@@ -232,16 +233,6 @@ def check_migration_status():
         print(f"Error checking migration status: {e}")
         return {'error': str(e)}
 
-def generate_migration(message: str = None):
-    """Generate a new migration"""
-    try:
-        from migration_utils import AutoMigrationManager
-        manager = AutoMigrationManager()
-        return manager.generate_migration(message)
-    except Exception as e:
-        print(f"Error generating migration: {e}")
-        return None
-
 def apply_migrations():
     """Apply pending migrations"""
     try:
@@ -266,6 +257,5 @@ __all__ = [
     'initialize_database',
     'auto_migrate',
     'check_migration_status',
-    'generate_migration',
     'apply_migrations'
 ]
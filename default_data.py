@@ -281,40 +281,105 @@ def calculate_total_project_duration(phases):
     return total_duration
 
 
-def ensure_base_session_state(st):
-    if "resources" not in st.session_state:
-        st.session_state.resources = get_default_resources()
-    if "profession_types" not in st.session_state:
-        st.session_state.profession_types = get_default_profession_types()
-    if "project_types" not in st.session_state or not st.session_state.project_types:
-        st.session_state.project_types = get_default_project_types()
-    if "projects" not in st.session_state:
-        st.session_state.projects = []
-        seed_projects_if_empty(st)
-    if "selected_project_index" not in st.session_state:
-        st.session_state.selected_project_index = None
-    if "selected_project_type_index" not in st.session_state:
-        st.session_state.selected_project_type_index = None
+class FrozenDict(dict):
+    """Read-only dict for reference data shared by all sessions; deepcopy() returns a mutable copy"""
 
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Shared reference data is read-only; use make_editable() to get a session copy")
 
-def seed_projects_if_empty(st):
-    member_names = [r.get("Név", "") for r in st.session_state.resources if r.get("Név")]
-    phases = get_default_phases()
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class FrozenList(list):
+    """Read-only list for reference data shared by all sessions; deepcopy() returns a mutable copy"""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Shared reference data is read-only; use make_editable() to get a session copy")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def freeze(value, memo=None):
+    """Recursively convert dicts and lists to their read-only shared variants
+
+    An object referenced from several places is frozen once and stays shared.
+    """
+    if memo is None:
+        memo = {}
+    if isinstance(value, (FrozenDict, FrozenList)) or not isinstance(value, (dict, list)):
+        return value
+    if id(value) not in memo:
+        if isinstance(value, dict):
+            memo[id(value)] = FrozenDict((key, freeze(item, memo)) for key, item in value.items())
+        else:
+            memo[id(value)] = FrozenList(freeze(item, memo) for item in value)
+    return memo[id(value)]
+
+
+def thaw(value):
+    """Recursively copy dicts and lists (frozen or not) into plain mutable ones"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+def is_shared(value):
+    """Check if a value is frozen reference data shared between sessions"""
+    return isinstance(value, (FrozenDict, FrozenList))
+
+
+def make_editable(items, index):
+    """Copy-on-write: replace a shared item of a session list with a mutable copy and return it
+
+    Session lists start out as lists of references to the shared reference
+    data; only the items a session edits are copied into the session.
+    """
+    item = items[index]
+    if is_shared(item):
+        item = thaw(item)
+        items[index] = item
+    return item
+
+
+def get_seed_projects(resources, project_types, phases):
+    """Demo projects shown until real projects are created (members and phases_checked lists are shared)"""
+    member_names = [r.get("Név", "") for r in resources if r.get("Név")]
+    members = member_names[:2]
     phases_checked_template = [[False for _ in phase["tasks"]] for phase in phases]
-    type_names = [pt.get("Név", "") for pt in st.session_state.project_types if pt.get("Név")]
-    seed_type = random.choice(type_names) if type_names else ""
-    st.session_state.projects.append({
+    type_names = [pt.get("Név", "") for pt in project_types if pt.get("Név")]
+    projects = [{
         "name": "Alap projekt",
         "start": "2025-01-01",
         "end": "2025-12-31",
         "status": "Folyamatban",
-        "members": member_names[:2],
+        "members": members,
         "locations": ["Győr"],
         "progress": 25,
         "phases_checked": phases_checked_template,
-        "type": seed_type,
+        "type": random.choice(type_names) if type_names else "",
         "project_id": generate_project_id(),
-    })
+    }]
     cities = ["Győr", "Budapest", "Debrecen", "Szeged", "Pécs", "Miskolc", "Veszprém"]
     statuses = ["Tervezés alatt", "Folyamatban", "Késésben", "Lezárt"]
     for i in range(1, 26):
@@ -322,18 +387,79 @@ def seed_projects_if_empty(st):
         end_month = ((i + 5) % 12) + 1
         city = cities[i % len(cities)]
         status = statuses[i % len(statuses)]
-        seed_type_i = random.choice(type_names) if type_names else ""
-        st.session_state.projects.append({
+        projects.append({
             "name": f"Családi ház {i}",
             "start": f"2025-{start_month:02d}-01",
             "end": f"2025-{end_month:02d}-28",
             "size": random.randint(80, 200),
             "status": status,
-            "members": member_names[:2],
+            "members": members,
             "locations": [city],
             "progress": 100 if status == "Lezárt" else (i * 7) % 100,
-            "phases_checked": [[False for _ in phase["tasks"]] for phase in phases],
-            "type": seed_type_i,
+            "phases_checked": phases_checked_template,
+            "type": random.choice(type_names) if type_names else "",
+            "project_id": generate_project_id(),
         })
+    return projects
+
+
+def build_reference_data():
+    """Build the default resources, types and seed projects as one frozen structure
+
+    The phase tree and the empty phases_checked matrix are built once and
+    referenced by every project type and seed project.
+    """
+    phases = get_default_phases()
+    phases_checked = [[False for _ in phase["tasks"]] for phase in phases]
+    resources = get_default_resources()
+    project_types = [
+        dict(project_type, phases=phases, phases_checked=phases_checked)
+        for project_type in get_default_project_types()
+    ]
+    return freeze({
+        "resources": resources,
+        "profession_types": get_default_profession_types(),
+        "project_types": project_types,
+        "projects": get_seed_projects(resources, project_types, phases),
+    })
+
+
+_shared_reference_loader = None
+
+
+def get_shared_reference_data(st):
+    """Reference data built once per process and shared by every session (st.cache_resource)"""
+    global _shared_reference_loader
+    if _shared_reference_loader is None:
+        _shared_reference_loader = st.cache_resource(show_spinner=False)(build_reference_data)
+    return _shared_reference_loader()
+
+
+def ensure_base_session_state(st):
+    """Initialise the session's lists as overlays over the shared reference data
+
+    Each list holds references to the shared, read-only items; appends,
+    deletions and replaced items stay in the session, and make_editable()
+    copies an item into the session before it is changed in place.
+    """
+    reference = get_shared_reference_data(st)
+    if "resources" not in st.session_state:
+        st.session_state.resources = list(reference["resources"])
+    if "profession_types" not in st.session_state:
+        st.session_state.profession_types = list(reference["profession_types"])
+    if "project_types" not in st.session_state or not st.session_state.project_types:
+        st.session_state.project_types = list(reference["project_types"])
+    if "projects" not in st.session_state:
+        st.session_state.projects = list(reference["projects"])
+        # Share links work before anyone opens a project (unchanged snapshots are cache hits)
+        from client_snapshot import publish_client_snapshots
+        publish_client_snapshots(st.session_state.projects)
+    if "selected_project_index" not in st.session_state:
+        st.session_state.selected_project_index = None
+    if "selected_project_type_index" not in st.session_state:
+        st.session_state.selected_project_type_index = None
 
 
+def invalidate_resource_profiles(st):
+    """Forget the session's cached resource profiles after projects, members or resources changed"""
+    st.session_state.pop("resource_profiles", None)
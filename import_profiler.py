@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Import profiler for ÉpítAI Construction Management System
+
+Measures what each Streamlit page costs to import in a fresh interpreter,
+using `python -X importtime`:
+
+- the page's top-level import statements run after `import streamlit`, which
+  every page shares and is therefore the baseline
+- the -X importtime report is parsed; a page's cost is the cumulative time of
+  the top-level modules it pulls in beyond the baseline
+- every run is a new process (cold interpreter); the median of --repeat runs
+  is reported
+
+Budgets in import_budgets.json are relative to the baseline measured in the
+same runs (a page budget of 0.5 allows half of what `import streamlit` costs
+on that machine), so they hold on faster and slower machines alike. `check`
+exits with status 1 when a page is over budget, so an eager import of
+plotly/pandas/Pillow sneaking back into a page is caught before it ships.
+`record` rewrites the budgets from the current measurements plus headroom.
+
+Usage:
+  python import_profiler.py report [page ...] [--repeat 3] [--top 5]
+  python import_profiler.py check [page ...] [--budgets import_budgets.json] [--repeat 3]
+  python import_profiler.py record [--headroom 50] [--repeat 3]
+"""
+
+import ast
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+from typing import Optional, List
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+PAGES_DIR = os.path.join(PROJECT_ROOT, 'pages')
+BUDGETS_FILE = os.path.join(PROJECT_ROOT, 'import_budgets.json')
+BASELINE_IMPORTS = 'import streamlit'
+DEFAULT_REPEAT = 3
+DEFAULT_HEADROOM = 50.0
+# Budgets (fractions of the baseline import time) never go below this, so pages
+# that import almost nothing do not fail on noise
+MIN_BUDGET = 0.1
+# Budget of pages missing from the budget file
+DEFAULT_BUDGET = 0.2
+DEFAULT_TOP = 5
+
+_MARKER = 'import-profiler:'
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def list_pages() -> List[str]:
+    """Names of the Streamlit pages (pages/*.py without the extension)"""
+    return sorted(name[:-3] for name in os.listdir(PAGES_DIR) if name.endswith('.py') and not name.startswith('_'))
+
+
+def page_imports(page_path: str) -> List[str]:
+    """Source of the page's top-level import statements"""
+    with open(page_path, encoding='utf-8') as handle:
+        source = handle.read()
+    tree = ast.parse(source, page_path)
+    return [ast.get_source_segment(source, node) for node in tree.body
+            if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def build_probe(statements: List[str]) -> str:
+    """Program that imports the baseline, marks the start of the page imports and runs them
+
+    Imports that fail (e.g. database without its environment) are reported
+    instead of aborting the probe.
+    """
+    lines = [
+        'import sys, time',
+        BASELINE_IMPORTS,
+        f'sys.stderr.write({_MARKER + " start"!r} + "\\n"); sys.stderr.flush()',
+        'started = time.perf_counter()',
+    ]
+    for statement in statements:
+        lines += [
+            'try:',
+            f'    {statement}',
+            'except Exception as e:',
+            f'    sys.stderr.write({_MARKER + " failed "!r} + {statement!r} + ": " + type(e).__name__ + "\\n")',
+            '    sys.stderr.flush()',
+        ]
+    lines.append(f'sys.stderr.write({_MARKER + " wall "!r} + str(time.perf_counter() - started) + "\\n")')
+    return '\n'.join(lines) + '\n'
+
+
+def parse_importtime(output: str) -> dict:
+    """Parse -X importtime output after the start marker
+
+    Returns the top-level modules with their cumulative time (ms), the time of
+    the baseline imports before the marker, the wall time of the page imports
+    and the statements that failed.
+    """
+    modules, failed, wall_ms, started, baseline_ms = [], [], None, False, 0.0
+    for line in output.splitlines():
+        if line.startswith(_MARKER):
+            event = line[len(_MARKER):].strip()
+            if event == 'start':
+                started = True
+            elif event.startswith('failed '):
+                failed.append(event[len('failed '):])
+            elif event.startswith('wall '):
+                wall_ms = float(event[len('wall '):]) * 1000
+            continue
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        # One space separates the columns; nested imports add two more per level
+        if len(indent) != 1:
+            continue
+        if not started:
+            baseline_ms += int(cumulative_us) / 1000
+            continue
+        modules.append({'module': module, 'self_ms': int(self_us) / 1000, 'cumulative_ms': int(cumulative_us) / 1000})
+    import_ms = sum(module['cumulative_ms'] for module in modules)
+    return {
+        'import_ms': import_ms,
+        'baseline_ms': baseline_ms,
+        'relative': import_ms / baseline_ms if baseline_ms else 0.0,
+        'wall_ms': wall_ms,
+        'modules': sorted(modules, key=lambda module: module['cumulative_ms'], reverse=True),
+        'failed': failed,
+    }
+
+
+def profile_page_once(page: str, python: str = sys.executable) -> dict:
+    """Import a page's modules in a fresh interpreter and parse the timing report"""
+    probe = build_probe(page_imports(os.path.join(PAGES_DIR, f'{page}.py')))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get('PYTHONPATH')])))
+    completed = subprocess.run([python, '-X', 'importtime', '-c', probe], cwd=PROJECT_ROOT, env=env,
+                               capture_output=True, text=True, timeout=300)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Profiling {page} failed: {completed.stderr.strip().splitlines()[-1:]}")
+    return parse_importtime(completed.stderr)
+
+
+def profile_page(page: str, repeat: int = DEFAULT_REPEAT, python: str = sys.executable) -> dict:
+    """Profile a page `repeat` times; returns the run with the median cost relative to the baseline"""
+    runs = sorted((profile_page_once(page, python) for _ in range(max(repeat, 1))), key=lambda run: run['relative'])
+    median = runs[len(runs) // 2]
+    median['page'] = page
+    median['runs_ms'] = [round(run['import_ms'], 1) for run in runs]
+    median['spread_ms'] = round(runs[-1]['import_ms'] - runs[0]['import_ms'], 1)
+    return median
+
+
+def profile_pages(pages: Optional[List[str]] = None, repeat: int = DEFAULT_REPEAT) -> List[dict]:
+    """Profile several pages (default: all)"""
+    return [profile_page(page, repeat) for page in (pages or list_pages())]
+
+
+def load_budgets(path: str = BUDGETS_FILE) -> dict:
+    """Read per-page budgets as fractions of the baseline: {"default": float or null, "pages": {page: fraction}}"""
+    try:
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {'baseline': BASELINE_IMPORTS, 'default': DEFAULT_BUDGET, 'pages': {}}
+
+
+def page_budget(budgets: dict, page: str) -> Optional[float]:
+    """A page's budget (fraction of the baseline), the default for pages without one"""
+    return budgets.get('pages', {}).get(page, budgets.get('default'))
+
+
+def check_budgets(results: List[dict], budgets: dict) -> List[dict]:
+    """Pages whose import time relative to the baseline is over budget"""
+    over = []
+    for result in results:
+        budget = page_budget(budgets, result['page'])
+        if budget is not None and result['relative'] > budget:
+            over.append({'page': result['page'], 'import_ms': result['import_ms'], 'relative': result['relative'],
+                         'budget': budget, 'budget_ms': budget * result['baseline_ms']})
+    return over
+
+
+def record_budgets(results: List[dict], headroom: float = DEFAULT_HEADROOM, path: str = BUDGETS_FILE) -> dict:
+    """Write budgets from measurements: median plus headroom percent, rounded up to 0.05 (at least MIN_BUDGET)"""
+    budgets = load_budgets(path)
+    pages = budgets.setdefault('pages', {})
+    for result in results:
+        pages[result['page']] = max(MIN_BUDGET, math.ceil(result['relative'] * (1 + headroom / 100) * 20) / 20)
+    budgets['pages'] = dict(sorted(pages.items()))
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(budgets, handle, indent=2)
+        handle.write('\n')
+    return budgets
+
+
+def print_report(results: List[dict], top: int = DEFAULT_TOP, budgets: Optional[dict] = None):
+    """Print per-page import cost and the heaviest modules"""
+    for result in sorted(results, key=lambda r: r['import_ms'], reverse=True):
+        budget = page_budget(budgets or {}, result['page'])
+        budget_text = f" / budget {budget:.2f}" if budget is not None else ''
+        print(f"📄 {result['page']:<24} {result['import_ms']:8.1f} ms = {result['relative']:.2f} × baseline "
+              f"{result['baseline_ms']:.0f} ms{budget_text} (runs: {result['runs_ms']})")
+        for module in result['modules'][:top]:
+            print(f"     {module['cumulative_ms']:8.1f} ms  {module['module']}")
+        for statement in result['failed']:
+            print(f"     ⚠️ failed: {statement}")
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Per-page import time profiler")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    report_parser = subparsers.add_parser("report", help="Show per-page import cost")
+    report_parser.add_argument("pages", nargs="*", help="Pages to profile (default: all)")
+    report_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Cold runs per page")
+    report_parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Heaviest modules to list per page")
+
+    check_parser = subparsers.add_parser("check", help="Fail if a page is over its import budget")
+    check_parser.add_argument("pages", nargs="*", help="Pages to check (default: all)")
+    check_parser.add_argument("--budgets", default=BUDGETS_FILE, help="Budget file")
+    check_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Cold runs per page")
+
+    record_parser = subparsers.add_parser("record", help="Write budgets from the current measurements")
+    record_parser.add_argument("pages", nargs="*", help="Pages to record (default: all)")
+    record_parser.add_argument("--budgets", default=BUDGETS_FILE, help="Budget file")
+    record_parser.add_argument("--headroom", type=float, default=DEFAULT_HEADROOM, help="Percent added to the measurement")
+    record_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Cold runs per page")
+
+    args = parser.parse_args()
+    results = profile_pages(args.pages or None, args.repeat)
+
+    if args.command == "report":
+        print_report(results, args.top, load_budgets())
+    elif args.command == "check":
+        budgets = load_budgets(args.budgets)
+        print_report(results, 0, budgets)
+        over = check_budgets(results, budgets)
+        for item in over:
+            print(f"❌ {item['page']}: {item['relative']:.2f} × baseline > budget {item['budget']:.2f} "
+                  f"({item['import_ms']:.1f} ms > {item['budget_ms']:.0f} ms)")
+        if over:
+            sys.exit(1)
+        print("✅ All pages within their import budget")
+    elif args.command == "record":
+        record_budgets(results, args.headroom, args.budgets)
+        print(f"💾 Budgets written to {args.budgets}")
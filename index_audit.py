@@ -0,0 +1,282 @@
+"""
+Index audit for ÉpítAI Construction Management System
+
+Runs EXPLAIN on the application's hot query patterns (built from the models,
+the budget engine and procurement planning) and reports sequential scans on
+large tables, the indexes each plan uses and foreign keys without a covering
+index. The benchmark command seeds a scratch database with synthetic rows and
+compares plans and timings before and after the index migration.
+"""
+
+import os
+import sys
+import time
+from datetime import date, timedelta
+from typing import Optional, List, Dict
+
+from sqlalchemy import select, inspect, text
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+from models.project import Project, ProjectMember
+from models.project_phase import ProjectPhase
+from models.project_task import ProjectTask
+from models.task_assignment import TaskAssignment, build_assignment_range_query
+from models.weather_data import build_weather_range_query
+from models.material import Material, ProjectMaterial
+from models.project_budget import build_deviation_select
+from procurement import build_reorder_query
+
+INDEX_REVISION = '8e4f1a6b2c57'
+AUDITED_TABLES = [
+    'projects', 'project_members', 'project_phases', 'project_tasks',
+    'task_assignments', 'materials', 'project_materials',
+]
+ACTIVE_PROJECT_STATUSES = ('Tervezés alatt', 'Folyamatban', 'Késésben')
+
+
+def _sample_ids(connection) -> dict:
+    """Pick representative ids to bind into the audited queries"""
+    def pick(column):
+        return connection.execute(select(column).order_by(column.desc()).limit(1)).scalar() or 1
+
+    return {
+        'project_id': pick(Project.project_id),
+        'resource_id': pick(TaskAssignment.resource_id),
+        'project_phase_id': pick(ProjectTask.project_phase_id),
+        'material_id': pick(ProjectMaterial.material_id),
+        'supplier_id': connection.execute(
+            select(Material.resource_id).where(Material.resource_id.isnot(None)).limit(1)
+        ).scalar() or 1,
+    }
+
+
+def hot_queries(ids: dict, today: Optional[date] = None) -> Dict[str, object]:
+    """Build the application's hot query patterns with representative parameters"""
+    today = today or date(2025, 6, 1)
+    return {
+        'members_of_resource': select(ProjectMember.project_id).where(ProjectMember.resource_id == ids['resource_id']),
+        'phases_of_project': select(ProjectPhase).where(ProjectPhase.project_id == ids['project_id']),
+        'tasks_of_phase': select(ProjectTask).where(ProjectTask.project_phase_id == ids['project_phase_id']),
+        'resource_schedule': select(TaskAssignment).where(
+            TaskAssignment.resource_id == ids['resource_id'],
+            TaskAssignment.start_date >= today,
+        ),
+        'project_assignments': (
+            select(TaskAssignment.assignment_id, TaskAssignment.resource_id, TaskAssignment.hours_worked)
+            .join(ProjectTask, ProjectTask.project_task_id == TaskAssignment.project_task_id)
+            .join(ProjectPhase, ProjectPhase.project_phase_id == ProjectTask.project_phase_id)
+            .where(ProjectPhase.project_id == ids['project_id'])
+        ),
+        'project_materials_by_status': select(ProjectMaterial).where(
+            ProjectMaterial.project_id == ids['project_id'], ProjectMaterial.status == 'Ordered'
+        ),
+        'material_usage': select(ProjectMaterial.project_id).where(ProjectMaterial.material_id == ids['material_id']),
+        'supplier_materials': select(Material).where(Material.resource_id == ids['supplier_id']),
+        'active_projects': select(Project.project_id, Project.project_name).where(Project.status == 'Folyamatban'),
+        'overdue_projects': select(Project.project_id, Project.project_name).where(
+            Project.end_date < today, Project.status.in_(ACTIVE_PROJECT_STATUSES)
+        ),
+        'assignments_starting_this_month': build_assignment_range_query(
+            today.replace(day=1), date(today.year + today.month // 12, today.month % 12 + 1, 1)
+        ),
+        'weather_next_two_weeks': build_weather_range_query(today, today + timedelta(days=14)),
+        'budget_deviation_refresh': build_deviation_select([ids['project_id']]),
+        'reorder_demand': build_reorder_query(today),
+    }
+
+
+def _compile(connection, query) -> str:
+    """Render a query with literal parameters for EXPLAIN"""
+    return str(query.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True}))
+
+
+def _walk_pg_plan(node: dict, scans: list, indexes: list):
+    """Collect sequential scans and used indexes from a PostgreSQL JSON plan"""
+    node_type = node.get('Node Type', '')
+    if node_type == 'Seq Scan':
+        scans.append(node.get('Relation Name'))
+    if node.get('Index Name'):
+        indexes.append(node['Index Name'])
+    for child in node.get('Plans', []):
+        _walk_pg_plan(child, scans, indexes)
+
+
+def explain(connection, query) -> dict:
+    """EXPLAIN a query and summarise sequential scans and index usage"""
+    sql = _compile(connection, query)
+    scans, indexes = [], []
+    if connection.dialect.name == 'postgresql':
+        plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        root = plan[0]['Plan']
+        _walk_pg_plan(root, scans, indexes)
+        details = [f"{root['Node Type']} (cost {root['Total Cost']})"]
+        cost = root['Total Cost']
+    else:
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        details = [row[-1] for row in rows]
+        for detail in details:
+            words = detail.split()
+            if words[:1] == ['SCAN'] and 'USING' not in words and len(words) > 1:
+                scans.append(words[1])
+            if ' INDEX ' in f" {detail} ":
+                indexes.append(words[words.index('INDEX') + 1])
+        cost = None
+    return {
+        'seq_scans': sorted(set(filter(None, scans))),
+        'indexes': sorted(set(indexes)),
+        'cost': cost,
+        'plan': details,
+    }
+
+
+def unindexed_foreign_keys(connection, tables: List[str] = AUDITED_TABLES) -> List[dict]:
+    """Find foreign keys whose columns are not the leading columns of any index or unique constraint"""
+    inspector = inspect(connection)
+    missing = []
+    for table in tables:
+        leading = [tuple(index['column_names']) for index in inspector.get_indexes(table)]
+        leading += [tuple(constraint['column_names']) for constraint in inspector.get_unique_constraints(table)]
+        pk = inspector.get_pk_constraint(table).get('constrained_columns') or []
+        if pk:
+            leading.append(tuple(pk))
+        for fk in inspector.get_foreign_keys(table):
+            columns = tuple(fk['constrained_columns'])
+            if not any(cols[:len(columns)] == columns for cols in leading):
+                missing.append({'table': table, 'columns': list(columns), 'references': fk['referred_table']})
+    return missing
+
+
+def audit(connection, repeat: int = 0) -> dict:
+    """Explain (and optionally time) every hot query and list unindexed foreign keys"""
+    ids = _sample_ids(connection)
+    results = {}
+    for name, query in hot_queries(ids).items():
+        result = explain(connection, query)
+        if repeat:
+            started = time.perf_counter()
+            for _ in range(repeat):
+                connection.execute(query).fetchall()
+            result['avg_ms'] = round((time.perf_counter() - started) * 1000 / repeat, 3)
+        results[name] = result
+    return {
+        'queries': results,
+        'unindexed_foreign_keys': unindexed_foreign_keys(connection),
+    }
+
+
+def print_audit(report: dict):
+    """Print an audit report"""
+    for name, result in report['queries'].items():
+        flag = "⚠️ " if result['seq_scans'] else "✅"
+        timing = f" {result['avg_ms']:.2f} ms" if 'avg_ms' in result else ""
+        scans = f" seq scan: {', '.join(result['seq_scans'])}" if result['seq_scans'] else ""
+        used = f" indexes: {', '.join(result['indexes'])}" if result['indexes'] else ""
+        print(f"{flag} {name}:{timing}{scans}{used}")
+    for fk in report['unindexed_foreign_keys']:
+        print(f"⚠️ Unindexed foreign key {fk['table']}({', '.join(fk['columns'])}) -> {fk['references']}")
+
+
+def benchmark(database_url: str, rows: int = 1_000_000, repeat: int = 20, alembic_cfg_path: str = "alembic.ini") -> dict:
+    """Compare hot query plans and timings before and after the index migration on synthetic data"""
+    from sqlalchemy import create_engine
+    from alembic import command
+    from alembic.config import Config
+    from migration_utils import get_script_directory
+    from online_migrations import seed_synthetic_rows
+
+    parent = get_script_directory(alembic_cfg_path).get_revision(INDEX_REVISION).down_revision
+    engine = create_engine(database_url)
+    config = Config(alembic_cfg_path)
+
+    def run_command(operation, to):
+        with engine.connect() as connection:
+            config.attributes['connection'] = connection
+            try:
+                operation(config, to)
+            finally:
+                config.attributes.pop('connection', None)
+
+    def run_audit():
+        with engine.connect() as connection:
+            connection.execute(text("ANALYZE"))
+            return audit(connection, repeat=repeat)
+
+    with engine.connect() as connection:
+        seeded = inspect(connection).has_table('projects') and \
+            connection.execute(select(Project.project_id).limit(1)).first() is not None
+    if seeded:
+        # Start from the parent revision so the "before" plans cannot use the new indexes
+        run_command(command.downgrade, parent)
+    else:
+        run_command(command.upgrade, parent)
+        seed_synthetic_rows(engine, rows)
+
+    before = run_audit()
+    started = time.perf_counter()
+    run_command(command.upgrade, INDEX_REVISION)
+
+    migration_seconds = time.perf_counter() - started
+    after = run_audit()
+    engine.dispose()
+
+    comparison = {}
+    for name in before['queries']:
+        b, a = before['queries'][name], after['queries'][name]
+        comparison[name] = {
+            'before_ms': b['avg_ms'],
+            'after_ms': a['avg_ms'],
+            'speedup': round(b['avg_ms'] / a['avg_ms'], 1) if a['avg_ms'] else None,
+            'before_seq_scans': b['seq_scans'],
+            'after_seq_scans': a['seq_scans'],
+            'after_indexes': a['indexes'],
+        }
+    return {
+        'rows': rows,
+        'migration_seconds': round(migration_seconds, 2),
+        'queries': comparison,
+        'unindexed_foreign_keys_before': before['unindexed_foreign_keys'],
+        'unindexed_foreign_keys_after': after['unindexed_foreign_keys'],
+    }
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Index audit for hot queries")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    audit_parser = subparsers.add_parser("audit", help="EXPLAIN hot queries against a database")
+    audit_parser.add_argument("--database-url", help="Database URL (default: application database)")
+    audit_parser.add_argument("--repeat", type=int, default=0, help="Also time each query this many times")
+
+    benchmark_parser = subparsers.add_parser("benchmark", help="Before/after comparison on synthetic data")
+    benchmark_parser.add_argument("--database-url", required=True, help="Scratch database URL (never production)")
+    benchmark_parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic rows per large table")
+    benchmark_parser.add_argument("--repeat", type=int, default=20, help="Timed executions per query")
+    benchmark_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "audit":
+        if args.database_url:
+            from sqlalchemy import create_engine
+            audit_engine = create_engine(args.database_url)
+        else:
+            from database import engine as audit_engine
+        with audit_engine.connect() as connection:
+            print_audit(audit(connection, repeat=args.repeat))
+    elif args.command == "benchmark":
+        report = benchmark(args.database_url, args.rows, args.repeat)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print(f"Rows per large table: {report['rows']}, index migration: {report['migration_seconds']} s")
+            for name, row in report['queries'].items():
+                print(f"{name:30} {row['before_ms']:9.3f} ms -> {row['after_ms']:9.3f} ms "
+                      f"(x{row['speedup']})  seq scans: {row['before_seq_scans'] or '-'} -> {row['after_seq_scans'] or '-'}")
+            for fk in report['unindexed_foreign_keys_after']:
+                print(f"⚠️ Still unindexed: {fk['table']}({', '.join(fk['columns'])})")
@@ -0,0 +1,463 @@
+"""
+Background job queue for ÉpítAI Construction Management System
+
+Slow work (contract batches, budget rebuilds, procurement plans, archiving,
+partition maintenance) runs in worker processes instead of the Streamlit
+script thread, so the page returns immediately:
+
+- submit_job() inserts a row into `jobs` and returns its id
+- workers claim the highest-priority, oldest queued job with
+  SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers share the queue
+  without handing a job out twice; on SQLite, where writers are serialised,
+  the claim is a guarded UPDATE instead
+- handlers report progress through JobContext.progress() (throttled writes to
+  the job row) and return a JSON-serialisable result, or a JobFile; results
+  are stored in `job_results`
+- a running job's row is heartbeated; requeue_stale_jobs() puts jobs of dead
+  workers back in the queue (or fails them after max_attempts)
+- cancelling a running job takes effect at its next progress report
+
+Handlers are registered with @job_handler("kind"); components/job_widget.py
+submits jobs from Streamlit and polls their progress.
+
+Usage:
+  python job_queue.py worker [--processes 2] [--database-url URL]
+  python job_queue.py submit <kind> [--payload '{"key": "value"}'] [--priority 0]
+  python job_queue.py status [--limit 20]
+  python job_queue.py requeue-stale [--stale-after 300]
+"""
+
+import os
+import sys
+import json
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, List
+
+from sqlalchemy import select, update, or_
+from sqlalchemy.orm import Session
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+from models.job import Job, JobResult
+
+POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '1'))
+HEARTBEAT_INTERVAL = float(os.getenv('JOB_HEARTBEAT_INTERVAL', '15'))
+STALE_AFTER = float(os.getenv('JOB_STALE_AFTER', '300'))
+PROGRESS_INTERVAL = 0.5
+DEFAULT_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+
+# kind -> handler(payload, context)
+HANDLERS: Dict[str, Callable] = {}
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when its job was cancelled"""
+
+
+class JobFile:
+    """Handler result carrying a file (stored in job_results.content)"""
+
+    def __init__(self, filename: str, content: bytes, content_type: str = 'application/octet-stream',
+                 result: Optional[dict] = None):
+        self.filename = filename
+        self.content = content
+        self.content_type = content_type
+        self.result = result
+
+
+def job_handler(kind: str):
+    """Register a function as the handler of a job kind"""
+    def register(function):
+        HANDLERS[kind] = function
+        return function
+    return register
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def submit_job(engine, kind: str, payload: Optional[dict] = None, priority: int = 0, max_attempts: int = 1,
+               submitted_by: Optional[str] = None, delay_seconds: float = 0) -> int:
+    """Queue a job and return its id"""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        job = Job(kind=kind, payload=_dumps(payload or {}), status='queued', priority=priority, attempts=0,
+                  max_attempts=max_attempts, progress=0.0, submitted_by=submitted_by,
+                  run_after=now + timedelta(seconds=delay_seconds))
+        session.add(job)
+        session.commit()
+        return job.job_id
+
+
+def get_job(engine, job_id: int) -> Optional[dict]:
+    """Job state with its result (without file content), or None"""
+    with Session(engine) as session:
+        job = session.get(Job, job_id)
+        if job is None:
+            return None
+        data = job.to_dict()
+        data['result'] = job.result.to_dict() if job.result is not None else None
+        return data
+
+
+def get_job_file(engine, job_id: int) -> Optional[JobFile]:
+    """File produced by a job, or None"""
+    with Session(engine) as session:
+        result = session.get(JobResult, job_id)
+        if result is None or result.content is None:
+            return None
+        return JobFile(result.filename, result.content, result.content_type,
+                       json.loads(result.result) if result.result else None)
+
+
+def list_jobs(engine, limit: int = 20, statuses: Optional[List[str]] = None) -> List[dict]:
+    """Most recent jobs first"""
+    query = select(Job).order_by(Job.job_id.desc()).limit(limit)
+    if statuses:
+        query = query.where(Job.status.in_(statuses))
+    with Session(engine) as session:
+        return [job.to_dict() for job in session.execute(query).scalars()]
+
+
+def cancel_job(engine, job_id: int) -> bool:
+    """Cancel a queued or running job; running handlers stop at their next progress report"""
+    with engine.begin() as connection:
+        result = connection.execute(
+            update(Job.__table__)
+            .where(Job.job_id == job_id, Job.status.in_(('queued', 'running')))
+            .values(status='cancelled', finished_at=datetime.utcnow(), updated_at=datetime.utcnow())
+        )
+    return result.rowcount == 1
+
+
+def claim_job(engine, worker: str) -> Optional[dict]:
+    """Take the next runnable job and mark it running; None when the queue is empty"""
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        candidate = (
+            select(Job.job_id)
+            .where(Job.status == 'queued', Job.run_after <= now)
+            .order_by(Job.priority.desc(), Job.job_id)
+            .limit(1)
+        )
+        if connection.dialect.name == 'postgresql':
+            candidate = candidate.with_for_update(skip_locked=True)
+        job_id = connection.execute(candidate).scalar()
+        if job_id is None:
+            return None
+        # The status guard makes the claim safe without row locks (SQLite)
+        claimed = connection.execute(
+            update(Job.__table__)
+            .where(Job.job_id == job_id, Job.status == 'queued')
+            .values(status='running', worker=worker, attempts=Job.attempts + 1, started_at=now,
+                    heartbeat_at=now, progress=0.0, progress_message=None, error=None, updated_at=now)
+        ).rowcount
+        if claimed != 1:
+            return None
+        row = connection.execute(
+            select(Job.job_id, Job.kind, Job.payload, Job.attempts, Job.max_attempts).where(Job.job_id == job_id)
+        ).one()
+    return {'job_id': row.job_id, 'kind': row.kind, 'payload': json.loads(row.payload or '{}'),
+            'attempts': row.attempts, 'max_attempts': row.max_attempts}
+
+
+class JobContext:
+    """Handed to handlers: the engine, progress reporting and cancellation checks"""
+
+    def __init__(self, engine, job_id: int, worker: str):
+        self.engine = engine
+        self.job_id = job_id
+        self.worker = worker
+        self._last_report = 0.0
+
+    def progress(self, fraction: float, message: Optional[str] = None, force: bool = False):
+        """Record progress (0.0 - 1.0); raises JobCancelled if the job was cancelled"""
+        now = time.monotonic()
+        if not force and now - self._last_report < PROGRESS_INTERVAL:
+            return
+        self._last_report = now
+        with self.engine.begin() as connection:
+            updated = connection.execute(
+                update(Job.__table__)
+                .where(Job.job_id == self.job_id, Job.status == 'running', Job.worker == self.worker)
+                .values(progress=max(0.0, min(1.0, float(fraction))), progress_message=message,
+                        heartbeat_at=datetime.utcnow(), updated_at=datetime.utcnow())
+            ).rowcount
+        if updated != 1:
+            raise JobCancelled(f"Job {self.job_id} is no longer running")
+
+
+def _heartbeat(engine, job_id: int, worker: str, stop: threading.Event):
+    """Keep a running job's heartbeat fresh while its handler works"""
+    while not stop.wait(HEARTBEAT_INTERVAL):
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    update(Job.__table__)
+                    .where(Job.job_id == job_id, Job.status == 'running', Job.worker == worker)
+                    .values(heartbeat_at=datetime.utcnow())
+                )
+        except Exception as e:
+            print(f"Heartbeat of job {job_id} failed: {e}")
+
+
+def _store_result(engine, job_id: int, worker: str, output) -> bool:
+    """Save a handler's output and mark the job succeeded"""
+    now = datetime.utcnow()
+    if isinstance(output, JobFile):
+        values = {'result': _dumps(output.result) if output.result is not None else None, 'content': output.content,
+                  'filename': output.filename, 'content_type': output.content_type}
+    else:
+        values = {'result': _dumps(output) if output is not None else None}
+    with Session(engine) as session:
+        finished = session.execute(
+            update(Job.__table__)
+            .where(Job.job_id == job_id, Job.status == 'running', Job.worker == worker)
+            .values(status='succeeded', progress=1.0, finished_at=now, updated_at=now)
+        ).rowcount
+        if finished != 1:
+            session.rollback()
+            return False
+        session.merge(JobResult(job_id=job_id, created_at=now, **values))
+        session.commit()
+    return True
+
+
+def _fail(engine, job: dict, worker: str, error: str):
+    """Requeue a failed job while attempts remain, otherwise mark it failed"""
+    now = datetime.utcnow()
+    retry = job['attempts'] < job['max_attempts']
+    with engine.begin() as connection:
+        connection.execute(
+            update(Job.__table__)
+            .where(Job.job_id == job['job_id'], Job.status == 'running', Job.worker == worker)
+            .values(status='queued' if retry else 'failed', error=error[-4000:], updated_at=now,
+                    finished_at=None if retry else now,
+                    # Back off before the next attempt
+                    run_after=now + timedelta(seconds=30 * job['attempts']) if retry else Job.run_after)
+        )
+
+
+def run_job(engine, job: dict, worker: str) -> str:
+    """Run a claimed job's handler and record the outcome; returns the final status"""
+    handler = HANDLERS.get(job['kind'])
+    if handler is None:
+        _fail(engine, dict(job, attempts=job['max_attempts']), worker, f"Unknown job kind: {job['kind']}")
+        return 'failed'
+
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(engine, job['job_id'], worker, stop), daemon=True)
+    heartbeat.start()
+    try:
+        output = handler(job['payload'], JobContext(engine, job['job_id'], worker))
+        return 'succeeded' if _store_result(engine, job['job_id'], worker, output) else 'cancelled'
+    except JobCancelled:
+        return 'cancelled'
+    except Exception as e:
+        print(f"Job {job['job_id']} ({job['kind']}) failed: {e}")
+        _fail(engine, job, worker, f"{type(e).__name__}: {e}\n{traceback.format_exc()}")
+        return 'failed'
+    finally:
+        stop.set()
+        heartbeat.join()
+
+
+def requeue_stale_jobs(engine, stale_after: float = STALE_AFTER) -> int:
+    """Requeue running jobs whose heartbeat stopped (worker crashed); fail them after max_attempts"""
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=stale_after)
+    stale = [Job.status == 'running', or_(Job.heartbeat_at < cutoff, Job.heartbeat_at.is_(None))]
+    with engine.begin() as connection:
+        requeued = connection.execute(
+            update(Job.__table__).where(*stale, Job.attempts < Job.max_attempts)
+            .values(status='queued', worker=None, error='Worker stopped responding', updated_at=now)
+        ).rowcount
+        failed = connection.execute(
+            update(Job.__table__).where(*stale, Job.attempts >= Job.max_attempts)
+            .values(status='failed', error='Worker stopped responding', finished_at=now, updated_at=now)
+        ).rowcount
+    return requeued + failed
+
+
+def work(engine, worker: Optional[str] = None, stop: Optional[threading.Event] = None,
+         poll_interval: float = POLL_INTERVAL, max_jobs: Optional[int] = None) -> int:
+    """Process jobs until stopped (or max_jobs are done); returns the number of jobs run"""
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    stop = stop or threading.Event()
+    done = 0
+    last_reap = 0.0
+    while not stop.is_set() and (max_jobs is None or done < max_jobs):
+        try:
+            if time.monotonic() - last_reap > STALE_AFTER / 2:
+                last_reap = time.monotonic()
+                if requeue_stale_jobs(engine):
+                    print("♻️ Requeued stale jobs")
+            job = claim_job(engine, worker)
+        except Exception as e:
+            print(f"Job queue unavailable: {e}")
+            stop.wait(max(poll_interval, 5))
+            continue
+        if job is None:
+            stop.wait(poll_interval)
+            continue
+        started = time.perf_counter()
+        status = run_job(engine, job, worker)
+        done += 1
+        print(f"{'✅' if status == 'succeeded' else '⚠️'} Job {job['job_id']} ({job['kind']}) {status} "
+              f"in {time.perf_counter() - started:.1f}s [{worker}]")
+    return done
+
+
+def _worker_main(database_url: Optional[str], index: int):
+    """Entry point of a worker process: its own engine, then the work loop"""
+    if database_url:
+        from sqlalchemy import create_engine
+        engine = create_engine(database_url, pool_pre_ping=True, pool_size=2, max_overflow=2)
+    else:
+        from database import engine
+    try:
+        work(engine, f"{socket.gethostname()}:{os.getpid()}:{index}")
+    except KeyboardInterrupt:
+        pass
+
+
+def run_worker_pool(processes: int = DEFAULT_WORKERS, database_url: Optional[str] = None):
+    """Run worker processes until interrupted; an interrupted job is requeued once it goes stale"""
+    import multiprocessing
+
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=_worker_main, args=(database_url, index), name=f"job-worker-{index}")
+               for index in range(max(processes, 1))]
+    for process in workers:
+        process.start()
+    print(f"👷 {len(workers)} job workers running (handlers: {', '.join(sorted(HANDLERS))})")
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.join(timeout=10)
+
+
+# Built-in handlers
+
+@job_handler("budget_rebuild")
+def _budget_rebuild(payload: dict, context: JobContext):
+    """Recompute the project budget deviation table"""
+    from budget_engine import rebuild_budget_deviations
+
+    context.progress(0.1, "Költségeltérések újraszámolása", force=True)
+    with Session(context.engine) as session:
+        count = rebuild_budget_deviations(session)
+        session.commit()
+    return {'projects': count}
+
+
+@job_handler("resource_profile_rebuild")
+def _resource_profile_rebuild(payload: dict, context: JobContext):
+    """Recompute every resource profile"""
+    from resource_profiles import rebuild_resource_profiles
+
+    context.progress(0.1, "Erőforrás profilok újraszámolása", force=True)
+    with Session(context.engine) as session:
+        count = rebuild_resource_profiles(session)
+        session.commit()
+    return {'resources': count}
+
+
+@job_handler("procurement_plan")
+def _procurement_plan(payload: dict, context: JobContext):
+    """Reorder report and draft purchase orders"""
+    from procurement import plan_procurement, DEFAULT_HORIZON_DAYS
+
+    context.progress(0.1, "Beszerzési terv készítése", force=True)
+    with Session(context.engine) as session:
+        plan = plan_procurement(session, horizon_days=int(payload.get('horizon_days', DEFAULT_HORIZON_DAYS)))
+    return json.loads(_dumps(plan))
+
+
+@job_handler("project_archive")
+def _project_archive(payload: dict, context: JobContext):
+    """Archive closed projects to Parquet"""
+    from project_archive import archive_closed_projects, DEFAULT_OLDER_THAN_MONTHS
+
+    context.progress(0.05, "Lezárt projektek archiválása", force=True)
+    return archive_closed_projects(context.engine, int(payload.get('older_than_months', DEFAULT_OLDER_THAN_MONTHS)),
+                                   dry_run=bool(payload.get('dry_run', False)))
+
+
+@job_handler("partition_maintenance")
+def _partition_maintenance(payload: dict, context: JobContext):
+    """Create future partitions and apply retention"""
+    from partitioning import maintain, PARTITIONS_AHEAD
+
+    context.progress(0.05, "Partíciók karbantartása", force=True)
+    return json.loads(_dumps(maintain(context.engine, int(payload.get('ahead', PARTITIONS_AHEAD)))))
+
+
+@job_handler("contract_batch")
+def _contract_batch(payload: dict, context: JobContext):
+    """Render contract documents and pack them into a zip"""
+    from contract_engine import render_batch, export_batch_zip
+
+    documents = payload.get('documents', [])
+    formats = tuple(payload.get('formats', ['pdf']))
+    files = []
+    for index, document in enumerate(documents):
+        context.progress(index / max(len(documents), 1), f"{index + 1}/{len(documents)} szerződés", force=index == 0)
+        # The worker pool already runs jobs in parallel; render in process
+        files.extend(render_batch([document], formats, max_workers=1))
+    return JobFile(payload.get('filename', 'szerzodesek.zip'), export_batch_zip(files), 'application/zip',
+                   {'documents': len(files)})
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+    from sqlalchemy import create_engine
+
+    parser = argparse.ArgumentParser(description="Background job queue")
+    parser.add_argument("--database-url", default=os.getenv('JOB_DATABASE_URL'), help="Database URL (default: database.py)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    worker_parser = subparsers.add_parser("worker", help="Run a pool of worker processes")
+    worker_parser.add_argument("--processes", type=int, default=DEFAULT_WORKERS, help="Worker processes")
+
+    submit_parser = subparsers.add_parser("submit", help="Queue a job")
+    submit_parser.add_argument("kind", choices=sorted(HANDLERS), help="Job kind")
+    submit_parser.add_argument("--payload", default="{}", help="JSON payload")
+    submit_parser.add_argument("--priority", type=int, default=0, help="Higher runs first")
+
+    status_parser = subparsers.add_parser("status", help="List recent jobs")
+    status_parser.add_argument("--limit", type=int, default=20, help="Number of jobs")
+
+    stale_parser = subparsers.add_parser("requeue-stale", help="Requeue jobs of workers that stopped responding")
+    stale_parser.add_argument("--stale-after", type=float, default=STALE_AFTER, help="Seconds without heartbeat")
+
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        run_worker_pool(args.processes, args.database_url)
+    else:
+        if args.database_url:
+            cli_engine = create_engine(args.database_url)
+        else:
+            from database import engine as cli_engine
+
+        if args.command == "submit":
+            job_id = submit_job(cli_engine, args.kind, json.loads(args.payload), args.priority, submitted_by='cli')
+            print(f"📥 Job {job_id} queued ({args.kind})")
+        elif args.command == "status":
+            for job in list_jobs(cli_engine, args.limit):
+                print(f"#{job['job_id']:<6} {job['kind']:<22} {job['status']:<10} {job['progress'] * 100:5.1f}% "
+                      f"{job['progress_message'] or ''}")
+        elif args.command == "requeue-stale":
+            print(f"♻️ {requeue_stale_jobs(cli_engine, args.stale_after)} stale jobs requeued")
@@ -0,0 +1,69 @@
+"""
+Lazy imports for ÉpítAI Construction Management System
+
+Heavy, optional dependencies (plotly, pandas, Pillow) cost tens to hundreds of
+milliseconds to import. Pages that import them at the top pay that on every
+fresh session and page switch, even when the chart or table is never drawn.
+
+lazy_import() returns a stand-in module that performs the real import on the
+first attribute access:
+
+    from lazy_imports import lazy_import
+    px = lazy_import("plotly.express")
+    pd = lazy_import("pandas")
+
+    fig = px.bar(...)   # plotly.express is imported here
+
+If the package is missing, the ImportError is raised at first use, so pages
+that only draw a chart conditionally keep working without it. Use
+import_profiler.py to see what each page imports at startup.
+"""
+
+import importlib
+import sys
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<LazyModule {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str):
+    """Return the module if it is already imported, otherwise a lazily importing stand-in"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_loaded(module) -> bool:
+    """Check if a module returned by lazy_import has been imported"""
+    if isinstance(module, LazyModule):
+        return module.__dict__['_lazy_module'] is not None
+    return True
@@ -4,7 +4,10 @@ Database migration utilities for automatic schema updates
 
 import os
 import sys
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, List
 from sqlalchemy import create_engine, text, inspect
 from sqlalchemy.exc import SQLAlchemyError
@@ -19,42 +22,96 @@ sys.path.append(os.path.dirname(__file__))
 
 from database import engine, DATABASE_URL
 from models.base import Base
+from partitioning import ensure_future_partitions
+
+
+@lru_cache(maxsize=None)
+def get_script_directory(alembic_cfg_path: str = "alembic.ini") -> ScriptDirectory:
+    """Load the revision scripts once per process (revision files only change on deploy)"""
+    return ScriptDirectory.from_config(Config(alembic_cfg_path))
+
+
+@contextmanager
+def timed(timings: dict, step: str):
+    """Record the duration of a step in milliseconds"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[step] = round((time.perf_counter() - started) * 1000, 2)
 
 
 class AutoMigrationManager:
     """Manages automatic database migrations"""
     
     def __init__(self, alembic_cfg_path: str = "alembic.ini"):
+        self.alembic_cfg_path = alembic_cfg_path
         self.alembic_cfg = Config(alembic_cfg_path)
         self.engine = engine
+    
+    @property
+    def script(self) -> ScriptDirectory:
+        """Cached revision script directory"""
+        return get_script_directory(self.alembic_cfg_path)
         
     def check_migration_status(self) -> dict:
-        """Check the current migration status"""
+        """Check the current migration status by comparing revision ids only
+        
+        Reads alembic_version and the cached script directory; the database
+        schema itself is never reflected.
+        """
+        timings = {}
         try:
-            with self.engine.connect() as connection:
-                context = MigrationContext.configure(connection)
-                current_rev = context.get_current_revision()
-                
-                script = ScriptDirectory.from_config(self.alembic_cfg)
-                head_rev = script.get_current_head()
-                
-                return {
-                    'current_revision': current_rev,
-                    'head_revision': head_rev,
-                    'is_up_to_date': current_rev == head_rev,
-                    'needs_migration': current_rev != head_rev
-                }
+            with timed(timings, 'load_scripts'):
+                script = self.script
+                head_revs = set(script.get_heads())
+            
+            with timed(timings, 'read_current_revision'):
+                with self.engine.connect() as connection:
+                    context = MigrationContext.configure(connection)
+                    current_revs = set(context.get_current_heads())
+            
+            unknown_revs = {rev for rev in current_revs if not self._is_known_revision(script, rev)}
+            current_rev = ','.join(sorted(current_revs)) or None
+            head_rev = ','.join(sorted(head_revs)) or None
+            
+            return {
+                'current_revision': current_rev,
+                'head_revision': head_rev,
+                'unknown_revisions': sorted(unknown_revs),
+                'is_up_to_date': current_revs == head_revs,
+                'needs_migration': current_revs != head_revs and not unknown_revs,
+                'timings': timings
+            }
         except Exception as e:
             return {
                 'error': str(e),
                 'current_revision': None,
                 'head_revision': None,
                 'is_up_to_date': False,
-                'needs_migration': True
+                'needs_migration': True,
+                'timings': timings
             }
     
+    @staticmethod
+    def _is_known_revision(script: ScriptDirectory, revision: str) -> bool:
+        """Check if a revision id exists in the script directory"""
+        try:
+            return script.get_revision(revision) is not None
+        except CommandError:
+            return False
+    
+    def pending_revisions(self, current_revision: Optional[str]) -> List[str]:
+        """List revision ids between the current revision and head, oldest first"""
+        revisions = self.script.iterate_revisions('heads', current_revision or 'base')
+        return [revision.revision for revision in reversed(list(revisions))]
+    
     def generate_migration(self, message: str = None) -> Optional[str]:
-        """Generate a new migration based on model changes"""
+        """Generate a new migration based on model changes (developer command only)
+        
+        Autogenerate reflects the whole database schema and writes files into
+        alembic/versions, so it is never called from application startup.
+        """
         try:
             if not message:
                 message = f"Auto migration {datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -67,7 +124,8 @@ class AutoMigrationManager:
             )
             
             # Get the latest migration file
-            script = ScriptDirectory.from_config(self.alembic_cfg)
+            get_script_directory.cache_clear()
+            script = self.script
             revisions = list(script.walk_revisions())
             if revisions:
                 latest_revision = revisions[0]
@@ -85,7 +143,14 @@ class AutoMigrationManager:
     def apply_migrations(self, target: str = "head") -> bool:
         """Apply pending migrations"""
         try:
-            command.upgrade(self.alembic_cfg, target)
+            # Reuse the application engine instead of letting env.py open its own;
+            # Alembic manages the transaction so revisions can use autocommit_block()
+            with self.engine.connect() as connection:
+                self.alembic_cfg.attributes['connection'] = connection
+                try:
+                    command.upgrade(self.alembic_cfg, target)
+                finally:
+                    self.alembic_cfg.attributes.pop('connection', None)
             return True
         except CommandError as e:
             print(f"Error applying migrations: {e}")
@@ -94,64 +159,80 @@ class AutoMigrationManager:
             print(f"Unexpected error applying migrations: {e}")
             return False
     
-    def auto_migrate(self, force: bool = False) -> dict:
-        """Automatically detect changes and apply migrations"""
+    def migrate(self) -> dict:
+        """Apply existing revisions up to head (production mode)
+        
+        Only revision ids are compared; nothing is autogenerated and the schema
+        is never reflected. Upcoming monthly partitions are created afterwards.
+        Every step is timed in milliseconds.
+        """
         result = {
             'success': False,
-            'migration_generated': False,
             'migration_applied': False,
             'message': '',
-            'revision': None
+            'from_revision': None,
+            'to_revision': None,
+            'applied_revisions': [],
+            'created_partitions': {},
+            'timings': {}
         }
+        timings = result['timings']
         
         try:
-            # Check current status
-            status = self.check_migration_status()
-            
-            if 'error' in status:
-                result['message'] = f"Error checking migration status: {status['error']}"
-                return result
-            
-            # Generate migration if there are changes
-            if status['needs_migration'] or force:
-                print("Detected model changes, generating migration...")
-                revision = self.generate_migration()
+            with timed(timings, 'total'):
+                status = self.check_migration_status()
+                timings.update(status.get('timings', {}))
+                result['from_revision'] = status.get('current_revision')
+                result['to_revision'] = status.get('head_revision')
                 
-                if revision:
-                    result['migration_generated'] = True
-                    result['revision'] = revision
-                    print(f"Generated migration: {revision}")
-                    
-                    # Apply the migration
-                    if self.apply_migrations():
-                        result['migration_applied'] = True
+                if 'error' in status:
+                    result['message'] = f"Error checking migration status: {status['error']}"
+                elif status['unknown_revisions']:
+                    result['message'] = (
+                        f"Database is at unknown revision(s) {', '.join(status['unknown_revisions'])}; "
+                        "deploy the matching migration scripts before migrating"
+                    )
+                elif status['is_up_to_date']:
+                    result['success'] = True
+                    result['message'] = "Database is up to date, no migrations needed"
+                else:
+                    result['applied_revisions'] = self.pending_revisions(status['current_revision'])
+                    with timed(timings, 'upgrade'):
+                        applied = self.apply_migrations()
+                    if applied:
                         result['success'] = True
-                        result['message'] = f"Successfully applied migration {revision}"
-                        print(f"Applied migration: {revision}")
+                        result['migration_applied'] = True
+                        result['message'] = f"Upgraded {result['from_revision'] or 'base'} -> {result['to_revision']}"
                     else:
-                        result['message'] = f"Generated migration {revision} but failed to apply it"
-                else:
-                    result['message'] = "Failed to generate migration"
-            else:
-                result['success'] = True
-                result['message'] = "Database is up to date, no migrations needed"
-                print("Database is up to date")
-            
+                        result['message'] = f"Failed to upgrade to {result['to_revision']}"
+                
+                if result['success']:
+                    with timed(timings, 'partitions'):
+                        result['created_partitions'] = self.ensure_partitions()
         except Exception as e:
-            result['message'] = f"Auto-migration failed: {str(e)}"
-            print(f"Auto-migration error: {e}")
+            result['message'] = f"Migration failed: {str(e)}"
         
+        print(f"{result['message']} (timings ms: {timings})")
         return result
     
+    def ensure_partitions(self) -> dict:
+        """Create upcoming monthly partitions (PostgreSQL); a failure is reported but does not fail startup"""
+        try:
+            return ensure_future_partitions(self.engine)
+        except SQLAlchemyError as e:
+            print(f"Partition maintenance failed: {e}")
+            return {}
+    
+    def auto_migrate(self) -> dict:
+        """Apply pending migrations on startup; never generates new revisions"""
+        return self.migrate()
+    
     def create_initial_migration(self) -> bool:
-        """Create the initial migration for existing models"""
+        """Create the initial migration for existing models (developer command only)"""
         try:
             # Check if alembic_version table exists
             with self.engine.connect() as connection:
-                inspector = inspect(connection)
-                tables = inspector.get_table_names()
-                
-                if 'alembic_version' not in tables:
+                if not inspect(connection).has_table('alembic_version'):
                     print("Creating initial migration...")
                     command.revision(
                         self.alembic_cfg,
@@ -195,16 +276,9 @@ class AutoMigrationManager:
 
 
 def auto_migrate_on_startup():
-    """Convenience function to run auto-migration on application startup"""
+    """Convenience function to run migrations on application startup (read-only status check + upgrade)"""
     manager = AutoMigrationManager()
-    
-    # First, ensure we have an initial migration if needed
-    if not manager.create_initial_migration():
-        print("Warning: Failed to create initial migration")
-        return False
-    
-    # Then run auto-migration
-    result = manager.auto_migrate()
+    result = manager.migrate()
     
     if result['success']:
         print(f"Auto-migration completed: {result['message']}")
@@ -232,24 +306,19 @@ if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="Database migration utilities")
-    parser.add_argument("command", choices=["auto", "status", "generate", "apply", "reset"], 
-                       help="Migration command to run")
-    parser.add_argument("--message", "-m", help="Migration message")
-    parser.add_argument("--force", "-f", action="store_true", help="Force migration generation")
+    parser.add_argument("command", choices=["auto", "status", "apply", "reset"], 
+                       help="Migration command to run (use run_migrations.py generate to autogenerate)")
     
     args = parser.parse_args()
     
     manager = AutoMigrationManager()
     
     if args.command == "auto":
-        result = manager.auto_migrate(force=args.force)
+        result = manager.migrate()
         print(f"Result: {result}")
     elif args.command == "status":
         status = manager.check_migration_status()
         print(f"Migration status: {status}")
-    elif args.command == "generate":
-        revision = manager.generate_migration(args.message)
-        print(f"Generated migration: {revision}")
     elif args.command == "apply":
         success = manager.apply_migrations()
         print(f"Migration applied: {success}")
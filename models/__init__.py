@@ -4,7 +4,7 @@
 from .base import Base, db
 from .user import User
 from .profession_type import ProfessionType
-from .resource import Resource
+from .resource import Resource, ResourceUnavailability
 from .project_type import ProjectType
 from .project import Project, ProjectLocation, ProjectMember
 from .phase import Phase
@@ -13,7 +13,11 @@ from .project_phase import ProjectPhase
 from .project_task import ProjectTask
 from .task_assignment import TaskAssignment
 from .material import Material, ProjectMaterial
+from .material_price import MaterialPrice
+from .project_budget import ProjectBudgetDeviation
+from .resource_profile import ResourceProfile
 from .weather_data import WeatherData
+from .job import Job, JobResult
 
 # Export all models
 __all__ = [
@@ -22,6 +26,7 @@ __all__ = [
     'User',
     'ProfessionType',
     'Resource',
+    'ResourceUnavailability',
     'ProjectType',
     'Project',
     'ProjectLocation',
@@ -33,5 +38,10 @@ __all__ = [
     'TaskAssignment',
     'Material',
     'ProjectMaterial',
-    'WeatherData'
+    'MaterialPrice',
+    'ProjectBudgetDeviation',
+    'ResourceProfile',
+    'WeatherData',
+    'Job',
+    'JobResult'
 ]
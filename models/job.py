@@ -0,0 +1,98 @@
+"""
+Background job models for ÉpítAI Construction Management System
+"""
+
+import json
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, LargeBinary, ForeignKey, CheckConstraint, Index
+from sqlalchemy.orm import relationship
+from .base import Base, db, TimestampMixin
+
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed', 'cancelled')
+
+class Job(Base, TimestampMixin):
+    """Queued unit of long-running work, claimed by a worker with FOR UPDATE SKIP LOCKED"""
+    __tablename__ = 'jobs'
+
+    job_id = db(Integer, primary_key=True, autoincrement=True)
+    kind = db(String(100), nullable=False)
+    payload = db(Text)  # JSON arguments of the handler
+    status = db(String(20), nullable=False, default='queued')
+    priority = db(Integer, nullable=False, default=0)
+    attempts = db(Integer, nullable=False, default=0)
+    max_attempts = db(Integer, nullable=False, default=1)
+    progress = db(Float, nullable=False, default=0)  # 0.0 - 1.0
+    progress_message = db(String(500))
+    error = db(Text)
+    worker = db(String(100))
+    submitted_by = db(String(255))
+    run_after = db(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db(DateTime)
+    heartbeat_at = db(DateTime)
+    finished_at = db(DateTime)
+
+    # Relationships
+    result = relationship("JobResult", back_populates="job", uselist=False, cascade="all, delete-orphan")
+
+    # Constraints
+    __table_args__ = (
+        CheckConstraint("status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled')", name='ck_job_status'),
+        Index('ix_jobs_status_priority', 'status', 'priority', 'job_id'),
+    )
+
+    def __repr__(self):
+        return f"<Job(id={self.job_id}, kind='{self.kind}', status='{self.status}', progress={self.progress})>"
+
+    @property
+    def is_finished(self):
+        """Check if the job reached a final state"""
+        return self.status in ('succeeded', 'failed', 'cancelled')
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'payload': json.loads(self.payload) if self.payload else None,
+            'status': self.status,
+            'priority': self.priority,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'progress': self.progress,
+            'progress_message': self.progress_message,
+            'error': self.error,
+            'worker': self.worker,
+            'submitted_by': self.submitted_by,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class JobResult(Base):
+    """Output of a finished job: a JSON result and optionally a file"""
+    __tablename__ = 'job_results'
+
+    job_id = db(Integer, ForeignKey('jobs.job_id', ondelete='CASCADE'), primary_key=True)
+    result = db(Text)  # JSON
+    content = db(LargeBinary)
+    filename = db(String(255))
+    content_type = db(String(100))
+    created_at = db(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    job = relationship("Job", back_populates="result")
+
+    def __repr__(self):
+        return f"<JobResult(job_id={self.job_id}, filename='{self.filename}')>"
+
+    def to_dict(self):
+        """Convert to dictionary (without the file content)"""
+        return {
+            'job_id': self.job_id,
+            'result': json.loads(self.result) if self.result else None,
+            'filename': self.filename,
+            'content_type': self.content_type,
+            'size': len(self.content) if self.content is not None else 0,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
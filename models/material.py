@@ -2,7 +2,7 @@
 Material models for ÉpítAI Construction Management System
 """
 
-from sqlalchemy import Column, Integer, String, Text, Numeric, ForeignKey, CheckConstraint, Date
+from sqlalchemy import Column, Integer, String, Text, Numeric, ForeignKey, CheckConstraint, Date, Index, text
 from sqlalchemy.orm import relationship
 from .base import Base, db, TimestampMixin
 
@@ -28,10 +28,15 @@ class Material(Base, TimestampMixin):
     # Relationships
     supplier_resource = relationship("Resource", back_populates="materials")
     project_materials = relationship("ProjectMaterial", back_populates="material")
+    price_history = relationship("MaterialPrice", back_populates="material", passive_deletes=True,
+                                 order_by="MaterialPrice.price_date")
     
     # Constraints
     __table_args__ = (
         CheckConstraint("status IN ('Available', 'Out of Stock', 'Discontinued')", name='ck_material_status'),
+        Index('ix_materials_resource_id', 'resource_id'),
+        # Natural key of bulk imports: one material name per supplier (no supplier counts as 0)
+        Index('uq_materials_supplier_name', text('COALESCE(resource_id, 0)'), 'name', unique=True),
     )
     
     def __repr__(self):
@@ -100,6 +105,11 @@ class ProjectMaterial(Base, TimestampMixin):
     # Constraints
     __table_args__ = (
         CheckConstraint("status IN ('Planned', 'Ordered', 'Delivered', 'Used')", name='ck_project_material_status'),
+        Index('ix_project_materials_project_status', 'project_id', 'status'),
+        Index('ix_project_materials_material_id', 'material_id'),
+        Index('ix_project_materials_planned_demand', 'material_id', 'assigned_date',
+              postgresql_where=text("status = 'Planned'"),
+              sqlite_where=text("status = 'Planned'")),
     )
     
     def __repr__(self):
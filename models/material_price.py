@@ -0,0 +1,76 @@
+"""
+Material price history model for ÉpítAI Construction Management System
+"""
+
+from datetime import datetime, date
+from sqlalchemy import Column, Integer, String, Date, DateTime, Numeric, ForeignKey, CheckConstraint, Index
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import relationship, Session
+from .base import Base, db
+from .material import Material
+
+class MaterialPrice(Base):
+    """Append-only price history of construction materials"""
+    __tablename__ = 'material_prices'
+
+    price_id = db(Integer, primary_key=True, autoincrement=True)
+    material_id = db(Integer, ForeignKey('materials.material_id', ondelete='CASCADE'), nullable=False)
+    resource_id = db(Integer, ForeignKey('resources.resource_id', ondelete='SET NULL'))
+    price_date = db(Date, nullable=False, default=date.today)
+    unit_cost = db(Numeric(10, 2), nullable=False)
+    source = db(String(50), nullable=False, default='catalogue')
+    created_at = db(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    material = relationship("Material", back_populates="price_history")
+    supplier_resource = relationship("Resource")
+
+    # Constraints
+    __table_args__ = (
+        CheckConstraint("source IN ('catalogue', 'quote', 'import')", name='ck_material_price_source'),
+        Index('ix_material_prices_material_date', 'material_id', 'price_date'),
+        Index('ix_material_prices_price_date', 'price_date'),
+        # One imported price per material and day, so re-importing a price list adds nothing
+        Index('uq_material_prices_import', 'material_id', 'price_date', unique=True,
+              postgresql_where=text("source = 'import'"), sqlite_where=text("source = 'import'")),
+    )
+
+    def __repr__(self):
+        return f"<MaterialPrice(id={self.price_id}, material_id={self.material_id}, date='{self.price_date}', unit_cost={self.unit_cost})>"
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'price_id': self.price_id,
+            'material_id': self.material_id,
+            'resource_id': self.resource_id,
+            'price_date': self.price_date.isoformat() if self.price_date else None,
+            'unit_cost': float(self.unit_cost) if self.unit_cost is not None else None,
+            'source': self.source,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+# Price history rows are never changed once written
+@event.listens_for(MaterialPrice, 'before_update')
+def prevent_price_update(mapper, connection, target):
+    """Reject updates to the append-only price history"""
+    raise ValueError("material_prices is append-only; record a new price instead")
+
+# Record a history row whenever a material's catalogue unit cost changes
+@event.listens_for(Session, 'before_flush')
+def record_unit_cost_changes(session, flush_context, instances):
+    """Append a MaterialPrice row for new or changed Material.unit_cost values"""
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Material) or obj.unit_cost is None:
+            continue
+        history = inspect(obj).attrs.unit_cost.history
+        if not history.added:
+            continue
+        if history.deleted and history.deleted[0] == obj.unit_cost:
+            continue
+        session.add(MaterialPrice(
+            material=obj,
+            resource_id=obj.resource_id,
+            unit_cost=obj.unit_cost,
+            source='catalogue'
+        ))
@@ -2,7 +2,7 @@
 Project models for ÉpítAI Construction Management System
 """
 
-from sqlalchemy import Column, Integer, String, Text, Date, Numeric, ForeignKey, CheckConstraint, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, Date, Numeric, ForeignKey, CheckConstraint, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from .base import Base, db, TimestampMixin
 
@@ -39,6 +39,10 @@ class Project(Base, TimestampMixin):
         CheckConstraint("status IN ('Tervezés alatt', 'Folyamatban', 'Késésben', 'Lezárt')", name='ck_project_status'),
         CheckConstraint("priority IN ('Alacsony', 'Közepes', 'Magas')", name='ck_project_priority'),
         CheckConstraint("progress_percent >= 0 AND progress_percent <= 100", name='ck_project_progress'),
+        Index('ix_projects_status_end_date', 'status', 'end_date'),
+        Index('ix_projects_active_end_date', 'end_date',
+              postgresql_where=text("status IN ('Tervezés alatt', 'Folyamatban', 'Késésben')"),
+              sqlite_where=text("status IN ('Tervezés alatt', 'Folyamatban', 'Késésben')")),
     )
     
     def __repr__(self):
@@ -134,6 +138,7 @@ class ProjectMember(Base, TimestampMixin):
     # Constraints
     __table_args__ = (
         UniqueConstraint('project_id', 'resource_id', name='uq_project_member'),
+        Index('ix_project_members_resource_id', 'resource_id'),
     )
     
     def __repr__(self):
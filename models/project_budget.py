@@ -0,0 +1,207 @@
+"""
+Project budget deviation model for ÉpítAI Construction Management System
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey, Index
+from sqlalchemy import event, inspect, select, delete, exists, func, case, literal, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import relationship, Session
+from .base import Base, db
+from .project import Project
+from .project_phase import ProjectPhase
+from .project_task import ProjectTask
+from .task_assignment import TaskAssignment
+from .material import ProjectMaterial
+from .resource import Resource
+
+class ProjectBudgetDeviation(Base):
+    """Precomputed per-project budget, committed spend and forecast deviation"""
+    __tablename__ = 'project_budget_deviations'
+
+    project_id = db(Integer, ForeignKey('projects.project_id', ondelete='CASCADE'), primary_key=True)
+    budget = db(Numeric(15, 2))
+    material_planned = db(Numeric(15, 2), nullable=False, default=0)
+    material_ordered = db(Numeric(15, 2), nullable=False, default=0)
+    material_actual = db(Numeric(15, 2), nullable=False, default=0)
+    labour_cost = db(Numeric(15, 2), nullable=False, default=0)
+    committed_cost = db(Numeric(15, 2), nullable=False, default=0)
+    forecast_cost = db(Numeric(15, 2), nullable=False, default=0)
+    deviation_amount = db(Numeric(15, 2))
+    deviation_percent = db(Numeric(8, 2))
+    updated_at = db(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    project = relationship("Project")
+
+    # Constraints
+    __table_args__ = (
+        Index('ix_project_budget_deviations_percent', 'deviation_percent'),
+    )
+
+    def __repr__(self):
+        return f"<ProjectBudgetDeviation(project_id={self.project_id}, deviation_percent={self.deviation_percent})>"
+
+    @property
+    def is_over_budget(self):
+        """Check if the forecast cost exceeds the budget"""
+        return self.deviation_amount is not None and self.deviation_amount > 0
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'project_id': self.project_id,
+            'budget': float(self.budget) if self.budget is not None else None,
+            'material_planned': float(self.material_planned or 0),
+            'material_ordered': float(self.material_ordered or 0),
+            'material_actual': float(self.material_actual or 0),
+            'labour_cost': float(self.labour_cost or 0),
+            'committed_cost': float(self.committed_cost or 0),
+            'forecast_cost': float(self.forecast_cost or 0),
+            'deviation_amount': float(self.deviation_amount) if self.deviation_amount is not None else None,
+            'deviation_percent': float(self.deviation_percent) if self.deviation_percent is not None else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+def _material_cost_sum(*statuses):
+    """Sum of project material line costs with the given statuses"""
+    line_cost = func.coalesce(ProjectMaterial.total_cost, ProjectMaterial.quantity * ProjectMaterial.unit_cost, 0)
+    return func.coalesce(func.sum(case((ProjectMaterial.status.in_(statuses), line_cost), else_=0)), 0)
+
+def build_deviation_select(project_ids=None):
+    """Build the select computing deviation rows (all projects, or only the given ones)"""
+    materials = select(
+        ProjectMaterial.project_id,
+        _material_cost_sum('Planned').label('planned'),
+        _material_cost_sum('Ordered').label('ordered'),
+        _material_cost_sum('Delivered', 'Used').label('actual'),
+    ).group_by(ProjectMaterial.project_id)
+
+    labour = (
+        select(
+            ProjectPhase.project_id,
+            func.coalesce(func.sum(TaskAssignment.hours_worked * Resource.hourly_rate), 0).label('cost'),
+        )
+        .join(ProjectTask, ProjectTask.project_phase_id == ProjectPhase.project_phase_id)
+        .join(TaskAssignment, TaskAssignment.project_task_id == ProjectTask.project_task_id)
+        .join(Resource, Resource.resource_id == TaskAssignment.resource_id)
+        .where(TaskAssignment.status != 'Cancelled')
+        .group_by(ProjectPhase.project_id)
+    )
+
+    projects = select(Project.project_id, Project.budget)
+    if project_ids is not None:
+        materials = materials.where(ProjectMaterial.project_id.in_(project_ids))
+        labour = labour.where(ProjectPhase.project_id.in_(project_ids))
+        projects = projects.where(Project.project_id.in_(project_ids))
+    materials = materials.subquery('material_totals')
+    labour = labour.subquery('labour_totals')
+    projects = projects.subquery('budgeted_projects')
+
+    planned = func.coalesce(materials.c.planned, 0)
+    ordered = func.coalesce(materials.c.ordered, 0)
+    actual = func.coalesce(materials.c.actual, 0)
+    labour_cost = func.coalesce(labour.c.cost, 0)
+    committed = ordered + actual + labour_cost
+    forecast = committed + planned
+
+    return (
+        select(
+            projects.c.project_id,
+            projects.c.budget,
+            planned.label('material_planned'),
+            ordered.label('material_ordered'),
+            actual.label('material_actual'),
+            labour_cost.label('labour_cost'),
+            committed.label('committed_cost'),
+            forecast.label('forecast_cost'),
+            case((projects.c.budget.isnot(None), forecast - projects.c.budget), else_=None).label('deviation_amount'),
+            case((projects.c.budget > 0, (forecast - projects.c.budget) * 100 / projects.c.budget), else_=None).label('deviation_percent'),
+            literal(datetime.utcnow()).label('updated_at'),
+        )
+        .outerjoin(materials, materials.c.project_id == projects.c.project_id)
+        .outerjoin(labour, labour.c.project_id == projects.c.project_id)
+    )
+
+def _insert(connection, table):
+    """INSERT construct with ON CONFLICT support for the connection's dialect"""
+    dialect = postgresql if connection.dialect.name == 'postgresql' else sqlite
+    return dialect.insert(table)
+
+def refresh_budget_deviations(connection, project_ids=None):
+    """Recompute the deviation rows of the given projects (all projects when None)
+
+    Rows are upserted (INSERT ... ON CONFLICT (project_id) DO UPDATE), so
+    concurrent transactions recomputing the same project never delete each
+    other's rows or collide on the primary key. Rows of projects that no
+    longer exist are removed.
+    """
+    if project_ids is not None:
+        project_ids = sorted(set(project_ids))
+        if not project_ids:
+            return 0
+    table = ProjectBudgetDeviation.__table__
+    remove = delete(table).where(~exists().where(Project.project_id == table.c.project_id))
+    if project_ids is not None:
+        remove = remove.where(table.c.project_id.in_(project_ids))
+    connection.execute(remove)
+
+    # "WHERE true" keeps SQLite from reading ON CONFLICT as a join constraint
+    query = build_deviation_select(project_ids).where(true())
+    columns = [column.name for column in query.selected_columns]
+    upsert = _insert(connection, table).from_select(columns, query)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[table.c.project_id],
+        set_={name: upsert.excluded[name] for name in columns if name != 'project_id'},
+    )
+    result = connection.execute(upsert)
+    return result.rowcount
+
+def _changed(obj, *attributes):
+    """Check if any of the given attributes has pending changes"""
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+# Keep the deviation table in step with the rows it is derived from
+@event.listens_for(Session, 'after_flush')
+def refresh_affected_budget_deviations(session, flush_context):
+    """Recompute deviations of projects whose materials, labour or budget changed in this flush"""
+    project_ids = set()
+    task_ids = set()
+    resource_ids = set()
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, ProjectMaterial):
+            project_ids.add(obj.project_id)
+            project_ids.update(inspect(obj).attrs.project_id.history.deleted or ())
+        elif isinstance(obj, TaskAssignment):
+            task_ids.add(obj.project_task_id)
+            task_ids.update(inspect(obj).attrs.project_task_id.history.deleted or ())
+        elif isinstance(obj, Project):
+            if obj in session.new or obj in session.deleted or _changed(obj, 'budget'):
+                project_ids.add(obj.project_id)
+        elif isinstance(obj, Resource) and obj in session.dirty and _changed(obj, 'hourly_rate'):
+            resource_ids.add(obj.resource_id)
+
+    if not (project_ids or task_ids or resource_ids):
+        return
+
+    connection = session.connection()
+    if task_ids:
+        project_ids.update(connection.execute(
+            select(ProjectPhase.project_id)
+            .join(ProjectTask, ProjectTask.project_phase_id == ProjectPhase.project_phase_id)
+            .where(ProjectTask.project_task_id.in_(task_ids))
+        ).scalars())
+    if resource_ids:
+        project_ids.update(connection.execute(
+            select(ProjectPhase.project_id)
+            .join(ProjectTask, ProjectTask.project_phase_id == ProjectPhase.project_phase_id)
+            .join(TaskAssignment, TaskAssignment.project_task_id == ProjectTask.project_task_id)
+            .where(TaskAssignment.resource_id.in_(resource_ids))
+            .distinct()
+        ).scalars())
+
+    project_ids.discard(None)
+    if project_ids:
+        refresh_budget_deviations(connection, project_ids)
@@ -2,7 +2,7 @@
 Project Phase model for ÉpítAI Construction Management System
 """
 
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from .base import Base, db, TimestampMixin
 
@@ -27,6 +27,7 @@ class ProjectPhase(Base, TimestampMixin):
     __table_args__ = (
         CheckConstraint("status IN ('Not Started', 'In Progress', 'Completed', 'On Hold')", name='ck_project_phase_status'),
         CheckConstraint("progress_percent >= 0 AND progress_percent <= 100", name='ck_project_phase_progress'),
+        Index('ix_project_phases_project_id', 'project_id'),
     )
     
     def __repr__(self):
@@ -2,7 +2,7 @@
 Project Task model for ÉpítAI Construction Management System
 """
 
-from sqlalchemy import Column, Integer, String, Date, Boolean, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, String, Date, Boolean, ForeignKey, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from .base import Base, db, TimestampMixin
 
@@ -29,6 +29,7 @@ class ProjectTask(Base, TimestampMixin):
     __table_args__ = (
         CheckConstraint("status IN ('Not Started', 'In Progress', 'Completed', 'On Hold')", name='ck_project_task_status'),
         CheckConstraint("progress_percent >= 0 AND progress_percent <= 100", name='ck_project_task_progress'),
+        Index('ix_project_tasks_project_phase_id', 'project_phase_id'),
     )
     
     def __repr__(self):
@@ -2,7 +2,7 @@
 Resource model for ÉpítAI Construction Management System
 """
 
-from sqlalchemy import Column, Integer, String, Text, Numeric, CheckConstraint, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Numeric, Date, CheckConstraint, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from .base import Base, db, TimestampMixin
 
@@ -28,11 +28,18 @@ class Resource(Base, TimestampMixin):
     project_memberships = relationship("ProjectMember", back_populates="resource")
     task_assignments = relationship("TaskAssignment", back_populates="resource")
     materials = relationship("Material", back_populates="supplier_resource")
+    unavailability_periods = relationship("ResourceUnavailability", back_populates="resource",
+                                          cascade="all, delete-orphan", passive_deletes=True,
+                                          order_by="ResourceUnavailability.start_date")
     
     # Constraints
     __table_args__ = (
         CheckConstraint("type IN ('Alkalmazott', 'Alvállalkozó', 'Beszállító')", name='ck_resource_type'),
         CheckConstraint("availability IN ('Elérhető', 'Foglalt', 'Szabadságon', 'Betegszabadság')", name='ck_resource_availability'),
+        # Natural key of bulk imports (bulk_import.py upserts on it); names are not
+        # unique (two employees may share one), e-mail addresses are
+        Index('uq_resources_type_email', 'type', text('lower(email)'), unique=True,
+              postgresql_where=text("email <> ''"), sqlite_where=text("email <> ''")),
     )
     
     def __repr__(self):
@@ -75,3 +82,39 @@ class Resource(Base, TimestampMixin):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+
+class ResourceUnavailability(Base, TimestampMixin):
+    """Periods when a resource cannot be scheduled (holiday, sick leave, ...)"""
+    __tablename__ = 'resource_unavailability'
+
+    unavailability_id = db(Integer, primary_key=True, autoincrement=True)
+    resource_id = db(Integer, ForeignKey('resources.resource_id', ondelete='CASCADE'), nullable=False)
+    start_date = db(Date, nullable=False)
+    end_date = db(Date, nullable=False)
+    reason = db(String(50), nullable=False, default='Szabadság')
+    notes = db(Text)
+
+    # Relationships
+    resource = relationship("Resource", back_populates="unavailability_periods")
+
+    # Constraints
+    __table_args__ = (
+        CheckConstraint("reason IN ('Szabadság', 'Betegszabadság', 'Személyes ok', 'Egyéb')", name='ck_resource_unavailability_reason'),
+        CheckConstraint("end_date >= start_date", name='ck_resource_unavailability_dates'),
+        Index('ix_resource_unavailability_resource_end', 'resource_id', 'end_date'),
+    )
+
+    def __repr__(self):
+        return f"<ResourceUnavailability(resource_id={self.resource_id}, start='{self.start_date}', end='{self.end_date}')>"
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'unavailability_id': self.unavailability_id,
+            'resource_id': self.resource_id,
+            'start_date': self.start_date.isoformat() if self.start_date else None,
+            'end_date': self.end_date.isoformat() if self.end_date else None,
+            'reason': self.reason,
+            'notes': self.notes,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
@@ -0,0 +1,234 @@
+"""
+Resource profile read model for ÉpítAI Construction Management System
+"""
+
+import json
+import re
+from datetime import date, datetime
+from sqlalchemy import Column, Integer, Numeric, Date, DateTime, Text, ForeignKey
+from sqlalchemy import event, inspect, select, insert, delete, func
+from sqlalchemy.orm import relationship, Session
+from .base import Base, db
+from .resource import Resource, ResourceUnavailability
+from .project import Project, ProjectMember
+from .phase import Phase
+from .task import Task
+from .project_phase import ProjectPhase
+from .project_task import ProjectTask
+from .task_assignment import TaskAssignment
+
+ACTIVE_PROJECT_STATUSES = ('Tervezés alatt', 'Folyamatban', 'Késésben')
+OPEN_ASSIGNMENT_STATUSES = ('Assigned', 'In Progress')
+HOURS_PER_DAY = 8
+UPCOMING_TASK_LIMIT = 20
+SKILL_SEPARATORS = re.compile(r'[,;|\n]')
+
+class ResourceProfile(Base):
+    """Precomputed skills, projects, tasks, hours and unavailability of a resource"""
+    __tablename__ = 'resource_profiles'
+
+    resource_id = db(Integer, ForeignKey('resources.resource_id', ondelete='CASCADE'), primary_key=True)
+    skills = db(Text)  # JSON list of normalised skills
+    active_projects = db(Text)  # JSON lists of project summaries
+    past_projects = db(Text)
+    current_tasks = db(Text)  # JSON lists of open assignments, split on as_of
+    upcoming_tasks = db(Text)
+    upcoming_unavailability = db(Text)  # JSON list of periods ending on or after as_of
+    booked_hours = db(Numeric(10, 2), nullable=False, default=0)  # Open assignment hours from as_of on
+    hours_worked = db(Numeric(10, 2), nullable=False, default=0)
+    as_of = db(Date, nullable=False)
+    updated_at = db(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    resource = relationship("Resource")
+
+    def __repr__(self):
+        return f"<ResourceProfile(resource_id={self.resource_id}, booked_hours={self.booked_hours}, as_of='{self.as_of}')>"
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'resource_id': self.resource_id,
+            'skills': json.loads(self.skills or '[]'),
+            'active_projects': json.loads(self.active_projects or '[]'),
+            'past_projects': json.loads(self.past_projects or '[]'),
+            'current_tasks': json.loads(self.current_tasks or '[]'),
+            'upcoming_tasks': json.loads(self.upcoming_tasks or '[]'),
+            'upcoming_unavailability': json.loads(self.upcoming_unavailability or '[]'),
+            'booked_hours': float(self.booked_hours or 0),
+            'hours_worked': float(self.hours_worked or 0),
+            'as_of': self.as_of.isoformat() if self.as_of else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+def normalise_skills(skills):
+    """Split a free-text skills field on , ; | and newlines; trimmed, duplicates (any case) removed"""
+    seen = set()
+    result = []
+    for skill in SKILL_SEPARATORS.split(skills or ''):
+        skill = skill.strip()
+        if skill and skill.lower() not in seen:
+            seen.add(skill.lower())
+            result.append(skill)
+    return result
+
+def working_days(start, end):
+    """Number of Monday-Friday days from start to end, both included"""
+    if start is None or end is None or end < start:
+        return 0
+    weeks, extra = divmod((end - start).days + 1, 7)
+    weekday = start.weekday()
+    return weeks * 5 + sum(1 for offset in range(extra) if (weekday + offset) % 7 < 5)
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+def _in(column, ids):
+    return column.in_(ids) if ids is not None else True
+
+def build_profile_rows(connection, resource_ids=None, today=None):
+    """Compute profile rows of the given resources (all resources when None)"""
+    today = today or date.today()
+    profiles = {
+        resource_id: {
+            'resource_id': resource_id,
+            'skills': normalise_skills(skills),
+            'active_projects': [], 'past_projects': [],
+            'current_tasks': [], 'upcoming_tasks': [],
+            'upcoming_unavailability': [],
+            'booked_hours': 0.0, 'hours_worked': 0.0,
+        }
+        for resource_id, skills in connection.execute(
+            select(Resource.resource_id, Resource.skills).where(_in(Resource.resource_id, resource_ids))
+        )
+    }
+    if not profiles:
+        return []
+
+    memberships = connection.execute(
+        select(ProjectMember.resource_id, Project.project_id, Project.project_name, Project.status,
+               Project.start_date, Project.end_date, Project.progress_percent)
+        .join(Project, Project.project_id == ProjectMember.project_id)
+        .where(_in(ProjectMember.resource_id, resource_ids))
+        .order_by(Project.start_date.desc(), Project.project_id)
+    )
+    for row in memberships:
+        summary = {'project_id': row.project_id, 'name': row.project_name, 'status': row.status,
+                   'start': _iso(row.start_date), 'end': _iso(row.end_date), 'progress': row.progress_percent or 0}
+        key = 'active_projects' if row.status in ACTIVE_PROJECT_STATUSES else 'past_projects'
+        profiles[row.resource_id][key].append(summary)
+
+    # Open assignments that have not ended yet, in start order (uses ix_task_assignments_resource_start)
+    assignments = connection.execute(
+        select(TaskAssignment.assignment_id, TaskAssignment.resource_id, TaskAssignment.start_date,
+               TaskAssignment.end_date, TaskAssignment.status, Task.name.label('task_name'),
+               Phase.name.label('phase_name'), Project.project_id, Project.project_name)
+        .join(ProjectTask, ProjectTask.project_task_id == TaskAssignment.project_task_id)
+        .join(Task, Task.task_id == ProjectTask.task_id)
+        .join(ProjectPhase, ProjectPhase.project_phase_id == ProjectTask.project_phase_id)
+        .join(Phase, Phase.phase_id == ProjectPhase.phase_id)
+        .join(Project, Project.project_id == ProjectPhase.project_id)
+        .where(_in(TaskAssignment.resource_id, resource_ids))
+        .where(TaskAssignment.status.in_(OPEN_ASSIGNMENT_STATUSES))
+        .where(func.coalesce(TaskAssignment.end_date, TaskAssignment.start_date) >= today)
+        .order_by(TaskAssignment.resource_id, TaskAssignment.start_date, TaskAssignment.assignment_id)
+    )
+    for row in assignments:
+        profile = profiles[row.resource_id]
+        end = row.end_date or row.start_date
+        task = {'assignment_id': row.assignment_id, 'project_id': row.project_id, 'project': row.project_name,
+                'phase': row.phase_name, 'task': row.task_name, 'start': _iso(row.start_date), 'end': _iso(end),
+                'status': row.status}
+        profile['booked_hours'] += working_days(max(row.start_date, today), end) * HOURS_PER_DAY
+        if row.start_date <= today:
+            profile['current_tasks'].append(task)
+        elif len(profile['upcoming_tasks']) < UPCOMING_TASK_LIMIT:
+            profile['upcoming_tasks'].append(task)
+
+    hours = connection.execute(
+        select(TaskAssignment.resource_id, func.coalesce(func.sum(TaskAssignment.hours_worked), 0))
+        .where(_in(TaskAssignment.resource_id, resource_ids))
+        .where(TaskAssignment.status != 'Cancelled')
+        .group_by(TaskAssignment.resource_id)
+    )
+    for resource_id, total in hours:
+        profiles[resource_id]['hours_worked'] = float(total)
+
+    periods = connection.execute(
+        select(ResourceUnavailability.resource_id, ResourceUnavailability.start_date,
+               ResourceUnavailability.end_date, ResourceUnavailability.reason, ResourceUnavailability.notes)
+        .where(_in(ResourceUnavailability.resource_id, resource_ids))
+        .where(ResourceUnavailability.end_date >= today)
+        .order_by(ResourceUnavailability.resource_id, ResourceUnavailability.start_date)
+    )
+    for row in periods:
+        profiles[row.resource_id]['upcoming_unavailability'].append(
+            {'start_date': _iso(row.start_date), 'end_date': _iso(row.end_date), 'reason': row.reason,
+             'notes': row.notes or ''}
+        )
+
+    updated_at = datetime.utcnow()
+    json_columns = ('skills', 'active_projects', 'past_projects', 'current_tasks', 'upcoming_tasks',
+                    'upcoming_unavailability')
+    return [
+        dict(profile, as_of=today, updated_at=updated_at,
+             booked_hours=round(profile['booked_hours'], 2),
+             **{name: json.dumps(profile[name], ensure_ascii=False) for name in json_columns})
+        for profile in profiles.values()
+    ]
+
+def refresh_resource_profiles(connection, resource_ids=None, today=None):
+    """Recompute the profiles of the given resources (all resources when None)"""
+    if resource_ids is not None:
+        resource_ids = sorted(set(resource_ids) - {None})
+        if not resource_ids:
+            return 0
+    table = ResourceProfile.__table__
+    connection.execute(delete(table).where(_in(table.c.resource_id, resource_ids)))
+    rows = build_profile_rows(connection, resource_ids, today)
+    if rows:
+        connection.execute(insert(table), rows)
+    return len(rows)
+
+def _changed(obj, *attributes):
+    """Check if any of the given attributes has pending changes"""
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+# Keep the profiles in step with memberships, assignments and unavailability
+@event.listens_for(Session, 'after_flush')
+def refresh_affected_resource_profiles(session, flush_context):
+    """Recompute profiles of resources whose memberships, assignments, skills or periods changed in this flush"""
+    resource_ids = set()
+    project_ids = set()
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (ProjectMember, TaskAssignment, ResourceUnavailability)):
+            resource_ids.add(obj.resource_id)
+            resource_ids.update(inspect(obj).attrs.resource_id.history.deleted or ())
+        elif isinstance(obj, Resource):
+            if obj in session.new or _changed(obj, 'skills'):
+                resource_ids.add(obj.resource_id)
+        elif isinstance(obj, Project) and obj in session.dirty:
+            if _changed(obj, 'project_name', 'status', 'start_date', 'end_date', 'progress_percent'):
+                project_ids.add(obj.project_id)
+
+    if not (resource_ids or project_ids):
+        return
+
+    connection = session.connection()
+    if project_ids:
+        resource_ids.update(connection.execute(
+            select(ProjectMember.resource_id).where(ProjectMember.project_id.in_(project_ids))
+        ).scalars())
+        resource_ids.update(connection.execute(
+            select(TaskAssignment.resource_id)
+            .join(ProjectTask, ProjectTask.project_task_id == TaskAssignment.project_task_id)
+            .join(ProjectPhase, ProjectPhase.project_phase_id == ProjectTask.project_phase_id)
+            .where(ProjectPhase.project_id.in_(project_ids))
+            .distinct()
+        ).scalars())
+
+    resource_ids.discard(None)
+    if resource_ids:
+        refresh_resource_profiles(connection, resource_ids)
@@ -2,7 +2,10 @@
 Task Assignment model for ÉpítAI Construction Management System
 """
 
-from sqlalchemy import Column, Integer, String, Date, Numeric, Text, ForeignKey, CheckConstraint, UniqueConstraint
+from datetime import date
+from typing import Optional, List
+
+from sqlalchemy import select, Column, Integer, String, Date, Numeric, Text, ForeignKey, CheckConstraint, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from .base import Base, db, TimestampMixin
 
@@ -14,7 +17,7 @@ class TaskAssignment(Base, TimestampMixin):
     project_task_id = db(Integer, ForeignKey('project_tasks.project_task_id', ondelete='CASCADE'), nullable=False)
     resource_id = db(Integer, ForeignKey('resources.resource_id', ondelete='CASCADE'), nullable=False)
     assigned_date = db(Date, default='CURRENT_DATE')
-    start_date = db(Date)
+    start_date = db(Date, nullable=False)  # Monthly partition key on PostgreSQL (see partitioning.py)
     end_date = db(Date)
     status = db(String(50), default='Assigned')
     hours_worked = db(Numeric(8, 2), default=0)
@@ -27,7 +30,10 @@ class TaskAssignment(Base, TimestampMixin):
     # Constraints
     __table_args__ = (
         CheckConstraint("status IN ('Assigned', 'In Progress', 'Completed', 'Cancelled')", name='ck_task_assignment_status'),
-        UniqueConstraint('project_task_id', 'resource_id', name='uq_task_assignment'),
+        # On PostgreSQL the table is partitioned by start_date, which every unique constraint has to
+        # include; SQLite uses the same key, so a resource can be assigned to a task once per start date
+        UniqueConstraint('project_task_id', 'resource_id', 'start_date', name='uq_task_assignment'),
+        Index('ix_task_assignments_resource_start', 'resource_id', 'start_date'),
     )
     
     def __repr__(self):
@@ -72,3 +78,18 @@ class TaskAssignment(Base, TimestampMixin):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+def build_assignment_range_query(start_date: date, end_date: date, resource_ids: Optional[List[int]] = None):
+    """Select assignments starting in [start_date, end_date)
+
+    Compares the bare partition column with half-open bounds so PostgreSQL
+    only scans the partitions of the requested months.
+    """
+    query = select(TaskAssignment).where(
+        TaskAssignment.start_date >= start_date,
+        TaskAssignment.start_date < end_date,
+    )
+    if resource_ids:
+        query = query.where(TaskAssignment.resource_id.in_(resource_ids))
+    return query.order_by(TaskAssignment.start_date)
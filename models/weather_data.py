@@ -2,7 +2,10 @@
 Weather Data model for ÉpítAI Construction Management System
 """
 
-from sqlalchemy import Column, Integer, String, Date, Numeric, Boolean, UniqueConstraint
+from datetime import date as date_type
+from typing import Optional, List
+
+from sqlalchemy import select, Column, Integer, String, Date, Numeric, Boolean, UniqueConstraint
 from sqlalchemy.orm import relationship
 from .base import Base, db, TimestampMixin
 
@@ -12,7 +15,7 @@ class WeatherData(Base, TimestampMixin):
     
     weather_id = db(Integer, primary_key=True, autoincrement=True)
     location = db(String(200), nullable=False)
-    date = db(Date, nullable=False)
+    date = db(Date, nullable=False)  # Monthly partition key on PostgreSQL (see partitioning.py)
     precipitation_probability = db(Integer)  # 0-100
     precipitation_hours = db(Integer, default=0)
     temperature_min = db(Numeric(5, 2))
@@ -74,3 +77,18 @@ class WeatherData(Base, TimestampMixin):
             'can_work_outdoor': self.can_work_outdoor,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+
+
+def build_weather_range_query(start_date: date_type, end_date: date_type, locations: Optional[List[str]] = None):
+    """Select weather rows for [start_date, end_date)
+
+    Compares the bare partition column with half-open bounds so PostgreSQL
+    only scans the partitions of the requested months.
+    """
+    query = select(WeatherData).where(
+        WeatherData.date >= start_date,
+        WeatherData.date < end_date,
+    )
+    if locations:
+        query = query.where(WeatherData.location.in_(locations))
+    return query.order_by(WeatherData.location, WeatherData.date)
@@ -0,0 +1,487 @@
+"""
+Online migration helpers for ÉpítAI Construction Management System
+
+Helpers for Alembic revisions that touch large tables (task_assignments,
+weather_data, project_materials) without blocking the application:
+
+- create_index_concurrently / drop_index_concurrently
+- with_lock_retry: lock_timeout / statement_timeout guard with retry and backoff
+- add_check_constraint_not_valid / add_foreign_key_not_valid + validate_constraint
+- backfill_in_batches: keyset-batched UPDATEs with resumable checkpoints and throttling
+
+On PostgreSQL the online variants are used; on SQLite the helpers fall back to
+the plain Alembic operations. The rehearse command runs a revision against a
+scratch database filled by synthetic_data.py and reports duration and how long
+application queries were blocked.
+
+Usage from a revision:
+
+    from online_migrations import create_index_concurrently, backfill_in_batches
+"""
+
+import os
+import sys
+import time
+import random
+import threading
+from contextlib import contextmanager
+from typing import Optional, List, Callable
+
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+LOCK_TIMEOUT = os.getenv('MIGRATION_LOCK_TIMEOUT', '2s')
+STATEMENT_TIMEOUT = os.getenv('MIGRATION_STATEMENT_TIMEOUT', '5min')
+LOCK_RETRIES = 5
+RETRY_DELAY = 0.5
+# lock_not_available, query_canceled (statement_timeout)
+LOCK_ERROR_CODES = {'55P03', '57014'}
+CHECKPOINT_TABLE = 'online_migration_checkpoints'
+
+
+def is_postgresql(bind=None) -> bool:
+    """Check if the migration runs against PostgreSQL"""
+    bind = bind if bind is not None else op.get_bind()
+    return bind.dialect.name == 'postgresql'
+
+
+def _quote(bind, name: str) -> str:
+    """Quote an identifier for the current dialect"""
+    return bind.dialect.identifier_preparer.quote(name)
+
+
+def _is_lock_error(error: DBAPIError) -> bool:
+    """Check if an error was caused by lock_timeout/statement_timeout (or a busy SQLite database)"""
+    orig = getattr(error, 'orig', None)
+    code = getattr(orig, 'pgcode', None) or getattr(orig, 'sqlstate', None)
+    if code in LOCK_ERROR_CODES:
+        return True
+    return isinstance(error, OperationalError) and 'database is locked' in str(orig)
+
+
+def _retry_wait(attempt: int, delay: float) -> float:
+    """Exponential backoff with jitter"""
+    return delay * (2 ** (attempt - 1)) * (0.5 + random.random())
+
+
+@contextmanager
+def timeouts(bind=None, lock_timeout: str = LOCK_TIMEOUT, statement_timeout: str = STATEMENT_TIMEOUT,
+             local: bool = True):
+    """Apply lock_timeout/statement_timeout for a block and restore the previous values afterwards"""
+    bind = bind if bind is not None else op.get_bind()
+    if not is_postgresql(bind):
+        yield
+        return
+
+    settings = {'lock_timeout': lock_timeout, 'statement_timeout': statement_timeout}
+    previous = {name: bind.execute(text("SELECT current_setting(:name)"), {'name': name}).scalar()
+                for name in settings}
+    for name, value in settings.items():
+        bind.execute(text("SELECT set_config(:name, :value, :local)"), {'name': name, 'value': value, 'local': local})
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            bind.execute(text("SELECT set_config(:name, :value, :local)"), {'name': name, 'value': value, 'local': local})
+
+
+def with_lock_retry(operation: Callable, retries: int = LOCK_RETRIES, delay: float = RETRY_DELAY,
+                    lock_timeout: str = LOCK_TIMEOUT, statement_timeout: str = STATEMENT_TIMEOUT):
+    """Run a DDL operation under a short lock_timeout, retrying with backoff when the lock is not granted
+
+    Each attempt runs in a savepoint so a timed-out attempt does not abort the
+    migration transaction. A short lock_timeout keeps the ACCESS EXCLUSIVE
+    request from queueing the application's queries behind it.
+    """
+    bind = op.get_bind()
+    if not is_postgresql(bind):
+        return operation()
+
+    for attempt in range(1, retries + 1):
+        savepoint = bind.begin_nested()
+        try:
+            with timeouts(bind, lock_timeout, statement_timeout):
+                result = operation()
+            savepoint.commit()
+            return result
+        except DBAPIError as e:
+            savepoint.rollback()
+            if not _is_lock_error(e) or attempt == retries:
+                raise
+            wait = _retry_wait(attempt, delay)
+            print(f"⏳ Lock not granted ({attempt}/{retries}), retrying in {wait:.1f}s")
+            time.sleep(wait)
+
+
+def _drop_invalid_index(bind, index_name: str):
+    """Drop an INVALID index left behind by an interrupted concurrent build"""
+    invalid = bind.execute(text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND NOT i.indisvalid"
+    ), {'name': index_name}).scalar()
+    if invalid:
+        print(f"🧹 Dropping invalid index {index_name}")
+        bind.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {_quote(bind, index_name)}"))
+
+
+def create_index_concurrently(index_name: str, table_name: str, columns: List[str], unique: bool = False,
+                              where: Optional[str] = None, lock_timeout: str = LOCK_TIMEOUT, **kw):
+    """Create an index without blocking writes (CREATE INDEX CONCURRENTLY on PostgreSQL)
+
+    Runs outside the migration transaction, is idempotent (IF NOT EXISTS) and
+    cleans up an invalid index from a previously interrupted build.
+    """
+    bind = op.get_bind()
+    predicate = text(where) if where else None
+    if not is_postgresql(bind):
+        op.create_index(index_name, table_name, columns, unique=unique, sqlite_where=predicate, **kw)
+        return
+
+    with op.get_context().autocommit_block():
+        with timeouts(bind, lock_timeout, '0', local=False):
+            _drop_invalid_index(bind, index_name)
+            op.create_index(index_name, table_name, columns, unique=unique, postgresql_where=predicate,
+                            postgresql_concurrently=True, if_not_exists=True, **kw)
+
+
+def drop_index_concurrently(index_name: str, table_name: str, lock_timeout: str = LOCK_TIMEOUT):
+    """Drop an index without blocking reads and writes"""
+    bind = op.get_bind()
+    if not is_postgresql(bind):
+        op.drop_index(index_name, table_name=table_name)
+        return
+
+    with op.get_context().autocommit_block():
+        with timeouts(bind, lock_timeout, '0', local=False):
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
+
+
+def add_check_constraint_not_valid(constraint_name: str, table_name: str, condition: str):
+    """Add a CHECK constraint without scanning the table (NOT VALID); call validate_constraint afterwards"""
+    bind = op.get_bind()
+    if not is_postgresql(bind):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.create_check_constraint(constraint_name, condition)
+        return
+
+    with_lock_retry(lambda: op.execute(
+        f"ALTER TABLE {_quote(bind, table_name)} ADD CONSTRAINT {_quote(bind, constraint_name)} "
+        f"CHECK ({condition}) NOT VALID"
+    ))
+
+
+def add_foreign_key_not_valid(constraint_name: str, source_table: str, referent_table: str,
+                              local_cols: List[str], remote_cols: List[str], ondelete: Optional[str] = None):
+    """Add a FOREIGN KEY without scanning the table (NOT VALID); call validate_constraint afterwards"""
+    bind = op.get_bind()
+    if not is_postgresql(bind):
+        with op.batch_alter_table(source_table) as batch_op:
+            batch_op.create_foreign_key(constraint_name, referent_table, local_cols, remote_cols, ondelete=ondelete)
+        return
+
+    local = ", ".join(_quote(bind, col) for col in local_cols)
+    remote = ", ".join(_quote(bind, col) for col in remote_cols)
+    on_delete = f" ON DELETE {ondelete}" if ondelete else ""
+    with_lock_retry(lambda: op.execute(
+        f"ALTER TABLE {_quote(bind, source_table)} ADD CONSTRAINT {_quote(bind, constraint_name)} "
+        f"FOREIGN KEY ({local}) REFERENCES {_quote(bind, referent_table)} ({remote}){on_delete} NOT VALID"
+    ))
+
+
+def validate_constraint(constraint_name: str, table_name: str, lock_timeout: str = LOCK_TIMEOUT):
+    """Validate a NOT VALID constraint in its own transaction (SHARE UPDATE EXCLUSIVE lock, writes keep flowing)"""
+    bind = op.get_bind()
+    if not is_postgresql(bind):
+        return
+
+    with op.get_context().autocommit_block():
+        with timeouts(bind, lock_timeout, '0', local=False):
+            op.execute(f"ALTER TABLE {_quote(bind, table_name)} VALIDATE CONSTRAINT {_quote(bind, constraint_name)}")
+
+
+def _ensure_checkpoint_table(bind):
+    """Create the backfill checkpoint table if it does not exist"""
+    bind.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} ("
+        "name VARCHAR(200) PRIMARY KEY, last_key BIGINT NOT NULL, rows_done BIGINT NOT NULL, "
+        "completed BOOLEAN NOT NULL, updated_at TIMESTAMP NOT NULL)"
+    ))
+
+
+def _load_checkpoint(bind, name: str) -> Optional[dict]:
+    """Load a backfill checkpoint"""
+    row = bind.execute(text(
+        f"SELECT last_key, rows_done, completed FROM {CHECKPOINT_TABLE} WHERE name = :name"
+    ), {'name': name}).first()
+    return dict(row._mapping) if row else None
+
+
+def _save_checkpoint(bind, name: str, last_key: int, rows_done: int, completed: bool = False):
+    """Persist backfill progress"""
+    bind.execute(text(f"DELETE FROM {CHECKPOINT_TABLE} WHERE name = :name"), {'name': name})
+    bind.execute(text(
+        f"INSERT INTO {CHECKPOINT_TABLE} (name, last_key, rows_done, completed, updated_at) "
+        "VALUES (:name, :last_key, :rows_done, :completed, CURRENT_TIMESTAMP)"
+    ), {'name': name, 'last_key': last_key, 'rows_done': rows_done, 'completed': completed})
+
+
+def backfill_in_batches(table_name: str, set_clause: str, key_column: str, where: Optional[str] = None,
+                        batch_size: int = 5000, throttle: float = 0.05, checkpoint: Optional[str] = None,
+                        retries: int = LOCK_RETRIES, statement_timeout: str = '30s', params: Optional[dict] = None) -> int:
+    """Backfill a large table in primary-key ranges, committing and checkpointing each batch
+
+    The UPDATE must be idempotent: a batch interrupted after its UPDATE but
+    before its checkpoint is re-run on resume. Each batch is its own
+    transaction, so row locks are held only for one batch, and the sleep
+    between batches leaves room for application traffic and replication.
+
+    Example:
+        backfill_in_batches('task_assignments', "status = 'Assigned'", 'assignment_id',
+                            where="status IS NULL")
+    """
+    bind = op.get_bind()
+    name = checkpoint or f"{table_name}.{key_column}:{set_clause}"[:200]
+    table = _quote(bind, table_name)
+    key = _quote(bind, key_column)
+    condition = f" AND ({where})" if where else ""
+    update = text(f"UPDATE {table} SET {set_clause} WHERE {key} >= :lower AND {key} < :upper{condition}")
+
+    with op.get_context().autocommit_block():
+        _ensure_checkpoint_table(bind)
+        state = _load_checkpoint(bind, name)
+        if state and state['completed']:
+            print(f"✅ Backfill {name} already completed ({state['rows_done']} rows)")
+            return state['rows_done']
+
+        low, high = bind.execute(text(f"SELECT MIN({key}), MAX({key}) FROM {table}")).one()
+        if high is None:
+            _save_checkpoint(bind, name, 0, 0, completed=True)
+            return 0
+
+        rows_done = state['rows_done'] if state else 0
+        lower = state['last_key'] + 1 if state else low
+        if state:
+            print(f"↪️ Resuming backfill {name} from {key_column} = {lower}")
+        started = time.perf_counter()
+        batch_params = dict(params or {})
+
+        while lower <= high:
+            upper = lower + batch_size
+            for attempt in range(1, retries + 1):
+                try:
+                    with timeouts(bind, LOCK_TIMEOUT, statement_timeout, local=False):
+                        result = bind.execute(update, dict(batch_params, lower=lower, upper=upper))
+                    break
+                except DBAPIError as e:
+                    if not _is_lock_error(e) or attempt == retries:
+                        raise
+                    time.sleep(_retry_wait(attempt, RETRY_DELAY))
+            rows_done += max(result.rowcount, 0)
+            _save_checkpoint(bind, name, upper - 1, rows_done)
+
+            elapsed = time.perf_counter() - started
+            done = min(upper - low, high - low + 1) / (high - low + 1)
+            eta = elapsed / done * (1 - done) if done else 0
+            print(f"  {name}: {done:6.1%} ({rows_done} rows, {elapsed:.1f}s, ETA {eta:.0f}s)")
+
+            lower = upper
+            if throttle and lower <= high:
+                time.sleep(throttle)
+
+        _save_checkpoint(bind, name, high, rows_done, completed=True)
+    return rows_done
+
+
+class _Probe(threading.Thread):
+    """Background thread that times application-like queries (or samples lock waits) while a migration runs"""
+
+    def __init__(self, engine, statements: List[str], interval: float = 0.05):
+        super().__init__(daemon=True)
+        self.engine = engine
+        self.statements = statements
+        self.interval = interval
+        self.samples = []
+        self.errors = 0
+        self.stop_event = threading.Event()
+
+    def run(self):
+        with self.engine.connect() as connection:
+            while not self.stop_event.is_set():
+                for statement in self.statements:
+                    started = time.perf_counter()
+                    try:
+                        with connection.begin():
+                            result = connection.execute(text(statement))
+                            value = result.scalar() if result.returns_rows else None
+                        self.samples.append(((time.perf_counter() - started) * 1000, value))
+                    except DBAPIError:
+                        self.errors += 1
+                        self.samples.append(((time.perf_counter() - started) * 1000, None))
+                self.stop_event.wait(self.interval)
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Get a percentile of a list of values (nearest rank)"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percentile / 100 * (len(values) - 1))))]
+
+
+PROBE_STATEMENTS = [
+    "SELECT COUNT(*) FROM (SELECT 1 FROM task_assignments LIMIT 1) probe",
+    "UPDATE task_assignments SET hours_worked = hours_worked WHERE assignment_id = 1",
+    "SELECT COUNT(*) FROM (SELECT 1 FROM project_materials LIMIT 1) probe",
+    "UPDATE project_materials SET quantity = quantity WHERE project_material_id = 1",
+    "SELECT COUNT(*) FROM (SELECT 1 FROM weather_data LIMIT 1) probe",
+]
+
+LOCK_WAIT_STATEMENT = (
+    "SELECT COALESCE(MAX(EXTRACT(EPOCH FROM (clock_timestamp() - state_change)) * 1000), 0) "
+    "FROM pg_stat_activity WHERE wait_event_type = 'Lock' AND datname = current_database()"
+)
+
+
+def seed_synthetic_rows(engine, rows: int, seed: int = 0) -> int:
+    """Fill the schema with about `rows` task assignments, project materials and weather rows
+
+    Delegates to the synthetic data generator with volumes scaled to `rows`,
+    so rehearsals run against realistic, reproducible distributions. Skips
+    seeding when the tables are already large. Derived tables are not
+    refreshed because they may not exist at the rehearsal's parent revision.
+    """
+    from synthetic_data import generate, scaled_volumes
+
+    with engine.connect() as connection:
+        existing = connection.execute(text("SELECT COUNT(*) FROM task_assignments")).scalar()
+    if existing >= rows:
+        return existing
+
+    loaded = generate(engine, scaled_volumes(rows), seed=seed, refresh_derived=False)
+    return loaded.get('task_assignments', 0)
+
+
+def rehearse(database_url: str, revision: str, rows: int = 1_000_000, alembic_cfg_path: str = "alembic.ini") -> dict:
+    """Run a revision against a scratch database with synthetic data and report duration and lock waits
+
+    The database is upgraded to the revision's parent, filled with synthetic
+    rows if needed, and then upgraded to the revision while probe threads run
+    application-like reads/writes and (on PostgreSQL) sample pg_stat_activity
+    for sessions waiting on locks.
+    """
+    from sqlalchemy import create_engine
+    from alembic import command
+    from alembic.config import Config
+    from migration_utils import get_script_directory
+
+    try:
+        from database import DATABASE_URL
+    except ValueError:
+        DATABASE_URL = None
+    if DATABASE_URL and database_url == DATABASE_URL:
+        raise ValueError("Refusing to rehearse against the application database; use a scratch database")
+
+    script = get_script_directory(alembic_cfg_path)
+    target = script.get_revision(revision)
+    parent = target.down_revision or 'base'
+    engine = create_engine(database_url)
+    config = Config(alembic_cfg_path)
+
+    def upgrade(to):
+        with engine.connect() as connection:
+            config.attributes['connection'] = connection
+            try:
+                command.upgrade(config, to)
+            finally:
+                config.attributes.pop('connection', None)
+
+    print(f"⬆️ Upgrading scratch database to parent revision {parent}")
+    upgrade(parent if isinstance(parent, str) else parent[0])
+
+    print(f"🌱 Seeding synthetic data ({rows} rows per large table)")
+    seed_started = time.perf_counter()
+    seeded = seed_synthetic_rows(engine, rows)
+    seed_seconds = time.perf_counter() - seed_started
+
+    probe = _Probe(engine, PROBE_STATEMENTS)
+    lock_monitor = _Probe(engine, [LOCK_WAIT_STATEMENT]) if engine.dialect.name == 'postgresql' else None
+    probe.start()
+    if lock_monitor:
+        lock_monitor.start()
+
+    print(f"🚀 Running revision {target.revision}: {target.doc}")
+    started = time.perf_counter()
+    error = None
+    try:
+        upgrade(target.revision)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    duration = time.perf_counter() - started
+
+    probe.stop()
+    if lock_monitor:
+        lock_monitor.stop()
+    engine.dispose()
+
+    latencies = [latency for latency, _ in probe.samples]
+    lock_waits = [float(value or 0) for _, value in lock_monitor.samples] if lock_monitor else []
+    return {
+        'revision': target.revision,
+        'parent': parent,
+        'rows': seeded,
+        'seed_seconds': round(seed_seconds, 2),
+        'duration_seconds': round(duration, 3),
+        'error': error,
+        'probe_queries': len(latencies),
+        'probe_errors': probe.errors,
+        'probe_p50_ms': round(_percentile(latencies, 50), 2),
+        'probe_p95_ms': round(_percentile(latencies, 95), 2),
+        'probe_max_ms': round(max(latencies, default=0), 2),
+        'max_lock_wait_ms': round(max(lock_waits, default=0), 2) if lock_monitor else None,
+        'lock_wait_samples': sum(1 for wait in lock_waits if wait > 0) if lock_monitor else None,
+    }
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Online migration tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rehearse_parser = subparsers.add_parser("rehearse", help="Rehearse a revision against a synthetic database")
+    rehearse_parser.add_argument("revision", help="Revision id to rehearse")
+    rehearse_parser.add_argument("--database-url", required=True, help="Scratch database URL (never production)")
+    rehearse_parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic rows per large table")
+
+    checkpoints_parser = subparsers.add_parser("checkpoints", help="List backfill checkpoints")
+    checkpoints_parser.add_argument("--database-url", help="Database URL (default: application database)")
+
+    args = parser.parse_args()
+
+    if args.command == "rehearse":
+        report = rehearse(args.database_url, args.revision, args.rows)
+        print(json.dumps(report, indent=2))
+        sys.exit(1 if report['error'] else 0)
+    elif args.command == "checkpoints":
+        from sqlalchemy import create_engine, inspect
+        if args.database_url:
+            checkpoint_engine = create_engine(args.database_url)
+        else:
+            from database import engine as checkpoint_engine
+        with checkpoint_engine.connect() as connection:
+            if not inspect(connection).has_table(CHECKPOINT_TABLE):
+                print("No backfill checkpoints")
+            else:
+                for row in connection.execute(text(f"SELECT * FROM {CHECKPOINT_TABLE} ORDER BY updated_at")):
+                    status = "✅" if row.completed else "⏸️"
+                    print(f"{status} {row.name}: last key {row.last_key}, {row.rows_done} rows, {row.updated_at}")
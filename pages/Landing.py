@@ -1,9 +1,6 @@
 import streamlit as st
 from default_data import ensure_base_session_state
 from datetime import datetime, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
 
 # Configure page
 st.set_page_config(
@@ -1,6 +1,9 @@
 import streamlit as st
-from default_data import ensure_base_session_state
+from default_data import ensure_base_session_state, invalidate_resource_profiles
+from client_snapshot import publish_client_snapshot
+from project_archive import archived_years, list_archived_projects, load_archived_project
 from components.sidebar import render_sidebar_navigation, handle_user_not_logged_in
+from components.export_buttons import render_export_buttons
 
 st.set_page_config(page_title="Projects – ÉpítAI", layout="wide")
 
@@ -41,11 +44,55 @@ with st.expander("➕ Új projekt", expanded=False):
                 "locations": locations_list,
                 "progress": 35
             })
+            publish_client_snapshot(st.session_state.projects[-1])
+            invalidate_resource_profiles(st)
             st.success(f"Projekt létrehozva: {name}")
             st.rerun()
 
 st.write("### Projektek")
 
+
+def open_archived_project(archive_id, year):
+    """Load an archived project into the session on demand and open its details page"""
+    for idx, proj in enumerate(st.session_state.projects):
+        if proj.get("archived") and proj.get("archive_id") == archive_id:
+            break
+    else:
+        project = load_archived_project(archive_id, year)
+        if project is None:
+            st.error("Az archivált projekt nem található.")
+            return
+        st.session_state.projects.append(project)
+        idx = len(st.session_state.projects) - 1
+    st.session_state.selected_project_index = idx
+    st.switch_page("pages/project_details.py")
+
+
+def render_archived_projects():
+    """List projects moved to the cold archive; they are read from disk only when opened"""
+    years = archived_years()
+    if not years:
+        return
+    with st.expander("📦 Archivált projektek", expanded=False):
+        filter_cols = st.columns([1, 3])
+        year = filter_cols[0].selectbox("Év", years, key="archive_year")
+        search = filter_cols[1].text_input("Keresés", key="archive_search")
+        archived = list_archived_projects(year, search)
+        if not archived:
+            st.info("Nincs megjeleníthető archivált projekt.")
+            return
+        for summary in archived[:50]:
+            cols = st.columns([3, 2, 2, 2, 2])
+            cols[0].markdown(f"**{summary['name']}**")
+            cols[1].write(summary["type"] or "-")
+            cols[2].write(summary["start"])
+            cols[3].write(summary["end"])
+            if cols[4].button("Megnyitás", key=f"open_archived_{summary['project_id']}"):
+                open_archived_project(summary["project_id"], summary["year"])
+        if len(archived) > 50:
+            st.caption(f"További {len(archived) - 50} projekt – szűkítsd a keresést.")
+
+
 if st.session_state.projects:
     future_projects = [p for p in st.session_state.projects if p.get("status") in ("Tervezés alatt",)]
     active_projects = [p for p in st.session_state.projects if p.get("status") in ("Folyamatban", "Késésben")]
@@ -91,5 +138,11 @@ if st.session_state.projects:
         render_list(active_projects, "active_")
     with tab_closed:
         render_list(closed_projects, "closed_")
+        render_archived_projects()
 else:
     st.info("Még nincs projekt. Hozz létre egyet fentebb.")
+
+with st.expander("📤 Exportálás", expanded=False):
+    st.caption("Projektek és feladat-hozzárendelések letöltése az adatbázisból.")
+    render_export_buttons("projects", key="export_projects", label="Projektek")
+    render_export_buttons("assignments", key="export_assignments", label="Hozzárendelések")
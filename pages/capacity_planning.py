@@ -0,0 +1,167 @@
+import streamlit as st
+from default_data import ensure_base_session_state
+from phase_catalogue import get_phase_catalogue
+from lazy_imports import lazy_import
+from components.sidebar import render_sidebar_navigation, handle_user_not_logged_in
+
+# NumPy, pandas and plotly are only imported once the forecast is computed
+capacity_planning = lazy_import("capacity_planning")
+pd = lazy_import("pandas")
+px = lazy_import("plotly.express")
+
+st.set_page_config(page_title="Kapacitástervezés – ÉpítAI", layout="wide")
+
+ensure_base_session_state(st)
+
+# Check if user is logged in
+handle_user_not_logged_in()
+
+# Render sidebar navigation
+render_sidebar_navigation()
+
+st.title("📈 Kapacitástervezés")
+
+st.write("Az aktív projektek hátralévő feladatainak szakmánkénti munkaerőigénye a következő 12 hónapban, "
+         "összevetve az alkalmazottak és alvállalkozók elérhető kapacitásával. A projektek kezdési dátuma "
+         "módosítható, az előrejelzés azonnal újraszámolódik.")
+
+SIGNAL_ICONS = {
+    "Felvétel": "🧑‍🔧",
+    "Alvállalkozó": "🤝",
+    "Többlet": "🟦",
+    "Rendben": "✅",
+}
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_database_portfolio():
+    """Read the active projects' remaining tasks and the workforce; None without a database or projects"""
+    try:
+        from database import engine
+        from change_notifications import subscribe
+        subscribe(f"{__file__}:load_database_portfolio", ["projects", "resources"],
+                  load_database_portfolio.clear, engine)
+        with engine.connect() as connection:
+            portfolio = capacity_planning.load_portfolio(connection)
+        return portfolio if portfolio.project_names else None
+    except Exception as e:
+        print(f"Failed to load capacity portfolio: {e}")
+        return None
+
+
+def get_portfolio():
+    """The database portfolio if there is one, otherwise the session's projects and resources"""
+    portfolio = load_database_portfolio()
+    if portfolio is not None:
+        return portfolio, "adatbázis"
+    return capacity_planning.session_portfolio(
+        st.session_state.projects, st.session_state.resources, get_phase_catalogue().phases,
+        st.session_state.profession_types,
+    ), "munkamenet"
+
+
+portfolio, source = get_portfolio()
+
+if not portfolio.project_names:
+    st.info("Nincs aktív projekt, amelyhez kapacitást kellene tervezni.")
+    st.stop()
+
+# What-if: other start dates for the projects
+with st.expander("🔀 Mi lenne, ha... – projektek kezdési dátuma"):
+    planned_starts = [start.item() for start in portfolio.project_starts]
+    edited = st.data_editor(
+        pd.DataFrame({
+            "Projekt": portfolio.project_names,
+            "Tervezett kezdés": planned_starts,
+            "Új kezdés": planned_starts,
+        }),
+        column_config={"Új kezdés": st.column_config.DateColumn("Új kezdés", format="YYYY-MM-DD")},
+        disabled=["Projekt", "Tervezett kezdés"],
+        hide_index=True,
+        key="capacity_start_dates",
+    )
+    start_dates = {}
+    for index, (new_start, planned) in enumerate(zip(edited["Új kezdés"], planned_starts)):
+        if pd.notna(new_start) and pd.Timestamp(new_start).date() != planned:
+            start_dates[index] = pd.Timestamp(new_start).date()
+    if start_dates:
+        st.caption(f"{len(start_dates)} projekt kezdése módosítva.")
+
+plan = capacity_planning.compute_capacity(portfolio, start_dates=start_dates)
+rows = pd.DataFrame(capacity_planning.monthly_rows(plan))
+
+st.caption(f"Forrás: {source} · {len(portfolio.project_names)} aktív projekt · "
+           f"{len(portfolio.task_project):,} hátralévő feladat · számítás {plan['seconds'] * 1000:.0f} ms")
+
+# Summary
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Hiány összesen", f"{rows['shortage'].sum():,.0f} embernap")
+col2.metric("Többlet összesen", f"{rows['surplus'].sum():,.0f} embernap")
+col3.metric("Legnagyobb napi hiány", f"{rows['peak_shortage'].max():,.0f} fő")
+col4.metric("Javasolt felvétel", f"{rows.groupby('profession')['hires'].max().sum():,} fő")
+
+# Shortage (-) / surplus (+) per profession and month
+st.subheader("📊 Havi hiány és többlet szakmánként")
+balance = rows.assign(balance=rows["surplus"] - rows["shortage"]).pivot(
+    index="profession", columns="month", values="balance"
+)
+limit = max(float(balance.abs().to_numpy().max()), 1.0)
+fig = px.imshow(
+    balance,
+    color_continuous_scale="RdBu",
+    zmin=-limit,
+    zmax=limit,
+    aspect="auto",
+    text_auto=".0f",
+    labels={"x": "Hónap", "y": "Szakma", "color": "Embernap"},
+)
+st.plotly_chart(fig, use_container_width=True)
+st.caption("Piros: hiány, kék: többlet (embernap). A munkanapokkal számolva, a szabadságok levonásával.")
+
+# Hiring / subcontracting signal
+st.subheader("🚦 Felvételi és alvállalkozói jelzés")
+signals = rows.assign(
+    label=[
+        f"{SIGNAL_ICONS[signal]} {signal}" + (f" ({hires} fő)" if hires else "")
+        for signal, hires in zip(rows["signal"], rows["hires"])
+    ]
+).pivot(index="profession", columns="month", values="label")
+st.dataframe(signals, use_container_width=True)
+st.caption(f"Felvétel: legalább {capacity_planning.HIRING_MIN_SHORTAGE:.0f} fő átlagos hiány "
+           f"{capacity_planning.HIRING_MIN_MONTHS} egymást követő hónapban. Alvállalkozó: rövidebb vagy "
+           f"kisebb hiány. Többlet: a kapacitás kevesebb mint {capacity_planning.SURPLUS_UTILISATION:.0%}-a kell.")
+
+# Daily demand vs supply of one profession
+st.subheader("📅 Napi igény és kapacitás")
+profession = st.selectbox(
+    "Szakma",
+    list(plan["professions"]),
+    index=int(rows.groupby("profession", sort=False)["shortage"].sum().to_numpy().argmax()),
+    key="capacity_profession",
+)
+p = plan["professions"].index(profession)
+daily = pd.DataFrame({
+    "Nap": plan["days"],
+    "Igény": plan["demand"][p],
+    "Alkalmazottak": plan["employees"][p],
+    "Kapacitás": plan["supply"][p],
+})
+fig = px.line(
+    daily,
+    x="Nap",
+    y=["Igény", "Alkalmazottak", "Kapacitás"],
+    line_shape="hv",
+    labels={"value": "Fő", "variable": ""},
+)
+st.plotly_chart(fig, use_container_width=True)
+
+with st.expander("📋 Havi részletek"):
+    st.dataframe(
+        rows[rows["profession"] == profession].rename(columns={
+            "month": "Hónap", "working_days": "Munkanap", "demand": "Igény (embernap)",
+            "supply": "Kapacitás (embernap)", "shortage": "Hiány", "surplus": "Többlet",
+            "peak_shortage": "Csúcshiány (fő)", "hires": "Felvétel (fő)", "signal": "Jelzés",
+        }).drop(columns="profession"),
+        hide_index=True,
+        use_container_width=True,
+    )
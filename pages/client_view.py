@@ -1,9 +1,11 @@
 import streamlit as st
-import requests
-from datetime import datetime, timedelta
-import plotly.express as px
-from default_data import get_default_phases, ensure_base_session_state
+from datetime import datetime
+from default_data import ensure_base_session_state
+from client_snapshot import publish_client_snapshot
 from components.sidebar import render_sidebar_navigation, handle_user_not_logged_in
+from lazy_imports import lazy_import
+
+px = lazy_import("plotly.express")
 
 st.set_page_config(page_title="Ügyfél Nézet – ÉpítAI", layout="wide")
 
@@ -102,119 +104,70 @@ else:
     st.stop()
 
 if selected_project:
+    # Derived values come from the cached snapshot (rebuilt only when the project changes)
+    snapshot = publish_client_snapshot(selected_project)
+
     # Project header with key information
     st.markdown(f"""
     <div class="client-header">
-        <h2>📋 {selected_project['name']}</h2>
-        <p><strong>Projekt típus:</strong> {selected_project.get('type', 'Nincs megadva')}</p>
+        <h2>📋 {snapshot['name']}</h2>
+        <p><strong>Projekt típus:</strong> {snapshot['type']}</p>
     </div>
     """, unsafe_allow_html=True)
+    st.caption(f"🔗 Megosztható állapotoldal: /snapshot/{snapshot['project_id']}")
 
     # Key metrics in a clean layout using native Streamlit components
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📊 Állapot", selected_project.get('status', 'Ismeretlen'))
+        st.metric("📊 Állapot", snapshot['status'])
     
     with col2:
-        st.metric("📅 Kezdés", selected_project.get('start', '-'))
+        st.metric("📅 Kezdés", snapshot['start'])
     
     with col3:
-        st.metric("🎯 Befejezés", selected_project.get('end', '-'))
+        st.metric("🎯 Befejezés", snapshot['end'])
     
     with col4:
-        st.metric("📍 Helyszín", ', '.join(selected_project.get('locations', ['Nincs megadva'])))
+        st.metric("📍 Helyszín", ', '.join(snapshot['locations']))
 
     # Overall progress
     st.markdown("### 📈 Teljes haladás")
-    progress_value = int(selected_project.get("progress", 0))
+    progress_value = snapshot['progress']
     st.progress(progress_value / 100)
     st.markdown(f"<p style='text-align: center; font-size: 1.2em;'><strong>{progress_value}% kész</strong></p>", unsafe_allow_html=True)
 
-    # Project phases with simplified view - only current and next phase
+    # Project phases with simplified view - only current phase
     st.markdown("### 🏗️ Aktuális fázisok")
-    phases_def = get_default_phases()
-    
-    # Ensure project has phases_checked field
-    if "phases_checked" not in selected_project or not selected_project["phases_checked"]:
-        selected_project["phases_checked"] = [[False for _ in p["tasks"]] for p in phases_def]
-
-    # Find current phase (first incomplete phase)
-    current_phase_index = -1
-    for pi, phase in enumerate(phases_def):
-        if pi < len(selected_project["phases_checked"]):
-            phase_total = len(phase["tasks"])
-            phase_done = sum(1 for v in selected_project["phases_checked"][pi] if v)
-            if phase_done < phase_total:
-                current_phase_index = pi
-                break
-    
-    # If all phases are complete, show the last phase
-    if current_phase_index == -1:
-        current_phase_index = len(phases_def) - 1
+    phase = snapshot['current_phase']
     
-    # Show current phase in expander
-    if 0 <= current_phase_index < len(phases_def):
-        phase = phases_def[current_phase_index]
-        phase_total = len(phase["tasks"])
-        phase_done = sum(1 for v in selected_project["phases_checked"][current_phase_index] if v) if current_phase_index < len(selected_project["phases_checked"]) else 0
-        phase_progress = int(phase_done * 100 / phase_total) if phase_total else 0
-        
-        # Calculate current phase days for time-based progress
-        current_phase_days = 0
-        if phase_total > 0:
-            completion_ratio = phase_done / phase_total
-            current_phase_days = int(phase.get('total_duration_days', 0) * completion_ratio)
-        
-        # Calculate total required people for this phase
-        total_required_people = 0
-        for task in phase["tasks"]:
-            if isinstance(task, dict) and "required_people" in task:
-                total_required_people += task.get("required_people", 0)
-        
-        # Time-based progress calculation
-        time_progress = int(current_phase_days * 100 / phase.get('total_duration_days', 1)) if phase.get('total_duration_days', 1) > 0 else 0
-        
+    if phase:
         with st.expander(f"🔄 {phase['name']} - Folyamatban", expanded=True):
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("Feladatok", f"{phase_done}/{phase_total}")
+                st.metric("Feladatok", f"{phase['tasks_done']}/{phase['tasks_total']}")
             with col2:
-                st.metric("Időtartam", f"{phase.get('total_duration_days', 0)} nap")
+                st.metric("Időtartam", f"{phase['duration_days']} nap")
             with col3:
-                st.metric("Szükséges emberek", f"{total_required_people} fő")
+                st.metric("Szükséges emberek", f"{phase['required_people']} fő")
             with col4:
-                st.metric("Haladás", f"{phase_progress}%")
+                st.metric("Haladás", f"{phase['progress']}%")
             
             # Time-based progress bar
-            st.progress(time_progress / 100)
-            st.markdown(f"<p style='text-align: center; color: #666;'><strong>Időbeli haladás: {time_progress}%</strong></p>", unsafe_allow_html=True)
+            st.progress(phase['time_progress'] / 100)
+            st.markdown(f"<p style='text-align: center; color: #666;'><strong>Időbeli haladás: {phase['time_progress']}%</strong></p>", unsafe_allow_html=True)
             
             # Show tasks in a simplified way
             st.markdown("**Feladatok:**")
-            for ti, task in enumerate(phase["tasks"]):
-                is_completed = selected_project["phases_checked"][current_phase_index][ti] if current_phase_index < len(selected_project["phases_checked"]) and ti < len(selected_project["phases_checked"][current_phase_index]) else False
-                
-                # Handle both old string format and new object format
-                if isinstance(task, str):
-                    task_name = task
-                    task_duration = "N/A"
-                    required_people = "N/A"
-                else:
-                    task_name = task.get("name", "Unknown task")
-                    task_duration = task.get("duration_days", "N/A")
-                    required_people = task.get("required_people", "N/A")
-                    if isinstance(task_duration, int):
-                        task_duration = f"{task_duration} nap"
-                    if isinstance(required_people, int):
-                        required_people = f"{required_people} fő"
-                
-                status_icon = "✅" if is_completed else "⏳"
-                css_class = "task-completed" if is_completed else "task-pending"
+            for task in phase['tasks']:
+                task_duration = f"{task['duration_days']} nap" if task['duration_days'] is not None else "N/A"
+                required_people = f"{task['required_people']} fő" if task['required_people'] is not None else "N/A"
+                status_icon = "✅" if task['done'] else "⏳"
+                css_class = "task-completed" if task['done'] else "task-pending"
                 
                 st.markdown(f"""
                 <div class="task-item {css_class}">
-                    {status_icon} {task_name} 
+                    {status_icon} {task['name']} 
                     <span style="float: right; color: #666; font-size: 0.9em;">
                         ⏱️ {task_duration} | 👥 {required_people}
                     </span>
@@ -223,123 +176,69 @@ if selected_project:
     
     # Project timeline summary
     st.markdown("### ⏱️ Projekt időtartam összefoglalás")
-    
-    # Calculate total project duration and remaining time
-    total_project_days = sum(phase.get('total_duration_days', 0) for phase in phases_def)
-    completed_phases_days = 0
-    current_phase_days = 0
-    
-    for pi, phase in enumerate(phases_def):
-        if pi < current_phase_index:
-            # Completed phases
-            completed_phases_days += phase.get('total_duration_days', 0)
-        elif pi == current_phase_index:
-            # Current phase - calculate partial completion
-            phase_total = len(phase["tasks"])
-            phase_done = sum(1 for v in selected_project["phases_checked"][pi] if v) if pi < len(selected_project["phases_checked"]) else 0
-            if phase_total > 0:
-                completion_ratio = phase_done / phase_total
-                current_phase_days = int(phase.get('total_duration_days', 0) * completion_ratio)
-                completed_phases_days += current_phase_days
-    
-    remaining_days = total_project_days - completed_phases_days
-    
-    # Calculate total required people for the entire project
-    total_required_people = 0
-    for phase in phases_def:
-        for task in phase["tasks"]:
-            if isinstance(task, dict) and "required_people" in task:
-                total_required_people += task.get("required_people", 0)
+    summary = snapshot['summary']
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📊 Teljes projekt", f"{total_project_days} nap")
+        st.metric("📊 Teljes projekt", f"{summary['total_days']} nap")
     
     with col2:
-        st.metric("✅ Teljesített", f"{completed_phases_days} nap")
+        st.metric("✅ Teljesített", f"{summary['completed_days']} nap")
     
     with col3:
-        st.metric("⏳ Hátralévő", f"{remaining_days} nap")
+        st.metric("⏳ Hátralévő", f"{summary['remaining_days']} nap")
     
     with col4:
-        st.metric("👥 Szükséges emberek", f"{total_required_people} fő")
+        st.metric("👥 Szükséges emberek", f"{summary['required_people']} fő")
     
     # Estimated completion information
-    try:
-        project_start = datetime.fromisoformat(str(selected_project.get("start", "2025-01-01")))
-        estimated_completion = project_start + timedelta(days=completed_phases_days + remaining_days)
-        current_date = datetime.now()
-        if current_date < estimated_completion:
-            days_until_completion = (estimated_completion - current_date).days
-        else:
-            days_until_completion = 0
-    except:
-        estimated_completion = None
-        days_until_completion = None
+    estimated_completion = datetime.fromisoformat(summary['estimated_completion'])
+    days_until_completion = max((estimated_completion - datetime.now()).days, 0)
+    
+    st.markdown("### 📅 Becsült befejezés")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.metric("Becsült befejezés", estimated_completion.strftime("%Y-%m-%d"))
     
-    if estimated_completion and days_until_completion is not None:
-        st.markdown("### 📅 Becsült befejezés")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.metric("Becsült befejezés", estimated_completion.strftime("%Y-%m-%d"))
-        
-        with col2:
-            if days_until_completion > 0:
-                st.metric("Hátralévő napok", f"{days_until_completion} nap")
-            else:
-                st.metric("Státusz", "Befejezve")
+    with col2:
+        if days_until_completion > 0:
+            st.metric("Hátralévő napok", f"{days_until_completion} nap")
+        else:
+            st.metric("Státusz", "Befejezve")
 
     # Simplified timeline chart
     st.markdown("### 📅 Ütemterv")
-    try:
-        proj_start = datetime.fromisoformat(str(selected_project.get("start", "2025-01-01")))
-        proj_end = datetime.fromisoformat(str(selected_project.get("end", "2025-12-31")))
-        duration_days = max((proj_end - proj_start).days, 1)
-        num_phases = max(len(phases_def), 1)
-        slice_days = max(duration_days // num_phases, 1)
-        
-        rows = []
-        current_start = proj_start
-        for pi, phase in enumerate(phases_def):
-            # Use actual phase duration instead of equal slices
-            phase_duration = phase.get('total_duration_days', slice_days)
-            current_end = current_start + timedelta(days=phase_duration)
-            if pi == num_phases - 1 or current_end > proj_end:
-                current_end = proj_end
-            
-            phase_total = len(phase["tasks"]) or 1
-            phase_done = sum(1 for v in selected_project["phases_checked"][pi] if v) if pi < len(selected_project["phases_checked"]) else 0
-            completion = int(phase_done * 100 / phase_total)
-            
-            rows.append({
-                "Fázis": f"{pi+1}. {phase['name']} ({phase_duration} nap)",
-                "Kezdés": current_start,
-                "Befejezés": current_end,
-                "Készültség": completion,
-            })
-            current_start = current_end
-        
-        if rows:
-            fig = px.timeline(
-                rows,
-                x_start="Kezdés",
-                x_end="Befejezés",
-                y="Fázis",
-                color="Készültség",
-                color_continuous_scale="Blues",
-                title="Projekt ütemterv",
-            )
-            fig.update_yaxes(autorange="reversed")
-            fig.update_layout(
-                height=320, 
-                margin=dict(l=10, r=10, t=40, b=10),
-                title_font_size=16,
-                font=dict(size=12)
-            )
-            st.plotly_chart(fig, use_container_width=True)
-    except Exception as e:
+    rows = [
+        {
+            "Fázis": row['phase'],
+            "Kezdés": row['start'],
+            "Befejezés": row['end'],
+            "Készültség": row['completion'],
+        }
+        for row in snapshot['timeline']
+    ]
+    
+    if rows:
+        fig = px.timeline(
+            rows,
+            x_start="Kezdés",
+            x_end="Befejezés",
+            y="Fázis",
+            color="Készültség",
+            color_continuous_scale="Blues",
+            title="Projekt ütemterv",
+        )
+        fig.update_yaxes(autorange="reversed")
+        fig.update_layout(
+            height=320, 
+            margin=dict(l=10, r=10, t=40, b=10),
+            title_font_size=16,
+            font=dict(size=12)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    else:
         st.info("Ütemterv nem elérhető.")
 
     # Footer with contact information
@@ -1,7 +1,13 @@
 import streamlit as st
 from datetime import date
+from functools import partial
 from default_data import ensure_base_session_state
 from components.sidebar import render_sidebar_navigation, handle_user_not_logged_in
+from components.job_widget import submit_job_button, render_job_status
+from contract_engine import (
+    CONTRACT_TEMPLATES, MAIN_CONTRACTOR, build_contract, build_subcontracts, project_subcontractors,
+    render_text, render_docx, render_pdf, contract_filename,
+)
 
 st.set_page_config(page_title="Szerződéskészítés AI-val – ÉpítAI", layout="wide")
 
@@ -28,22 +34,19 @@ with st.expander("Fontos jogi megjegyzés", expanded=False):
 
 st.write("Töltsd ki az alábbi mezőket a szerződés tervezetéhez.")
 
+projects = st.session_state.projects
+project_options = ["(nincs kiválasztva)"] + [p.get("name", "") for p in projects]
+selected_project_name = st.selectbox("Projekt kiválasztása (kitölti a projekt adatait)", project_options)
+selected_project = next((p for p in projects if p.get("name") == selected_project_name), None)
+
 col1, col2 = st.columns(2)
 with col1:
-    contract_type = st.selectbox(
-        "Szerződés típusa",
-        [
-            "Vállalkozási szerződés",
-            "Alvállalkozói szerződés",
-            "Adatfeldolgozási megállapodás (DPA)",
-            "Titoktartási megállapodás (NDA)",
-        ],
-    )
-    party_a = st.text_input("Megrendelő / Fél A neve", value="Megrendelő Kft.")
+    contract_type = st.selectbox("Szerződés típusa", list(CONTRACT_TEMPLATES))
+    party_a = st.text_input("Megrendelő / Fél A neve", value=(selected_project or {}).get("client") or "Megrendelő Kft.")
     party_b = st.text_input("Vállalkozó / Fél B neve", value="Vállalkozó Bt.")
-    project_name = st.text_input("Projekt megnevezése", value="Családi ház építés")
-    start_on = st.date_input("Kezdés", value=date.today())
-    end_on = st.date_input("Befejezés (tervezett)")
+    project_name = st.text_input("Projekt megnevezése", value=selected_project_name if selected_project else "Családi ház építés")
+    start_on = st.date_input("Kezdés", value=date.fromisoformat(selected_project["start"]) if selected_project else date.today())
+    end_on = st.date_input("Befejezés (tervezett)", value=date.fromisoformat(selected_project["end"]) if selected_project else "today")
 
 with col2:
     scope = st.text_area(
@@ -65,45 +68,72 @@ ack = st.checkbox("Megértettem, hogy a generált szöveg nem minősül jogi tan
 generate = st.button("Szerződéstervezet generálása", disabled=not ack)
 
 if generate:
-    clauses = []
-    clauses.append(f"Szerződés típusa: {contract_type}")
-    clauses.append(f"Felek: {party_a} (Megrendelő) és {party_b} (Vállalkozó)")
-    clauses.append(f"Projekt: {project_name}")
-    clauses.append(f"Időtartam: {start_on.isoformat()} – {end_on.isoformat() if end_on else '(n/a)'}")
-    clauses.append(f"Teljesítés tárgya: {scope}")
-    clauses.append(f"Vállalkozói díj: {price}")
-    clauses.append(f"Fizetési feltételek: {payment}")
-    clauses.append(f"Irányadó jog: {governing_law}")
-    clauses.append(f"Jótállás / szavatosság: {warranty}")
-
-    body = [
-        f"1. Felek\nA szerződő felek: {party_a} és {party_b}.",
-        f"2. A szerződés tárgya\n{scope}",
-        (
-            "3. Határidők\nA teljesítés tervezett időtartama: "
-            f"{start_on.isoformat()} – {end_on.isoformat() if end_on else '(n/a)'}"
-        ),
-        f"4. Díjazás és fizetés\nVállalkozói díj: {price}. Fizetés módja: {payment}.",
-        "5. Teljesítés igazolása\nRész-számlázás mérföldkövek szerint, végszámla átadás-átvétel után.",
-        f"6. Irányadó jog és jogvita rendezése\n{governing_law}. A jogvitákat felek elsősorban egyeztetéssel rendezik.",
-        f"7. Jótállás és szavatosság\n{warranty}.",
-    ]
-
-    if include_nd_conf:
-        body.append(
-            "8. Titoktartás és adatvédelem\nA felek a szerződéssel összefüggő üzleti és személyes adatokat "
-            "bizalmasan kezelik, és azokat kizárólag a teljesítéshez szükséges mértékben használják fel."
-        )
-
-    body.append("9. Vegyes rendelkezések\nA szerződés módosítása csak írásban érvényes.")
-
-    draft = (
-        f"{contract_type}\n\n"
-        f"ALAPADATOK\n" + "\n".join(clauses) + "\n\n"
-        f"RENDELKEZÉSEK\n" + "\n\n".join(body) + "\n\n"
-        "FIGYELMEZTETÉS: A tervezet nem minősül jogi tanácsnak. Ügyvédi felülvizsgálat szükséges."
+    project = dict(selected_project or {}, name=project_name, start=start_on, end=end_on)
+    terms = {
+        "scope": scope,
+        "price": price,
+        "payment": payment,
+        "governing_law": governing_law,
+        "warranty": warranty,
+    }
+    st.session_state.contract_document = build_contract(
+        contract_type, project, party_a, party_b, terms, include_confidentiality=include_nd_conf
     )
 
-    st.text_area("Generált szerződéstervezet", value=draft, height=420)
-
+document = st.session_state.get("contract_document")
+if document:
+    st.text_area("Generált szerződéstervezet", value=render_text(document), height=420)
+
+    # The files are only rendered when a button is clicked, never on a rerun of the page
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "⬇️ Letöltés DOCX",
+            data=partial(render_docx, document),
+            file_name=contract_filename(document, "docx"),
+            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            key="contract_docx",
+            on_click="ignore",
+        )
+    with col2:
+        st.download_button(
+            "⬇️ Letöltés PDF",
+            data=partial(render_pdf, document),
+            file_name=contract_filename(document, "pdf"),
+            mime="application/pdf",
+            key="contract_pdf",
+            on_click="ignore",
+        )
 
+st.markdown("---")
+st.subheader("📦 Alvállalkozói szerződések tömeges generálása")
+st.write("Projektindításkor egy lépésben elkészíthető az összes alvállalkozói szerződés.")
+
+batch_project_name = st.selectbox("Projekt", [p.get("name", "") for p in projects], key="batch_project")
+batch_project = next((p for p in projects if p.get("name") == batch_project_name), None)
+resource_names = [r.get("Név", "") for r in st.session_state.resources if r.get("Név")]
+default_names = [r.get("Név") for r in project_subcontractors(batch_project, st.session_state.resources)] if batch_project else []
+
+batch_names = st.multiselect("Erőforrások", options=resource_names, default=default_names, key="batch_resources")
+batch_formats = st.multiselect("Formátum", options=["pdf", "docx"], default=["pdf"], key="batch_formats")
+batch_ack = st.checkbox("Megértettem, hogy a generált szövegek nem minősülnek jogi tanácsnak.", key="batch_ack")
+
+
+def build_batch_payload():
+    """Documents of the selected subcontracts for the contract_batch job"""
+    batch_resources = [r for r in st.session_state.resources if r.get("Név") in batch_names]
+    batch_terms = {"payment": payment, "governing_law": governing_law, "warranty": warranty}
+    documents = build_subcontracts(batch_project, batch_resources, batch_terms, MAIN_CONTRACTOR, include_nd_conf)
+    return {
+        "documents": documents,
+        "formats": batch_formats,
+        "filename": f"alvallalkozoi_szerzodesek_{date.today().isoformat()}.zip",
+    }
+
+
+# Rendered by a background worker; the page only polls the job's progress
+batch_job_id = submit_job_button(
+    "Szerződések generálása", "contract_batch", build_batch_payload, key="contract_batch",
+    disabled=not (batch_ack and batch_names and batch_formats and batch_project),
+)
+render_job_status(batch_job_id, key="contract_batch")
@@ -1,11 +1,14 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import pandas as pd
+from lazy_imports import lazy_import
 from default_data import ensure_base_session_state
 from components.sidebar import render_sidebar_navigation, handle_user_not_logged_in
 
+px = lazy_import("plotly.express")
+pd = lazy_import("pandas")
+# Deviation labels and threshold; loads SQLAlchemy and the models, so only when deviations are shown
+budget_engine = lazy_import("budget_engine")
+
 st.set_page_config(page_title="ÉpítAI Dashboard", layout="wide", initial_sidebar_state="expanded")
 
 # Initialize session state
@@ -19,90 +22,111 @@ render_sidebar_navigation()
 
 st.title("Dashboard")
 
-# Calculate key metrics
-projects = st.session_state.projects
-resources = st.session_state.resources
-today = datetime.now().date()
 
-# Project status distribution
-status_counts = {}
-for project in projects:
-    status = project.get("status", "Ismeretlen")
-    status_counts[status] = status_counts.get(status, 0) + 1
-
-# Progress metrics
-total_projects = len(projects)
-active_projects = len([p for p in projects if p.get("status") == "Folyamatban"])
-completed_projects = len([p for p in projects if p.get("status") == "Lezárt"])
-overdue_projects = len([p for p in projects if p.get("status") == "Késésben"])
-
-# Overdue projects (past end date)
-overdue_projects_list = []
-for project in projects:
+# Cleared by the change listener when the underlying tables change; the TTL is only a safety net
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_material_price_changes():
+    """Get the latest month-over-month material price change per category from the price history"""
+    try:
+        from database import engine
+        from change_notifications import subscribe
+        from price_analytics import get_price_dashboard_data
+        subscribe(f"{__file__}:load_material_price_changes", ["material_prices", "materials"],
+                  load_material_price_changes.clear, engine)
+        data = get_price_dashboard_data(engine, start=datetime.now().date() - timedelta(days=400))
+        return {category: f"{change:+.1f}%" for category, change in data['category_changes'].items()}
+    except Exception as e:
+        print(f"Failed to load material price changes: {e}")
+        return {}
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_budget_deviations():
+    """Get the largest budget deviations per project from the precomputed deviation table"""
     try:
-        end_date = datetime.strptime(project.get("end", "2025-12-31"), "%Y-%m-%d").date()
-        if end_date < today and project.get("status") not in ["Lezárt"]:
-            overdue_projects_list.append(project)
-    except:
-        pass
-
-# Resource utilization
-total_resources = len(resources)
-available_resources = len([r for r in resources if r.get("Elérhetőség") == "Elérhető"])
-
-# Check for resource overload (working on multiple projects)
-resource_overload = {}
-for resource in resources:
-    if resource.get("Elérhetőség") == "Elérhető":
-        assigned_projects = 0
-        for project in projects:
-            if project.get("status") in ["Folyamatban", "Késésben"]:
-                if resource.get("Név") in project.get("members", []):
-                    assigned_projects += 1
-        if assigned_projects > 1:
-            resource_overload[resource.get("Név", "Névtelen")] = assigned_projects
-
-# Projects by location
-location_counts = {}
-for project in projects:
-    locations = project.get("locations", [])
-    for location in locations:
-        location_counts[location] = location_counts.get(location, 0) + 1
+        from database import engine
+        from change_notifications import subscribe
+        subscribe(f"{__file__}:load_budget_deviations", ["project_budget_deviations", "projects"],
+                  load_budget_deviations.clear, engine)
+        with engine.connect() as connection:
+            return {d['project_name']: d['deviation_percent'] for d in budget_engine.get_budget_deviations(connection)}
+    except Exception as e:
+        print(f"Failed to load budget deviations: {e}")
+        return {}
+
+
+
+def compute_dashboard_metrics(projects, resources, today):
+    """Calculate the dashboard's project and resource metrics from session state"""
+    # Project status distribution
+    status_counts = {}
+    for project in projects:
+        status = project.get("status", "Ismeretlen")
+        status_counts[status] = status_counts.get(status, 0) + 1
 
-# Create tabs for better organization
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📊 Projekt státusz", 
-    "👥 Erőforrások", 
-    "💰 Anyag & Költség", 
-    "🌤️ Időjárás", 
-    "🚨 Riasztások"
-])
+    # Progress metrics
+    total_projects = len(projects)
+    active_projects = len([p for p in projects if p.get("status") == "Folyamatban"])
+    completed_projects = len([p for p in projects if p.get("status") == "Lezárt"])
+    overdue_projects = len([p for p in projects if p.get("status") == "Késésben"])
 
-# Simulate material price changes (in real app, this would come from external API)
-material_price_changes = {
-    "Vasanyag": "+10%",
-    "Beton": "+5%",
-    "Faanyag": "-2%",
-    "Csempe": "+8%"
-}
+    # Overdue projects (past end date)
+    overdue_projects_list = []
+    for project in projects:
+        try:
+            end_date = datetime.strptime(project.get("end", "2025-12-31"), "%Y-%m-%d").date()
+            if end_date < today and project.get("status") not in ["Lezárt"]:
+                overdue_projects_list.append(project)
+        except:
+            pass
 
-# Simulate budget deviations
-budget_deviations = {
-    "Projekt A": "+15% (túllépés)",
-    "Projekt B": "-5% (takarékosság)",
-    "Projekt C": "+25% (sürgős figyelem)"
-}
+    # Resource utilization
+    total_resources = len(resources)
+    available_resources = len([r for r in resources if r.get("Elérhetőség") == "Elérhető"])
 
-# Simulate weather forecast by project location
-weather_forecast = {
-    "Budapest": ["☀️ 22°C", "⛅ 20°C", "🌧️ 18°C", "☀️ 24°C", "⛅ 21°C", "🌧️ 19°C", "☀️ 23°C"],
-    "Debrecen": ["☀️ 25°C", "☀️ 27°C", "⛅ 23°C", "🌧️ 20°C", "☀️ 26°C", "☀️ 28°C", "⛅ 24°C"],
-    "Szeged": ["⛅ 24°C", "🌧️ 21°C", "🌧️ 19°C", "☀️ 25°C", "⛅ 22°C", "☀️ 26°C", "☀️ 27°C"]
-}
+    # Check for resource overload (working on multiple projects)
+    resource_overload = {}
+    for resource in resources:
+        if resource.get("Elérhetőség") == "Elérhető":
+            assigned_projects = 0
+            for project in projects:
+                if project.get("status") in ["Folyamatban", "Késésben"]:
+                    if resource.get("Név") in project.get("members", []):
+                        assigned_projects += 1
+            if assigned_projects > 1:
+                resource_overload[resource.get("Név", "Névtelen")] = assigned_projects
+
+    # Projects by location
+    location_counts = {}
+    for project in projects:
+        locations = project.get("locations", [])
+        for location in locations:
+            location_counts[location] = location_counts.get(location, 0) + 1
+
+    return {
+        "status_counts": status_counts,
+        "total_projects": total_projects,
+        "active_projects": active_projects,
+        "completed_projects": completed_projects,
+        "overdue_projects": overdue_projects,
+        "overdue_projects_list": overdue_projects_list,
+        "total_resources": total_resources,
+        "available_resources": available_resources,
+        "resource_overload": resource_overload,
+        "location_counts": location_counts,
+    }
 
-days = ["Hétfő", "Kedd", "Szerda", "Csütörtök", "Péntek", "Szombat", "Vasárnap"]
 
-with tab1:
+@st.fragment
+def render_status_tab(metrics):
+    """Project status tab"""
+    status_counts = metrics["status_counts"]
+    total_projects = metrics["total_projects"]
+    active_projects = metrics["active_projects"]
+    completed_projects = metrics["completed_projects"]
+    overdue_projects = metrics["overdue_projects"]
+    location_counts = metrics["location_counts"]
+
     # 1. Projekt státusz összefoglaló
     st.subheader("📊 Projekt státusz összefoglaló")
     col1, col2, col3, col4 = st.columns(4)
@@ -174,7 +198,14 @@ with tab1:
     else:
         st.info("Nincs projekt adat megjelenítéshez.")
 
-with tab2:
+
+@st.fragment
+def render_resources_tab(metrics, resources):
+    """Resources tab"""
+    total_resources = metrics["total_resources"]
+    available_resources = metrics["available_resources"]
+    resource_overload = metrics["resource_overload"]
+
     # 2. Erőforrások állapota
     st.subheader("👥 Erőforrások állapota")
     col1, col2, col3 = st.columns(3)
@@ -237,7 +268,10 @@ with tab2:
     else:
         st.info("Nincs szakma adat megjelenítéshez.")
 
-with tab3:
+
+@st.fragment
+def render_costs_tab(material_price_changes, budget_deviations):
+    """Material and cost alerts tab"""
     # 3. Anyag- és költségriasztások
     st.subheader("💰 Anyag- és költségriasztások")
     
@@ -250,14 +284,18 @@ with tab3:
                 st.error(f"📈 {material}: {change}")
             else:
                 st.success(f"📉 {material}: {change}")
+        if not material_price_changes:
+            st.info("Nincs elég árelőzmény az összehasonlításhoz.")
 
     with col2:
         st.write("**Költségkerethez képest eltérés:**")
         for project, deviation in budget_deviations.items():
-            if "túllépés" in deviation or "+" in deviation and int(deviation.split("+")[1].split("%")[0]) > 10:
-                st.error(f"⚠️ {project}: {deviation}")
+            if deviation > budget_engine.BUDGET_OVERRUN_THRESHOLD:
+                st.error(f"⚠️ {project}: {budget_engine.describe_deviation(deviation)}")
             else:
-                st.success(f"✅ {project}: {deviation}")
+                st.success(f"✅ {project}: {budget_engine.describe_deviation(deviation)}")
+        if not budget_deviations:
+            st.info("Nincs költségkerettel rendelkező aktív projekt.")
 
     st.markdown("---")
 
@@ -267,13 +305,10 @@ with tab3:
     # Create cost deviation chart
     cost_data = []
     for project, deviation in budget_deviations.items():
-        percentage = int(deviation.split("+")[1].split("%")[0]) if "+" in deviation else int(deviation.split("-")[1].split("%")[0])
-        if "-" in deviation:
-            percentage = -percentage
         cost_data.append({
             'Projekt': project,
-            'Eltérés (%)': percentage,
-            'Típus': 'Túllépés' if percentage > 10 else 'Takarékosság' if percentage < 0 else 'Normál'
+            'Eltérés (%)': round(deviation, 1),
+            'Típus': budget_engine.classify_deviation(deviation)
         })
     
     if cost_data:
@@ -289,7 +324,10 @@ with tab3:
         fig_cost.update_layout(height=400)
         st.plotly_chart(fig_cost, use_container_width=True)
 
-with tab4:
+
+@st.fragment
+def render_weather_tab(projects, weather_forecast, days):
+    """Weather forecast tab"""
     # 4. Időjárás előrejelzés (AI előkészítve)
     st.subheader("🌤️ Időjárás előrejelzés - Következő 7 nap")
 
@@ -339,7 +377,14 @@ with tab4:
         fig_weather.update_layout(height=400)
         st.plotly_chart(fig_weather, use_container_width=True)
 
-with tab5:
+
+@st.fragment
+def render_alerts_tab(metrics, projects, budget_deviations, weather_forecast, today):
+    """Alerts tab"""
+    overdue_projects = metrics["overdue_projects"]
+    overdue_projects_list = metrics["overdue_projects_list"]
+    resource_overload = metrics["resource_overload"]
+
     # 5. Riasztások (Alert box)
     st.subheader("🚨 Riasztások")
 
@@ -352,7 +397,7 @@ with tab5:
     if len(overdue_projects_list) > 0:
         red_alerts.append(f"🔴 **Sürgős:** {len(overdue_projects_list)} lejárt projekt")
 
-    if any("túllépés" in dev for dev in budget_deviations.values()):
+    if any(dev > budget_engine.BUDGET_OVERRUN_THRESHOLD for dev in budget_deviations.values()):
         red_alerts.append("🔴 **Sürgős:** Költségtúllépés észlelve")
 
     if any("🌧️" in forecast for forecast in weather_forecast.values()):
@@ -401,12 +446,6 @@ with tab5:
     # Alert summary
     st.subheader("📊 Riasztás összefoglaló")
     
-    alert_summary = {
-        'Sürgős (Piros)': len(red_alerts),
-        'Figyelmeztetés (Sárga)': len(yellow_alerts),
-        'Rendben (Zöld)': len(green_alerts)
-    }
-    
     col1, col2, col3 = st.columns(3)
     
     with col1:
@@ -418,5 +457,51 @@ with tab5:
     with col3:
         st.metric("Rendben", len(green_alerts), delta="🟢")
 
+
+# Calculate key metrics
+projects = st.session_state.projects
+resources = st.session_state.resources
+today = datetime.now().date()
+metrics = compute_dashboard_metrics(projects, resources, today)
+
+# Create tabs for better organization
+tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    "📊 Projekt státusz", 
+    "👥 Erőforrások", 
+    "💰 Anyag & Költség", 
+    "🌤️ Időjárás", 
+    "🚨 Riasztások"
+])
+
+# Material price changes from the material_prices history
+material_price_changes = load_material_price_changes()
+
+# Budget deviations (%) from the project_budget_deviations table
+budget_deviations = load_budget_deviations()
+
+# Simulate weather forecast by project location
+weather_forecast = {
+    "Budapest": ["☀️ 22°C", "⛅ 20°C", "🌧️ 18°C", "☀️ 24°C", "⛅ 21°C", "🌧️ 19°C", "☀️ 23°C"],
+    "Debrecen": ["☀️ 25°C", "☀️ 27°C", "⛅ 23°C", "🌧️ 20°C", "☀️ 26°C", "☀️ 28°C", "⛅ 24°C"],
+    "Szeged": ["⛅ 24°C", "🌧️ 21°C", "🌧️ 19°C", "☀️ 25°C", "⛅ 22°C", "☀️ 26°C", "☀️ 27°C"]
+}
+
+days = ["Hétfő", "Kedd", "Szerda", "Csütörtök", "Péntek", "Szombat", "Vasárnap"]
+
+with tab1:
+    render_status_tab(metrics)
+
+with tab2:
+    render_resources_tab(metrics, resources)
+
+with tab3:
+    render_costs_tab(material_price_changes, budget_deviations)
+
+with tab4:
+    render_weather_tab(projects, weather_forecast, days)
+
+with tab5:
+    render_alerts_tab(metrics, projects, budget_deviations, weather_forecast, today)
+
 st.markdown("---")
-st.caption("💡 **Tipp:** Használd a fenti tabokat a különböző területek megtekintéséhez.")
\ No newline at end of file
+st.caption("💡 **Tipp:** Használd a fenti tabokat a különböző területek megtekintéséhez.")
@@ -2,6 +2,7 @@ import streamlit as st
 from datetime import date
 from default_data import ensure_base_session_state
 from components.sidebar import render_sidebar_navigation, handle_user_not_logged_in
+from rfq_engine import MaterialCatalogue, build_rfqs, export_rfqs_zip
 
 st.set_page_config(page_title="Anyagár ajánlatkérés AI-val – ÉpítAI", layout="wide")
 
@@ -18,6 +19,23 @@ st.title("🧠 Anyagár ajánlatkérés AI-val")
 
 st.write("Készíts gyorsan, egységes formátumú ajánlatkérő e-maileket a beszállítóknak.")
 
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def load_material_catalogue():
+    """The materials catalogue with its suppliers; None without a database or materials"""
+    try:
+        from database import engine
+        from change_notifications import subscribe
+        subscribe(f"{__file__}:load_material_catalogue", ["materials", "resources"],
+                  load_material_catalogue.clear, engine)
+        with engine.connect() as connection:
+            catalogue = MaterialCatalogue.from_database(connection)
+        return catalogue if catalogue.names else None
+    except Exception as e:
+        print(f"Failed to load material catalogue: {e}")
+        return None
+
+
 suppliers = [r for r in st.session_state.resources if r.get("Típus") == "Beszállító"]
 supplier_names = [s.get("Név", "") for s in suppliers if s.get("Név")]
 project_names = [p.get("name", "") for p in st.session_state.projects if p.get("name")]
@@ -43,26 +61,40 @@ if submitted:
     if not selected_suppliers:
         st.warning("Válassz ki legalább egy beszállítót.")
     else:
-        st.success("Ajánlatkérő tervezetek elkészítve. Másold a megfelelő e-mail kliensbe.")
-        line_items = [ln.strip() for ln in (materials or "").split("\n") if ln.strip()]
-        line_block = "\n".join(f"- {ln}" for ln in line_items) if line_items else "- (nincs tétel megadva)"
         proj_display = project if project and project != "(nincs kiválasztva)" else "(projekt megnevezése)"
+        # Match against the materials catalogue; the suppliers' product lists when there is no database
+        catalogue = load_material_catalogue() or MaterialCatalogue.from_session_resources(suppliers)
+        result = build_rfqs(materials, catalogue, selected_suppliers, proj_display, need_by.isoformat(), notes)
+
+        st.success("Ajánlatkérő tervezetek elkészítve. Másold a megfelelő e-mail kliensbe, vagy töltsd le .eml fájlokként.")
 
-        for i, name in enumerate(selected_suppliers):
-            with st.expander(f"✉️ E-mail terv – {name}", expanded=False):
-                subject = f"Ajánlatkérés – {proj_display} – anyagár"
-                body = (
-                    f"Tisztelt {name}!\n\n"
-                    f"Az alábbi anyagokra kérnénk árajánlatot a {proj_display} projekthez:\n\n"
-                    f"{line_block}\n\n"
-                    f"Kért szállítási határidő: {need_by.isoformat()}\n"
-                    f"Kérjük, az ajánlat tartalmazza a szállítási és esetleges rakodási költségeket is.\n"
-                    f"{notes.strip()}\n\n"
-                    f"Köszönjük együttműködésüket!\n"
-                    f"Üdvözlettel,\n"
-                    f"ÉpítAI rendszer"
-                )
-                st.text_input("Tárgy", value=subject, key=f"rfq_subject_{i}_{name}")
-                st.text_area("Törzs", value=body, height=220, key=f"rfq_body_{i}_{name}")
+        # Parsed line items and their routing
+        st.dataframe(
+            [
+                {
+                    "Tétel": item["name"],
+                    "Mennyiség": item["quantity"],
+                    "Egység": item["unit"],
+                }
+                for item in result["items"]
+            ],
+            use_container_width=True,
+        )
+        if result["unmatched"]:
+            st.info(
+                "Nem található beszállító ezekhez a tételekhez, ezért minden címzett megkapja őket: "
+                + ", ".join(item["name"] for item in result["unmatched"])
+            )
 
+        st.download_button(
+            "📦 Összes ajánlatkérés letöltése (.eml, zip)",
+            data=export_rfqs_zip(result["rfqs"]),
+            file_name=f"ajanlatkeres_{need_by.isoformat()}.zip",
+            mime="application/zip",
+        )
 
+        for i, rfq in enumerate(result["rfqs"]):
+            name = rfq["supplier"]
+            with st.expander(f"✉️ E-mail terv – {name} ({len(rfq['lines'])} tétel)", expanded=False):
+                st.text_input("Tárgy", value=rfq["subject"], key=f"rfq_subject_{i}_{name}")
+                st.text_area("Törzs", value=rfq["body"], height=220, key=f"rfq_body_{i}_{name}")
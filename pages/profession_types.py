@@ -1,5 +1,5 @@
 import streamlit as st
-from default_data import ensure_base_session_state, get_default_profession_types
+from default_data import ensure_base_session_state, get_default_profession_types, make_editable
 from components.sidebar import render_sidebar_navigation, handle_user_not_logged_in
 
 st.set_page_config(page_title="Szakma típusok – ÉpítAI", layout="wide")
@@ -67,6 +67,7 @@ if selected_index is not None and 0 <= selected_index < len(st.session_state.pro
     col1, col2 = st.columns(2)
     with col1:
         if st.button("💾 Mentés", key=f"save_szakma_{selected_index}"):
+            profession = make_editable(st.session_state.profession_types, selected_index)
             profession["Név"] = new_name
             profession["Leírás"] = new_desc
             profession["Szint"] = new_level
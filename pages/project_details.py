@@ -1,6 +1,7 @@
 import streamlit as st
 from datetime import datetime
-from default_data import ensure_base_session_state
+from default_data import ensure_base_session_state, make_editable, invalidate_resource_profiles
+from client_snapshot import publish_client_snapshot, remove_client_snapshot
 from components.sidebar import render_sidebar_navigation, handle_user_not_logged_in
 from components.project_details_tabs import basic_info, team, phases, locations, schedule, material_costs
 
@@ -24,7 +25,7 @@ else:
     # Get the selected project
     project_index = st.session_state.selected_project_index
     if project_index < len(st.session_state.projects):
-        project = st.session_state.projects[project_index]
+        project = make_editable(st.session_state.projects, project_index)
         
         # Header with project info
         col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
@@ -32,6 +33,8 @@ else:
         with col1:
             st.subheader(f"📋 {project.get('name', 'Névtelen projekt')}")
             st.caption(f"Státusz: {project.get('status', 'Ismeretlen')}")
+            if project.get("archived"):
+                st.caption(f"📦 Archivált projekt ({project.get('archive_year')}) – a módosítások nem kerülnek vissza az archívumba")
         
         with col2:
             if st.button("✏️ Szerkesztés", key="edit_project"):
@@ -125,8 +128,11 @@ else:
                                 "members": new_members,
                                 "locations": locations_list,
                                 "progress": project.get("progress", 0),
-                                "phases_checked": project.get("phases_checked", [])
+                                "phases_checked": project.get("phases_checked", []),
+                                "project_id": project.get("project_id")
                             }
+                            publish_client_snapshot(st.session_state.projects[project_index])
+                            invalidate_resource_profiles(st)
                             st.success("Projekt sikeresen frissítve!")
                             st.session_state.edit_mode = False
                             st.rerun()
@@ -170,9 +176,8 @@ else:
             
             # Progress section
             st.write("### 📊 Haladás")
-            progress = int(project.get("progress", 0))
-            st.progress(progress / 100)
-            st.caption(f"{progress}%")
+            progress_slot = st.empty()
+            phases.render_progress(progress_slot, int(project.get("progress", 0)))
             
             # Detailed information tabs
             tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
@@ -191,7 +196,7 @@ else:
                 team.render_team_tab(project, project_index)
             
             with tab3:
-                phases.render_phases_tab(project, project_index)
+                phases.render_phases_tab(project_index, progress_slot)
             
             with tab4:
                 locations.render_locations_tab(project)
@@ -200,7 +205,7 @@ else:
                 schedule.render_schedule_tab(project)
             
             with tab6:
-                material_costs.render_material_costs_tab(project)
+                material_costs.render_material_costs_tab(project_index)
             
             # Action buttons
             st.markdown("---")
@@ -228,6 +233,7 @@ else:
                 
                 with col1:
                     if st.button("✅ Igen, törlés", key="confirm_delete"):
+                        remove_client_snapshot(project.get("project_id"))
                         del st.session_state.projects[project_index]
                         st.session_state.selected_project_index = None
                         st.session_state.show_delete_confirmation = False
@@ -259,6 +265,7 @@ else:
                             if "members" not in project:
                                 project["members"] = []
                             project["members"].append(selected_resource_name)
+                            invalidate_resource_profiles(st)
                             
                             st.success(f"Tag hozzáadva a projekthez: {selected_resource_name}")
                             st.session_state.show_add_member = False
@@ -1,5 +1,5 @@
 import streamlit as st
-from default_data import get_default_phases, ensure_base_session_state, get_default_project_types, update_phase_durations, calculate_total_project_duration
+from default_data import get_default_phases, ensure_base_session_state, make_editable, get_default_project_types, update_phase_durations, calculate_total_project_duration
 from components.sidebar import render_sidebar_navigation, handle_user_not_logged_in
 
 # Profession types are now handled by ensure_base_session_state
@@ -40,7 +40,7 @@ with st.expander("➕ Új típus hozzáadása", expanded=False):
 selected_index = st.session_state.selected_project_type_index
 
 if selected_index is not None and 0 <= selected_index < len(st.session_state.project_types):
-    ptype = st.session_state.project_types[selected_index]
+    ptype = make_editable(st.session_state.project_types, selected_index)
     st.subheader(ptype.get("Név", "-"))
     st.write(ptype.get("Leírás", "-"))
 
@@ -1,8 +1,13 @@
 import streamlit as st
-from default_data import ensure_base_session_state, get_default_phases
-import pandas as pd
+from default_data import ensure_base_session_state, make_editable, invalidate_resource_profiles
+from phase_catalogue import get_phase_catalogue
+from lazy_imports import lazy_import
 from datetime import datetime, timedelta
 from components.sidebar import render_sidebar_navigation, handle_user_not_logged_in
+from components.fragments import rerun_fragment
+
+# SQLAlchemy and the models are only imported once a profile is read
+resource_profiles = lazy_import("resource_profiles")
 
 st.set_page_config(page_title="Resource Details – ÉpítAI", layout="wide")
 
@@ -16,6 +21,238 @@ render_sidebar_navigation()
 
 st.title("👤 Erőforrás Részletek")
 
+TASK_STATUS_ICONS = {"Completed": "✅", "In Progress": "🔨", "Assigned": "⏳"}
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_stored_profile(resource_type, name):
+    """Read the resource's precomputed profile row; None without a database or a matching resource"""
+    try:
+        from database import engine
+        from change_notifications import subscribe
+        subscribe(f"{__file__}:load_stored_profile", ["resource_profiles"], load_stored_profile.clear, engine)
+        with engine.connect() as connection:
+            return resource_profiles.get_resource_profile(connection, resource_type=resource_type, name=name)
+    except Exception as e:
+        print(f"Failed to load resource profile: {e}")
+        return None
+
+
+def get_resource_profile(resource):
+    """The resource's profile: the stored row if the database has the resource, otherwise built from session state"""
+    profile = load_stored_profile(resource.get("Típus"), resource.get("Név"))
+    if profile is None:
+        session_profiles = st.session_state.setdefault("resource_profiles", {})
+        key = (resource.get("Típus"), resource.get("Név"))
+        if key not in session_profiles:
+            session_profiles[key] = resource_profiles.build_session_profile(
+                resource, st.session_state.projects, get_phase_catalogue().phases
+            )
+        profile = session_profiles[key]
+    return resource_profiles.current_profile(profile)
+
+
+def session_project_index(summary):
+    """Index of a profile's project in st.session_state.projects (by id, then by name)"""
+    for key, value in (("project_id", summary["project_id"]), ("name", summary["name"])):
+        for index, project in enumerate(st.session_state.projects):
+            if value is not None and project.get(key) == value:
+                return index
+    return None
+
+
+@st.fragment
+def render_unavailability_tab(resource_index):
+    """Render the unavailability tab; its buttons and forms rerun only this fragment"""
+    resource = make_editable(st.session_state.resources, resource_index)
+    
+    st.subheader("🚫 Elérhetetlenségi időszakok")
+    
+    # Initialize unavailability periods if not exists
+    if "unavailability_periods" not in resource:
+        resource["unavailability_periods"] = []
+    
+    # Display existing periods
+    if resource["unavailability_periods"]:
+        st.write("**Jelenlegi elérhetetlenségi időszakok:**")
+        
+        for i, period in enumerate(resource["unavailability_periods"]):
+            with st.expander(f"📅 {period['start_date']} - {period['end_date']} ({period['reason']})"):
+                col1, col2, col3 = st.columns([2, 1, 1])
+                
+                with col1:
+                    st.write(f"**Indulás:** {period['start_date']}")
+                    st.write(f"**Befejezés:** {period['end_date']}")
+                    st.write(f"**Ok:** {period['reason']}")
+                    if period.get('notes'):
+                        st.write(f"**Megjegyzés:** {period['notes']}")
+                
+                with col2:
+                    if st.button("✏️ Szerkesztés", key=f"edit_period_{i}"):
+                        st.session_state[f"edit_period_index"] = i
+                        rerun_fragment()
+                
+                with col3:
+                    if st.button("🗑️ Törlés", key=f"delete_period_{i}"):
+                        st.session_state[f"delete_period_index"] = i
+                        rerun_fragment()
+    else:
+        st.info("Nincsenek megadva elérhetetlenségi időszakok.")
+    
+    # Add new period form
+    st.markdown("---")
+    st.subheader("➕ Új elérhetetlenségi időszak hozzáadása")
+    
+    with st.form("add_unavailability_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            start_date = st.date_input(
+                "Kezdő dátum",
+                value=datetime.now().date(),
+                key="new_start_date"
+            )
+            reason = st.selectbox(
+                "Ok",
+                ["Szabadság", "Betegszabadság", "Személyes ok", "Egyéb"],
+                key="new_reason"
+            )
+        
+        with col2:
+            end_date = st.date_input(
+                "Befejező dátum",
+                value=datetime.now().date() + timedelta(days=1),
+                key="new_end_date"
+            )
+            notes = st.text_input(
+                "Megjegyzés (opcionális)",
+                key="new_notes"
+            )
+        
+        if st.form_submit_button("➕ Hozzáadás", type="primary"):
+            if start_date <= end_date:
+                # Check for conflicts
+                conflict = False
+                for existing_period in resource["unavailability_periods"]:
+                    existing_start = datetime.strptime(existing_period["start_date"], "%Y-%m-%d").date()
+                    existing_end = datetime.strptime(existing_period["end_date"], "%Y-%m-%d").date()
+                    
+                    if (start_date <= existing_end and end_date >= existing_start):
+                        conflict = True
+                        break
+                
+                if not conflict:
+                    new_period = {
+                        "start_date": start_date.strftime("%Y-%m-%d"),
+                        "end_date": end_date.strftime("%Y-%m-%d"),
+                        "reason": reason,
+                        "notes": notes
+                    }
+                    resource["unavailability_periods"].append(new_period)
+                    invalidate_resource_profiles(st)
+                    st.success("Elérhetetlenségi időszak sikeresen hozzáadva!")
+                    rerun_fragment()
+                else:
+                    st.error("A megadott időszak ütközik egy meglévő elérhetetlenségi időszakkal!")
+            else:
+                st.error("A kezdő dátum nem lehet későbbi, mint a befejező dátum!")
+    
+    # Edit period dialog
+    if st.session_state.get("edit_period_index") is not None:
+        period_index = st.session_state.edit_period_index
+        period = resource["unavailability_periods"][period_index]
+        
+        st.subheader("✏️ Elérhetetlenségi időszak szerkesztése")
+        
+        with st.form("edit_period_form"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                edit_start_date = st.date_input(
+                    "Kezdő dátum",
+                    value=datetime.strptime(period["start_date"], "%Y-%m-%d").date(),
+                    key="edit_start_date"
+                )
+                edit_reason = st.selectbox(
+                    "Ok",
+                    ["Szabadság", "Betegszabadság", "Személyes ok", "Egyéb"],
+                    index=["Szabadság", "Betegszabadság", "Személyes ok", "Egyéb"].index(period["reason"]),
+                    key="edit_reason"
+                )
+            
+            with col2:
+                edit_end_date = st.date_input(
+                    "Befejező dátum",
+                    value=datetime.strptime(period["end_date"], "%Y-%m-%d").date(),
+                    key="edit_end_date"
+                )
+                edit_notes = st.text_input(
+                    "Megjegyzés (opcionális)",
+                    value=period.get("notes", ""),
+                    key="edit_notes"
+                )
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                if st.form_submit_button("💾 Mentés", type="primary"):
+                    if edit_start_date <= edit_end_date:
+                        # Check for conflicts with other periods
+                        conflict = False
+                        for i, existing_period in enumerate(resource["unavailability_periods"]):
+                            if i != period_index:  # Skip the current period being edited
+                                existing_start = datetime.strptime(existing_period["start_date"], "%Y-%m-%d").date()
+                                existing_end = datetime.strptime(existing_period["end_date"], "%Y-%m-%d").date()
+                                
+                                if (edit_start_date <= existing_end and edit_end_date >= existing_start):
+                                    conflict = True
+                                    break
+                        
+                        if not conflict:
+                            resource["unavailability_periods"][period_index] = {
+                                "start_date": edit_start_date.strftime("%Y-%m-%d"),
+                                "end_date": edit_end_date.strftime("%Y-%m-%d"),
+                                "reason": edit_reason,
+                                "notes": edit_notes
+                            }
+                            invalidate_resource_profiles(st)
+                            st.success("Elérhetetlenségi időszak sikeresen frissítve!")
+                            st.session_state.edit_period_index = None
+                            rerun_fragment()
+                        else:
+                            st.error("A megadott időszak ütközik egy másik elérhetetlenségi időszakkal!")
+                    else:
+                        st.error("A kezdő dátum nem lehet későbbi, mint a befejező dátum!")
+            
+            with col2:
+                if st.form_submit_button("❌ Mégse"):
+                    st.session_state.edit_period_index = None
+                    rerun_fragment()
+    
+    # Delete period confirmation
+    if st.session_state.get("delete_period_index") is not None:
+        period_index = st.session_state.delete_period_index
+        period = resource["unavailability_periods"][period_index]
+        
+        st.warning(f"⚠️ Biztosan törölni szeretnéd ezt az elérhetetlenségi időszakot?")
+        st.write(f"**Időszak:** {period['start_date']} - {period['end_date']} ({period['reason']})")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            if st.button("✅ Igen, törlés", key="confirm_delete_period"):
+                del resource["unavailability_periods"][period_index]
+                invalidate_resource_profiles(st)
+                st.success("Elérhetetlenségi időszak sikeresen törölve!")
+                st.session_state.delete_period_index = None
+                rerun_fragment()
+        
+        with col2:
+            if st.button("❌ Mégse", key="cancel_delete_period"):
+                st.session_state.delete_period_index = None
+                rerun_fragment()
+
+
 # Check if a resource is selected
 if "selected_resource_index" not in st.session_state or st.session_state.selected_resource_index is None:
     st.warning("Nincs kiválasztott erőforrás. Kérjük, válassz ki egy erőforrást a fő Erőforrások oldalról.")
@@ -27,7 +264,7 @@ else:
     # Get the selected resource
     resource_index = st.session_state.selected_resource_index
     if resource_index < len(st.session_state.resources):
-        resource = st.session_state.resources[resource_index]
+        resource = make_editable(st.session_state.resources, resource_index)
         
         # Header with resource info
         col1, col2, col3 = st.columns([2, 1, 1])
@@ -157,6 +394,7 @@ else:
                                 "Tapasztalat": experience_years,
                                 "unavailability_periods": resource.get("unavailability_periods", [])
                             }
+                            invalidate_resource_profiles(st)
                             st.success("Erőforrás sikeresen frissítve!")
                             st.session_state.edit_mode = False
                             st.rerun()
@@ -250,230 +488,82 @@ else:
                     else:
                         st.write("**Cím:** Nincs megadva")
             
+            profile = get_resource_profile(resource)
+
             with tab3:
                 st.subheader("Készségek és szakterületek")
-                skills = resource.get("Készségek", "")
-                if skills:
-                    # Split skills by common separators and clean them
-                    skill_separators = [',', ';', '\n', '|']
-                    skill_list = [skills]
-                    
-                    for separator in skill_separators:
-                        new_skill_list = []
-                        for skill in skill_list:
-                            new_skill_list.extend([s.strip() for s in skill.split(separator) if s.strip()])
-                        skill_list = new_skill_list
-                    
-                    # Remove duplicates while preserving order
-                    unique_skills = []
-                    for skill in skill_list:
-                        if skill not in unique_skills:
-                            unique_skills.append(skill)
+                unique_skills = profile["skills"]
+                if unique_skills:
+                    st.write(f"**{len(unique_skills)}** szakma/készség:")
+                    st.write("")  # Add some spacing
                     
-                    if unique_skills:
-                        st.write(f"**{len(unique_skills)}** szakma/készség:")
-                        st.write("")  # Add some spacing
+                    # Display skills in columns (2 per row for better space utilization)
+                    for i in range(0, len(unique_skills), 2):
+                        cols = st.columns(2)
                         
-                        # Display skills in columns (2 per row for better space utilization)
-                        for i in range(0, len(unique_skills), 2):
-                            cols = st.columns(2)
-                            
-                            for j, col in enumerate(cols):
-                                if i + j < len(unique_skills):
-                                    skill = unique_skills[i + j]
-                                    
-                                    with col:
-                                        st.info(f"🛠️ {skill}")
+                        for j, col in enumerate(cols):
+                            if i + j < len(unique_skills):
+                                with col:
+                                    st.info(f"🛠️ {unique_skills[i + j]}")
                 else:
                     st.info("Nincsenek megadva készségek.")
             
             with tab4:
                 st.subheader("📋 Projektek és feladatok")
                 
-                # Find projects where this resource is involved
-                involved_projects = []
-                for project in st.session_state.projects:
-                    if resource.get("Név") in project.get("members", []):
-                        involved_projects.append(project)
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Aktív projektek", len(profile["active_projects"]))
+                col2.metric("Lekötött órák", f"{profile['booked_hours']:,.0f} óra")
+                col3.metric("Ledolgozott órák", f"{profile['hours_worked']:,.0f} óra")
+                
+                if profile["upcoming_unavailability"]:
+                    next_period = profile["upcoming_unavailability"][0]
+                    st.caption(f"🚫 Következő elérhetetlenség: {next_period['start_date']} - {next_period['end_date']} "
+                               f"({next_period['reason']})")
                 
-                if involved_projects:
-                    st.write(f"Ez az erőforrás **{len(involved_projects)}** projektben vesz részt:")
+                tasks = profile["current_tasks"] + profile["upcoming_tasks"]
+                
+                if profile["active_projects"]:
+                    st.write(f"Ez az erőforrás **{len(profile['active_projects'])}** aktív projektben vesz részt:")
                     st.write("")  # Add some spacing
                     
-                    # Get default phases for task structure
-                    phases_def = get_default_phases()
-                    
                     # Display each project with its tasks
-                    for project_index, project in enumerate(involved_projects):
-                        project_name = project.get('name', 'Névtelen projekt')
-                        project_status = project.get('status', 'Ismeretlen')
-                        project_progress = project.get('progress', 0)
-                        
+                    for project_number, summary in enumerate(profile["active_projects"]):
                         # Project header with navigation button
                         col1, col2 = st.columns([3, 1])
                         
                         with col1:
-                            st.subheader(f"📁 {project_name}")
-                            st.caption(f"Státusz: {project_status} | Haladás: {project_progress}%")
+                            st.subheader(f"📁 {summary['name']}")
+                            st.caption(f"Státusz: {summary['status']} | Haladás: {summary['progress']}%")
                         
                         with col2:
-                            if st.button("🔍 Részletek", key=f"view_project_{project_index}"):
+                            project_index = session_project_index(summary)
+                            if project_index is not None and st.button("🔍 Részletek", key=f"view_project_{project_number}"):
                                 st.session_state.selected_project_index = project_index
                                 st.switch_page("pages/project_details.py")
                         
-                        # Show only relevant tasks for this resource
-                        if "phases_checked" in project and project["phases_checked"]:
-                            # Collect all relevant tasks for this resource
-                            relevant_tasks = []
-                            resource_profession = resource.get("Pozíció", "").lower()
-                            
-                            for phase_index, phase in enumerate(phases_def):
-                                phase_name = phase["name"]
-                                phase_tasks = phase["tasks"]
-                                
-                                # Check if this phase has any tasks
-                                if phase_index < len(project["phases_checked"]):
-                                    phase_checked = project["phases_checked"][phase_index]
-                                    
-                                    for task_index, task in enumerate(phase_tasks):
-                                        if task_index < len(phase_checked):
-                                            is_completed = phase_checked[task_index]
-                                            
-                                            # Handle task format
-                                            if isinstance(task, str):
-                                                task_name = task
-                                                task_profession = ""
-                                                task_duration = "N/A"
-                                            else:
-                                                task_name = task.get("name", "Unknown task")
-                                                task_profession = task.get("profession", "")
-                                                task_duration = task.get("duration_days", "N/A")
-                                                if isinstance(task_duration, int):
-                                                    task_duration = f"{task_duration} nap"
-                                            
-                                            # Check if this resource's profession matches the task
-                                            is_relevant = (task_profession == "" or 
-                                                        task_profession.lower() in resource_profession or
-                                                        resource_profession in task_profession.lower())
-                                            
-                                            if is_relevant:
-                                                relevant_tasks.append({
-                                                    'phase_name': phase_name,
-                                                    'task_name': task_name,
-                                                    'task_profession': task_profession,
-                                                    'task_duration': task_duration,
-                                                    'is_completed': is_completed
-                                                })
-                            
-                            # Display relevant tasks under one expander
-                            if relevant_tasks:
-                                # Limit to 3 tasks for better readability
-                                display_tasks = relevant_tasks
-                                
-                                with st.expander(f"📋 Erőforrás feladatai ({len(display_tasks)} feladat)", expanded=False):
-                                    for task_info in display_tasks:
-                                        status_icon = "✅" if task_info['is_completed'] else "⏳"
-                                        st.write(f"{status_icon} {task_info['task_name']}")
-                                
-                            else:
-                                st.info("Nincsenek feladatok, amelyek ehhez az erőforráshoz tartoznának.")
+                        # Show only this resource's tasks of the project
+                        project_tasks = [task for task in tasks if task["project_id"] == summary["project_id"]]
+                        if project_tasks:
+                            with st.expander(f"📋 Erőforrás feladatai ({len(project_tasks)} feladat)", expanded=False):
+                                for task in project_tasks:
+                                    st.write(f"{TASK_STATUS_ICONS.get(task['status'], '⏳')} {task['task']}"
+                                             + (f" ({task['start']} - {task['end']})" if task["start"] else ""))
                         else:
-                            st.info("Nincsenek megadva fázisok ehhez a projekthez.")
+                            st.info("Nincsenek feladatok, amelyek ehhez az erőforráshoz tartoznának.")
                         
                         st.markdown("---")
                 else:
-                    st.info("Ez az erőforrás még nem vett részt egyetlen projektben sem.")
+                    st.info("Ez az erőforrás jelenleg nem vesz részt aktív projektben.")
+                
+                if profile["past_projects"]:
+                    with st.expander(f"📂 Korábbi projektek ({len(profile['past_projects'])})"):
+                        for summary in profile["past_projects"]:
+                            period = f" ({summary['start']} - {summary['end']})" if summary["start"] else ""
+                            st.write(f"📁 {summary['name']}{period} – {summary['status']}")
             
             with tab5:
-                st.subheader("🚫 Elérhetetlenségi időszakok")
-                
-                # Initialize unavailability periods if not exists
-                if "unavailability_periods" not in resource:
-                    resource["unavailability_periods"] = []
-                
-                # Display existing periods
-                if resource["unavailability_periods"]:
-                    st.write("**Jelenlegi elérhetetlenségi időszakok:**")
-                    
-                    for i, period in enumerate(resource["unavailability_periods"]):
-                        with st.expander(f"📅 {period['start_date']} - {period['end_date']} ({period['reason']})"):
-                            col1, col2, col3 = st.columns([2, 1, 1])
-                            
-                            with col1:
-                                st.write(f"**Indulás:** {period['start_date']}")
-                                st.write(f"**Befejezés:** {period['end_date']}")
-                                st.write(f"**Ok:** {period['reason']}")
-                                if period.get('notes'):
-                                    st.write(f"**Megjegyzés:** {period['notes']}")
-                            
-                            with col2:
-                                if st.button("✏️ Szerkesztés", key=f"edit_period_{i}"):
-                                    st.session_state[f"edit_period_index"] = i
-                                    st.rerun()
-                            
-                            with col3:
-                                if st.button("🗑️ Törlés", key=f"delete_period_{i}"):
-                                    st.session_state[f"delete_period_index"] = i
-                                    st.rerun()
-                else:
-                    st.info("Nincsenek megadva elérhetetlenségi időszakok.")
-                
-                # Add new period form
-                st.markdown("---")
-                st.subheader("➕ Új elérhetetlenségi időszak hozzáadása")
-                
-                with st.form("add_unavailability_form"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        start_date = st.date_input(
-                            "Kezdő dátum",
-                            value=datetime.now().date(),
-                            key="new_start_date"
-                        )
-                        reason = st.selectbox(
-                            "Ok",
-                            ["Szabadság", "Betegszabadság", "Személyes ok", "Egyéb"],
-                            key="new_reason"
-                        )
-                    
-                    with col2:
-                        end_date = st.date_input(
-                            "Befejező dátum",
-                            value=datetime.now().date() + timedelta(days=1),
-                            key="new_end_date"
-                        )
-                        notes = st.text_input(
-                            "Megjegyzés (opcionális)",
-                            key="new_notes"
-                        )
-                    
-                    if st.form_submit_button("➕ Hozzáadás", type="primary"):
-                        if start_date <= end_date:
-                            # Check for conflicts
-                            conflict = False
-                            for existing_period in resource["unavailability_periods"]:
-                                existing_start = datetime.strptime(existing_period["start_date"], "%Y-%m-%d").date()
-                                existing_end = datetime.strptime(existing_period["end_date"], "%Y-%m-%d").date()
-                                
-                                if (start_date <= existing_end and end_date >= existing_start):
-                                    conflict = True
-                                    break
-                            
-                            if not conflict:
-                                new_period = {
-                                    "start_date": start_date.strftime("%Y-%m-%d"),
-                                    "end_date": end_date.strftime("%Y-%m-%d"),
-                                    "reason": reason,
-                                    "notes": notes
-                                }
-                                resource["unavailability_periods"].append(new_period)
-                                st.success("Elérhetetlenségi időszak sikeresen hozzáadva!")
-                                st.rerun()
-                            else:
-                                st.error("A megadott időszak ütközik egy meglévő elérhetetlenségi időszakkal!")
-                        else:
-                            st.error("A kezdő dátum nem lehet későbbi, mint a befejező dátum!")
+                render_unavailability_tab(resource_index)
             
             # Action buttons
             st.markdown("---")
@@ -528,11 +618,13 @@ else:
                     with col1:
                         if st.button("✅ Hozzáadás", key="confirm_add_to_project"):
                             # Find the selected project and add the resource
-                            for project in st.session_state.projects:
+                            for project_index, project in enumerate(st.session_state.projects):
                                 if project.get("name") == selected_project_name:
+                                    project = make_editable(st.session_state.projects, project_index)
                                     if "members" not in project:
                                         project["members"] = []
                                     project["members"].append(resource.get("Név"))
+                                    invalidate_resource_profiles(st)
                                     break
                             
                             st.success(f"Erőforrás hozzáadva a '{selected_project_name}' projekthez!")
@@ -548,99 +640,6 @@ else:
                     if st.button("❌ Bezárás", key="close_add_to_project"):
                         st.session_state.show_add_to_project = False
                         st.rerun()
-            
-            # Edit period dialog
-            if st.session_state.get("edit_period_index") is not None:
-                period_index = st.session_state.edit_period_index
-                period = resource["unavailability_periods"][period_index]
-                
-                st.subheader("✏️ Elérhetetlenségi időszak szerkesztése")
-                
-                with st.form("edit_period_form"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        edit_start_date = st.date_input(
-                            "Kezdő dátum",
-                            value=datetime.strptime(period["start_date"], "%Y-%m-%d").date(),
-                            key="edit_start_date"
-                        )
-                        edit_reason = st.selectbox(
-                            "Ok",
-                            ["Szabadság", "Betegszabadság", "Személyes ok", "Egyéb"],
-                            index=["Szabadság", "Betegszabadság", "Személyes ok", "Egyéb"].index(period["reason"]),
-                            key="edit_reason"
-                        )
-                    
-                    with col2:
-                        edit_end_date = st.date_input(
-                            "Befejező dátum",
-                            value=datetime.strptime(period["end_date"], "%Y-%m-%d").date(),
-                            key="edit_end_date"
-                        )
-                        edit_notes = st.text_input(
-                            "Megjegyzés (opcionális)",
-                            value=period.get("notes", ""),
-                            key="edit_notes"
-                        )
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        if st.form_submit_button("💾 Mentés", type="primary"):
-                            if edit_start_date <= edit_end_date:
-                                # Check for conflicts with other periods
-                                conflict = False
-                                for i, existing_period in enumerate(resource["unavailability_periods"]):
-                                    if i != period_index:  # Skip the current period being edited
-                                        existing_start = datetime.strptime(existing_period["start_date"], "%Y-%m-%d").date()
-                                        existing_end = datetime.strptime(existing_period["end_date"], "%Y-%m-%d").date()
-                                        
-                                        if (edit_start_date <= existing_end and edit_end_date >= existing_start):
-                                            conflict = True
-                                            break
-                                
-                                if not conflict:
-                                    resource["unavailability_periods"][period_index] = {
-                                        "start_date": edit_start_date.strftime("%Y-%m-%d"),
-                                        "end_date": edit_end_date.strftime("%Y-%m-%d"),
-                                        "reason": edit_reason,
-                                        "notes": edit_notes
-                                    }
-                                    st.success("Elérhetetlenségi időszak sikeresen frissítve!")
-                                    st.session_state.edit_period_index = None
-                                    st.rerun()
-                                else:
-                                    st.error("A megadott időszak ütközik egy másik elérhetetlenségi időszakkal!")
-                            else:
-                                st.error("A kezdő dátum nem lehet későbbi, mint a befejező dátum!")
-                    
-                    with col2:
-                        if st.form_submit_button("❌ Mégse"):
-                            st.session_state.edit_period_index = None
-                            st.rerun()
-            
-            # Delete period confirmation
-            if st.session_state.get("delete_period_index") is not None:
-                period_index = st.session_state.delete_period_index
-                period = resource["unavailability_periods"][period_index]
-                
-                st.warning(f"⚠️ Biztosan törölni szeretnéd ezt az elérhetetlenségi időszakot?")
-                st.write(f"**Időszak:** {period['start_date']} - {period['end_date']} ({period['reason']})")
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    if st.button("✅ Igen, törlés", key="confirm_delete_period"):
-                        del resource["unavailability_periods"][period_index]
-                        st.success("Elérhetetlenségi időszak sikeresen törölve!")
-                        st.session_state.delete_period_index = None
-                        st.rerun()
-                
-                with col2:
-                    if st.button("❌ Mégse", key="cancel_delete_period"):
-                        st.session_state.delete_period_index = None
-                        st.rerun()
     else:
         st.error("A kiválasztott erőforrás nem található.")
         st.session_state.selected_resource_index = None
@@ -1,6 +1,8 @@
 import streamlit as st
-from default_data import ensure_base_session_state
+from default_data import ensure_base_session_state, invalidate_resource_profiles
 from components.sidebar import render_sidebar_navigation, handle_user_not_logged_in
+from components.export_buttons import render_export_buttons
+from components.import_panel import render_import_panel
 
 st.set_page_config(page_title="Resources – ÉpítAI", layout="wide")
 
@@ -79,6 +81,38 @@ with st.expander("➕ Új erőforrás"):
         else:
             st.error("A név megadása kötelező!")
 
+# Import columns -> keys of the resource dicts in session state
+IMPORTED_RESOURCE_KEYS = {
+    "type": "Típus", "name": "Név", "position": "Pozíció", "phone": "Telefonszám", "email": "E-mail",
+    "address": "Cím", "skills": "Készségek", "hourly_rate": "Órabér", "availability": "Elérhetőség",
+    "experience_years": "Tapasztalat",
+}
+
+
+def merge_imported_resources(kind, frame):
+    """Show imported resources in the list: update the same type and e-mail (the import key), append the rest"""
+    if kind != "resources":
+        return
+    invalidate_resource_profiles(st)
+    index = {(r.get("Típus"), r["E-mail"].lower()): i for i, r in enumerate(st.session_state.resources)
+             if r.get("E-mail")}
+    for row in frame.to_dict("records"):
+        resource = {IMPORTED_RESOURCE_KEYS[column]: value for column, value in row.items()
+                    if column in IMPORTED_RESOURCE_KEYS and value is not None}
+        resource["Órabér"] = float(resource.get("Órabér") or 0)
+        resource["Tapasztalat"] = int(resource.get("Tapasztalat") or 0)
+        key = (resource["Típus"], resource["E-mail"].lower())
+        position = index.get(key)
+        if position is None:
+            index[key] = len(st.session_state.resources)
+            st.session_state.resources.append(resource)
+        else:
+            st.session_state.resources[position] = {**st.session_state.resources[position], **resource}
+
+
+with st.expander("📥 Tömeges importálás (CSV / Excel)"):
+    render_import_panel("resource_import", on_rows=merge_imported_resources)
+
 
 st.write("### Aktuális erőforrások")
 
@@ -139,4 +173,7 @@ with tab2:
     render_resource_list(subs, "sub_")
 
 with tab3:
-    render_resource_list(sups, "sup_")
\ No newline at end of file
+    render_resource_list(sups, "sup_")
+with st.expander("📤 Exportálás", expanded=False):
+    st.caption("Erőforrások letöltése az adatbázisból.")
+    render_export_buttons("resources", key="export_resources", label="Erőforrások")
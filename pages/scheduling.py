@@ -1,9 +1,10 @@
 import streamlit as st
-import pandas as pd
 import random
 from datetime import date, timedelta
-from default_data import ensure_base_session_state, get_default_phases
+from default_data import ensure_base_session_state
+from phase_catalogue import get_phase_catalogue
 from components.sidebar import render_sidebar_navigation, handle_user_not_logged_in
+from components.fragments import rerun_fragment
 import random
 
 st.set_page_config(page_title="Következő nap ütemezése – ÉpítAI", layout="wide")
@@ -22,13 +23,9 @@ st.title("📅 Ütemezés")
 st.write("Az erőforrások hozzárendelése a kiválasztott dátumtól kezdve történik. Amint egy erőforrás egy feladathoz lett rendelve, a befejezésig vagy módosításig azon a feladaton marad.")
 
 
-def get_random_tasks():
-    """Get random tasks from default phases"""
-    phases = get_default_phases()
-    all_tasks = []
-    for phase in phases:
-        for task in phase.get("tasks", []):
-            all_tasks.append(task.get("name", ""))
+def get_random_tasks(catalogue=None):
+    """Get random tasks from the phase catalogue"""
+    all_tasks = (catalogue or get_phase_catalogue()).task_names
     
     # Return 1-4 random tasks
     num_tasks = random.randint(1, 4)
@@ -68,13 +65,9 @@ def get_fake_weather_data(location_name: str):
         "daily": daily_data
     }
 
-def get_task_profession(task_name, phases):
-    """Get the required profession for a task from phases"""
-    for phase in phases:
-        for task in phase.get("tasks", []):
-            if task.get("name") == task_name:
-                return task.get("profession", "")
-    return ""
+def get_task_profession(task_name, catalogue):
+    """Get the required profession for a task from the phase catalogue"""
+    return catalogue.profession_of(task_name)
 
 def get_used_resources_from_session():
     """Get all currently assigned resources from session state"""
@@ -122,7 +115,6 @@ def get_available_resources_for_task(task_profession, used_resources):
 def get_tasks_grouped_by_location():
     """Get all tasks grouped by location"""
     location_groups = {}
-    phases = get_default_phases()
     
     projects_in_progress = [
         p for p in st.session_state.projects if p.get("status") == "Folyamatban" or p.get("status") == "Késésben"
@@ -131,6 +123,7 @@ def get_tasks_grouped_by_location():
     for project in projects_in_progress:
         project_name = project.get("name", "")
         locations = project.get("locations", [])
+        catalogue = get_phase_catalogue(project.get("type"))
         
         # Get weather data for projects with locations
         if locations:
@@ -152,10 +145,10 @@ def get_tasks_grouped_by_location():
             weather_summary = "Helyszín nincs megadva"
         
         # Get tasks for this project
-        actual_tasks = project.get("current_tasks", []) or get_random_tasks()
+        actual_tasks = project.get("current_tasks", []) or get_random_tasks(catalogue)
         
         for i, task in enumerate(actual_tasks):
-            task_profession = get_task_profession(task, phases)
+            task_profession = get_task_profession(task, catalogue)
             location = locations[0] if locations else "Helyszín nincs megadva"
             
             # Group by location
@@ -180,125 +173,116 @@ def get_tasks_grouped_by_location():
     return location_groups
 
 
-ensure_base_session_state(st)
+@st.fragment
+def render_location_assignments(location, location_data, used_resources):
+    """Render the assignment table of one location
 
-col_a, col_b = st.columns([1, 2])
-with col_a:
-    current_date = st.date_input("Dátum kiválasztása", value=date.today())
-
-if not st.session_state.projects:
-    st.info("Nincs projekt a rendszerben. Adj hozzá projekteket a Projektek oldalon.")
-    st.stop()
-
-projects_in_progress = [
-    p for p in st.session_state.projects if p.get("status") == "Folyamatban" or p.get("status") == "Késésben"
-]
-if not projects_in_progress:
-    st.info("Nincs folyamatban lévő projekt a rendszerben.")
-    st.stop()
-
-
-# Get tasks grouped by location
-location_groups = get_tasks_grouped_by_location()
-
-# Initialize task assignments in session state if not exists
-if "task_assignments" not in st.session_state:
-    st.session_state.task_assignments = {}
-
-if location_groups:
-    tab1, tab2 = st.tabs(["Feladat-hozzárendelés", "Erőforrás-helyszín táblázat"])
-    with tab1:
-        # Get currently used resources from session state
-        used_resources = get_used_resources_from_session()
+    Runs as its own fragment: changing a task's multiselect reruns only this
+    location. The save button of render_assignments stores the selections of
+    every location at once.
+    """
+    tasks = location_data["tasks"]
+    weather_summary = location_data["weather_summary"]
+    can_progress = location_data["can_progress"]
+    
+    # Determine container color based on weather
+    if can_progress:
+        container_color = "green"
+        status_icon = "✅"
+    else:
+        container_color = "orange"
+        status_icon = "⚠️"
+    
+    # Create colored container for this location
+    with st.container():
+        # Add custom CSS for colored background
+        st.markdown(f"""
+        <div style="
+            background-color: {'#d4edda' if container_color == 'green' else '#fff3cd'};
+            border: 2px solid {'#c3e6cb' if container_color == 'green' else '#ffeaa7'};
+            border-radius: 10px;
+            padding: 15px;
+            margin: 10px 0;
+        ">
+        """, unsafe_allow_html=True)
         
-        # Create a form for all
-        with st.form("task_assignments_form"):
-            # Display each location as a separate table
-            for location, location_data in location_groups.items():
-                tasks = location_data["tasks"]
-                weather_summary = location_data["weather_summary"]
-                can_progress = location_data["can_progress"]
-                
-                # Determine container color based on weather
-                if can_progress:
-                    container_color = "green"
-                    status_icon = "✅"
-                else:
-                    container_color = "orange"
-                    status_icon = "⚠️"
+        # Location header with weather info
+        st.markdown(f"### 📍 {location} {status_icon}")
+        
+        if weather_summary != "Helyszín nincs megadva":
+            st.caption(f"Időjárás: {weather_summary}")
+        
+        # Create table for this location
+        col1, col2, col3 = st.columns([2, 2, 2])
+        
+        with col1:
+            st.markdown("**Projekt**")
+        with col2:
+            st.markdown("**Feladat**")
+        with col3:
+            st.markdown("**Hozzárendelt szakemberek**")
+        
+        st.markdown("---")
+        
+        # Display each task as a row
+        for row in tasks:
+            col1, col2, col3 = st.columns([2, 2, 2])
+            
+            with col1:
+                st.write(row["Projekt"])
+            with col2:
+                st.write(row["Feladat"])
+            with col3:
+                # Get available resources for this task
+                task_profession = row["Szükséges szakma"]
+                available_resources = get_available_resources_for_task(task_profession, used_resources)
                 
-                # Create colored container for this location
-                with st.container():
-                    # Add custom CSS for colored background
-                    st.markdown(f"""
-                    <div style="
-                        background-color: {'#d4edda' if container_color == 'green' else '#fff3cd'};
-                        border: 2px solid {'#c3e6cb' if container_color == 'green' else '#ffeaa7'};
-                        border-radius: 10px;
-                        padding: 15px;
-                        margin: 10px 0;
-                    ">
-                    """, unsafe_allow_html=True)
-                    
-                    # Location header with weather info
-                    st.markdown(f"### 📍 {location} {status_icon}")
+                if available_resources:
+                    # Get current assignments for this task
+                    task_id = row["task_id"]
+                    current_assignments = st.session_state.task_assignments.get(task_id, [])
                     
-                    if weather_summary != "Helyszín nincs megadva":
-                        st.caption(f"Időjárás: {weather_summary}")
+                    # Ensure current_assignments is a list
+                    if not isinstance(current_assignments, list):
+                        current_assignments = []
                     
-                    # Create table for this location
-                    col1, col2, col3 = st.columns([2, 2, 2])
+                    # Create resource options; the task's own assignments stay selectable
+                    resource_options = [f"{r.get('Név', '')} ({r.get('Pozíció', 'Ismeretlen')})" for r in available_resources]
+                    resource_options += [a for a in current_assignments if a not in resource_options]
                     
-                    with col1:
-                        st.markdown("**Projekt**")
-                    with col2:
-                        st.markdown("**Feladat**")
-                    with col3:
-                        st.markdown("**Hozzárendelt szakemberek**")
-                    
-                    st.markdown("---")
-                    
-                    # Display each task as a row
-                    for row in tasks:
-                        col1, col2, col3 = st.columns([2, 2, 2])
-                        
-                        with col1:
-                            st.write(row["Projekt"])
-                        with col2:
-                            st.write(row["Feladat"])
-                        with col3:
-                            # Get available resources for this task
-                            task_profession = row["Szükséges szakma"]
-                            available_resources = get_available_resources_for_task(task_profession, used_resources)
-                            
-                            if available_resources:
-                                # Create resource options
-                                resource_options = [f"{r.get('Név', '')} ({r.get('Pozíció', 'Ismeretlen')})" for r in available_resources]
-                                
-                                # Get current assignments for this task
-                                task_id = row["task_id"]
-                                current_assignments = st.session_state.task_assignments.get(task_id, [])
-                                
-                                # Ensure current_assignments is a list
-                                if not isinstance(current_assignments, list):
-                                    current_assignments = []
-                                
-                                # Resource assignment multi-select
-                                selected_resources = st.multiselect(
-                                    "",
-                                    options=resource_options,
-                                    default=current_assignments,
-                                    key=f"assign_{task_id}",
-                                    label_visibility="collapsed"
-                                )
-                    
-                    # Close the colored container
-                    st.markdown("</div>", unsafe_allow_html=True)
+                    # Resource assignment multi-select
+                    st.multiselect(
+                        "",
+                        options=resource_options,
+                        default=current_assignments,
+                        key=f"assign_{task_id}",
+                        label_visibility="collapsed"
+                    )
+        
+        # Close the colored container
+        st.markdown("</div>", unsafe_allow_html=True)
+
+
+@st.fragment
+def render_assignments(location_groups):
+    """Render the assignment tabs and the summary
+
+    Runs as a fragment: saving or clearing assignments reruns only this part
+    of the page, so the location groups (weather and task lookups) are not
+    rebuilt on every interaction. Each location is a nested fragment of its own.
+    """
+    if location_groups:
+        tab1, tab2 = st.tabs(["Feladat-hozzárendelés", "Erőforrás-helyszín táblázat"])
+        with tab1:
+            # Get currently used resources from session state
+            used_resources = get_used_resources_from_session()
             
-            # Single save button for all assignments
-            submitted = st.form_submit_button("💾 Összes hozzárendelés mentése", type="primary")
+            # Display each location as a separate table
+            for location, location_data in location_groups.items():
+                render_location_assignments(location, location_data, used_resources)
             
-            if submitted:
+            # Single save button for all assignments
+            if st.button("💾 Összes hozzárendelés mentése", type="primary"):
                 # Update session state with all selections from all locations
                 for location, location_data in location_groups.items():
                     for row in location_data["tasks"]:
@@ -307,99 +291,125 @@ if location_groups:
                         if multiselect_key in st.session_state:
                             st.session_state.task_assignments[task_id] = st.session_state[multiselect_key]
                 st.success("✅ Összes hozzárendelés mentve!")
-                st.rerun()
+                rerun_fragment()
             else:
                 st.info("Nincs feladat az időszakban.")
 
-    with tab2:
-        st.subheader("👥 Erőforrás-helyszín táblázat")
-        
-        # Get all available resources (excluding suppliers)
-        available_resources = [
-            r for r in st.session_state.resources 
-            if r.get("Típus") != "Beszállító" and r.get("Név")
-        ]
-        
-        if available_resources:
-            # Create a table showing resources and their assigned locations
-            table_data = []
+        with tab2:
+            st.subheader("👥 Erőforrás-helyszín táblázat")
             
-            for resource in available_resources:
-                resource_name = resource.get("Név", "")
-                resource_position = resource.get("Pozíció", "Ismeretlen")
-                
-                # Find assigned locations for this resource
-                assigned_locations = set()
+            # Get all available resources (excluding suppliers)
+            available_resources = [
+                r for r in st.session_state.resources 
+                if r.get("Típus") != "Beszállító" and r.get("Név")
+            ]
+            
+            if available_resources:
+                # Create a table showing resources and their assigned locations
+                table_data = []
                 
-                for task_id, assignments in st.session_state.task_assignments.items():
-                    if isinstance(assignments, list):
-                        for assignment in assignments:
-                            if assignment.startswith(resource_name):
-                                # Find the task details
-                                for location, location_data in location_groups.items():
-                                    for task_row in location_data["tasks"]:
-                                        if task_row["task_id"] == task_id:
-                                            assigned_locations.add(location)
-                                            break
+                for resource in available_resources:
+                    resource_name = resource.get("Név", "")
+                    resource_position = resource.get("Pozíció", "Ismeretlen")
+                    
+                    # Find assigned locations for this resource
+                    assigned_locations = set()
+                    
+                    for task_id, assignments in st.session_state.task_assignments.items():
+                        if isinstance(assignments, list):
+                            for assignment in assignments:
+                                if assignment.startswith(resource_name):
+                                    # Find the task details
+                                    for location, location_data in location_groups.items():
+                                        for task_row in location_data["tasks"]:
+                                            if task_row["task_id"] == task_id:
+                                                assigned_locations.add(location)
+                                                break
+                    
+                    # Create table row
+                    if assigned_locations:
+                        locations_text = ", ".join(sorted(assigned_locations))
+                    else:
+                        locations_text = "Nincs hozzárendelve"
+                    
+                    table_data.append({
+                        "Erőforrás": f"{resource_name} ({resource_position})",
+                        "Helyszín": locations_text,
+                    })
                 
-                # Create table row
-                if assigned_locations:
-                    locations_text = ", ".join(sorted(assigned_locations))
+                # Display the table using st.table with index starting from 1
+                if table_data:
+                    import pandas as pd
+                    df = pd.DataFrame(table_data)
+                    df.index = df.index + 1  # Start index from 1
+                    st.table(df)
                 else:
-                    locations_text = "Nincs hozzárendelve"
-                
-                table_data.append({
-                    "Erőforrás": f"{resource_name} ({resource_position})",
-                    "Helyszín": locations_text,
-                })
-            
-            # Display the table using st.table with index starting from 1
-            if table_data:
-                import pandas as pd
-                df = pd.DataFrame(table_data)
-                df.index = df.index + 1  # Start index from 1
-                st.table(df)
+                    st.info("Nincsenek hozzárendelt erőforrások.")
             else:
-                st.info("Nincsenek hozzárendelt erőforrások.")
-        else:
-            st.info("Nincsenek elérhető erőforrások.")
+                st.info("Nincsenek elérhető erőforrások.")
+
+    # Show current assignments summary
+    if "task_assignments" in st.session_state and st.session_state.task_assignments:
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            st.subheader("📋 Aktuális hozzárendelések összefoglalója")
+        
+        with col2:
+            if st.button("🗑️ Összes hozzárendelés törlése", type="secondary"):
+                st.session_state.task_assignments = {}
+                st.success("✅ Összes hozzárendelés törölve!")
+                rerun_fragment()
+        
+        assignment_summary = {}
+        for task_id, assignments in st.session_state.task_assignments.items():
+            if isinstance(assignments, list) and assignments:
+                # Extract project and task from task_id
+                parts = task_id.split("_", 2)
+                if len(parts) >= 3:
+                    project_name = parts[0]
+                    task_name = parts[2]
+                    
+                    if project_name not in assignment_summary:
+                        assignment_summary[project_name] = []
+                    
+                    assignment_summary[project_name].append({
+                        "task": task_name,
+                        "resources": assignments
+                    })
+        
+        if assignment_summary:
+            for project_name, tasks in assignment_summary.items():
+                with st.expander(f"📁 {project_name}", expanded=False):
+                    for task_info in tasks:
+                        st.write(f"**{task_info['task']}:** {', '.join(task_info['resources'])}")
+                    else:
+                        st.info("Nincsenek aktív hozzárendelések.")
 
-# Show current assignments summary
-if "task_assignments" in st.session_state and st.session_state.task_assignments:
-    col1, col2 = st.columns([3, 1])
-    
-    with col1:
-        st.subheader("📋 Aktuális hozzárendelések összefoglalója")
-    
-    with col2:
-        if st.button("🗑️ Összes hozzárendelés törlése", type="secondary"):
-            st.session_state.task_assignments = {}
-            st.success("✅ Összes hozzárendelés törölve!")
-            st.rerun()
-    
-    assignment_summary = {}
-    for task_id, assignments in st.session_state.task_assignments.items():
-        if isinstance(assignments, list) and assignments:
-            # Extract project and task from task_id
-            parts = task_id.split("_", 2)
-            if len(parts) >= 3:
-                project_name = parts[0]
-                task_name = parts[2]
-                
-                if project_name not in assignment_summary:
-                    assignment_summary[project_name] = []
-                
-                assignment_summary[project_name].append({
-                    "task": task_name,
-                    "resources": assignments
-                })
-    
-    if assignment_summary:
-        for project_name, tasks in assignment_summary.items():
-            with st.expander(f"📁 {project_name}", expanded=False):
-                for task_info in tasks:
-                    st.write(f"**{task_info['task']}:** {', '.join(task_info['resources'])}")
-                else:
-                    st.info("Nincsenek aktív hozzárendelések.")
 
+ensure_base_session_state(st)
+
+col_a, col_b = st.columns([1, 2])
+with col_a:
+    current_date = st.date_input("Dátum kiválasztása", value=date.today())
+
+if not st.session_state.projects:
+    st.info("Nincs projekt a rendszerben. Adj hozzá projekteket a Projektek oldalon.")
+    st.stop()
+
+projects_in_progress = [
+    p for p in st.session_state.projects if p.get("status") == "Folyamatban" or p.get("status") == "Késésben"
+]
+if not projects_in_progress:
+    st.info("Nincs folyamatban lévő projekt a rendszerben.")
+    st.stop()
+
+
+# Get tasks grouped by location
+location_groups = get_tasks_grouped_by_location()
+
+# Initialize task assignments in session state if not exists
+if "task_assignments" not in st.session_state:
+    st.session_state.task_assignments = {}
 
+render_assignments(location_groups)
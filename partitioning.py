@@ -0,0 +1,300 @@
+"""
+Table partitioning for ÉpítAI Construction Management System
+
+weather_data (locations × days) and task_assignments (every planning cycle)
+are range partitioned by month on PostgreSQL:
+
+- weather_data by `date`, task_assignments by `start_date`
+- partitions are named <table>_pYYYYMM, plus a <table>_default catch-all so
+  inserts never fail when maintenance has not run
+- ensure_partitions creates the current month and the months ahead; rows that
+  landed in the default partition are moved into the new partition
+- split_default_partition gives every month found in the default partition
+  (rows loaded later with older or far-future dates) its own partition
+- apply_retention detaches (and drops) weather partitions older than the
+  retention window, a catalogue operation that does not depend on table size
+
+Queries should filter on the partition column with plain comparisons
+(see build_weather_range_query / build_assignment_range_query) so the planner
+can prune partitions. On SQLite the tables stay unpartitioned and retention
+falls back to a DELETE.
+
+Usage:
+  python partitioning.py maintain [--ahead 3] [--weather-retention-months 24] [--keep-detached]
+  python partitioning.py list
+"""
+
+import os
+import re
+import sys
+from datetime import date
+from typing import Optional, List, Dict
+
+from sqlalchemy import text
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+PARTITIONS_AHEAD = int(os.getenv('PARTITIONS_AHEAD_MONTHS', '3'))
+WEATHER_RETENTION_MONTHS = int(os.getenv('WEATHER_RETENTION_MONTHS', '24'))
+
+# table -> partition column and retention in months (None keeps everything)
+PARTITIONED_TABLES = {
+    'weather_data': {'column': 'date', 'retention_months': WEATHER_RETENTION_MONTHS},
+    'task_assignments': {'column': 'start_date', 'retention_months': None},
+}
+
+_BOUND_PATTERN = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)")
+
+
+def month_start(day: date) -> date:
+    """First day of the day's month"""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Shift a month start by a number of months"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of a table's monthly partition"""
+    return f"{table}_p{month.year:04d}{month.month:02d}"
+
+
+def default_partition_name(table: str) -> str:
+    """Name of a table's catch-all partition"""
+    return f"{table}_default"
+
+
+def is_partitioned(connection, table: str) -> bool:
+    """Check if a table is a partitioned table (PostgreSQL only)"""
+    if connection.dialect.name != 'postgresql':
+        return False
+    return connection.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+    ), {'table': table}).scalar() is not None
+
+
+def list_partitions(connection, table: str) -> List[dict]:
+    """List a partitioned table's partitions with their month bounds, oldest first"""
+    rows = connection.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :table AND pg_table_is_visible(p.oid)"
+    ), {'table': table}).all()
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_PATTERN.search(bound or '')
+        partitions.append({
+            'name': name,
+            'default': bound == 'DEFAULT',
+            'from': date.fromisoformat(match.group(1)) if match else None,
+            'to': date.fromisoformat(match.group(2)) if match else None,
+        })
+    return sorted(partitions, key=lambda p: (p['from'] is None, p['from'] or date.min))
+
+
+def create_default_partition(connection, table: str):
+    """Create the catch-all partition for rows outside every monthly range"""
+    quote = connection.dialect.identifier_preparer.quote
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {quote(default_partition_name(table))} PARTITION OF {quote(table)} DEFAULT"
+    ))
+
+
+def create_month_partition(connection, table: str, column: str, month: date) -> bool:
+    """Create a monthly partition; returns False if it already exists
+
+    Rows for the month that were routed to the default partition are moved
+    into a standalone table which is then attached. The CHECK constraint added
+    before ATTACH lets PostgreSQL skip validating the new partition's rows.
+    """
+    quote = connection.dialect.identifier_preparer.quote
+    name = partition_name(table, month)
+    if connection.execute(text("SELECT to_regclass(:name)"), {'name': name}).scalar():
+        return False
+
+    lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+    bounds = f"FROM ('{lower}') TO ('{upper}')"
+    in_range = f"{quote(column)} >= '{lower}' AND {quote(column)} < '{upper}'"
+    default = default_partition_name(table)
+    has_default = connection.execute(text("SELECT to_regclass(:name)"), {'name': default}).scalar()
+    stray = has_default and connection.execute(text(
+        f"SELECT 1 FROM {quote(default)} WHERE {in_range} LIMIT 1"
+    )).scalar()
+
+    if not stray:
+        connection.execute(text(f"CREATE TABLE {quote(name)} PARTITION OF {quote(table)} FOR VALUES {bounds}"))
+        return True
+
+    check = quote(f"{name}_bounds")
+    connection.execute(text(
+        f"CREATE TABLE {quote(name)} (LIKE {quote(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    connection.execute(text(f"ALTER TABLE {quote(name)} ADD CONSTRAINT {check} CHECK ({in_range})"))
+    connection.execute(text(
+        f"WITH moved AS (DELETE FROM {quote(default)} WHERE {in_range} RETURNING *) "
+        f"INSERT INTO {quote(name)} SELECT * FROM moved"
+    ))
+    connection.execute(text(f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(name)} FOR VALUES {bounds}"))
+    connection.execute(text(f"ALTER TABLE {quote(name)} DROP CONSTRAINT {check}"))
+    return True
+
+
+def ensure_partitions(connection, table: str, column: str, first_month: Optional[date] = None,
+                      ahead: int = PARTITIONS_AHEAD, today: Optional[date] = None) -> List[str]:
+    """Create monthly partitions from first_month (default: current month) through `ahead` months"""
+    current = month_start(today or date.today())
+    month = month_start(first_month) if first_month else current
+    last = add_months(current, ahead)
+    create_default_partition(connection, table)
+    created = []
+    while month <= last:
+        if create_month_partition(connection, table, column, month):
+            created.append(partition_name(table, month))
+        month = add_months(month, 1)
+    return created
+
+
+def split_default_partition(connection, table: str, column: str, cutoff: Optional[date] = None) -> List[str]:
+    """Move the default partition's rows into monthly partitions; returns the created partitions
+
+    The default partition is detached, a partition is created for every month
+    it holds, its rows are re-inserted through the parent and it is attached
+    again empty. Rows before `cutoff` (expired under the retention policy) are
+    dropped instead of getting partitions. Detaching locks the table, so run
+    this inside the maintenance transaction.
+    """
+    quote = connection.dialect.identifier_preparer.quote
+    default = default_partition_name(table)
+    if not connection.execute(text("SELECT to_regclass(:name)"), {'name': default}).scalar():
+        return []
+    months = connection.execute(text(
+        f"SELECT DISTINCT CAST(date_trunc('month', {quote(column)}) AS date) FROM {quote(default)} ORDER BY 1"
+    )).scalars().all()
+    if not months:
+        return []
+
+    connection.execute(text(f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(default)}"))
+    created = []
+    for month in months:
+        name = partition_name(table, month)
+        if cutoff and add_months(month, 1) <= cutoff:
+            continue
+        if not connection.execute(text("SELECT to_regclass(:name)"), {'name': name}).scalar():
+            bounds = f"FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            connection.execute(text(f"CREATE TABLE {quote(name)} PARTITION OF {quote(table)} FOR VALUES {bounds}"))
+            created.append(name)
+    keep = f" WHERE {quote(column)} >= :cutoff" if cutoff else ""
+    connection.execute(text(f"INSERT INTO {quote(table)} SELECT * FROM {quote(default)}{keep}"), {'cutoff': cutoff})
+    connection.execute(text(f"TRUNCATE {quote(default)}"))
+    connection.execute(text(f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(default)} DEFAULT"))
+    return created
+
+
+def apply_retention(connection, table: str, column: str, retention_months: int,
+                    today: Optional[date] = None, drop: bool = True) -> dict:
+    """Detach (and drop) partitions that end before the retention window
+
+    Detaching is a catalogue change, so cleanup time does not grow with the
+    amount of history. Expired rows that sit in the default partition are
+    deleted. On databases without partitioning the rows are deleted instead.
+    Returns the removed partition names and the number of deleted rows.
+    """
+    cutoff = add_months(month_start(today or date.today()), -retention_months)
+    quote = connection.dialect.identifier_preparer.quote
+
+    if not is_partitioned(connection, table):
+        result = connection.execute(text(f"DELETE FROM {quote(table)} WHERE {quote(column)} < :cutoff"),
+                                    {'cutoff': cutoff})
+        return {'partitions': [], 'rows': max(result.rowcount, 0)}
+
+    removed = []
+    for partition in list_partitions(connection, table):
+        if partition['default'] or partition['to'] is None or partition['to'] > cutoff:
+            continue
+        connection.execute(text(f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(partition['name'])}"))
+        if drop:
+            connection.execute(text(f"DROP TABLE {quote(partition['name'])}"))
+        removed.append(partition['name'])
+    result = connection.execute(text(
+        f"DELETE FROM {quote(default_partition_name(table))} WHERE {quote(column)} < :cutoff"
+    ), {'cutoff': cutoff})
+    return {'partitions': removed, 'rows': max(result.rowcount, 0)}
+
+
+def ensure_future_partitions(engine, ahead: int = PARTITIONS_AHEAD, today: Optional[date] = None) -> Dict[str, List[str]]:
+    """Create upcoming monthly partitions for every partitioned table (no-op on SQLite)"""
+    created = {}
+    for table, settings in PARTITIONED_TABLES.items():
+        with engine.begin() as connection:
+            if is_partitioned(connection, table):
+                created[table] = ensure_partitions(connection, table, settings['column'], ahead=ahead, today=today)
+    return created
+
+
+def maintain(engine, ahead: int = PARTITIONS_AHEAD, today: Optional[date] = None, drop: bool = True,
+             retention: Optional[Dict[str, Optional[int]]] = None) -> dict:
+    """Create future partitions, split the default partitions and apply the retention policy
+
+    Meant for a daily scheduled job.
+    """
+    report = {'created': ensure_future_partitions(engine, ahead, today), 'removed': {}}
+    current = month_start(today or date.today())
+    for table, settings in PARTITIONED_TABLES.items():
+        months = (retention or {}).get(table, settings['retention_months'])
+        cutoff = add_months(current, -months) if months is not None else None
+        with engine.begin() as connection:
+            if is_partitioned(connection, table):
+                report['created'].setdefault(table, []).extend(
+                    split_default_partition(connection, table, settings['column'], cutoff)
+                )
+            if months is not None:
+                report['removed'][table] = apply_retention(connection, table, settings['column'], months,
+                                                           today, drop)
+    return report
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+    from database import engine
+
+    parser = argparse.ArgumentParser(description="Monthly partition maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    maintain_parser = subparsers.add_parser("maintain", help="Create future partitions and apply retention")
+    maintain_parser.add_argument("--ahead", type=int, default=PARTITIONS_AHEAD, help="Months to create ahead")
+    maintain_parser.add_argument("--weather-retention-months", type=int, default=WEATHER_RETENTION_MONTHS,
+                                 help="Months of weather history to keep")
+    maintain_parser.add_argument("--keep-detached", action="store_true",
+                                 help="Detach expired partitions without dropping them")
+
+    subparsers.add_parser("list", help="List partitions")
+
+    args = parser.parse_args()
+
+    if args.command == "maintain":
+        report = maintain(engine, args.ahead, drop=not args.keep_detached,
+                          retention={'weather_data': args.weather_retention_months})
+        for table, names in report['created'].items():
+            for name in names:
+                print(f"➕ Created {name}")
+        for table, removed in report['removed'].items():
+            for name in removed['partitions']:
+                print(f"🗑️ {'Detached' if args.keep_detached else 'Removed'} {table}: {name}")
+            if removed['rows']:
+                print(f"🗑️ Deleted {removed['rows']} expired rows from {table}")
+        print("✅ Partition maintenance done")
+    elif args.command == "list":
+        with engine.connect() as connection:
+            for table in PARTITIONED_TABLES:
+                if not is_partitioned(connection, table):
+                    print(f"{table}: not partitioned")
+                    continue
+                for partition in list_partitions(connection, table):
+                    bounds = 'DEFAULT' if partition['default'] else f"{partition['from']} .. {partition['to']}"
+                    print(f"{table}: {partition['name']} {bounds}")
@@ -0,0 +1,206 @@
+"""
+Phase and task catalogue for ÉpítAI Construction Management System
+
+A PhaseCatalogue is a frozen, indexed view of a project type's phases and
+tasks, built once per process from the phases/tasks tables or from
+get_default_phases() and rebuilt after phases/tasks change (see
+change_notifications.py):
+
+- `phases` keeps the get_default_phases() shape (read-only), so it can be
+  passed anywhere a phases_def list is expected
+- task lookups by name, database id or position and tasks per profession are
+  dictionary lookups instead of scans over the phase tree
+- phase order, durations and headcount are precomputed
+- `version` is a content hash; pages can key cached derived values on it
+
+Usage:
+    from phase_catalogue import get_phase_catalogue
+    catalogue = get_phase_catalogue()
+    catalogue.profession_of("Villanyszerelés")
+"""
+
+import os
+import sys
+import json
+import hashlib
+import threading
+from typing import Optional, List, Dict
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+from default_data import get_default_phases, freeze
+
+
+class PhaseCatalogue:
+    """Read-only, indexed phase/task catalogue of one project type"""
+
+    def __init__(self, phases: List[dict], project_type: Optional[str] = None, task_ids: Optional[List[List[int]]] = None):
+        self.project_type = project_type
+        self.phases = freeze(phases)
+        self.version = hashlib.sha256(
+            json.dumps(phases, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        ).hexdigest()[:12]
+
+        tasks = []
+        for phase_index, phase in enumerate(self.phases):
+            for task_index, task in enumerate(phase.get("tasks", [])):
+                if isinstance(task, str):
+                    task = {"name": task}
+                tasks.append(freeze({
+                    "name": task.get("name", ""),
+                    "profession": task.get("profession", ""),
+                    "duration_days": task.get("duration_days", 1),
+                    "required_people": task.get("required_people", 1),
+                    "phase_index": phase_index,
+                    "phase_name": phase["name"],
+                    "task_index": task_index,
+                    "order": len(tasks),
+                    "task_id": task_ids[phase_index][task_index] if task_ids else None,
+                }))
+        self.tasks = tuple(tasks)
+        self.task_names = tuple(task["name"] for task in tasks)
+
+        # First occurrence wins, matching the old linear scan
+        self._by_name = {}
+        for task in tasks:
+            self._by_name.setdefault(task["name"], task)
+        self._by_id = {task["task_id"]: task for task in tasks if task["task_id"] is not None}
+        self._by_position = {(task["phase_index"], task["task_index"]): task for task in tasks}
+        by_profession = {}
+        for task in tasks:
+            by_profession.setdefault(task["profession"], []).append(task)
+        self._by_profession = {profession: tuple(items) for profession, items in by_profession.items()}
+
+        self.phase_order = {phase["name"]: index for index, phase in enumerate(self.phases)}
+        self.phase_durations = tuple(
+            sum(task["duration_days"] for task in tasks if task["phase_index"] == index)
+            for index in range(len(self.phases))
+        )
+        self.phase_headcount = tuple(
+            sum(task["required_people"] for task in tasks if task["phase_index"] == index)
+            for index in range(len(self.phases))
+        )
+        self.phase_task_counts = tuple(len(phase.get("tasks", [])) for phase in self.phases)
+        self.total_duration_days = sum(self.phase_durations)
+        self.professions = tuple(profession for profession in self._by_profession if profession)
+
+    def __repr__(self):
+        return f"<PhaseCatalogue(type={self.project_type!r}, phases={len(self.phases)}, tasks={len(self.tasks)}, version={self.version})>"
+
+    def task(self, name: str) -> Optional[dict]:
+        """Task record by name"""
+        return self._by_name.get(name)
+
+    def task_by_id(self, task_id: int) -> Optional[dict]:
+        """Task record by tasks.task_id (catalogues loaded from the database)"""
+        return self._by_id.get(task_id)
+
+    def task_at(self, phase_index: int, task_index: int) -> Optional[dict]:
+        """Task record by position in the phase tree"""
+        return self._by_position.get((phase_index, task_index))
+
+    def profession_of(self, task_name: str) -> str:
+        """Required profession of a task ('' if unknown or not specified)"""
+        task = self._by_name.get(task_name)
+        return task["profession"] if task else ""
+
+    def tasks_for_profession(self, profession: str) -> tuple:
+        """Tasks that require a profession, in catalogue order"""
+        return self._by_profession.get(profession, ())
+
+    def phase_index(self, phase_name: str) -> Optional[int]:
+        """Position of a phase in the project's phase order"""
+        return self.phase_order.get(phase_name)
+
+    def empty_phases_checked(self) -> List[List[bool]]:
+        """A fresh, editable phases_checked matrix for this catalogue"""
+        return [[False] * count for count in self.phase_task_counts]
+
+
+def load_phases_from_db(connection, project_type: str):
+    """Read a project type's phases and tasks in get_default_phases() shape, with their task ids"""
+    # Imported here: pages that only use the default catalogue should not pay for SQLAlchemy
+    from sqlalchemy import text
+
+    rows = connection.execute(text(
+        "SELECT ph.phase_id, ph.name AS phase_name, ph.total_duration_days, t.task_id, t.name AS task_name, "
+        "t.duration_days, t.required_people, pt.name AS profession "
+        "FROM phases ph JOIN project_types ty ON ty.project_type_id = ph.project_type_id "
+        "LEFT JOIN tasks t ON t.phase_id = ph.phase_id "
+        "LEFT JOIN profession_types pt ON pt.profession_type_id = t.profession_type_id "
+        "WHERE ty.name = :project_type ORDER BY ph.order_sequence, ph.phase_id, t.order_sequence, t.task_id"
+    ), {'project_type': project_type}).all()
+    phases, task_ids, index = [], [], {}
+    for row in rows:
+        if row.phase_id not in index:
+            index[row.phase_id] = len(phases)
+            phases.append({"name": row.phase_name, "tasks": [], "total_duration_days": row.total_duration_days or 0})
+            task_ids.append([])
+        if row.task_id is not None:
+            position = index[row.phase_id]
+            phases[position]["tasks"].append({
+                "name": row.task_name, "profession": row.profession or "",
+                "duration_days": row.duration_days or 1, "required_people": row.required_people or 1,
+            })
+            task_ids[position].append(row.task_id)
+    return phases, task_ids
+
+
+_catalogues: Dict[Optional[str], PhaseCatalogue] = {}
+_catalogues_lock = threading.Lock()
+
+
+def get_default_catalogue() -> PhaseCatalogue:
+    """Catalogue of the built-in default phases"""
+    with _catalogues_lock:
+        if None not in _catalogues:
+            _catalogues[None] = PhaseCatalogue(get_default_phases())
+        return _catalogues[None]
+
+
+def get_phase_catalogue(project_type: Optional[str] = None, connection=None) -> PhaseCatalogue:
+    """Catalogue of a project type, built once per process
+
+    The type's phases/tasks are read from the database, with the given
+    connection or else the application engine; types without rows there, and
+    calls without a type or a reachable database, share the default catalogue.
+    Cached catalogues are dropped whenever phases or tasks change.
+    """
+    if not project_type:
+        return get_default_catalogue()
+    catalogue = _catalogues.get(project_type)
+    if catalogue is not None:
+        return catalogue
+    if connection is None:
+        return _load_with_application_engine(project_type)
+
+    phases, task_ids = load_phases_from_db(connection, project_type)
+    catalogue = PhaseCatalogue(phases, project_type, task_ids) if phases else get_default_catalogue()
+    with _catalogues_lock:
+        return _catalogues.setdefault(project_type, catalogue)
+
+
+def _load_with_application_engine(project_type: str) -> PhaseCatalogue:
+    """Load a project type's catalogue through database.py; the default catalogue if that fails"""
+    try:
+        from database import engine
+        from change_notifications import subscribe
+        subscribe("phase_catalogue", ["phases", "tasks"], invalidate_phase_catalogue, engine)
+        with engine.connect() as connection:
+            return get_phase_catalogue(project_type, connection)
+    except Exception as e:
+        print(f"Failed to load the phase catalogue of {project_type}: {e}")
+        # Remembered like a loaded catalogue, so an unreachable database is not retried on every call
+        default = get_default_catalogue()
+        with _catalogues_lock:
+            return _catalogues.setdefault(project_type, default)
+
+
+def invalidate_phase_catalogue(project_type: Optional[str] = None):
+    """Drop cached catalogues (one project type, or all) after phases/tasks change"""
+    with _catalogues_lock:
+        if project_type is None:
+            _catalogues.clear()
+        else:
+            _catalogues.pop(project_type, None)
@@ -0,0 +1,188 @@
+"""
+Material price history and analytics for ÉpítAI Construction Management System
+
+Price points are read straight into pandas/NumPy columns with Core selects, never
+as ORM objects, so the analytics scale to millions of rows in material_prices.
+"""
+
+import os
+import sys
+from datetime import date
+from typing import Optional, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, insert
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+from models.material import Material, ProjectMaterial
+from models.material_price import MaterialPrice
+
+OPEN_PROJECT_MATERIAL_STATUSES = ('Planned',)
+
+
+def record_supplier_quote(session, material_id: int, unit_cost, resource_id: Optional[int] = None,
+                          price_date: Optional[date] = None):
+    """Append a supplier quote to the price history"""
+    price = MaterialPrice(
+        material_id=material_id,
+        resource_id=resource_id,
+        unit_cost=unit_cost,
+        price_date=price_date or date.today(),
+        source='quote'
+    )
+    session.add(price)
+    return price
+
+
+def import_price_points(session, rows: List[dict], source: str = 'import') -> int:
+    """Bulk append price points (dicts with material_id, unit_cost, optional price_date/resource_id)"""
+    if not rows:
+        return 0
+    today = date.today()
+    payload = [
+        {
+            'material_id': row['material_id'],
+            'resource_id': row.get('resource_id'),
+            'price_date': row.get('price_date') or today,
+            'unit_cost': row['unit_cost'],
+            'source': source,
+        }
+        for row in rows
+    ]
+    session.execute(insert(MaterialPrice), payload)
+    return len(payload)
+
+
+def load_price_points(connection, start: Optional[date] = None, end: Optional[date] = None) -> pd.DataFrame:
+    """Load price points with their material category as a columnar DataFrame"""
+    query = (
+        select(
+            MaterialPrice.material_id,
+            MaterialPrice.price_date,
+            MaterialPrice.unit_cost,
+            Material.category,
+        )
+        .join(Material, Material.material_id == MaterialPrice.material_id)
+    )
+    if start:
+        query = query.where(MaterialPrice.price_date >= start)
+    if end:
+        query = query.where(MaterialPrice.price_date <= end)
+
+    df = pd.read_sql(query, connection)
+    df['price_date'] = pd.to_datetime(df['price_date'])
+    df['unit_cost'] = df['unit_cost'].astype('float64')
+    df['category'] = df['category'].fillna('Egyéb').astype('category')
+    return df
+
+
+def period_prices(points: pd.DataFrame, freq: str = 'M') -> pd.DataFrame:
+    """Get the last known price of every material in every period
+
+    Each material is carried forward from its first price point to the last
+    period of the data, so periods without a new price repeat the previous one
+    and period-over-period changes always compare consecutive periods.
+    """
+    if points.empty:
+        return pd.DataFrame(columns=['material_id', 'period', 'category', 'unit_cost'])
+    points = points.assign(period=points['price_date'].dt.to_period(freq))
+    points = points.sort_values(['material_id', 'period', 'price_date'], kind='mergesort')
+    observed = (
+        points.groupby(['material_id', 'period'], sort=False, observed=True)
+        .agg(category=('category', 'last'), unit_cost=('unit_cost', 'last'))
+        .reset_index()
+    )
+
+    # Material x period grid, forward filled; periods before a material's first price stay empty
+    periods = pd.period_range(observed['period'].min(), observed['period'].max(), freq=freq)
+    grid = (
+        observed.pivot(index='material_id', columns='period', values='unit_cost')
+        .reindex(columns=periods)
+        .ffill(axis=1)
+    )
+    grid.columns.name = 'period'
+    prices = grid.reset_index().melt(id_vars='material_id', var_name='period', value_name='unit_cost')
+    prices = prices[prices['unit_cost'].notna()].astype({'period': periods.dtype})
+    categories = observed.groupby('material_id', sort=False, observed=True)['category'].last()
+    return (
+        prices.assign(category=prices['material_id'].map(categories).astype(points['category'].dtype))
+        [['material_id', 'period', 'category', 'unit_cost']]
+        .sort_values(['material_id', 'period'], kind='mergesort')
+        .reset_index(drop=True)
+    )
+
+
+def period_over_period_changes(prices: pd.DataFrame) -> pd.DataFrame:
+    """Add the relative price change of each material versus its previous period"""
+    prices = prices.sort_values(['material_id', 'period'], kind='mergesort')
+    previous = prices.groupby('material_id', sort=False)['unit_cost'].shift(1)
+    return prices.assign(
+        previous_unit_cost=previous,
+        change_pct=(prices['unit_cost'] / previous - 1.0) * 100.0
+    )
+
+
+def category_indices(prices: pd.DataFrame, base_period=None) -> pd.DataFrame:
+    """Compute a geometric-mean (Jevons) price index per category, base period = 100"""
+    if prices.empty:
+        return pd.DataFrame(columns=['category', 'period', 'index'])
+    base_period = base_period or prices['period'].min()
+    base = prices.loc[prices['period'] == base_period, ['material_id', 'unit_cost']].rename(columns={'unit_cost': 'base_cost'})
+    merged = prices.merge(base, on='material_id', how='inner')
+    merged = merged[(merged['base_cost'] > 0) & (merged['unit_cost'] > 0)]
+    merged = merged.assign(log_relative=np.log(merged['unit_cost'].to_numpy() / merged['base_cost'].to_numpy()))
+    index = merged.groupby(['category', 'period'], observed=True)['log_relative'].mean()
+    return np.exp(index).mul(100.0).rename('index').reset_index()
+
+
+def category_changes(prices: pd.DataFrame) -> pd.Series:
+    """Get the average latest period-over-period change per category (in percent)"""
+    changes = period_over_period_changes(prices)
+    latest_period = changes['period'].max()
+    latest = changes[(changes['period'] == latest_period) & changes['change_pct'].notna()]
+    return latest.groupby('category', observed=True)['change_pct'].mean().sort_values(ascending=False)
+
+
+def budget_impact(connection, latest_prices: pd.DataFrame) -> pd.DataFrame:
+    """Estimate per-project cost impact of current prices on open project material lines"""
+    lines = pd.read_sql(
+        select(
+            ProjectMaterial.project_id,
+            ProjectMaterial.material_id,
+            ProjectMaterial.quantity,
+            ProjectMaterial.unit_cost,
+        ).where(ProjectMaterial.status.in_(OPEN_PROJECT_MATERIAL_STATUSES)),
+        connection,
+    )
+    if lines.empty or latest_prices.empty:
+        return pd.DataFrame(columns=['project_id', 'planned_cost', 'current_cost', 'impact', 'impact_pct'])
+
+    current = latest_prices.sort_values('period').groupby('material_id')['unit_cost'].last().rename('current_unit_cost')
+    lines = lines.join(current, on='material_id')
+    quantity = lines['quantity'].astype('float64').to_numpy()
+    planned_unit = lines['unit_cost'].astype('float64').to_numpy()
+    current_unit = lines['current_unit_cost'].to_numpy()
+    # Lines without a planned or current price do not contribute to the impact
+    current_unit = np.where(np.isnan(current_unit), planned_unit, current_unit)
+    planned_unit = np.where(np.isnan(planned_unit), current_unit, planned_unit)
+
+    lines = lines.assign(planned_cost=np.nan_to_num(quantity * planned_unit),
+                         current_cost=np.nan_to_num(quantity * current_unit))
+    impact = lines.groupby('project_id')[['planned_cost', 'current_cost']].sum()
+    impact['impact'] = impact['current_cost'] - impact['planned_cost']
+    impact['impact_pct'] = np.where(impact['planned_cost'] > 0, impact['impact'] / impact['planned_cost'] * 100.0, 0.0)
+    return impact.reset_index()
+
+
+def get_price_dashboard_data(engine, start: Optional[date] = None, freq: str = 'M') -> dict:
+    """Compute category changes, category indices and budget impact for the dashboard"""
+    with engine.connect() as connection:
+        prices = period_prices(load_price_points(connection, start=start), freq)
+        return {
+            'category_changes': category_changes(prices) if not prices.empty else pd.Series(dtype='float64'),
+            'category_indices': category_indices(prices),
+            'budget_impact': budget_impact(connection, prices),
+        }
@@ -0,0 +1,210 @@
+"""
+Procurement planning utilities for ÉpítAI Construction Management System
+
+Combines current stock, reorder levels, minimum order quantities, supplier lead
+times and upcoming planned ProjectMaterial demand in a single set-based query,
+and turns the result into a reorder report and draft purchase orders per supplier.
+"""
+
+import os
+import sys
+import math
+from datetime import date, timedelta
+from typing import Optional, List
+
+from sqlalchemy import select, func, case, literal, or_
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+from models.material import Material, ProjectMaterial
+from models.resource import Resource
+
+DEFAULT_HORIZON_DAYS = 90
+
+
+def build_reorder_query(today: date, horizon_days: int = DEFAULT_HORIZON_DAYS):
+    """Build the single query returning every material that needs ordering within the horizon"""
+    horizon_end = today + timedelta(days=horizon_days)
+
+    # Planned (not yet ordered) demand per material and day; overdue lines are due today
+    need_date = case(
+        (ProjectMaterial.assigned_date < today, literal(today)),
+        else_=ProjectMaterial.assigned_date,
+    ).label('assigned_date')
+    daily_demand = (
+        select(
+            ProjectMaterial.material_id,
+            need_date,
+            func.sum(ProjectMaterial.quantity).label('quantity'),
+        )
+        .where(
+            ProjectMaterial.status == 'Planned',
+            ProjectMaterial.assigned_date <= horizon_end,
+        )
+        .group_by(ProjectMaterial.material_id, need_date)
+        .cte('daily_demand')
+    )
+
+    # Running demand per material, ordered by need date
+    cumulative = select(
+        daily_demand.c.material_id,
+        daily_demand.c.assigned_date,
+        daily_demand.c.quantity,
+        func.sum(daily_demand.c.quantity).over(
+            partition_by=daily_demand.c.material_id,
+            order_by=daily_demand.c.assigned_date,
+        ).label('cumulative_quantity'),
+    ).cte('cumulative_demand')
+
+    # Demand totals and the first day projected stock drops to the reorder level
+    demand = (
+        select(
+            cumulative.c.material_id,
+            func.sum(cumulative.c.quantity).label('total_demand'),
+            func.min(cumulative.c.assigned_date).label('first_need_date'),
+            func.min(cumulative.c.assigned_date).filter(
+                func.coalesce(Material.current_stock, 0) - cumulative.c.cumulative_quantity
+                <= func.coalesce(Material.reorder_level, 0)
+            ).label('reorder_point_date'),
+        )
+        .join(Material, Material.material_id == cumulative.c.material_id)
+        .group_by(cumulative.c.material_id)
+        .cte('demand')
+    )
+
+    return (
+        select(
+            Material.material_id,
+            Material.name,
+            Material.category,
+            Material.unit,
+            Material.unit_cost,
+            Material.current_stock,
+            Material.reorder_level,
+            Material.minimum_order,
+            Material.lead_time_days,
+            Material.resource_id,
+            func.coalesce(Resource.name, Material.supplier).label('supplier_name'),
+            func.coalesce(Resource.email, Material.vendor_contact).label('supplier_contact'),
+            func.coalesce(demand.c.total_demand, 0).label('total_demand'),
+            demand.c.first_need_date,
+            demand.c.reorder_point_date,
+        )
+        .outerjoin(Resource, Resource.resource_id == Material.resource_id)
+        .outerjoin(demand, demand.c.material_id == Material.material_id)
+        .where(
+            Material.status != 'Discontinued',
+            or_(
+                func.coalesce(Material.current_stock, 0) <= func.coalesce(Material.reorder_level, 0),
+                demand.c.reorder_point_date.isnot(None),
+            ),
+        )
+        .order_by(Material.material_id)
+    )
+
+
+def _plan_line(row, today: date) -> dict:
+    """Turn one reorder query row into a reorder report line"""
+    current_stock = row.current_stock or 0
+    reorder_level = row.reorder_level or 0
+    total_demand = float(row.total_demand or 0)
+    minimum_order = row.minimum_order or 1
+    lead_time_days = row.lead_time_days or 0
+
+    # Cover all demand in the horizon and get back to the reorder level
+    shortfall = total_demand + reorder_level - current_stock
+    suggested_quantity = max(math.ceil(shortfall), minimum_order)
+
+    need_date = today if current_stock <= reorder_level else row.reorder_point_date
+    order_by_date = need_date - timedelta(days=lead_time_days)
+    unit_cost = float(row.unit_cost) if row.unit_cost else 0
+
+    return {
+        'material_id': row.material_id,
+        'name': row.name,
+        'category': row.category,
+        'unit': row.unit,
+        'supplier_id': row.resource_id,
+        'supplier_name': row.supplier_name or 'Ismeretlen beszállító',
+        'supplier_contact': row.supplier_contact,
+        'current_stock': current_stock,
+        'reorder_level': reorder_level,
+        'total_demand': total_demand,
+        'first_need_date': row.first_need_date,
+        'need_date': need_date,
+        'order_by_date': order_by_date,
+        'is_overdue': order_by_date < today,
+        'lead_time_days': lead_time_days,
+        'suggested_quantity': suggested_quantity,
+        'unit_cost': unit_cost,
+        'estimated_cost': suggested_quantity * unit_cost,
+    }
+
+
+def get_reorder_report(session, today: Optional[date] = None, horizon_days: int = DEFAULT_HORIZON_DAYS) -> List[dict]:
+    """Get reorder lines for the whole catalogue, most urgent first"""
+    today = today or date.today()
+    rows = session.execute(build_reorder_query(today, horizon_days)).all()
+    lines = [_plan_line(row, today) for row in rows]
+    lines.sort(key=lambda line: (line['order_by_date'], line['supplier_name'], line['name']))
+    return lines
+
+
+def build_purchase_orders(report_lines: List[dict]) -> List[dict]:
+    """Group reorder lines into draft purchase orders, one per supplier"""
+    orders = {}
+    for line in report_lines:
+        key = line['supplier_id'] if line['supplier_id'] is not None else line['supplier_name']
+        order = orders.get(key)
+        if order is None:
+            order = orders[key] = {
+                'supplier_id': line['supplier_id'],
+                'supplier_name': line['supplier_name'],
+                'supplier_contact': line['supplier_contact'],
+                'order_by_date': line['order_by_date'],
+                'is_overdue': line['is_overdue'],
+                'total_cost': 0,
+                'lines': [],
+            }
+        order['lines'].append(line)
+        order['total_cost'] += line['estimated_cost']
+        order['order_by_date'] = min(order['order_by_date'], line['order_by_date'])
+        order['is_overdue'] = order['is_overdue'] or line['is_overdue']
+
+    return sorted(orders.values(), key=lambda order: (order['order_by_date'], order['supplier_name']))
+
+
+def plan_procurement(session, today: Optional[date] = None, horizon_days: int = DEFAULT_HORIZON_DAYS) -> dict:
+    """Compute the reorder report and draft purchase orders in one pass"""
+    report = get_reorder_report(session, today, horizon_days)
+    return {
+        'report': report,
+        'purchase_orders': build_purchase_orders(report),
+    }
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+    from database import get_db_session
+
+    parser = argparse.ArgumentParser(description="Material reorder and procurement planning")
+    parser.add_argument("command", choices=["report", "orders"], help="Output to print")
+    parser.add_argument("--horizon", type=int, default=DEFAULT_HORIZON_DAYS, help="Planning horizon in days")
+
+    args = parser.parse_args()
+
+    with get_db_session() as session:
+        plan = plan_procurement(session, horizon_days=args.horizon)
+
+    if args.command == "report":
+        for line in plan['report']:
+            flag = "⚠️ " if line['is_overdue'] else ""
+            print(f"{flag}{line['order_by_date']} | {line['supplier_name']} | {line['name']}: "
+                  f"{line['suggested_quantity']} {line['unit'] or ''} (készlet: {line['current_stock']}, igény: {line['total_demand']:g})")
+    elif args.command == "orders":
+        for order in plan['purchase_orders']:
+            print(f"{order['supplier_name']} – rendelés határidő: {order['order_by_date']} – {order['total_cost']:,.0f} Ft")
+            for line in order['lines']:
+                print(f"  - {line['name']}: {line['suggested_quantity']} {line['unit'] or ''}")
@@ -0,0 +1,387 @@
+"""
+Cold archive of closed projects for ÉpítAI Construction Management System
+
+Projects with status 'Lezárt' that ended more than N months ago are moved out
+of the OLTP tables into zstd-compressed Parquet files:
+
+    <PROJECT_ARCHIVE_DIR>/<table>/year=<end year>/<batch>.parquet
+
+Every archived row carries its project_id (child tables are denormalised with
+the project id, phase/task names and member names), so one project can be read
+back without touching the database. Each batch is written to disk first and
+then deleted from the hot tables in its own transaction; if a batch fails
+after its files were written, the rows stay in the database and the next run
+archives them again, and readers drop the duplicates by primary key.
+
+Read-through API used by the projects page:
+  list_archived_projects(year, search) - archived project summaries
+  load_archived_project(project_id, year) - a project in session-state shape
+
+Usage:
+  python project_archive.py archive [--older-than-months 24] [--batch-size 200] [--dry-run]
+  python project_archive.py list [--year 2024] [--search text]
+  python project_archive.py show <project_id> [--year 2024]
+"""
+
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional, List, Dict
+
+from sqlalchemy import MetaData, Table, inspect, select, delete, and_
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+ARCHIVE_DIR = os.getenv('PROJECT_ARCHIVE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.project_archive'))
+ARCHIVED_STATUS = 'Lezárt'
+DEFAULT_OLDER_THAN_MONTHS = 24
+DEFAULT_BATCH_SIZE = 200
+COMPRESSION = 'zstd'
+
+# Archived tables and their primary keys, parents first; deletes run in reverse
+ARCHIVED_TABLES = {
+    'projects': 'project_id',
+    'project_locations': 'project_location_id',
+    'project_members': 'project_member_id',
+    'project_phases': 'project_phase_id',
+    'project_tasks': 'project_task_id',
+    'task_assignments': 'assignment_id',
+    'project_materials': 'project_material_id',
+    'project_budget_deviations': 'project_id',
+}
+
+
+def _add_months(day: date, months: int) -> date:
+    """Shift a date by a number of months (clamped to the 28th)"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, min(day.day, 28))
+
+
+def _reflect(connection) -> Dict[str, Table]:
+    """Reflect the archived tables (and the lookup tables used for denormalising) as they exist in the database"""
+    metadata = MetaData()
+    names = [name for name in list(ARCHIVED_TABLES) + ['project_types', 'phases', 'tasks', 'resources']
+             if inspect(connection).has_table(name)]
+    return {name: Table(name, metadata, autoload_with=connection) for name in names}
+
+
+def _archive_queries(tables: Dict[str, Table], project_ids: List[int]) -> Dict[str, object]:
+    """SELECT per archived table for a batch of projects, each row labelled with its project_id"""
+    projects = tables['projects']
+    phases = tables['project_phases']
+    tasks = tables['project_tasks']
+    queries = {
+        'projects': select(projects, tables['project_types'].c.name.label('project_type_name'))
+        .outerjoin(tables['project_types'], tables['project_types'].c.project_type_id == projects.c.project_type_id)
+        .where(projects.c.project_id.in_(project_ids)),
+        'project_locations': select(tables['project_locations'])
+        .where(tables['project_locations'].c.project_id.in_(project_ids)),
+        'project_members': select(tables['project_members'], tables['resources'].c.name.label('resource_name'))
+        .outerjoin(tables['resources'], tables['resources'].c.resource_id == tables['project_members'].c.resource_id)
+        .where(tables['project_members'].c.project_id.in_(project_ids)),
+        'project_phases': select(phases, tables['phases'].c.name.label('phase_name'))
+        .outerjoin(tables['phases'], tables['phases'].c.phase_id == phases.c.phase_id)
+        .where(phases.c.project_id.in_(project_ids)),
+        'project_tasks': select(tasks, phases.c.project_id, tables['tasks'].c.name.label('task_name'))
+        .join(phases, phases.c.project_phase_id == tasks.c.project_phase_id)
+        .outerjoin(tables['tasks'], tables['tasks'].c.task_id == tasks.c.task_id)
+        .where(phases.c.project_id.in_(project_ids)),
+        'task_assignments': select(tables['task_assignments'], phases.c.project_id)
+        .join(tasks, tasks.c.project_task_id == tables['task_assignments'].c.project_task_id)
+        .join(phases, phases.c.project_phase_id == tasks.c.project_phase_id)
+        .where(phases.c.project_id.in_(project_ids)),
+        'project_materials': select(tables['project_materials'])
+        .where(tables['project_materials'].c.project_id.in_(project_ids)),
+    }
+    if 'project_budget_deviations' in tables:
+        deviations = tables['project_budget_deviations']
+        queries['project_budget_deviations'] = select(deviations).where(deviations.c.project_id.in_(project_ids))
+    return queries
+
+
+def _delete_statements(tables: Dict[str, Table], project_ids: List[int]) -> List[object]:
+    """DELETEs for a batch of projects, children first"""
+    phases = tables['project_phases']
+    tasks = tables['project_tasks']
+    phase_ids = select(phases.c.project_phase_id).where(phases.c.project_id.in_(project_ids))
+    task_ids = select(tasks.c.project_task_id).where(tasks.c.project_phase_id.in_(phase_ids))
+    statements = [
+        delete(tables['task_assignments']).where(tables['task_assignments'].c.project_task_id.in_(task_ids)),
+        delete(tasks).where(tasks.c.project_phase_id.in_(phase_ids)),
+    ]
+    for name in ('project_phases', 'project_materials', 'project_members', 'project_locations',
+                 'project_budget_deviations', 'projects'):
+        if name in tables:
+            statements.append(delete(tables[name]).where(tables[name].c.project_id.in_(project_ids)))
+    return statements
+
+
+def _arrow_type(column):
+    """Arrow type for a reflected column"""
+    import pyarrow as pa
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return pa.string()
+    if python_type is bool:
+        return pa.bool_()
+    if python_type is int:
+        return pa.int64()
+    if python_type is Decimal:
+        precision, scale = getattr(column.type, 'precision', None), getattr(column.type, 'scale', None)
+        return pa.decimal128(precision, scale or 0) if precision else pa.float64()
+    if python_type is float:
+        return pa.float64()
+    if python_type is datetime:
+        return pa.timestamp('us')
+    if python_type is date:
+        return pa.date32()
+    return pa.string()
+
+
+def _arrow_table(query, rows: List[dict]):
+    """Build an Arrow table with a schema derived from the query's columns"""
+    import pyarrow as pa
+
+    schema = pa.schema([pa.field(column.name, _arrow_type(column)) for column in query.selected_columns])
+    for field in schema:
+        if pa.types.is_floating(field.type) or pa.types.is_string(field.type):
+            convert = float if pa.types.is_floating(field.type) else str
+            for row in rows:
+                if row[field.name] is not None:
+                    row[field.name] = convert(row[field.name])
+    return pa.Table.from_pylist(rows, schema=schema)
+
+
+def _write_parquet(table, table_name: str, year: int, batch_id: str, archive_dir: str) -> str:
+    """Write one table/year chunk atomically (temp file + rename)"""
+    import pyarrow.parquet as pq
+
+    directory = os.path.join(archive_dir, table_name, f"year={year}")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{batch_id}.parquet")
+    pq.write_table(table, f"{path}.tmp", compression=COMPRESSION)
+    os.replace(f"{path}.tmp", path)
+    return path
+
+
+def find_archivable_projects(connection, older_than_months: int = DEFAULT_OLDER_THAN_MONTHS,
+                             today: Optional[date] = None, limit: Optional[int] = None,
+                             after_id: int = 0) -> List[dict]:
+    """Closed projects that ended before the cutoff, in project_id order"""
+    cutoff = _add_months(today or date.today(), -older_than_months)
+    projects = Table('projects', MetaData(), autoload_with=connection)
+    query = (
+        select(projects.c.project_id, projects.c.end_date)
+        .where(and_(projects.c.status == ARCHIVED_STATUS, projects.c.end_date < cutoff,
+                    projects.c.project_id > after_id))
+        .order_by(projects.c.project_id)
+    )
+    if limit:
+        query = query.limit(limit)
+    return [dict(row._mapping) for row in connection.execute(query)]
+
+
+def archive_closed_projects(engine, older_than_months: int = DEFAULT_OLDER_THAN_MONTHS,
+                            batch_size: int = DEFAULT_BATCH_SIZE, today: Optional[date] = None,
+                            archive_dir: str = ARCHIVE_DIR, throttle: float = 0.05, dry_run: bool = False) -> dict:
+    """Move closed projects older than the cutoff to Parquet, one batch (and transaction) at a time"""
+    report = {'projects': 0, 'rows': {}, 'files': 0, 'batches': 0}
+    last_id = 0
+    while True:
+        with engine.begin() as connection:
+            candidates = find_archivable_projects(connection, older_than_months, today, batch_size, last_id)
+            if not candidates:
+                break
+            last_id = candidates[-1]['project_id']
+            if dry_run:
+                report['projects'] += len(candidates)
+                continue
+
+            tables = _reflect(connection)
+            project_ids = [candidate['project_id'] for candidate in candidates]
+            year_of = {candidate['project_id']: candidate['end_date'].year for candidate in candidates}
+            batch_id = f"{datetime.now():%Y%m%dT%H%M%S}-{project_ids[0]}-{uuid.uuid4().hex[:8]}"
+
+            for table_name, query in _archive_queries(tables, project_ids).items():
+                rows = [dict(row._mapping) for row in connection.execute(query)]
+                report['rows'][table_name] = report['rows'].get(table_name, 0) + len(rows)
+                by_year = {}
+                for row in rows:
+                    by_year.setdefault(year_of[row['project_id']], []).append(row)
+                for year, year_rows in by_year.items():
+                    _write_parquet(_arrow_table(query, year_rows), table_name, year, batch_id, archive_dir)
+                    report['files'] += 1
+
+            for statement in _delete_statements(tables, project_ids):
+                connection.execute(statement)
+            report['projects'] += len(project_ids)
+            report['batches'] += 1
+            print(f"  📦 Archived {report['projects']} projects (batch {report['batches']})")
+        if throttle:
+            time.sleep(throttle)
+
+    _read_table.cache_clear()
+    return report
+
+
+# Read-through API
+
+def archived_years(archive_dir: str = ARCHIVE_DIR) -> List[int]:
+    """Years that have archived projects, newest first"""
+    directory = os.path.join(archive_dir, 'projects')
+    if not os.path.isdir(directory):
+        return []
+    return sorted((int(name.split('=', 1)[1]) for name in os.listdir(directory) if name.startswith('year=')),
+                  reverse=True)
+
+
+@lru_cache(maxsize=64)
+def _read_table(table_name: str, year: int, archive_dir: str, signature: tuple) -> List[dict]:
+    """Read one table/year of the archive (cached until its files change), without duplicate rows"""
+    import pyarrow.parquet as pq
+
+    directory = os.path.join(archive_dir, table_name, f"year={year}")
+    rows, seen = [], set()
+    key = ARCHIVED_TABLES[table_name]
+    for name, _ in signature:
+        for row in pq.read_table(os.path.join(directory, name)).to_pylist():
+            if row[key] not in seen:
+                seen.add(row[key])
+                rows.append(row)
+    return rows
+
+
+def read_archived_rows(table_name: str, year: int, project_id: Optional[int] = None,
+                       archive_dir: str = ARCHIVE_DIR) -> List[dict]:
+    """Archived rows of a table for one year, optionally for a single project"""
+    directory = os.path.join(archive_dir, table_name, f"year={year}")
+    if not os.path.isdir(directory):
+        return []
+    signature = tuple(sorted(
+        (entry.name, entry.stat().st_mtime_ns) for entry in os.scandir(directory) if entry.name.endswith('.parquet')
+    ))
+    rows = _read_table(table_name, year, archive_dir, signature)
+    if project_id is None:
+        return list(rows)
+    return [row for row in rows if row['project_id'] == project_id]
+
+
+def list_archived_projects(year: Optional[int] = None, search: Optional[str] = None,
+                           archive_dir: str = ARCHIVE_DIR) -> List[dict]:
+    """Summaries of archived projects, most recently ended first"""
+    needle = (search or '').strip().lower()
+    summaries = []
+    for archive_year in ([year] if year else archived_years(archive_dir)):
+        for row in read_archived_rows('projects', archive_year, archive_dir=archive_dir):
+            if needle and needle not in f"{row['project_name']} {row.get('client_name') or ''}".lower():
+                continue
+            summaries.append({
+                'project_id': row['project_id'],
+                'year': archive_year,
+                'name': row['project_name'],
+                'client': row.get('client_name'),
+                'type': row.get('project_type_name') or '',
+                'start': row['start_date'].isoformat() if row.get('start_date') else '',
+                'end': row['end_date'].isoformat() if row.get('end_date') else '',
+            })
+    return sorted(summaries, key=lambda summary: summary['end'], reverse=True)
+
+
+def load_archived_project(project_id: int, year: Optional[int] = None, archive_dir: str = ARCHIVE_DIR) -> Optional[dict]:
+    """Load an archived project in the session-state project shape (read-only, marked 'archived')"""
+    years = [year] if year else archived_years(archive_dir)
+    for archive_year in years:
+        found = read_archived_rows('projects', archive_year, project_id, archive_dir)
+        if found:
+            break
+    else:
+        return None
+    row = found[0]
+
+    def rows(table_name):
+        return read_archived_rows(table_name, archive_year, project_id, archive_dir)
+
+    tasks_by_phase = {}
+    for task in sorted(rows('project_tasks'), key=lambda task: task['project_task_id']):
+        tasks_by_phase.setdefault(task['project_phase_id'], []).append(task['status'] == 'Completed')
+    phases = sorted(rows('project_phases'), key=lambda phase: (phase.get('start_date') or date.min,
+                                                                phase['project_phase_id']))
+    locations = [location['location_name'] for location in rows('project_locations')]
+    if not locations and row.get('location'):
+        locations = [row['location']]
+
+    return {
+        "name": row['project_name'],
+        "start": row['start_date'].isoformat() if row.get('start_date') else '',
+        "end": row['end_date'].isoformat() if row.get('end_date') else '',
+        "status": row['status'],
+        "type": row.get('project_type_name') or '',
+        "size": row.get('size_sqm'),
+        "client": row.get('client_name'),
+        "members": [member['resource_name'] for member in rows('project_members') if member.get('resource_name')],
+        "locations": locations,
+        "progress": row.get('progress_percent') or 0,
+        "phases_checked": [tasks_by_phase.get(phase['project_phase_id'], []) for phase in phases],
+        "project_id": None,
+        "archived": True,
+        "archive_id": row['project_id'],
+        "archive_year": archive_year,
+    }
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Cold archive of closed projects")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    archive_parser = subparsers.add_parser("archive", help="Move closed projects to Parquet")
+    archive_parser.add_argument("--older-than-months", type=int, default=DEFAULT_OLDER_THAN_MONTHS,
+                                help="Archive projects that ended more than this many months ago")
+    archive_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Projects per batch")
+    archive_parser.add_argument("--database-url", help="Database URL (default: application database)")
+    archive_parser.add_argument("--dry-run", action="store_true", help="Only count the projects to archive")
+
+    list_parser = subparsers.add_parser("list", help="List archived projects")
+    list_parser.add_argument("--year", type=int, help="Project end year")
+    list_parser.add_argument("--search", help="Filter by project or client name")
+
+    show_parser = subparsers.add_parser("show", help="Print an archived project")
+    show_parser.add_argument("project_id", type=int, help="Database id of the archived project")
+    show_parser.add_argument("--year", type=int, help="Project end year")
+
+    args = parser.parse_args()
+
+    if args.command == "archive":
+        if args.database_url:
+            from sqlalchemy import create_engine
+            archive_engine = create_engine(args.database_url)
+        else:
+            from database import engine as archive_engine
+        report = archive_closed_projects(archive_engine, args.older_than_months, args.batch_size, dry_run=args.dry_run)
+        if args.dry_run:
+            print(f"🔍 {report['projects']} projects would be archived")
+        else:
+            print(f"✅ Archived {report['projects']} projects in {report['batches']} batches "
+                  f"({report['files']} files in {ARCHIVE_DIR})")
+            for table_name, count in report['rows'].items():
+                print(f"  {table_name}: {count} rows")
+    elif args.command == "list":
+        for summary in list_archived_projects(args.year, args.search):
+            print(f"{summary['project_id']:>8}  {summary['end']}  {summary['name']}")
+    elif args.command == "show":
+        project = load_archived_project(args.project_id, args.year)
+        if project:
+            print(json.dumps(project, indent=2, ensure_ascii=False, default=str))
+        else:
+            print(f"❌ Archived project {args.project_id} not found")
+            sys.exit(1)
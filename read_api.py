@@ -0,0 +1,374 @@
+"""
+JSON read API for ÉpítAI Construction Management System
+
+A small read-only HTTP API over the models for integrations (ERP, site
+tablets, BI tools), run as its own process next to Streamlit:
+
+    GET /api/<collection>                  list, ordered by id
+    GET /api/<collection>/<id>             single item
+    GET /api/health                        listener and cache state
+
+Collections: projects, resources, assignments, materials, weather.
+
+- items are the models' to_dict() shapes; `?fields=a,b` keeps only those keys
+- cursor pagination: `?limit=100` returns `next_cursor`, passed back as
+  `?cursor=...`; the cursor is the last id seen (keyset, no OFFSET scans)
+- equality filters on the listed columns (`?status=Folyamatban`) and
+  `<date column>_from` / `<date column>_to` ranges (half-open, so the
+  partitioned tables are pruned)
+- responses carry an ETag (hash of the body); `If-None-Match` returns 304
+- serialised with orjson when installed, otherwise with json
+
+Rendered responses are cached in memory per process and dropped when the
+change listener (change_notifications.py) reports a change to the
+collection's tables; tables that are not watched, or any table while the
+listener is disconnected, fall back to READ_API_CACHE_TTL. The API has its
+own engine and connection pool (READ_API_POOL_SIZE).
+
+Requests need `Authorization: Bearer <READ_API_TOKEN>`. The API refuses to
+start without a token unless it only listens on localhost or is explicitly
+started insecure (--insecure, or READ_API_INSECURE=1 for create_app()).
+
+In production run create_app() under a WSGI server, e.g.
+`gunicorn --bind 0.0.0.0:8503 'read_api:create_app()'`; the built-in
+werkzeug server is for development.
+
+Usage: python read_api.py [--host 127.0.0.1] [--port 8503] [--database-url URL] [--insecure]
+"""
+
+import os
+import sys
+import json
+import base64
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from werkzeug.wrappers import Request, Response
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+from models import Project, Resource, TaskAssignment, Material, WeatherData
+from change_notifications import ChangeListener
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+CACHE_TTL = float(os.getenv('READ_API_CACHE_TTL', '30'))
+MAX_CACHE_ENTRIES = int(os.getenv('READ_API_CACHE_ENTRIES', '4096'))
+POOL_SIZE = int(os.getenv('READ_API_POOL_SIZE', '5'))
+API_TOKEN = os.getenv('READ_API_TOKEN')
+ALLOW_INSECURE = os.getenv('READ_API_INSECURE', 'false').lower() in ('1', 'true', 'yes')
+LOCAL_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+# collection -> model, id column, tables whose changes invalidate it, equality filters, date range filters
+COLLECTIONS = {
+    'projects': {
+        'model': Project, 'id': 'project_id', 'tables': ['projects'],
+        'filters': ['status', 'project_type_id', 'project_manager_id'], 'ranges': ['start_date', 'end_date'],
+    },
+    'resources': {
+        'model': Resource, 'id': 'resource_id', 'tables': ['resources'],
+        'filters': ['type', 'availability', 'profession_type_id'], 'ranges': [],
+    },
+    'assignments': {
+        'model': TaskAssignment, 'id': 'assignment_id', 'tables': ['task_assignments'],
+        'filters': ['resource_id', 'project_task_id', 'status'], 'ranges': ['start_date'],
+    },
+    'materials': {
+        'model': Material, 'id': 'material_id', 'tables': ['materials'],
+        'filters': ['category', 'status', 'resource_id'], 'ranges': [],
+    },
+    'weather': {
+        'model': WeatherData, 'id': 'weather_id', 'tables': ['weather_data'],
+        'filters': ['location'], 'ranges': ['date'],
+    },
+}
+
+
+class ApiError(Exception):
+    """Client error with an HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def dumps(payload) -> bytes:
+    """Serialise a response payload to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque cursor for the page after the given id"""
+    return base64.urlsafe_b64encode(str(last_id).encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> int:
+    """Id encoded in a cursor"""
+    try:
+        return int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii'))
+    except (ValueError, UnicodeDecodeError):
+        raise ApiError(400, "Invalid cursor")
+
+
+def _coerce(column, value: str):
+    """Convert a query string value to the column's Python type"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    try:
+        if python_type is date:
+            return date.fromisoformat(value)
+        if python_type is bool:
+            return value.lower() in ('1', 'true', 'yes')
+        return python_type(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"Invalid value for {column.key}: {value}")
+
+
+def _parse_fields(collection: str, fields: str):
+    """Requested to_dict keys, validated against the collection's columns"""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    known = COLLECTIONS[collection]['model'].__table__.columns.keys()
+    unknown = [field for field in requested if field not in known]
+    if unknown:
+        raise ApiError(400, f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+def build_list_query(collection: str, args: dict, after_id=None, limit: int = DEFAULT_LIMIT):
+    """Keyset-paginated select for a collection with the request's filters"""
+    spec = COLLECTIONS[collection]
+    model = spec['model']
+    columns = model.__table__.c
+    id_column = columns[spec['id']]
+    query = select(model)
+    for name in spec['filters']:
+        if name in args:
+            query = query.where(columns[name] == _coerce(columns[name], args[name]))
+    for name in spec['ranges']:
+        if f'{name}_from' in args:
+            query = query.where(columns[name] >= _coerce(columns[name], args[f'{name}_from']))
+        if f'{name}_to' in args:
+            query = query.where(columns[name] < _coerce(columns[name], args[f'{name}_to']))
+    if after_id is not None:
+        query = query.where(id_column > after_id)
+    # One extra row tells whether there is a next page
+    return query.order_by(id_column).limit(limit + 1)
+
+
+class ReadAPI:
+    """WSGI application serving the read API from its own engine"""
+
+    def __init__(self, database_url: str, pool_size: int = POOL_SIZE, token=API_TOKEN, listen: bool = True):
+        if database_url.startswith('sqlite'):
+            self.engine = create_engine(database_url, connect_args={'check_same_thread': False})
+        else:
+            self.engine = create_engine(database_url, pool_pre_ping=True, pool_recycle=300,
+                                        pool_size=pool_size, max_overflow=pool_size)
+        self.token = token
+        self.listen = listen
+        self.listener = None
+        self._listener_lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_listener(self):
+        """Change listener of this process, started on the first request (after a fork)"""
+        if self.listener is None and self.listen:
+            with self._listener_lock:
+                if self.listener is None:
+                    listener = ChangeListener(self.engine)
+                    listener.start()
+                    self.listener = listener
+        return self.listener
+
+    def _versions(self, tables):
+        """Version token of the tables and whether it can be trusted without a TTL"""
+        listener = self._get_listener()
+        if listener is None or not listener.connected:
+            return None, False
+        watched = [table for table in tables if table in listener.tables]
+        return listener.version(*tables), len(watched) == len(tables)
+
+    def _cached(self, key, tables, render):
+        """(etag, body) from the response cache, rendering on a miss or after a change"""
+        versions, trusted = self._versions(tables)
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == versions and (trusted or now - entry[1] < CACHE_TTL):
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[2], entry[3]
+
+        body = dumps(render())
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        with self._cache_lock:
+            self.misses += 1
+            self._cache[key] = (versions, now, etag, body)
+            self._cache.move_to_end(key)
+            while len(self._cache) > MAX_CACHE_ENTRIES:
+                self._cache.popitem(last=False)
+        return etag, body
+
+    def list_items(self, collection: str, args: dict) -> dict:
+        """One page of a collection"""
+        try:
+            limit = int(args.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            raise ApiError(400, "Invalid limit")
+        limit = max(1, min(limit, MAX_LIMIT))
+        after_id = decode_cursor(args['cursor']) if args.get('cursor') else None
+        fields = _parse_fields(collection, args.get('fields'))
+        id_name = COLLECTIONS[collection]['id']
+
+        with Session(self.engine) as session:
+            rows = session.execute(build_list_query(collection, args, after_id, limit)).scalars().all()
+            items = [row.to_dict() for row in rows[:limit]]
+
+        next_cursor = encode_cursor(items[-1][id_name]) if len(rows) > limit else None
+        if fields:
+            items = [{field: item.get(field) for field in fields} for item in items]
+        return {'data': items, 'next_cursor': next_cursor, 'limit': limit}
+
+    def get_item(self, collection: str, item_id: str, args: dict) -> dict:
+        """A single item by id"""
+        spec = COLLECTIONS[collection]
+        model = spec['model']
+        id_column = model.__table__.c[spec['id']]
+        fields = _parse_fields(collection, args.get('fields'))
+        with Session(self.engine) as session:
+            row = session.execute(select(model).where(id_column == _coerce(id_column, item_id))).scalars().first()
+            if row is None:
+                raise ApiError(404, f"{collection}/{item_id} not found")
+            item = row.to_dict()
+        if fields:
+            item = {field: item.get(field) for field in fields}
+        return {'data': item}
+
+    def health(self) -> dict:
+        """Listener and cache state"""
+        listener = self._get_listener()
+        return {
+            'status': 'ok',
+            'serializer': 'orjson' if orjson is not None else 'json',
+            'listener': listener.status() if listener is not None else None,
+            'cache': {'entries': len(self._cache), 'hits': self.hits, 'misses': self.misses},
+        }
+
+    def _authorized(self, request: Request) -> bool:
+        if not self.token:
+            return True
+        header = request.headers.get('Authorization', '')
+        return header.startswith('Bearer ') and hmac.compare_digest(header[7:], self.token)
+
+    def dispatch(self, request: Request) -> Response:
+        """Route a request and build the response"""
+        if request.method not in ('GET', 'HEAD'):
+            raise ApiError(405, "Read-only API")
+        if not self._authorized(request):
+            raise ApiError(401, "Missing or invalid token")
+
+        parts = [part for part in request.path.split('/') if part]
+        if parts == ['api', 'health']:
+            return Response(dumps(self.health()), mimetype='application/json', headers={'Cache-Control': 'no-store'})
+        if len(parts) not in (2, 3) or parts[0] != 'api' or parts[1] not in COLLECTIONS:
+            raise ApiError(404, "Not found")
+
+        collection = parts[1]
+        args = request.args.to_dict()
+        key = (collection, parts[2] if len(parts) == 3 else None, tuple(sorted(args.items())))
+        if len(parts) == 3:
+            etag, body = self._cached(key, COLLECTIONS[collection]['tables'],
+                                      lambda: self.get_item(collection, parts[2], args))
+        else:
+            etag, body = self._cached(key, COLLECTIONS[collection]['tables'],
+                                      lambda: self.list_items(collection, args))
+
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if etag in request.headers.get('If-None-Match', ''):
+            return Response(status=304, headers=headers)
+        return Response(body, mimetype='application/json', headers=headers)
+
+    def __call__(self, environ, start_response):
+        request = Request(environ)
+        try:
+            response = self.dispatch(request)
+        except ApiError as e:
+            response = Response(dumps({'error': str(e)}), status=e.status, mimetype='application/json')
+        except Exception as e:
+            print(f"Read API error on {request.path}: {e}")
+            response = Response(dumps({'error': 'Internal error'}), status=500, mimetype='application/json')
+        return response(environ, start_response)
+
+
+def default_database_url() -> str:
+    """READ_API_DATABASE_URL, or the application's database"""
+    url = os.getenv('READ_API_DATABASE_URL')
+    if url:
+        return url
+    from database import DATABASE_URL
+    return DATABASE_URL
+
+
+def create_app(database_url: str = None, insecure: bool = ALLOW_INSECURE) -> ReadAPI:
+    """WSGI application for any WSGI server, e.g. `gunicorn 'read_api:create_app()'`
+
+    Raises ValueError without READ_API_TOKEN unless `insecure` is set.
+    """
+    if not API_TOKEN and not insecure:
+        raise ValueError("READ_API_TOKEN is not set; set it or allow unauthenticated access explicitly")
+    return ReadAPI(database_url or default_database_url())
+
+
+def serve_read_api(host='127.0.0.1', port=8503, database_url=None, insecure=False):
+    """Serve the read API with werkzeug's threaded development server
+
+    Without READ_API_TOKEN only a localhost bind (or `insecure`) is allowed.
+    """
+    from werkzeug.serving import run_simple, WSGIRequestHandler
+
+    class QuietRequestHandler(WSGIRequestHandler):
+        def log_request(self, code='-', size='-'):
+            # Keep the endpoint quiet under load
+            pass
+
+    app = create_app(database_url, insecure=insecure or host in LOCAL_HOSTS)
+    print(f"Serving the read API on http://{host}:{port}/api/<{'|'.join(COLLECTIONS)}>")
+    run_simple(host, port, app, threaded=True, request_handler=QuietRequestHandler)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Read-only JSON API")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8503, help="Port to listen on")
+    parser.add_argument("--database-url", help="Database URL (default: READ_API_DATABASE_URL or database.py)")
+    parser.add_argument("--insecure", action="store_true",
+                        help="Serve without READ_API_TOKEN on a non-local address")
+
+    args = parser.parse_args()
+    try:
+        serve_read_api(args.host, args.port, args.database_url, args.insecure)
+    except ValueError as e:
+        parser.error(f"{e} (--insecure)")
@@ -0,0 +1,183 @@
+"""
+Resource profiles for ÉpítAI Construction Management System
+
+The resource details page shows a resource's skills, active and past projects,
+current and upcoming tasks, booked hours and upcoming unavailability. Rather
+than scanning every project, phase and task on each render, these live in the
+precomputed resource_profiles table (models/resource_profile.py), which is
+refreshed per resource whenever its memberships, assignments, skills or
+unavailability change, so the page reads a single row.
+
+Profiles are computed as of a day: tasks move from upcoming to current and
+periods expire as days pass, which current_profile() applies on read. Booked
+hours stay as of the stored day until the next refresh, so a daily
+`python resource_profiles.py rebuild` (or resource_profile_rebuild job) keeps
+them exact.
+
+Usage:
+  python resource_profiles.py rebuild
+  python resource_profiles.py show --type Alkalmazott --name "Kovács János"
+"""
+
+import os
+import sys
+import json
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+from models.resource import Resource
+from models.resource_profile import (
+    ResourceProfile, refresh_resource_profiles, build_profile_rows, normalise_skills,
+    ACTIVE_PROJECT_STATUSES, HOURS_PER_DAY,
+)
+
+PROFILE_LISTS = ('skills', 'active_projects', 'past_projects', 'current_tasks', 'upcoming_tasks',
+                 'upcoming_unavailability')
+
+
+def _decode(row) -> dict:
+    """Profile dict from a resource_profiles row (or a build_profile_rows dict)"""
+    profile = {name: json.loads(row[name] or '[]') for name in PROFILE_LISTS}
+    profile.update(
+        resource_id=row['resource_id'],
+        booked_hours=float(row['booked_hours'] or 0),
+        hours_worked=float(row['hours_worked'] or 0),
+        as_of=row['as_of'],
+    )
+    return profile
+
+
+def get_resource_profile(connection, resource_id: Optional[int] = None, resource_type: Optional[str] = None,
+                         name: Optional[str] = None) -> Optional[dict]:
+    """Read a resource's profile by id or by (type, name); None if the resource does not exist
+
+    Resources without a stored profile yet (created before the table existed and
+    not rebuilt since) are computed on the fly, without writing.
+    """
+    table = ResourceProfile.__table__
+    query = select(Resource.resource_id, *[column for column in table.c if column.name != 'resource_id']) \
+        .outerjoin(table, table.c.resource_id == Resource.resource_id)
+    if resource_id is not None:
+        query = query.where(Resource.resource_id == resource_id)
+    else:
+        query = query.where(Resource.type == resource_type, Resource.name == name)
+    row = connection.execute(query).mappings().first()
+    if row is None:
+        return None
+    if row['as_of'] is None:
+        rows = build_profile_rows(connection, [row['resource_id']])
+        return _decode(rows[0]) if rows else None
+    return _decode(row)
+
+
+def current_profile(profile: dict, today: Optional[date] = None) -> dict:
+    """Apply the days passed since the profile was computed: start due tasks, drop ended tasks and periods"""
+    today = (today or date.today()).isoformat()
+    tasks = profile['current_tasks'] + profile['upcoming_tasks']
+    return dict(
+        profile,
+        current_tasks=[t for t in tasks if (t['start'] or '') <= today and (t['end'] or today) >= today],
+        upcoming_tasks=[t for t in tasks if (t['start'] or '') > today],
+        upcoming_unavailability=[p for p in profile['upcoming_unavailability'] if p['end_date'] >= today],
+    )
+
+
+def build_session_profile(resource: dict, projects: list, phases: list, today: Optional[date] = None) -> dict:
+    """Profile of a session-state resource, for when the database has no row for it
+
+    Tasks are the phase catalogue tasks of the resource's projects whose
+    profession matches the resource's position (or that have no profession);
+    booked hours are the remaining person-hours of the open ones.
+    """
+    today = today or date.today()
+    name = resource.get("Név")
+    profession = (resource.get("Pozíció") or "").lower()
+    profile = {
+        'resource_id': None,
+        'skills': normalise_skills(resource.get("Készségek", "")),
+        'active_projects': [], 'past_projects': [],
+        'current_tasks': [], 'upcoming_tasks': [],
+        'upcoming_unavailability': sorted(
+            (period for period in resource.get("unavailability_periods", [])
+             if period["end_date"] >= today.isoformat()),
+            key=lambda period: period["start_date"],
+        ),
+        'booked_hours': 0.0, 'hours_worked': 0.0, 'as_of': today,
+    }
+
+    for project in projects:
+        if name not in project.get("members", []):
+            continue
+        active = project.get("status") in ACTIVE_PROJECT_STATUSES
+        profile['active_projects' if active else 'past_projects'].append({
+            'project_id': project.get("project_id"), 'name': project.get("name", "Névtelen projekt"),
+            'status': project.get("status", "Ismeretlen"), 'progress': project.get("progress", 0),
+            'start': str(project["start"]) if project.get("start") else None,
+            'end': str(project["end"]) if project.get("end") else None,
+        })
+        if not active:
+            continue
+
+        phases_checked = project.get("phases_checked") or []
+        for phase, checked in zip(phases, phases_checked):
+            for task, is_completed in zip(phase["tasks"], checked):
+                if isinstance(task, str):
+                    task = {"name": task}
+                task_profession = (task.get("profession") or "").lower()
+                if task_profession and task_profession not in profession and profession not in task_profession:
+                    continue
+                if not is_completed:
+                    people = task.get("required_people") or 1
+                    profile['booked_hours'] += (task.get("duration_days") or 0) * HOURS_PER_DAY / people
+                profile['current_tasks'].append({
+                    'assignment_id': None, 'project_id': project.get("project_id"),
+                    'project': project.get("name", "Névtelen projekt"), 'phase': phase["name"],
+                    'task': task.get("name", "Unknown task"), 'start': None, 'end': None,
+                    'status': 'Completed' if is_completed else 'Assigned',
+                })
+
+    profile['booked_hours'] = round(profile['booked_hours'], 2)
+    return profile
+
+
+def rebuild_resource_profiles(session, today: Optional[date] = None) -> int:
+    """Recompute every profile (daily, and after bulk loads that bypass the ORM)"""
+    return refresh_resource_profiles(session.connection(), today=today)
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+    from database import get_db_session
+
+    parser = argparse.ArgumentParser(description="Resource profiles")
+    parser.add_argument("command", choices=["rebuild", "show"], help="Command to run")
+    parser.add_argument("--id", type=int, help="Resource id to show")
+    parser.add_argument("--type", help="Resource type to show (with --name)")
+    parser.add_argument("--name", help="Resource name to show (with --type)")
+
+    args = parser.parse_args()
+
+    with get_db_session() as session:
+        if args.command == "rebuild":
+            count = rebuild_resource_profiles(session)
+            print(f"✅ {count} erőforrás profilja újraszámolva")
+        elif args.command == "show":
+            profile = get_resource_profile(session.connection(), args.id, args.type, args.name)
+            if profile is None:
+                print("❌ Az erőforrás nem található")
+            else:
+                profile = current_profile(profile)
+                print(f"🛠️ Készségek: {', '.join(profile['skills']) or '-'}")
+                print(f"📁 Aktív projektek: {', '.join(p['name'] for p in profile['active_projects']) or '-'}")
+                print(f"📂 Korábbi projektek: {len(profile['past_projects'])}")
+                print(f"⏳ Folyamatban lévő feladatok: {len(profile['current_tasks'])}, "
+                      f"következő: {len(profile['upcoming_tasks'])}")
+                print(f"🕒 Lekötött órák: {profile['booked_hours']:,.0f}, ledolgozott: {profile['hours_worked']:,.0f}")
+                for period in profile['upcoming_unavailability']:
+                    print(f"🚫 {period['start_date']} - {period['end_date']} ({period['reason']})")
@@ -0,0 +1,329 @@
+"""
+Request-for-quotation (RFQ) engine for ÉpítAI Construction Management System
+
+Parses a free-text bill of materials into structured line items, fuzzy-matches
+them against the material catalogue, routes every line to the suppliers that
+carry it and renders one RFQ e-mail per supplier from precompiled templates.
+RFQs can be exported as a zip of .eml files.
+"""
+
+import os
+import re
+import io
+import sys
+import zipfile
+import unicodedata
+from difflib import SequenceMatcher
+from string import Template
+from email.message import EmailMessage
+from typing import Optional, List
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+MATCH_THRESHOLD = 0.6
+RFQ_SENDER = os.getenv('RFQ_SENDER', 'ajanlatkeres@epitai.hu')
+
+# Templates are parsed once at import time and reused for every RFQ
+SUBJECT_TEMPLATE = Template("Ajánlatkérés – $project – anyagár")
+BODY_TEMPLATE = Template(
+    "Tisztelt $supplier!\n\n"
+    "Az alábbi anyagokra kérnénk árajánlatot a $project projekthez:\n\n"
+    "$lines\n\n"
+    "Kért szállítási határidő: $need_by\n"
+    "Kérjük, az ajánlat tartalmazza a szállítási és esetleges rakodási költségeket is.\n"
+    "$notes\n\n"
+    "Köszönjük együttműködésüket!\n"
+    "Üdvözlettel,\n"
+    "ÉpítAI rendszer"
+)
+LINE_TEMPLATE = Template("- $name, $quantity $unit")
+
+# Units a quantity is ordered in; dimensions such as mm/cm belong to the material name
+QUANTITY_UNITS = frozenset({
+    'db', 'darab', 'm', 'fm', 'm2', 'm²', 'nm', 'm3', 'm³', 'kg', 'q', 'mázsa', 't', 'tonna', 'l', 'liter',
+    'zsák', 'raklap', 'csomag', 'tekercs', 'doboz', 'vödör', 'tábla', 'ív', 'pár', 'szett', 'készlet', 'cső',
+})
+NUMBER = r'\d+(?:[.,]\d+)?'
+# A comma between two digits is a decimal comma ("12,5 mm"), not the name/quantity separator
+SEPARATOR_PATTERN = re.compile(r'(?<!\d),|,(?!\d)')
+QUANTITY_PATTERN = re.compile(rf'^\s*(?P<quantity>{NUMBER})\s*(?P<unit>\S+)?\s*$')
+TRAILING_QUANTITY_PATTERN = re.compile(rf'^(?P<name>.+?)\s+(?P<quantity>{NUMBER})\s*(?P<unit>\S+)\s*$')
+LEADING_QUANTITY_PATTERN = re.compile(rf'^(?P<quantity>{NUMBER})\s*(?P<unit>\S+)\s+(?P<name>.+)$')
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip accents and collapse whitespace for matching"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(re.sub(r'[^\w/.]+', ' ', text.lower()).split())
+
+
+def _format_quantity(quantity: Optional[float]) -> str:
+    """Format a quantity without a trailing .0"""
+    if quantity is None:
+        return ''
+    return f"{quantity:g}"
+
+
+def _is_unit(unit: Optional[str]) -> bool:
+    """Whether a token is a unit a quantity is ordered in ("db", "m³", "zsák", ...)"""
+    return (unit or '').lower().rstrip('.') in QUANTITY_UNITS
+
+
+def parse_line_item(text: str) -> Optional[dict]:
+    """Parse one bill-of-materials line into name, quantity and unit
+
+    Accepted forms are "Beton C25/30, 20 m³", "Beton C25/30 20 m³" and
+    "10 zsák cement". Without a separating comma the quantity needs a unit, so
+    sizes in the name ("Gipszkarton 12,5 mm", "Csempe 30x60") stay part of it.
+    """
+    text = (text or '').strip().lstrip('-•* ').strip()
+    if not text:
+        return None
+
+    separators = list(SEPARATOR_PATTERN.finditer(text))
+    if separators:
+        head, tail = text[:separators[-1].start()], text[separators[-1].end():]
+        match = QUANTITY_PATTERN.match(tail)
+        if match and head.strip() and (match.group('unit') is None or _is_unit(match.group('unit'))):
+            return _line_item(head, match, text)
+    for pattern in (TRAILING_QUANTITY_PATTERN, LEADING_QUANTITY_PATTERN):
+        match = pattern.match(text)
+        if match and _is_unit(match.group('unit')):
+            return _line_item(match.group('name'), match, text)
+
+    return {'name': text, 'quantity': None, 'unit': '', 'raw': text}
+
+
+def _line_item(name: str, match, raw: str) -> dict:
+    """Line item from a name and a quantity/unit match"""
+    return {
+        'name': name.strip(),
+        'quantity': float(match.group('quantity').replace(',', '.')),
+        'unit': match.group('unit') or '',
+        'raw': raw,
+    }
+
+
+def parse_line_items(text: str) -> List[dict]:
+    """Parse a multi-line bill of materials"""
+    items = []
+    for line in (text or '').splitlines():
+        item = parse_line_item(line)
+        if item:
+            items.append(item)
+    return items
+
+
+class MaterialCatalogue:
+    """Normalised, pre-indexed material catalogue used for fuzzy matching"""
+
+    def __init__(self, entries: List[dict]):
+        # Each entry: name, supplier_name, optional material_id, unit, supplier_id, supplier_email
+        self.names = {}
+        self.by_token = {}
+        for entry in entries:
+            normalized = normalize_text(entry.get('name', ''))
+            if not normalized:
+                continue
+            name = self.names.get(normalized)
+            if name is None:
+                # Entries are grouped by normalised name so each name is scored once
+                name = self.names[normalized] = {
+                    'normalized': normalized,
+                    'tokens': tuple(normalized.split()),
+                    'entries': [],
+                }
+                for token in set(name['tokens']):
+                    self.by_token.setdefault(token[:4], []).append(name)
+            name['entries'].append(entry)
+
+    @classmethod
+    def from_database(cls, connection):
+        """Build the catalogue from materials and their supplier resources"""
+        from sqlalchemy import select, func
+        from models.material import Material
+        from models.resource import Resource
+
+        rows = connection.execute(
+            select(
+                Material.material_id,
+                Material.name,
+                Material.unit,
+                Material.resource_id,
+                func.coalesce(Resource.name, Material.supplier).label('supplier_name'),
+                func.coalesce(Resource.email, Material.vendor_contact).label('supplier_email'),
+            )
+            .outerjoin(Resource, Resource.resource_id == Material.resource_id)
+            .where(Material.status != 'Discontinued')
+        ).all()
+        return cls([
+            {
+                'material_id': row.material_id,
+                'name': row.name,
+                'unit': row.unit,
+                'supplier_id': row.resource_id,
+                'supplier_name': row.supplier_name,
+                'supplier_email': row.supplier_email,
+            }
+            for row in rows if row.supplier_name
+        ])
+
+    @classmethod
+    def from_session_resources(cls, resources: List[dict]):
+        """Build the catalogue from supplier resources' product lists ("Készségek")"""
+        entries = []
+        for resource in resources:
+            if resource.get("Típus") != "Beszállító" or not resource.get("Név"):
+                continue
+            products = [p.strip() for p in re.split(r'[,;\n|]', resource.get("Készségek", "")) if p.strip()]
+            for product in products:
+                entries.append({
+                    'name': product,
+                    'supplier_name': resource["Név"],
+                    'supplier_email': resource.get("E-mail"),
+                })
+        return cls(entries)
+
+    def _candidates(self, tokens):
+        """Get catalogue names sharing a token prefix with the line item"""
+        seen = {}
+        for token in tokens:
+            for name in self.by_token.get(token[:4], ()):
+                seen[name['normalized']] = name
+        return seen.values()
+
+    @staticmethod
+    def _token_overlap(tokens, name_tokens):
+        """Share of the catalogue name covered by the line's tokens (prefix-aware for word endings)"""
+        covered = 0.0
+        for token in name_tokens:
+            best = 0.0
+            for line_token in tokens:
+                common = len(os.path.commonprefix((token, line_token)))
+                if common == len(token) == len(line_token):
+                    best = 1.0
+                    break
+                if common >= 4:
+                    best = max(best, common / max(len(token), len(line_token)))
+            covered += best
+        return covered / len(name_tokens)
+
+    def _score(self, normalized, tokens, name):
+        """Similarity between a line item name and a catalogue name (0..1)"""
+        overlap = self._token_overlap(tokens, name['tokens'])
+        # Catalogue names fully contained in the line ("beton" in "beton c25/30") are strong matches
+        if overlap == 1.0:
+            return 0.9 + 0.1 * len(name['normalized']) / max(len(normalized), 1)
+        score = 0.85 * overlap
+        matcher = SequenceMatcher(None, normalized, name['normalized'])
+        if matcher.real_quick_ratio() > max(score, MATCH_THRESHOLD) and matcher.quick_ratio() > max(score, MATCH_THRESHOLD):
+            score = max(score, matcher.ratio())
+        return score
+
+    def match(self, name: str) -> List[dict]:
+        """Get catalogue entries matching a line item name, best first"""
+        normalized = normalize_text(name)
+        tokens = normalized.split()
+        scored = []
+        for candidate in self._candidates(tokens):
+            score = self._score(normalized, tokens, candidate)
+            if score >= MATCH_THRESHOLD:
+                scored.append((score, candidate))
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return [dict(entry, score=round(score, 3)) for score, candidate in scored for entry in candidate['entries']]
+
+
+def route_line_items(items: List[dict], catalogue: MaterialCatalogue, suppliers: Optional[List[str]] = None) -> dict:
+    """Assign each line item to the suppliers carrying it
+
+    Lines that match no supplier are sent to every requested supplier so they
+    still get a quote.
+    """
+    allowed = set(suppliers) if suppliers else None
+    routed = {name: [] for name in (suppliers or [])}
+    unmatched = []
+    contacts = {}
+
+    for item in items:
+        matches = catalogue.match(item['name'])
+        carriers = []
+        for entry in matches:
+            supplier = entry['supplier_name']
+            if allowed is not None and supplier not in allowed:
+                continue
+            if supplier not in carriers:
+                carriers.append(supplier)
+                contacts.setdefault(supplier, entry.get('supplier_email'))
+
+        item = dict(item, matched_material=matches[0]['name'] if matches else None, suppliers=carriers)
+        if carriers:
+            for supplier in carriers:
+                routed.setdefault(supplier, []).append(item)
+        else:
+            unmatched.append(item)
+
+    for supplier in (suppliers or []):
+        routed[supplier].extend(unmatched)
+
+    return {
+        'routes': {supplier: lines for supplier, lines in routed.items() if lines},
+        'unmatched': unmatched,
+        'contacts': contacts,
+    }
+
+
+def render_rfq(supplier: str, lines: List[dict], project: str, need_by: str, notes: str = '',
+               supplier_email: Optional[str] = None) -> dict:
+    """Render one supplier's RFQ subject and body"""
+    line_block = "\n".join(
+        LINE_TEMPLATE.substitute(name=line['name'], quantity=_format_quantity(line['quantity']), unit=line['unit']).rstrip(', ')
+        if line['quantity'] is not None else f"- {line['name']}"
+        for line in lines
+    ) or "- (nincs tétel megadva)"
+    return {
+        'supplier': supplier,
+        'to': supplier_email,
+        'subject': SUBJECT_TEMPLATE.substitute(project=project),
+        'body': BODY_TEMPLATE.substitute(
+            supplier=supplier,
+            project=project,
+            lines=line_block,
+            need_by=need_by,
+            notes=(notes or '').strip(),
+        ),
+        'lines': lines,
+    }
+
+
+def build_rfqs(material_text: str, catalogue: MaterialCatalogue, suppliers: Optional[List[str]], project: str,
+               need_by: str, notes: str = '') -> dict:
+    """Parse, match, route and render all RFQs for a bill of materials"""
+    items = parse_line_items(material_text)
+    routing = route_line_items(items, catalogue, suppliers)
+    rfqs = [
+        render_rfq(supplier, lines, project, need_by, notes, routing['contacts'].get(supplier))
+        for supplier, lines in routing['routes'].items()
+    ]
+    return {'items': items, 'rfqs': rfqs, 'unmatched': routing['unmatched']}
+
+
+def _eml_filename(index: int, supplier: str) -> str:
+    """Get a filesystem-safe .eml file name for a supplier"""
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', normalize_text(supplier)).strip('_') or 'beszallito'
+    return f"{index:03d}_{slug}.eml"
+
+
+def export_rfqs_zip(rfqs: List[dict], sender: str = RFQ_SENDER) -> bytes:
+    """Export rendered RFQs as a zip archive of .eml files"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for index, rfq in enumerate(rfqs, start=1):
+            message = EmailMessage()
+            message['From'] = sender
+            if rfq.get('to'):
+                message['To'] = rfq['to']
+            message['Subject'] = rfq['subject']
+            message.set_content(rfq['body'])
+            archive.writestr(_eml_filename(index, rfq['supplier']), message.as_bytes())
+    return buffer.getvalue()
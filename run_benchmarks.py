@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for ÉpítAI Construction Management System
+
+Times the application's hot paths against a scratch database filled by the
+synthetic data generator:
+
+- dashboard metric computation (pages/home.py) and the budget deviation query
+- scheduling resource matching (pages/scheduling.py)
+- progress rollups (client snapshots) and schedule/timeline building
+- to_dict serialisation of large ORM result sets
+- login verification (user lookup + password hash check)
+- page render time of the main pages via Streamlit's AppTest
+- fragment rerun time of the interactive page sections (st.fragment), i.e.
+  the per-interaction cost to compare with the full page render
+
+Functions defined inside page scripts are loaded straight from the page source,
+so a regression in pages/home.py or pages/scheduling.py shows up here.
+
+Usage:
+  python run_benchmarks.py run [--database-url URL] [--compare-to baseline.json]
+  python run_benchmarks.py compare baseline.json current.json [--threshold 20]
+
+`run` writes a JSON result file to benchmark_results/ and, with --compare-to,
+exits with status 1 when a benchmark regressed beyond the threshold.
+"""
+
+import ast
+import copy
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+from phase_catalogue import get_phase_catalogue
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(PROJECT_ROOT, 'benchmark_results')
+DEFAULT_DATABASE_URL = f"sqlite:///{os.path.join(RESULTS_DIR, 'benchmarks.db')}"
+DEFAULT_PROFILE = 'small'
+DEFAULT_SEED = 42
+DEFAULT_REPEAT = 7
+DEFAULT_SESSION_PROJECTS = 300
+DEFAULT_ROWS = 10_000
+DEFAULT_THRESHOLD = 20.0
+MIN_DELTA_MS = 0.2
+BENCHMARK_TODAY = date(2025, 10, 1)
+
+BENCHMARK_USER_EMAIL = 'benchmark@synthetic.epitai.hu'
+BENCHMARK_USER_PASSWORD = 'benchmark-password'
+RENDERED_PAGES = ['home', 'scheduling', 'projects', 'resources', 'project_details', 'resource_details']
+# page -> extra session state needed to render it
+PAGE_STATE = {
+    'project_details': {'selected_project_index': 0},
+    'resource_details': {'selected_resource_index': 0},
+}
+# interaction -> (source file, fragment call); a widget inside the fragment reruns only this call
+FRAGMENT_INTERACTIONS = {
+    'scheduling_assignments': ('pages/scheduling.py', "render_assignments(st.session_state['benchmark_location_groups'])"),
+    # A multiselect change reruns only the fragment of its location
+    'scheduling_location': ('pages/scheduling.py', "render_location_assignments("
+                            "*next(iter(st.session_state['benchmark_location_groups'].items())), set())"),
+    'project_phases': ('components/project_details_tabs/phases.py', 'render_phases_tab(0)'),
+    'project_material_costs': ('components/project_details_tabs/material_costs.py', 'render_material_costs_tab(0)'),
+    'resource_unavailability': ('pages/resource_details.py', 'render_unavailability_tab(0)'),
+}
+ACTIVE_STATUSES = ('Folyamatban', 'Késésben')
+
+# name -> setup(context) returning (callable, items processed per call)
+BENCHMARKS: Dict[str, Callable] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark setup function"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class SessionStateStub(dict):
+    """Dict with attribute access, enough for page functions that read st.session_state"""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError as e:
+            raise AttributeError(name) from e
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+
+def load_page_functions(page_path: str, names: List[str], session_state: dict) -> dict:
+    """Compile selected top-level functions of a page script without running the page
+
+    The page's imports are executed (failing ones are skipped) and `st` is
+    replaced by an object exposing only the given session state.
+    """
+    with open(page_path, encoding='utf-8') as handle:
+        tree = ast.parse(handle.read(), page_path)
+
+    namespace = {'__name__': 'benchmarked_page', '__file__': page_path}
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            try:
+                exec(compile(ast.Module(body=[node], type_ignores=[]), page_path, 'exec'), namespace)
+            except (ImportError, ValueError):
+                pass
+    namespace['st'] = type('StreamlitStub', (), {'session_state': session_state})
+
+    functions = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in names]
+    missing = set(names) - {node.name for node in functions}
+    if missing:
+        raise LookupError(f"{page_path} does not define {', '.join(sorted(missing))}")
+    exec(compile(ast.Module(body=functions, type_ignores=[]), page_path, 'exec'), namespace)
+    return {name: namespace[name] for name in names}
+
+
+def _phases_checked(progress: int, phases: List[dict]) -> List[List[bool]]:
+    """Check the first tasks of the schedule in proportion to progress"""
+    total = sum(len(phase["tasks"]) for phase in phases)
+    remaining = round(total * (progress or 0) / 100)
+    checked = []
+    for phase in phases:
+        row = []
+        for _ in phase["tasks"]:
+            row.append(remaining > 0)
+            remaining -= 1
+        checked.append(row)
+    return checked
+
+
+def load_session_state(connection, limit: int = DEFAULT_SESSION_PROJECTS) -> dict:
+    """Build session-state style projects and resources from the scratch database"""
+    phases = get_phase_catalogue().phases
+    resources = [
+        {
+            "Típus": row.type, "Név": row.name, "Pozíció": row.position or "", "Telefonszám": row.phone or "",
+            "E-mail": row.email or "", "Cím": row.address or "", "Készségek": row.skills or "",
+            "Órabér": float(row.hourly_rate or 0), "Elérhetőség": row.availability or "Elérhető",
+            "Tapasztalat": row.experience_years or 0,
+        }
+        for row in connection.execute(text(
+            "SELECT type, name, position, phone, email, address, skills, hourly_rate, availability, experience_years "
+            "FROM resources ORDER BY resource_id"
+        ))
+    ]
+
+    rows = connection.execute(text(
+        "SELECT p.project_id, p.project_name, p.status, p.start_date, p.end_date, p.location, p.progress_percent, "
+        "p.size_sqm, t.name AS type_name FROM projects p LEFT JOIN project_types t ON t.project_type_id = p.project_type_id "
+        "ORDER BY p.project_id LIMIT :limit"
+    ), {'limit': limit}).all()
+    members = {}
+    if rows:
+        for project_id, name in connection.execute(text(
+            "SELECT pm.project_id, r.name FROM project_members pm JOIN resources r ON r.resource_id = pm.resource_id "
+            "WHERE pm.project_id BETWEEN :first AND :last ORDER BY pm.project_member_id"
+        ), {'first': rows[0].project_id, 'last': rows[-1].project_id}):
+            # Members are stored by name in session state, so same-named resources collapse
+            if name not in members.setdefault(project_id, []):
+                members[project_id].append(name)
+
+    projects = [
+        {
+            "name": row.project_name, "start": str(row.start_date), "end": str(row.end_date), "status": row.status,
+            "size": row.size_sqm, "members": members.get(row.project_id, []),
+            "locations": [row.location] if row.location else [], "progress": row.progress_percent or 0,
+            "phases_checked": _phases_checked(row.progress_percent, phases), "type": row.type_name or "",
+            "project_id": hashlib.md5(str(row.project_id).encode()).hexdigest(),
+        }
+        for row in rows
+    ]
+    return {'projects': projects, 'resources': resources}
+
+
+# Benchmarks
+
+@benchmark('dashboard_metrics')
+def _dashboard_metrics(context):
+    functions = load_page_functions(os.path.join(PROJECT_ROOT, 'pages', 'home.py'),
+                                    ['compute_dashboard_metrics'], SessionStateStub())
+    compute = functions['compute_dashboard_metrics']
+    projects, resources = context['session']['projects'], context['session']['resources']
+    return (lambda: compute(projects, resources, BENCHMARK_TODAY)), len(projects)
+
+
+@benchmark('dashboard_budget_deviations')
+def _dashboard_budget_deviations(context):
+    from budget_engine import get_budget_deviations
+    engine = context['engine']
+
+    def run():
+        with engine.connect() as connection:
+            return get_budget_deviations(connection)
+    return run, 1
+
+
+@benchmark('scheduling_matching')
+def _scheduling_matching(context):
+    session_state = SessionStateStub(copy.deepcopy(context['session']), task_assignments={})
+    functions = load_page_functions(
+        os.path.join(PROJECT_ROOT, 'pages', 'scheduling.py'),
+        ['get_task_profession', 'get_used_resources_from_session', 'get_available_resources_for_task'],
+        session_state,
+    )
+    catalogue = get_phase_catalogue()
+    task_names = catalogue.task_names
+    active = [p for p in session_state.projects if p.get("status") in ACTIVE_STATUSES]
+
+    def run():
+        used = functions['get_used_resources_from_session']()
+        for _ in active:
+            for task_name in task_names:
+                profession = functions['get_task_profession'](task_name, catalogue)
+                functions['get_available_resources_for_task'](profession, used)
+    return run, max(1, len(active) * len(task_names))
+
+
+@benchmark('progress_rollup')
+def _progress_rollup(context):
+    from client_snapshot import build_client_snapshot
+    phases = get_phase_catalogue().phases
+    projects = context['session']['projects']
+    return (lambda: [build_client_snapshot(project, phases) for project in projects]), len(projects)
+
+
+@benchmark('timeline_building')
+def _timeline_building(context):
+    from components.project_details_tabs.schedule import build_schedule_rows
+    phases = get_phase_catalogue().phases
+    projects = context['session']['projects']
+    return (lambda: [build_schedule_rows(project, phases) for project in projects]), len(projects)
+
+
+@benchmark('timeline_figure')
+def _timeline_figure(context):
+    from components.project_details_tabs.schedule import build_schedule_rows, build_schedule_figure
+    rows = build_schedule_rows(context['session']['projects'][0], get_phase_catalogue().phases)
+    return (lambda: build_schedule_figure(rows)), 1
+
+
+def _to_dict_benchmark(model, order_by):
+    def setup(context):
+        engine, limit = context['engine'], context['rows']
+
+        def run():
+            with Session(engine) as session:
+                return [row.to_dict() for row in session.query(model).order_by(order_by).limit(limit)]
+        return run, limit
+    return setup
+
+
+def _register_to_dict_benchmarks():
+    from models.project import Project
+    from models.resource import Resource
+    from models.task_assignment import TaskAssignment
+    from models.weather_data import WeatherData
+
+    benchmark('to_dict_projects')(_to_dict_benchmark(Project, Project.project_id))
+    benchmark('to_dict_resources')(_to_dict_benchmark(Resource, Resource.resource_id))
+    benchmark('to_dict_task_assignments')(_to_dict_benchmark(TaskAssignment, TaskAssignment.assignment_id))
+    benchmark('to_dict_weather')(_to_dict_benchmark(WeatherData, WeatherData.weather_id))
+
+
+_register_to_dict_benchmarks()
+
+
+@benchmark('login_verification')
+def _login_verification(context):
+    from models.user import User
+    engine = context['engine']
+
+    def run():
+        with Session(engine) as session:
+            user = session.query(User).filter(User.email == BENCHMARK_USER_EMAIL).first()
+            if not (user and user.check_password(BENCHMARK_USER_PASSWORD)):
+                raise RuntimeError("Benchmark user could not log in")
+    return run, 1
+
+
+def _page_script(page_path, project_root):
+    """AppTest script: run a page with the sidebar navigation disabled (page links need the multipage app)"""
+    import sys
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    import components.sidebar as sidebar
+    sidebar.render_sidebar_navigation = lambda *args, **kwargs: None
+    with open(page_path, encoding='utf-8') as handle:
+        exec(compile(handle.read(), page_path, 'exec'), {'__name__': '__main__', '__file__': page_path})
+
+
+def _fragment_script(source_path, call, project_root):
+    """AppTest script: define the functions of a page or component and run a single fragment call"""
+    import ast
+    import sys
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    with open(source_path, encoding='utf-8') as handle:
+        tree = ast.parse(handle.read(), source_path)
+    body = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef))]
+    namespace = {'__name__': 'benchmarked_fragment', '__file__': source_path}
+    exec(compile(ast.Module(body=body, type_ignores=[]), source_path, 'exec'), namespace)
+    eval(call, namespace)
+
+
+def _bind_application_database(engine) -> Optional[str]:
+    """Point the pages' database module at the benchmark engine; returns a reason when impossible"""
+    try:
+        import database
+    except ValueError as e:
+        return f"database module unavailable: {e}"
+    database.engine = engine
+    database.SessionLocal.configure(bind=engine)
+    return None
+
+
+def _app_test_run(context, script: Callable, args: tuple, state: Optional[dict] = None):
+    """Build an AppTest over the benchmark session; returns a callable that reruns it"""
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+
+    # Widget warnings are logged with stack traces on every rerun
+    set_log_level('error')
+    if context['page_skip_reason']:
+        raise RuntimeError(context['page_skip_reason'])
+    app = AppTest.from_function(script, args=args, default_timeout=120)
+    app.session_state['user_logged_in'] = True
+    app.session_state['projects'] = copy.deepcopy(context['session']['projects'])
+    app.session_state['resources'] = copy.deepcopy(context['session']['resources'])
+    for key, value in (state or {}).items():
+        app.session_state[key] = value
+
+    def run():
+        app.run()
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+    return run
+
+
+def _page_render_benchmark(page: str):
+    def setup(context):
+        page_path = os.path.join(PROJECT_ROOT, 'pages', f'{page}.py')
+        return _app_test_run(context, _page_script, (page_path, PROJECT_ROOT), PAGE_STATE.get(page)), 1
+    return setup
+
+
+def _interaction_benchmark(interaction: str):
+    def setup(context):
+        source, call = FRAGMENT_INTERACTIONS[interaction]
+        state = {'task_assignments': {}}
+        if interaction.startswith('scheduling_'):
+            # The location groups are built once per full page run and handed to the fragment
+            random.seed(DEFAULT_SEED)
+            functions = load_page_functions(
+                os.path.join(PROJECT_ROOT, 'pages', 'scheduling.py'),
+                ['get_tasks_grouped_by_location', 'get_random_tasks', 'get_fake_weather_data', 'get_task_profession'],
+                SessionStateStub(copy.deepcopy(context['session'])),
+            )
+            state['benchmark_location_groups'] = functions['get_tasks_grouped_by_location']()
+        return _app_test_run(context, _fragment_script, (os.path.join(PROJECT_ROOT, source), call, PROJECT_ROOT), state), 1
+    return setup
+
+
+for _page in RENDERED_PAGES:
+    benchmark(f'page_render_{_page}')(_page_render_benchmark(_page))
+
+for _interaction in FRAGMENT_INTERACTIONS:
+    benchmark(f'interaction_{_interaction}')(_interaction_benchmark(_interaction))
+
+
+# Runner
+
+def _measure(run: Callable, repeat: int, warmup: int = 1) -> List[float]:
+    for _ in range(warmup):
+        run()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _summarise(timings: List[float], items: int) -> dict:
+    ordered = sorted(timings)
+    median = statistics.median(ordered)
+    return {
+        'median_ms': round(median, 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))], 3),
+        'min_ms': round(ordered[0], 3),
+        'mean_ms': round(statistics.fmean(ordered), 3),
+        'runs': len(ordered),
+        'items': items,
+        'per_item_us': round(median * 1000 / items, 3) if items else None,
+    }
+
+
+def prepare_database(database_url: str, profile: str = DEFAULT_PROFILE, seed: int = DEFAULT_SEED,
+                     alembic_cfg_path: str = "alembic.ini"):
+    """Migrate the scratch database to head and load synthetic data once"""
+    from alembic import command
+    from alembic.config import Config
+    from models.user import User
+    from synthetic_data import PROFILES, generate
+
+    url = make_url(database_url)
+    if url.get_backend_name() == 'sqlite' and url.database:
+        os.makedirs(os.path.dirname(os.path.abspath(url.database)), exist_ok=True)
+    engine = create_engine(database_url)
+
+    config = Config(os.path.join(PROJECT_ROOT, alembic_cfg_path))
+    config.set_main_option('script_location', os.path.join(PROJECT_ROOT, 'alembic'))
+    with engine.connect() as connection:
+        config.attributes['connection'] = connection
+        command.upgrade(config, 'head')
+
+    with engine.connect() as connection:
+        seeded = connection.execute(text("SELECT COUNT(*) FROM projects")).scalar()
+    if not seeded:
+        print(f"🌱 Loading synthetic data (profile {profile}, seed {seed})")
+        generate(engine, PROFILES[profile], seed=seed, as_of=BENCHMARK_TODAY)
+
+    with Session(engine) as session:
+        if not session.query(User).filter(User.email == BENCHMARK_USER_EMAIL).first():
+            user = User(first_name='Benchmark', last_name='Felhasználó', email=BENCHMARK_USER_EMAIL,
+                        role='Projektvezető', status='Active')
+            user.set_password(BENCHMARK_USER_PASSWORD)
+            session.add(user)
+            session.commit()
+    return engine
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(database_url: str = DEFAULT_DATABASE_URL, profile: str = DEFAULT_PROFILE, seed: int = DEFAULT_SEED,
+                   repeat: int = DEFAULT_REPEAT, session_projects: int = DEFAULT_SESSION_PROJECTS,
+                   rows: int = DEFAULT_ROWS, only: Optional[List[str]] = None) -> dict:
+    """Run the selected benchmarks and return the JSON-serialisable report"""
+    try:
+        from database import DATABASE_URL
+    except ValueError:
+        DATABASE_URL = None
+    if DATABASE_URL and database_url == DATABASE_URL:
+        raise ValueError("Refusing to benchmark against the application database; use a scratch database")
+
+    engine = prepare_database(database_url, profile, seed)
+    with engine.connect() as connection:
+        session = load_session_state(connection, session_projects)
+        counts = {table: connection.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+                  for table in ('projects', 'resources', 'task_assignments', 'project_materials', 'weather_data')}
+
+    context = {
+        'engine': engine,
+        'session': session,
+        'rows': rows,
+        'page_skip_reason': _bind_application_database(engine),
+    }
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        try:
+            run, items = setup(context)
+            results[name] = _summarise(_measure(run, repeat), items)
+            print(f"  {name:32} {results[name]['median_ms']:10.3f} ms")
+        except Exception as e:
+            results[name] = {'error': f"{type(e).__name__}: {e}"}
+            print(f"  {name:32} ❌ {results[name]['error']}")
+    engine.dispose()
+
+    return {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': make_url(database_url).render_as_string(hide_password=True),
+            'dialect': engine.dialect.name,
+            'profile': profile,
+            'seed': seed,
+            'repeat': repeat,
+            'session_projects': len(session['projects']),
+            'session_resources': len(session['resources']),
+            'rows': rows,
+            'table_counts': counts,
+        },
+        'results': results,
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD,
+                    min_delta_ms: float = MIN_DELTA_MS) -> List[dict]:
+    """Compare median timings; a benchmark regresses when it is threshold % and min_delta_ms slower"""
+    rows = []
+    names = list(baseline['results']) + [name for name in current['results'] if name not in baseline['results']]
+    for name in names:
+        before, after = baseline['results'].get(name), current['results'].get(name)
+        if not after or 'error' in after:
+            status = 'missing' if not after else 'error'
+            rows.append({'name': name, 'status': status, 'before_ms': (before or {}).get('median_ms'), 'after_ms': None,
+                         'change_percent': None})
+            continue
+        if not before or 'error' in before:
+            rows.append({'name': name, 'status': 'new', 'before_ms': None, 'after_ms': after['median_ms'],
+                         'change_percent': None})
+            continue
+        delta = after['median_ms'] - before['median_ms']
+        change = delta * 100 / before['median_ms'] if before['median_ms'] else 0.0
+        if change > threshold and delta > min_delta_ms:
+            status = 'regression'
+        elif change < -threshold and -delta > min_delta_ms:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({'name': name, 'status': status, 'before_ms': before['median_ms'], 'after_ms': after['median_ms'],
+                     'change_percent': round(change, 1)})
+    return rows
+
+
+def print_comparison(rows: List[dict]):
+    icons = {'regression': '🔴', 'improvement': '🟢', 'ok': '✅', 'new': '🆕', 'missing': '⚠️', 'error': '❌'}
+    for row in rows:
+        before = f"{row['before_ms']:.3f}" if row['before_ms'] is not None else '-'
+        after = f"{row['after_ms']:.3f}" if row['after_ms'] is not None else '-'
+        change = f"{row['change_percent']:+.1f}%" if row['change_percent'] is not None else ''
+        print(f"{icons[row['status']]} {row['name']:32} {before:>10} -> {after:>10} ms {change}")
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def _has_regressions(rows: List[dict]) -> bool:
+    return any(row['status'] in ('regression', 'error', 'missing') for row in rows)
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the application's hot paths")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark suite")
+    run_parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL,
+                            help="Scratch database URL, e.g. postgresql+psycopg2://localhost/epitai_bench")
+    run_parser.add_argument("--profile", default=DEFAULT_PROFILE, help="Synthetic data profile for a fresh database")
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Synthetic data seed")
+    run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per benchmark")
+    run_parser.add_argument("--session-projects", type=int, default=DEFAULT_SESSION_PROJECTS,
+                            help="Projects loaded into the simulated session state")
+    run_parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Rows per to_dict result set")
+    run_parser.add_argument("--only", help="Comma separated benchmark names")
+    run_parser.add_argument("--output", help="Result file (default: benchmark_results/<timestamp>-<dialect>.json)")
+    run_parser.add_argument("--compare-to", help="Baseline result file to compare against")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Regression threshold in %%")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", help="Baseline result file")
+    compare_parser.add_argument("current", help="Current result file")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Regression threshold in %%")
+
+    subparsers.add_parser("list", help="List benchmark names")
+
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name in BENCHMARKS:
+            print(name)
+    elif args.command == "run":
+        print(f"⏱️ Running benchmarks against {make_url(args.database_url).render_as_string(hide_password=True)}")
+        report = run_benchmarks(args.database_url, args.profile, args.seed, args.repeat, args.session_projects,
+                                args.rows, args.only.split(',') if args.only else None)
+        output = args.output or os.path.join(
+            RESULTS_DIR, f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{report['meta']['dialect']}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2, ensure_ascii=False)
+        print(f"💾 Results written to {output}")
+        if args.compare_to:
+            comparison = compare_results(_load(args.compare_to), report, args.threshold)
+            print_comparison(comparison)
+            sys.exit(1 if _has_regressions(comparison) else 0)
+    elif args.command == "compare":
+        comparison = compare_results(_load(args.baseline), _load(args.current), args.threshold)
+        print_comparison(comparison)
+        sys.exit(1 if _has_regressions(comparison) else 0)
@@ -3,10 +3,12 @@
 Simple script to run database migrations
 Usage: python run_migrations.py [command]
 Commands:
-  auto    - Automatically detect and apply migrations
-  status  - Check migration status
-  generate - Generate a new migration
+  auto    - Apply pending revisions (production mode, never autogenerates)
+  status  - Check migration status (revision ids only)
   apply   - Apply pending migrations
+Developer commands (reflect the database and write files to alembic/versions):
+  generate - Autogenerate a new migration from model changes
+  init     - Create and apply the initial migration
 """
 
 import sys
@@ -17,6 +19,11 @@ sys.path.append(os.path.dirname(__file__))
 
 from migration_utils import AutoMigrationManager
 
+def print_timings(timings):
+    """Print per-step timings in milliseconds"""
+    for step, elapsed in timings.items():
+        print(f"  {step}: {elapsed:.1f} ms")
+
 def main():
     if len(sys.argv) < 2:
         command = "auto"
@@ -27,8 +34,11 @@ def main():
     
     if command == "auto":
         print("Running automatic migration...")
-        result = manager.auto_migrate()
-        print(f"Result: {result}")
+        result = manager.migrate()
+        print(f"Result: {result['message']}")
+        for revision in result['applied_revisions']:
+            print(f"  applied: {revision}")
+        print_timings(result['timings'])
         
     elif command == "status":
         print("Checking migration status...")
@@ -37,6 +47,11 @@ def main():
         print(f"Head revision: {status.get('head_revision', 'None')}")
         print(f"Up to date: {status.get('is_up_to_date', False)}")
         print(f"Needs migration: {status.get('needs_migration', False)}")
+        if status.get('unknown_revisions'):
+            print(f"Unknown revisions in database: {', '.join(status['unknown_revisions'])}")
+        if 'error' in status:
+            print(f"Error: {status['error']}")
+        print_timings(status.get('timings', {}))
         
     elif command == "generate":
         message = sys.argv[2] if len(sys.argv) > 2 else None
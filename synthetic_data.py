@@ -0,0 +1,666 @@
+"""
+Synthetic data generator for ÉpítAI Construction Management System
+
+Fills the real schema with configurable volumes of realistic data for load
+testing and benchmarks: resources with a profession mix and skewed hourly
+rates, projects scheduled from the default phase/task catalogue with statuses
+derived from their dates, task assignments sized by required people, project
+materials drawn from a long-tailed catalogue and daily weather per city with
+seasonal temperatures and persistent wet spells.
+
+Generation is deterministic for a given seed, volumes, as-of date and starting
+database state. Rows are streamed in chunks and loaded with COPY on PostgreSQL
+and executemany elsewhere (SQLite).
+"""
+
+import csv
+import io
+import math
+import os
+import random
+import sys
+import time
+import unicodedata
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+# Add project root to path
+sys.path.append(os.path.dirname(__file__))
+
+from default_data import get_default_phases, get_default_profession_types, get_default_project_types
+
+DEFAULT_SEED = 42
+DEFAULT_AS_OF = date(2025, 10, 1)
+DEFAULT_CHUNK_SIZE = 50_000
+
+DEFAULT_VOLUMES = {
+    'users': 100,
+    'resources': 5_000,
+    'projects': 20_000,
+    'task_assignments': 2_000_000,
+    'materials': 2_000,
+    'project_materials': 400_000,
+    'weather_locations': 20,
+    'weather_years': 5,
+    'history_years': 5,
+}
+
+PROFILES = {
+    'small': dict(DEFAULT_VOLUMES, users=10, resources=200, projects=500, task_assignments=20_000,
+                  materials=200, project_materials=5_000, weather_locations=7, weather_years=1),
+    'medium': dict(DEFAULT_VOLUMES, users=30, resources=1_000, projects=5_000, task_assignments=300_000,
+                   materials=1_000, project_materials=60_000, weather_locations=10, weather_years=3),
+    'large': dict(DEFAULT_VOLUMES),
+    'xlarge': dict(DEFAULT_VOLUMES, users=300, resources=20_000, projects=100_000, task_assignments=10_000_000,
+                   materials=5_000, project_materials=2_000_000, weather_locations=50, weather_years=10),
+}
+
+# Load order (parents before children) and the columns written for each table
+TABLE_COLUMNS = [
+    ('profession_types', ['profession_type_id', 'name', 'description', 'level']),
+    ('project_types', ['project_type_id', 'name', 'description']),
+    ('phases', ['phase_id', 'project_type_id', 'name', 'order_sequence', 'total_duration_days']),
+    ('tasks', ['task_id', 'phase_id', 'name', 'profession_type_id', 'duration_days', 'required_people',
+               'order_sequence']),
+    ('users', ['user_id', 'first_name', 'last_name', 'email', 'password_hash', 'role', 'department',
+               'hire_date', 'status', 'phone']),
+    ('resources', ['resource_id', 'type', 'name', 'position', 'profession_type_id', 'phone', 'email', 'address',
+                   'skills', 'hourly_rate', 'availability', 'experience_years']),
+    ('materials', ['material_id', 'resource_id', 'name', 'category', 'unit', 'unit_cost', 'supplier',
+                   'lead_time_days', 'minimum_order', 'current_stock', 'reorder_level', 'status']),
+    ('projects', ['project_id', 'project_name', 'client_name', 'project_type_id', 'status', 'start_date', 'end_date',
+                  'budget', 'project_manager_id', 'location', 'priority', 'progress_percent', 'size_sqm',
+                  'project_code']),
+    ('project_locations', ['project_location_id', 'project_id', 'location_name', 'address']),
+    ('project_members', ['project_member_id', 'project_id', 'resource_id', 'role_in_project', 'assigned_date']),
+    ('project_phases', ['project_phase_id', 'project_id', 'phase_id', 'start_date', 'end_date', 'status',
+                        'progress_percent']),
+    ('project_tasks', ['project_task_id', 'project_phase_id', 'task_id', 'start_date', 'end_date', 'status',
+                       'progress_percent', 'completed_date']),
+    ('task_assignments', ['assignment_id', 'project_task_id', 'resource_id', 'assigned_date', 'start_date',
+                          'end_date', 'status', 'hours_worked']),
+    ('project_materials', ['project_material_id', 'project_id', 'material_id', 'quantity', 'unit_cost',
+                           'total_cost', 'assigned_date', 'status']),
+    ('weather_data', ['weather_id', 'location', 'date', 'precipitation_probability', 'precipitation_hours',
+                      'temperature_min', 'temperature_max', 'wind_speed', 'can_work_outdoor']),
+]
+PRIMARY_KEYS = {table: columns[0] for table, columns in TABLE_COLUMNS}
+
+# Cities weighted roughly by construction activity
+CITIES = [
+    ("Budapest", 30), ("Debrecen", 6), ("Szeged", 5), ("Miskolc", 4), ("Pécs", 4), ("Győr", 5),
+    ("Nyíregyháza", 3), ("Kecskemét", 3), ("Székesfehérvár", 3), ("Szombathely", 2), ("Szolnok", 2),
+    ("Érd", 3), ("Tatabánya", 2), ("Kaposvár", 2), ("Veszprém", 2), ("Sopron", 2), ("Eger", 2),
+    ("Zalaegerszeg", 1), ("Dunaújváros", 1), ("Vác", 1),
+]
+FAMILY_NAMES = ["Nagy", "Kovács", "Tóth", "Szabó", "Horváth", "Varga", "Kiss", "Molnár", "Németh", "Farkas",
+                "Balogh", "Papp", "Takács", "Juhász", "Lakatos", "Mészáros", "Oláh", "Simon", "Rácz", "Fekete"]
+GIVEN_NAMES = ["László", "István", "József", "János", "Zoltán", "Sándor", "Gábor", "Ferenc", "Attila", "Péter",
+               "Tamás", "Zsolt", "Tibor", "András", "Csaba", "Imre", "Lajos", "György", "Balázs", "Róbert",
+               "Mária", "Erzsébet", "Katalin", "Éva", "Ilona", "Anna", "Zsuzsanna", "Judit", "Ágnes", "Andrea"]
+STREETS = ["Kossuth L.", "Petőfi S.", "Rákóczi", "Széchenyi", "Ady E.", "Dózsa Gy.", "Bajcsy-Zs.", "Arany J.",
+           "József A.", "Béke", "Fő", "Kölcsey"]
+RESOURCE_TYPES = [("Alkalmazott", 70), ("Alvállalkozó", 22), ("Beszállító", 8)]
+AVAILABILITY = [("Elérhető", 75), ("Foglalt", 18), ("Szabadságon", 5), ("Betegszabadság", 2)]
+PRIORITIES = [("Alacsony", 25), ("Közepes", 55), ("Magas", 20)]
+LEVEL_RATES = {'Szakmunkás': 3500, 'Vezető': 6500, 'Szakértő': 8000}
+
+# (category, unit, typical unit cost in HUF, typical quantity per project line)
+MATERIAL_CATEGORIES = [
+    ("Cement", "zsák", 2_600, 80), ("Tégla", "db", 260, 4_000), ("Betonacél", "kg", 480, 1_500),
+    ("Transzportbeton", "m3", 38_000, 25), ("Fűrészáru", "m3", 130_000, 6), ("Tetőcserép", "db", 420, 2_500),
+    ("Hőszigetelés", "m2", 3_600, 300), ("Vízszigetelés", "m2", 2_900, 200), ("Gipszkarton", "m2", 2_200, 350),
+    ("Csempe", "m2", 6_500, 120), ("Járólap", "m2", 7_800, 140), ("Festék", "l", 3_100, 90),
+    ("Villanyszerelési kábel", "m", 320, 1_200), ("Vízvezeték cső", "m", 1_250, 250), ("Nyílászáró", "db", 185_000, 12),
+]
+MATERIAL_GRADES = ["Standard", "Prémium", "Eco", "Pro", "Extra", "Basic"]
+MATERIAL_STATUSES = [("Available", 92), ("Out of Stock", 6), ("Discontinued", 2)]
+
+
+def _weighted(options):
+    """Split [(value, weight), ...] into values and cumulative weights for random.choices"""
+    values, cumulative, total = [], [], 0
+    for value, weight in options:
+        total += weight
+        values.append(value)
+        cumulative.append(total)
+    return values, cumulative
+
+
+def _pick(rng: random.Random, weighted) -> object:
+    """Pick one value from a _weighted() pair"""
+    values, cumulative = weighted
+    return rng.choices(values, cum_weights=cumulative)[0]
+
+
+def _round_random(rng: random.Random, value: float) -> int:
+    """Round so that the expected result equals the input"""
+    whole = int(value)
+    return whole + (1 if rng.random() < value - whole else 0)
+
+
+def _slug(value: str) -> str:
+    """ASCII e-mail friendly version of a Hungarian name"""
+    ascii_value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii')
+    return '.'.join(ascii_value.lower().split())
+
+
+def _phone(rng: random.Random) -> str:
+    return f"+36 {rng.choice(('20', '30', '70'))} {rng.randint(100, 999)} {rng.randint(1000, 9999)}"
+
+
+def location_names(count: int) -> List[str]:
+    """Weather/project locations: real cities first, then numbered districts"""
+    names = [city for city, _ in CITIES][:count]
+    district = 1
+    while len(names) < count:
+        names.append(f"{CITIES[district % len(CITIES)][0]} {district // len(CITIES) + 1}. körzet")
+        district += 1
+    return names
+
+
+def scaled_volumes(rows: int) -> Dict[str, int]:
+    """Volumes with about `rows` task assignments, project materials and weather rows"""
+    projects = max(10, rows // 100)
+    return dict(
+        DEFAULT_VOLUMES,
+        users=max(5, projects // 200),
+        resources=max(60, rows // 400),
+        projects=projects,
+        task_assignments=rows,
+        materials=min(5_000, max(100, rows // 500)),
+        project_materials=rows,
+        weather_years=5,
+        weather_locations=max(1, math.ceil(rows / (5 * 365))),
+    )
+
+
+class BulkLoader:
+    """Buffers generated rows per table and loads them in chunks
+
+    Uses COPY FROM STDIN on PostgreSQL and executemany on other dialects.
+    Every flush writes all buffered tables in dependency order, so foreign
+    keys always point at rows that are already loaded. The TimestampMixin
+    columns are filled with a fixed timestamp.
+    """
+
+    def __init__(self, connection, timestamp: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.connection = connection
+        self.timestamp = (timestamp, timestamp)
+        self.chunk_size = chunk_size
+        self.is_postgresql = connection.dialect.name == 'postgresql'
+        self.placeholder = '?' if connection.dialect.paramstyle == 'qmark' else '%s'
+        self.buffers = {table: [] for table, _ in TABLE_COLUMNS}
+        self.columns = {table: columns + ['created_at', 'updated_at'] for table, columns in TABLE_COLUMNS}
+        self.counts = {table: 0 for table, _ in TABLE_COLUMNS}
+        self.pending = 0
+
+    def add(self, table: str, row: tuple):
+        self.buffers[table].append(row + self.timestamp)
+        self.pending += 1
+        if self.pending >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        for table, rows in self.buffers.items():
+            if rows:
+                self._load(table, rows)
+                self.counts[table] += len(rows)
+                self.buffers[table] = []
+        self.pending = 0
+
+    def _load(self, table: str, rows: List[tuple]):
+        columns = self.columns[table]
+        if self.is_postgresql:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            buffer.seek(0)
+            cursor = self.connection.connection.cursor()
+            try:
+                cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+            finally:
+                cursor.close()
+        else:
+            placeholders = ', '.join([self.placeholder] * len(columns))
+            self.connection.exec_driver_sql(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows
+            )
+
+
+class SyntheticDataGenerator:
+    """Deterministic generator for the whole construction schema"""
+
+    def __init__(self, connection, volumes: Optional[Dict[str, int]] = None, seed: int = DEFAULT_SEED,
+                 as_of: date = DEFAULT_AS_OF, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.connection = connection
+        self.volumes = dict(DEFAULT_VOLUMES, **(volumes or {}))
+        self.seed = seed
+        self.as_of = as_of
+        self.loader = BulkLoader(connection, datetime.combine(as_of, datetime.min.time()).isoformat(sep=' '), chunk_size)
+        self.next_ids = {table: self._max_id(table) for table, _ in TABLE_COLUMNS}
+
+    def _max_id(self, table: str) -> int:
+        return self.connection.execute(text(f"SELECT COALESCE(MAX({PRIMARY_KEYS[table]}), 0) FROM {table}")).scalar()
+
+    def _next_id(self, table: str) -> int:
+        self.next_ids[table] += 1
+        return self.next_ids[table]
+
+    def _rng(self, stream: str) -> random.Random:
+        """Independent random stream per entity so volumes of one table do not shift another"""
+        return random.Random(f"{self.seed}:{stream}")
+
+    # Reference data
+
+    def _ensure_profession_types(self) -> Dict[str, dict]:
+        existing = {row.name: row for row in self.connection.execute(
+            text("SELECT profession_type_id, name, level FROM profession_types"))}
+        professions = {}
+        for profession in get_default_profession_types():
+            row = existing.get(profession["Név"])
+            if row:
+                professions[row.name] = {'id': row.profession_type_id, 'level': row.level,
+                                         'description': profession["Leírás"]}
+            else:
+                profession_id = self._next_id('profession_types')
+                self.loader.add('profession_types', (profession_id, profession["Név"], profession["Leírás"],
+                                                     profession["Szint"]))
+                professions[profession["Név"]] = {'id': profession_id, 'level': profession["Szint"],
+                                                  'description': profession["Leírás"]}
+        return professions
+
+    def _ensure_catalogue(self, professions: Dict[str, dict]) -> Dict[int, List[dict]]:
+        """Project types with their phase/task templates: {project_type_id: [phase, ...]}"""
+        existing_types = {row.name: row.project_type_id for row in self.connection.execute(
+            text("SELECT project_type_id, name FROM project_types"))}
+        catalogue = {}
+        for project_type in get_default_project_types():
+            type_id = existing_types.get(project_type["Név"])
+            if type_id is None:
+                type_id = self._next_id('project_types')
+                self.loader.add('project_types', (type_id, project_type["Név"], project_type["Leírás"]))
+            catalogue[type_id] = self._load_phases(type_id) or self._create_phases(type_id, professions)
+        return catalogue
+
+    def _load_phases(self, type_id: int) -> List[dict]:
+        rows = self.connection.execute(text(
+            "SELECT p.phase_id, p.order_sequence AS phase_order, t.task_id, t.duration_days, t.required_people, "
+            "t.profession_type_id, t.order_sequence "
+            "FROM phases p JOIN tasks t ON t.phase_id = p.phase_id "
+            "WHERE p.project_type_id = :type_id ORDER BY p.order_sequence, t.order_sequence"
+        ), {'type_id': type_id}).all()
+        phases = {}
+        for row in rows:
+            phase = phases.setdefault(row.phase_id, {'id': row.phase_id, 'tasks': []})
+            phase['tasks'].append({'id': row.task_id, 'duration': row.duration_days or 1,
+                                   'people': row.required_people or 1, 'profession_id': row.profession_type_id})
+        return list(phases.values())
+
+    def _create_phases(self, type_id: int, professions: Dict[str, dict]) -> List[dict]:
+        phases = []
+        for phase_order, template in enumerate(get_default_phases(), start=1):
+            phase_id = self._next_id('phases')
+            self.loader.add('phases', (phase_id, type_id, template["name"], phase_order,
+                                       template["total_duration_days"]))
+            tasks = []
+            for task_order, task in enumerate(template["tasks"], start=1):
+                task_id = self._next_id('tasks')
+                profession = professions.get(task["profession"])
+                self.loader.add('tasks', (task_id, phase_id, task["name"], profession['id'] if profession else None,
+                                          task["duration_days"], task["required_people"], task_order))
+                tasks.append({'id': task_id, 'duration': task["duration_days"], 'people': task["required_people"],
+                              'profession_id': profession['id'] if profession else None})
+            phases.append({'id': phase_id, 'tasks': tasks})
+        return phases
+
+    # Core entities
+
+    def _generate_users(self) -> List[int]:
+        rng = self._rng('users')
+        user_ids = []
+        for _ in range(self.volumes['users']):
+            user_id = self._next_id('users')
+            first, last = rng.choice(GIVEN_NAMES), rng.choice(FAMILY_NAMES)
+            hire_date = self.as_of - timedelta(days=rng.randint(30, 15 * 365))
+            self.loader.add('users', (user_id, first, last, f"{_slug(last)}.{_slug(first)}.{user_id}@synthetic.epitai.hu",
+                                      'synthetic', 'Projektvezető', 'Kivitelezés', hire_date.isoformat(), 'Active',
+                                      _phone(rng)))
+            user_ids.append(user_id)
+        return user_ids
+
+    def _generate_resources(self, professions: Dict[str, dict], demand: Dict[int, float]) -> Dict[str, object]:
+        """Resources with professions weighted by catalogue demand; returns worker pools and suppliers"""
+        rng = self._rng('resources')
+        by_id = {profession['id']: (name, profession) for name, profession in professions.items()}
+        demanded = _weighted([(profession_id, weight) for profession_id, weight in sorted(demand.items())])
+        resource_types = _weighted(RESOURCE_TYPES)
+        availability = _weighted(AVAILABILITY)
+        cities = _weighted(CITIES)
+        pools = {profession_id: [] for profession_id in demand}
+        rates = {}
+        suppliers = []
+
+        for index in range(self.volumes['resources']):
+            resource_id = self._next_id('resources')
+            resource_type = _pick(rng, resource_types)
+            city = _pick(rng, cities)
+            family, given = rng.choice(FAMILY_NAMES), rng.choice(GIVEN_NAMES)
+            # Names repeat like in real life; the e-mail carries the resource id, since
+            # (type, e-mail) is the unique key bulk imports upsert on
+            if resource_type == 'Beszállító':
+                name = f"{family} és Társa {rng.choice(('Kft.', 'Bt.', 'Zrt.'))}"
+                row = (resource_id, resource_type, name, 'Beszállító', None, _phone(rng),
+                       f"info.{resource_id}@synthetic.epitai.hu", f"{city}, {rng.choice(STREETS)} u. {rng.randint(1, 120)}.",
+                       'Építőanyag kereskedelem', 0, 'Elérhető', rng.randint(1, 30))
+                suppliers.append((resource_id, name))
+            else:
+                # The first workers cover every demanded profession so each pool is non-empty
+                profession_id = sorted(demand)[index] if index < len(demand) else _pick(rng, demanded)
+                profession_name, profession = by_id[profession_id]
+                rate = LEVEL_RATES.get(profession['level'], 3500) * rng.lognormvariate(0, 0.18)
+                if resource_type == 'Alvállalkozó':
+                    rate *= 1.3
+                name = f"{family} {given}"
+                row = (resource_id, resource_type, name, profession_name, profession_id, _phone(rng),
+                       f"{_slug(family)}.{_slug(given)}.{resource_id}@synthetic.epitai.hu",
+                       f"{city}, {rng.choice(STREETS)} u. {rng.randint(1, 120)}.", profession['description'],
+                       round(rate / 50) * 50, _pick(rng, availability), min(40, int(rng.gammavariate(2, 5))))
+                pools[profession_id].append(resource_id)
+                rates[resource_id] = row[9]
+            self.loader.add('resources', row)
+        return {'pools': pools, 'rates': rates, 'suppliers': suppliers}
+
+    def _generate_materials(self, suppliers: List[tuple]) -> List[dict]:
+        rng = self._rng('materials')
+        statuses = _weighted(MATERIAL_STATUSES)
+        materials = []
+        for index in range(self.volumes['materials']):
+            material_id = self._next_id('materials')
+            category, unit, base_cost, typical_quantity = MATERIAL_CATEGORIES[index % len(MATERIAL_CATEGORIES)]
+            grade = MATERIAL_GRADES[(index // len(MATERIAL_CATEGORIES)) % len(MATERIAL_GRADES)]
+            unit_cost = round(base_cost * rng.lognormvariate(0, 0.25), 2)
+            supplier_id, supplier_name = rng.choice(suppliers) if suppliers else (None, None)
+            self.loader.add('materials', (
+                material_id, supplier_id, f"{category} {grade} {index + 1:05d}", category, unit, unit_cost,
+                supplier_name, rng.choice((1, 2, 3, 5, 7, 10, 14, 21)), rng.choice((1, 1, 5, 10, 50)),
+                int(rng.lognormvariate(math.log(typical_quantity), 1.0)), typical_quantity // 4,
+                _pick(rng, statuses),
+            ))
+            materials.append({'id': material_id, 'unit_cost': unit_cost, 'quantity': typical_quantity})
+        return materials
+
+    def _generate_projects(self, catalogue: Dict[int, List[dict]], user_ids: List[int], resources: Dict[str, object],
+                           materials: List[dict], profession_names: Dict[int, str]):
+        """Projects with locations, schedules, members, assignments and material lines"""
+        pools, rates = resources['pools'], resources['rates']
+        rng = self._rng('projects')
+        assignment_rng = self._rng('task_assignments')
+        material_rng = self._rng('project_materials')
+        cities = _weighted(CITIES)
+        priorities = _weighted(PRIORITIES)
+        projects = self.volumes['projects']
+        history_days = self.volumes['history_years'] * 365
+
+        people_per_project = sum(
+            task['people'] for phases in catalogue.values() for phase in phases for task in phase['tasks']
+            if task['profession_id']
+        ) / max(1, len(catalogue))
+        assignment_scale = self.volumes['task_assignments'] / max(1, projects * people_per_project)
+        materials_per_project = self.volumes['project_materials'] / max(1, projects)
+        # Zipf-like popularity: a few materials appear on most projects
+        material_weights = _weighted([(material, 1 / (rank + 1)) for rank, material in enumerate(materials)])
+        type_ids = sorted(catalogue)
+
+        for index in range(projects):
+            project_id = self._next_id('projects')
+            type_id = rng.choice(type_ids)
+            city = _pick(rng, cities)
+            # Recent years hold more projects; a few start in the future
+            if rng.random() < 0.08:
+                start = self.as_of + timedelta(days=rng.randint(1, 180))
+            else:
+                start = self.as_of - timedelta(days=int(history_days * rng.random() ** 1.5))
+            pace = rng.lognormvariate(0, 0.2)
+
+            # Sequential task schedule inside each phase
+            cursor = start
+            schedule = []
+            for phase in catalogue[type_id]:
+                phase_start = cursor
+                tasks = []
+                for task in phase['tasks']:
+                    duration = max(1, round(task['duration'] * pace))
+                    tasks.append((task, cursor, cursor + timedelta(days=duration - 1)))
+                    cursor += timedelta(days=duration)
+                schedule.append((phase, phase_start, cursor - timedelta(days=1), tasks))
+            end = cursor - timedelta(days=1)
+
+            if start > self.as_of:
+                status, progress = 'Tervezés alatt', 0
+            elif end < self.as_of:
+                status, progress = 'Lezárt', 100
+            else:
+                status = 'Késésben' if rng.random() < 0.18 else 'Folyamatban'
+                progress = min(99, int(100 * (self.as_of - start).days / max(1, (end - start).days)))
+
+            # Children first so the budget can be drawn around the planned cost
+            children = [('project_locations', (
+                self._next_id('project_locations'), project_id, city,
+                f"{city}, {rng.choice(STREETS)} u. {rng.randint(1, 120)}.",
+            ))]
+            planned_cost = 0.0
+            members = {}
+            for phase, phase_start, phase_end, tasks in schedule:
+                project_phase_id = self._next_id('project_phases')
+                phase_status, phase_progress = self._progress(phase_start, phase_end)
+                children.append(('project_phases', (project_phase_id, project_id, phase['id'], phase_start.isoformat(),
+                                                    phase_end.isoformat(), phase_status, phase_progress)))
+                for task, task_start, task_end in tasks:
+                    project_task_id = self._next_id('project_tasks')
+                    task_status, task_progress = self._progress(task_start, task_end)
+                    children.append(('project_tasks', (
+                        project_task_id, project_phase_id, task['id'], task_start.isoformat(), task_end.isoformat(),
+                        task_status, task_progress, task_end.isoformat() if task_status == 'Completed' else None,
+                    )))
+                    pool = pools.get(task['profession_id'])
+                    if not pool:
+                        continue
+                    count = min(len(pool), max(1, _round_random(assignment_rng, task['people'] * assignment_scale)))
+                    for resource_id in assignment_rng.sample(pool, count):
+                        row = self._assignment_row(assignment_rng, project_task_id, resource_id, task_start,
+                                                   task_end, task_status)
+                        children.append(('task_assignments', row))
+                        planned_cost += ((task_end - task_start).days + 1) * 8 * 0.8 * rates[resource_id]
+                        members.setdefault(resource_id, profession_names.get(task['profession_id']))
+
+            for resource_id, role in members.items():
+                children.append(('project_members', (self._next_id('project_members'), project_id, resource_id, role,
+                                                     (start - timedelta(days=14)).isoformat())))
+
+            lines = max(0, _round_random(material_rng, material_rng.gauss(materials_per_project, materials_per_project / 3)))
+            for material in (material_rng.choices(material_weights[0], cum_weights=material_weights[1], k=lines)
+                             if materials else []):
+                row = self._project_material_row(material_rng, project_id, material, start, end)
+                children.append(('project_materials', row))
+                planned_cost += row[5]
+
+            size = int(rng.triangular(70, 260, 120))
+            budget = round(max(planned_cost, size * 100_000) * rng.lognormvariate(0.02, 0.12), -3)
+            self.loader.add('projects', (
+                project_id, f"Családi ház {city} {project_id}", f"{rng.choice(FAMILY_NAMES)} {rng.choice(GIVEN_NAMES)}",
+                type_id, status, start.isoformat(), end.isoformat(), budget,
+                rng.choice(user_ids) if user_ids else None, city, _pick(rng, priorities), progress, size,
+                f"SYN-{self.seed}-{project_id}",
+            ))
+            for table, row in children:
+                self.loader.add(table, row)
+
+            if (index + 1) % 1000 == 0:
+                print(f"  … {index + 1}/{projects} projects")
+
+    def _progress(self, start: date, end: date):
+        """Status and progress of a scheduled item on the as-of date"""
+        if end < self.as_of:
+            return 'Completed', 100
+        if start > self.as_of:
+            return 'Not Started', 0
+        return 'In Progress', min(99, int(100 * (self.as_of - start).days / max(1, (end - start).days + 1)))
+
+    def _assignment_row(self, rng: random.Random, project_task_id: int, resource_id: int,
+                        start: date, end: date, task_status: str) -> tuple:
+        days = (end - start).days + 1
+        if rng.random() < 0.02:
+            status, hours = 'Cancelled', 0
+        elif task_status == 'Completed':
+            status, hours = 'Completed', round(days * 8 * rng.uniform(0.6, 1.0), 1)
+        elif task_status == 'In Progress':
+            status, hours = 'In Progress', round(((self.as_of - start).days + 1) * 8 * rng.uniform(0.5, 1.0), 1)
+        else:
+            status, hours = 'Assigned', 0
+        return (
+            self._next_id('task_assignments'), project_task_id, resource_id,
+            (start - timedelta(days=rng.randint(3, 30))).isoformat(), start.isoformat(), end.isoformat(),
+            status, hours,
+        )
+
+    def _project_material_row(self, rng: random.Random, project_id: int, material: dict,
+                              start: date, end: date) -> tuple:
+        assigned = start + timedelta(days=rng.randint(0, max(0, (end - start).days)))
+        if assigned > self.as_of + timedelta(days=30):
+            status = 'Planned'
+        elif assigned > self.as_of:
+            status = 'Ordered' if rng.random() < 0.5 else 'Planned'
+        else:
+            status = rng.choices(('Used', 'Delivered', 'Ordered'), cum_weights=(70, 90, 100))[0]
+        quantity = max(1, round(material['quantity'] * rng.lognormvariate(0, 0.5)))
+        unit_cost = round(material['unit_cost'] * rng.uniform(0.9, 1.15), 2)
+        return (
+            self._next_id('project_materials'), project_id, material['id'], quantity, unit_cost,
+            round(quantity * unit_cost, 2), assigned.isoformat(), status,
+        )
+
+    def _generate_weather(self):
+        """Daily weather per location with seasonal temperatures and persistent wet spells"""
+        existing = {row[0] for row in self.connection.execute(text("SELECT DISTINCT location FROM weather_data"))}
+        locations = [name for name in location_names(self.volumes['weather_locations'] + len(existing))
+                     if name not in existing][:self.volumes['weather_locations']]
+        days = self.volumes['weather_years'] * 365
+        first_day = self.as_of - timedelta(days=days - 1)
+        for location in locations:
+            rng = self._rng(f"weather:{location}")
+            anomaly, wet = 0.0, False
+            for offset in range(days):
+                day = first_day + timedelta(days=offset)
+                season = math.cos(2 * math.pi * (day.timetuple().tm_yday - 201) / 365)
+                anomaly = 0.7 * anomaly + rng.gauss(0, 2.2)
+                mean = 11 + 11.5 * season + anomaly
+                wet = rng.random() < (0.6 if wet else 0.22 + 0.05 * season)
+                probability = rng.randint(55, 100) if wet else rng.randint(0, 45)
+                hours = rng.randint(1, 10) if wet else (1 if probability > 35 and rng.random() < 0.3 else 0)
+                self.loader.add('weather_data', (
+                    self._next_id('weather_data'), location, day.isoformat(), probability, hours,
+                    round(mean - rng.uniform(3, 6), 1), round(mean + rng.uniform(3, 7), 1),
+                    round(min(90.0, rng.gammavariate(2, 6)), 1), probability < 40 and hours <= 2,
+                ))
+
+    def generate(self) -> Dict[str, int]:
+        """Generate and load everything; returns rows loaded per table"""
+        professions = self._ensure_profession_types()
+        catalogue = self._ensure_catalogue(professions)
+        demand = {}
+        for phases in catalogue.values():
+            for phase in phases:
+                for task in phase['tasks']:
+                    if task['profession_id']:
+                        demand[task['profession_id']] = demand.get(task['profession_id'], 0) + \
+                            task['people'] * task['duration']
+        profession_names = {profession['id']: name for name, profession in professions.items()}
+
+        user_ids = self._generate_users()
+        resources = self._generate_resources(professions, demand)
+        materials = self._generate_materials(resources['suppliers'])
+        self._generate_projects(catalogue, user_ids, resources, materials, profession_names)
+        self._generate_weather()
+        self.loader.flush()
+        return {table: count for table, count in self.loader.counts.items() if count}
+
+
+def _reset_sequences(connection, tables: List[str]):
+    """Move PostgreSQL serial sequences past explicitly loaded ids"""
+    for table in tables:
+        key = PRIMARY_KEYS[table]
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', '{key}'), "
+            f"COALESCE((SELECT MAX({key}) FROM {table}), 1))"
+        ))
+
+
+def generate(engine, volumes: Optional[Dict[str, int]] = None, seed: int = DEFAULT_SEED,
+             as_of: date = DEFAULT_AS_OF, chunk_size: int = DEFAULT_CHUNK_SIZE,
+             refresh_derived: bool = True) -> Dict[str, int]:
+    """Load synthetic data into an already migrated database in one transaction"""
+    with engine.begin() as connection:
+        if connection.dialect.name == 'sqlite':
+            connection.exec_driver_sql("PRAGMA foreign_keys = ON")
+        elif connection.dialect.name == 'postgresql':
+            connection.execute(text("SET LOCAL synchronous_commit = off"))
+
+        counts = SyntheticDataGenerator(connection, volumes, seed, as_of, chunk_size).generate()
+
+        if connection.dialect.name == 'postgresql':
+            _reset_sequences(connection, list(counts))
+        if refresh_derived and counts.get('projects'):
+            from models.project_budget import refresh_budget_deviations
+            refresh_budget_deviations(connection)
+    return counts
+
+
+if __name__ == "__main__":
+    # Command line interface
+    import argparse
+    from sqlalchemy import create_engine
+
+    parser = argparse.ArgumentParser(description="Generate synthetic construction data for load testing")
+    parser.add_argument("--database-url", required=True, help="Target database URL (never production)")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small", help="Volume preset")
+    for key in DEFAULT_VOLUMES:
+        parser.add_argument(f"--{key.replace('_', '-')}", type=int, dest=key, help=f"Override {key} volume")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed (same seed, same data)")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=DEFAULT_AS_OF,
+                        help="Date that separates history from the future (YYYY-MM-DD)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows buffered per load")
+    parser.add_argument("--upgrade", action="store_true", help="Run Alembic migrations to head first")
+    parser.add_argument("--skip-derived", action="store_true", help="Do not rebuild budget deviations")
+
+    args = parser.parse_args()
+
+    try:
+        from database import DATABASE_URL
+    except ValueError:
+        DATABASE_URL = None
+    if DATABASE_URL and args.database_url == DATABASE_URL:
+        print("❌ Refusing to load synthetic data into the application database")
+        sys.exit(1)
+
+    target_engine = create_engine(args.database_url)
+    if args.upgrade:
+        from alembic import command
+        from alembic.config import Config
+        config = Config("alembic.ini")
+        with target_engine.connect() as connection:
+            config.attributes['connection'] = connection
+            command.upgrade(config, "head")
+
+    volumes = dict(PROFILES[args.profile])
+    volumes.update({key: getattr(args, key) for key in DEFAULT_VOLUMES if getattr(args, key) is not None})
+
+    print(f"🌱 Generating synthetic data (profile {args.profile}, seed {args.seed}, as of {args.as_of})")
+    started = time.perf_counter()
+    loaded = generate(target_engine, volumes, args.seed, args.as_of, args.chunk_size, not args.skip_derived)
+    elapsed = time.perf_counter() - started
+    total = sum(loaded.values())
+    for table, count in loaded.items():
+        print(f"  {table:20} {count:>12,}")
+    print(f"✅ Loaded {total:,} rows in {elapsed:.1f} s ({total / max(elapsed, 0.001):,.0f} rows/s)")